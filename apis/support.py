@@ -9,6 +9,7 @@ from maibot_sdk import API
 from ..types import NapCatActionParamsInput, NapCatActionResponse, NapCatIdInput
 
 if TYPE_CHECKING:
+    from ..runtime import NapCatRuntimeBundle
     from ..services import NapCatActionService, NapCatQueryService
 
 
@@ -26,6 +27,10 @@ class NapCatApiSupportMixin:
         """确保运行时组件已经初始化。"""
         raise NotImplementedError
 
+    def _require_runtime_bundle(self) -> "NapCatRuntimeBundle":
+        """返回当前已初始化的运行时组件集合。"""
+        raise NotImplementedError
+
     @staticmethod
     def _coerce_int(value: object, field_name: str, expectation: str) -> int:
         """将受支持的输入值转换为整数。
@@ -21,6 +21,30 @@ class NapCatSystemApiMixin(NapCatApiSupportMixin):
         """
         return await self._require_query_service().get_login_info()
 
+    @API("adapter.napcat.system.get_runtime_stats", description="获取适配器运行时监控指标", version="1", public=True)
+    async def api_get_runtime_stats(self) -> Dict[str, Any]:
+        """获取适配器运行时监控指标。
+
+        Returns:
+            Dict[str, Any]: 以组件名为键的指标字典，例如入站队列深度与等待时长。
+        """
+        return self._require_runtime_bundle().collect_stats()
+
+    @API("adapter.napcat.system.get_contact_directory", description="获取账号的群与好友目录", version="1", public=True)
+    async def api_get_contact_directory(self, connection_id: str = "") -> Dict[str, Any]:
+        """获取连接建立时预热、并随通知增量更新的群与好友目录。
+
+        Args:
+            connection_id: 连接标识；为空时使用默认连接。
+
+        Returns:
+            Dict[str, Any]: ``groups``、``friends`` 列表与两者最近一次全量加载的 Unix 时间戳。
+
+        Raises:
+            ValueError: 当连接标识不存在时抛出。
+        """
+        return self._require_runtime_bundle().connections.get_contact_directory(connection_id).to_dict()
+
     @API("adapter.napcat.system.bot_exit", description="退出登录", version="1", public=True)
     async def api_action_bot_exit(self, params: NapCatApiParamsInput = None) -> Dict[str, Any]:
         """调用 NapCat 的 ``bot_exit`` 动作。
@@ -0,0 +1,54 @@
+"""基准脚本共用的适配器包加载辅助。
+
+仓库根目录含有 ``types.py`` 与 ``codecs/`` 等与标准库同名的模块，
+不能直接加入 ``sys.path``；这里以固定别名把仓库注册为一个包再导入子模块。
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import ModuleType
+
+import importlib
+import importlib.util
+import sys
+
+PACKAGE_ALIAS = "napcat_adapter"
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_adapter_package() -> ModuleType:
+    """以 ``napcat_adapter`` 别名注册适配器包。
+
+    Returns:
+        ModuleType: 已注册的适配器包模块。
+    """
+    existing_module = sys.modules.get(PACKAGE_ALIAS)
+    if existing_module is not None:
+        return existing_module
+
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE_ALIAS,
+        REPO_ROOT / "__init__.py",
+        submodule_search_locations=[str(REPO_ROOT)],
+    )
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"无法加载适配器包: {REPO_ROOT}")
+
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE_ALIAS] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+def load_adapter_module(module_name: str) -> ModuleType:
+    """导入适配器包内的子模块。
+
+    Args:
+        module_name: 相对于包根的模块路径，例如 ``codecs.json_codec``。
+
+    Returns:
+        ModuleType: 已导入的子模块。
+    """
+    load_adapter_package()
+    return importlib.import_module(f"{PACKAGE_ALIAS}.{module_name}")
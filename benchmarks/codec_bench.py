@@ -0,0 +1,351 @@
+"""入站、出站与通知编解码热路径微基准。
+
+语料见 ``benchmarks/codec_corpus.py``。每个测量项在计时前先把输出与
+``benchmarks/golden/codec_golden.json`` 中的黄金结果比较，任一项不一致时以退出码 1 结束，
+避免优化在提速的同时悄悄改变输出。有意改变输出时使用 ``--update-golden`` 重新生成黄金结果，
+并在评审中检查其差异。
+
+用法::
+
+    python benchmarks/codec_bench.py
+    python benchmarks/codec_bench.py --check-only
+    python benchmarks/codec_bench.py --filter inbound --json > bench_output.txt
+    python benchmarks/codec_bench.py --update-golden
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import statistics
+import sys
+import time
+import timeit
+
+from _loader import load_adapter_module
+
+import codec_corpus
+
+GOLDEN_PATH = Path(__file__).resolve().parent / "golden" / "codec_golden.json"
+# 超过该长度的字符串（图片与语音的 Base64）在黄金结果中只保存摘要
+_MAX_INLINE_STRING_LENGTH = 256
+_MISSING = object()
+
+
+def canonicalize(value: Any) -> Any:
+    """把编解码输出转换为可写入黄金文件的稳定结构。
+
+    Args:
+        value: 任意编解码输出。
+
+    Returns:
+        Any: 元组转为列表、长字符串替换为 ``<sha256:...;len=N>`` 后的结构。
+    """
+    if isinstance(value, dict):
+        return {str(key): canonicalize(child_value) for key, child_value in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(item) for item in value]
+    if isinstance(value, str) and len(value) > _MAX_INLINE_STRING_LENGTH:
+        return f"<sha256:{hashlib.sha256(value.encode('utf-8')).hexdigest()};len={len(value)}>"
+    return value
+
+
+class BenchCase:
+    """一个测量项：同步或异步的无参调用及其所属分组。"""
+
+    def __init__(
+        self,
+        group: str,
+        name: str,
+        func: Optional[Callable[[], Any]] = None,
+        coro_func: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> None:
+        """初始化测量项。
+
+        Args:
+            group: 被测函数的分组名。
+            name: 语料名称。
+            func: 同步被测调用。
+            coro_func: 异步被测调用，与 ``func`` 二选一。
+        """
+        self.group = group
+        self.name = name
+        self.func = func
+        self.coro_func = coro_func
+
+    def run_once(self, loop: asyncio.AbstractEventLoop) -> Any:
+        """执行一次被测调用并返回输出。
+
+        Args:
+            loop: 执行异步调用的事件循环。
+
+        Returns:
+            Any: 被测调用的输出。
+        """
+        if self.coro_func is not None:
+            return loop.run_until_complete(self.coro_func())
+        assert self.func is not None
+        return self.func()
+
+
+def build_cases(loop: asyncio.AbstractEventLoop) -> List[BenchCase]:
+    """构造全部测量项。
+
+    Args:
+        loop: 预先执行入站转换以取得 ``build_plain_text`` 输入的事件循环。
+
+    Returns:
+        List[BenchCase]: 按分组排列的测量项。
+    """
+    inbound_module = load_adapter_module("codecs.inbound.message_codec")
+    outbound_codec_module = load_adapter_module("codecs.outbound.message_codec")
+    segment_encoder_module = load_adapter_module("codecs.outbound.segment_encoder")
+    notice_helpers = load_adapter_module("codecs.notice.helpers")
+    notice_renderer_module = load_adapter_module("codecs.notice.renderer")
+
+    inbound_codec = inbound_module.NapCatInboundCodec(
+        logging.getLogger("napcat_codec_bench"),
+        codec_corpus.StubQueryService(),
+    )
+    segment_encoder = segment_encoder_module.NapCatOutboundSegmentEncoder()
+    outbound_codec = outbound_codec_module.NapCatOutboundCodec()
+    notice_renderer = notice_renderer_module.NapCatNoticeTextRenderer()
+
+    cases: List[BenchCase] = []
+    for name, payload in codec_corpus.INBOUND_MESSAGES.items():
+
+        def build_message(payload: Dict[str, Any] = payload) -> Awaitable[Any]:
+            return inbound_codec.build_message_dict(
+                payload, codec_corpus.SELF_ID, str(payload["user_id"]), payload["sender"]
+            )
+
+        cases.append(BenchCase("inbound.build_message_dict", name, coro_func=build_message))
+
+    for name, payload in codec_corpus.INBOUND_MESSAGES.items():
+        message_dict = loop.run_until_complete(
+            inbound_codec.build_message_dict(payload, codec_corpus.SELF_ID, str(payload["user_id"]), payload["sender"])
+        )
+        raw_message = message_dict["raw_message"]
+        cases.append(
+            BenchCase(
+                "inbound.build_plain_text",
+                name,
+                func=lambda raw=raw_message: inbound_codec.build_plain_text(raw),
+            )
+        )
+
+    for name, (message, route) in codec_corpus.OUTBOUND_MESSAGES.items():
+        raw_message = message["raw_message"]
+        cases.append(
+            BenchCase(
+                "outbound.convert_segments",
+                name,
+                func=lambda raw=raw_message: segment_encoder.convert_segments(raw),
+            )
+        )
+    for name, (message, route) in codec_corpus.OUTBOUND_MESSAGES.items():
+        cases.append(
+            BenchCase(
+                "outbound.build_outbound_action",
+                name,
+                func=lambda message=message, route=route: outbound_codec.build_outbound_action(message, route),
+            )
+        )
+
+    for name, payload in codec_corpus.NOTICES.items():
+        cases.append(
+            BenchCase(
+                "notice.build_payload_digest",
+                name,
+                func=lambda payload=payload: notice_helpers.build_payload_digest(payload),
+            )
+        )
+    for name, payload in codec_corpus.NOTICES.items():
+        cases.append(
+            BenchCase(
+                "notice.build_notice_text",
+                name,
+                func=lambda payload=payload: notice_renderer.build_notice_text(payload, codec_corpus.NOTICE_ACTOR_NAME),
+            )
+        )
+    return cases
+
+
+def _time_sync(func: Callable[[], Any], min_time: float) -> List[float]:
+    """测量同步调用的单次耗时。
+
+    Args:
+        func: 待测量的无参函数。
+        min_time: 每个测量项的最短总耗时秒数。
+
+    Returns:
+        List[float]: 每组测量的单次调用耗时，单位为微秒。
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    repeat_count = max(5, int(min_time / max(elapsed, 1e-9)))
+    return [total / number * 1_000_000 for total in timer.repeat(repeat=repeat_count, number=number)]
+
+
+def _time_async(
+    loop: asyncio.AbstractEventLoop,
+    coro_func: Callable[[], Awaitable[Any]],
+    min_time: float,
+) -> List[float]:
+    """测量异步调用的单次耗时。
+
+    每组在同一个协程内连续等待 ``number`` 次，避免把 ``run_until_complete`` 的开销计入单次耗时；
+    ``number`` 与 ``timeit.Timer.autorange`` 一样按 1、2、5、10… 递增，直到一组耗时不少于 0.2 秒。
+
+    Args:
+        loop: 执行协程的事件循环。
+        coro_func: 返回被测协程的无参函数。
+        min_time: 每个测量项的最短总耗时秒数。
+
+    Returns:
+        List[float]: 每组测量的单次调用耗时，单位为微秒。
+    """
+
+    async def run_batch(number: int) -> float:
+        started_at = time.perf_counter()
+        for _ in range(number):
+            await coro_func()
+        return time.perf_counter() - started_at
+
+    number = 1
+    elapsed = 0.0
+    multipliers = (1, 2, 5)
+    scale = 1
+    while True:
+        for multiplier in multipliers:
+            number = scale * multiplier
+            elapsed = loop.run_until_complete(run_batch(number))
+            if elapsed >= 0.2:
+                break
+        else:
+            scale *= 10
+            continue
+        break
+
+    repeat_count = max(5, int(min_time / max(elapsed, 1e-9)))
+    return [loop.run_until_complete(run_batch(number)) / number * 1_000_000 for _ in range(repeat_count)]
+
+
+def check_golden(
+    cases: List[BenchCase],
+    loop: asyncio.AbstractEventLoop,
+    golden: Dict[str, Dict[str, Any]],
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """执行每个测量项一次，并与黄金结果比较。
+
+    Args:
+        cases: 全部测量项。
+        loop: 执行异步调用的事件循环。
+        golden: 已保存的黄金结果，分组名到“语料名到输出”的映射。
+
+    Returns:
+        Tuple[Dict[str, Dict[str, Any]], List[str]]: 本次的规范化输出，以及输出不一致或缺少黄金结果的测量项。
+    """
+    outputs: Dict[str, Dict[str, Any]] = {}
+    mismatches: List[str] = []
+    for case in cases:
+        output = canonicalize(case.run_once(loop))
+        outputs.setdefault(case.group, {})[case.name] = output
+        expected = golden.get(case.group, {}).get(case.name, _MISSING)
+        if expected is _MISSING:
+            mismatches.append(f"{case.group}/{case.name}: 缺少黄金结果")
+        elif expected != output:
+            mismatches.append(f"{case.group}/{case.name}: 输出与黄金结果不一致")
+    return outputs, mismatches
+
+
+def run(cases: List[BenchCase], loop: asyncio.AbstractEventLoop, min_time: float) -> List[Dict[str, Any]]:
+    """测量全部测量项。
+
+    Args:
+        cases: 全部测量项。
+        loop: 执行异步调用的事件循环。
+        min_time: 每个测量项的最短总耗时秒数。
+
+    Returns:
+        List[Dict[str, Any]]: 每个测量项的最小与中位单次耗时。
+    """
+    results: List[Dict[str, Any]] = []
+    for case in cases:
+        if case.coro_func is not None:
+            samples = _time_async(loop, case.coro_func, min_time)
+        else:
+            assert case.func is not None
+            samples = _time_sync(case.func, min_time)
+        results.append(
+            {
+                "group": case.group,
+                "case": case.name,
+                "min_us": min(samples),
+                "median_us": statistics.median(samples),
+                "repeats": len(samples),
+            }
+        )
+    return results
+
+
+def main() -> None:
+    """命令行入口。"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    parser.add_argument("--min-time", type=float, default=0.2, help="每个测量项的最短总耗时秒数")
+    parser.add_argument("--filter", default="", help="只运行分组名或语料名包含该文本的测量项")
+    parser.add_argument("--check-only", action="store_true", help="只比较黄金结果，不计时")
+    parser.add_argument("--update-golden", action="store_true", help="用本次输出重写黄金结果文件")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    loop = asyncio.new_event_loop()
+    try:
+        cases = build_cases(loop)
+        if args.filter:
+            cases = [case for case in cases if args.filter in case.group or args.filter in case.name]
+
+        golden: Dict[str, Dict[str, Any]] = {}
+        if GOLDEN_PATH.exists():
+            golden = json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+        outputs, mismatches = check_golden(cases, loop, golden)
+
+        if args.update_golden:
+            for group, group_outputs in outputs.items():
+                golden.setdefault(group, {}).update(group_outputs)
+            GOLDEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+            GOLDEN_PATH.write_text(
+                json.dumps(golden, ensure_ascii=False, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+            )
+            print(f"已写入 {len(cases)} 项黄金结果: {GOLDEN_PATH}", file=sys.stderr)
+            return
+        if mismatches:
+            for mismatch in mismatches:
+                print(mismatch, file=sys.stderr)
+            sys.exit(1)
+        if args.check_only:
+            print(f"{len(cases)} 项输出与黄金结果一致", file=sys.stderr)
+            return
+
+        results = run(cases, loop, args.min_time)
+    finally:
+        loop.close()
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"{'group':<34}{'case':<30}{'min(us)':>12}{'median(us)':>12}")
+    for item in results:
+        print(f"{item['group']:<34}{item['case']:<30}{item['min_us']:>12.2f}{item['median_us']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,657 @@
+"""编解码微基准使用的 OneBot 载荷语料。
+
+语料按 NapCat 实际推送的结构整理：入站消息覆盖文本、@、回复、QQ 表情、图片、语音、合并转发，以及
+``_build_json_segments`` 识别的每一种 JSON 卡片（含兜底与非法 JSON）；通知覆盖渲染器处理的全部
+``notice_type`` / ``sub_type`` 组合；出站消息覆盖 ``NapCatOutboundSegmentEncoder`` 的全部消息段类型。
+
+所有载荷都带固定的 ``message_id`` 与 ``time``，查询结果由 ``StubQueryService`` 按入参确定性地生成，
+因此同一份代码对同一份语料的输出可以与黄金结果逐字段比较。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import base64
+import hashlib
+import json
+
+SELF_ID = "10001"
+GROUP_ID = "30003"
+SENDER_ID = "20002"
+EVENT_TIME = 1760000000
+IMAGE_BYTES = 16 * 1024
+RECORD_BYTES = 8 * 1024
+FORWARD_IMAGE_NODES = 8
+LARGE_IMAGE_BYTES = 128 * 1024
+LARGE_FORWARD_IMAGE_NODES = 50
+
+
+def deterministic_bytes(seed: str, size: int) -> bytes:
+    """按种子生成固定内容的二进制数据。
+
+    Args:
+        seed: 种子文本，相同种子得到相同内容。
+        size: 字节数。
+
+    Returns:
+        bytes: 以 PNG 文件头开头的伪图片数据。
+    """
+    block = hashlib.sha256(seed.encode("utf-8")).digest()
+    return (b"\x89PNG\r\n\x1a\n" + block * (size // len(block) + 1))[:size]
+
+
+def media_url(name: str, size: int = IMAGE_BYTES) -> str:
+    """构造语料中使用的媒体地址。
+
+    Args:
+        name: 媒体名称，同时作为内容种子。
+        size: 媒体字节数。
+
+    Returns:
+        str: ``StubQueryService.download_binary`` 能够解析的地址。
+    """
+    return f"https://multimedia.nt.qq.com.cn/download?name={name}&size={size}"
+
+
+def _sender(user_id: str, nickname: str, card: str = "", role: str = "member") -> Dict[str, Any]:
+    """构造 OneBot ``sender`` 字段。"""
+    return {"user_id": int(user_id), "nickname": nickname, "card": card, "role": role}
+
+
+def _group_message(message_id: int, segments: List[Dict[str, Any]], **overrides: Any) -> Dict[str, Any]:
+    """构造一条群消息事件。
+
+    Args:
+        message_id: 消息 ID。
+        segments: OneBot 消息段列表。
+        **overrides: 覆盖默认字段的键值。
+
+    Returns:
+        Dict[str, Any]: 与 NapCat 推送结构一致的群消息事件。
+    """
+    payload: Dict[str, Any] = {
+        "self_id": int(SELF_ID),
+        "user_id": int(SENDER_ID),
+        "time": EVENT_TIME,
+        "message_id": message_id,
+        "message_seq": message_id,
+        "real_id": message_id,
+        "message_type": "group",
+        "sender": _sender(SENDER_ID, "测试用户", "群名片"),
+        "raw_message": "",
+        "font": 14,
+        "sub_type": "normal",
+        "message": segments,
+        "message_format": "array",
+        "post_type": "message",
+        "group_id": int(GROUP_ID),
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _private_message(message_id: int, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """构造一条好友私聊消息事件。"""
+    payload = _group_message(message_id, segments, message_type="private", sub_type="friend")
+    payload.pop("group_id")
+    payload["sender"] = _sender(SENDER_ID, "测试用户")
+    return payload
+
+
+def _text(text: str) -> Dict[str, Any]:
+    """构造 OneBot 文本段。"""
+    return {"type": "text", "data": {"text": text}}
+
+
+def _at(user_id: str) -> Dict[str, Any]:
+    """构造 OneBot @ 段。"""
+    return {"type": "at", "data": {"qq": user_id}}
+
+
+def _image(name: str, sub_type: int = 0, size: int = IMAGE_BYTES) -> Dict[str, Any]:
+    """构造 OneBot 图片段。"""
+    return {
+        "type": "image",
+        "data": {
+            "summary": "[动画表情]" if sub_type else "",
+            "file": f"{name}.png",
+            "sub_type": sub_type,
+            "url": media_url(name, size),
+            "file_size": str(size),
+        },
+    }
+
+
+def _json_card(app: str, meta: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
+    """构造 OneBot JSON 卡片段。
+
+    Args:
+        app: 卡片 ``app`` 字段。
+        meta: 卡片 ``meta`` 字段。
+        prompt: 卡片 ``prompt`` 字段。
+
+    Returns:
+        Dict[str, Any]: ``data.data`` 为卡片 JSON 文本的消息段。
+    """
+    card = {"app": app, "desc": "", "view": "news", "ver": "0.0.0.1", "prompt": prompt, "meta": meta}
+    return {"type": "json", "data": {"data": json.dumps(card, ensure_ascii=False)}}
+
+
+def _b64(text: str) -> str:
+    """把文本编码为 Base64。"""
+    return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+
+def _forward_node(index: int, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """构造 ``get_forward_msg`` 返回的单个转发节点。"""
+    user_id = str(40000 + index)
+    return {
+        "self_id": int(SELF_ID),
+        "user_id": int(user_id),
+        "time": EVENT_TIME - 600 + index,
+        "message_id": 7000000 + index,
+        "message_type": "group",
+        "sender": _sender(user_id, f"转发成员{index}"),
+        "message": segments,
+        "message_format": "array",
+        "post_type": "message",
+    }
+
+
+FORWARD_MESSAGES: Dict[str, List[Dict[str, Any]]] = {
+    "fwd-text": [
+        _forward_node(index, [_text(f"转发的第 {index} 条消息，内容稍微长一点以贴近真实聊天记录。")])
+        for index in range(10)
+    ],
+    "fwd-images": [
+        _forward_node(100 + index, [_text(f"图 {index}"), _image(f"forward-image-{index}")])
+        for index in range(FORWARD_IMAGE_NODES)
+    ],
+    "fwd-images-50": [
+        _forward_node(300 + index, [_image(f"forward-large-{index}", size=LARGE_IMAGE_BYTES)])
+        for index in range(LARGE_FORWARD_IMAGE_NODES)
+    ],
+    "fwd-outer": [
+        _forward_node(200, [_text("外层转发")]),
+        _forward_node(201, [{"type": "forward", "data": {"id": "fwd-text"}}]),
+        _forward_node(202, [_at(SELF_ID), _text(" 看看这个"), {"type": "face", "data": {"id": "178"}}]),
+    ],
+}
+
+REPLY_TARGETS: Dict[str, Dict[str, Any]] = {
+    "5000001": _group_message(5000001, [_text("被回复的原消息")], user_id=30001, sender=_sender("30001", "原作者")),
+    "5000002": _group_message(
+        5000002,
+        [_at("30002"), _text(" 原消息里带图"), _image("reply-target")],
+        user_id=30001,
+        sender=_sender("30001", "原作者", "原作者名片"),
+    ),
+}
+
+_NEWS_META = {
+    "news": {
+        "title": "图文分享：今天的新闻标题",
+        "desc": "[图片]新闻摘要内容",
+        "tag": "图文分享",
+        "preview": media_url("card-news"),
+        "jumpUrl": "https://example.com/news/1",
+    }
+}
+
+_FORUM_META = {
+    "detail": {
+        "channel_info": {"guild_name": "测试频道"},
+        "poster": {"nick": "频道作者"},
+        "feed": {
+            "title": {"contents": [{"text_content": {"text": "帖子标题"}}]},
+            "contents": {"contents": [{"emoji_content": {"id": "178"}}, {"emoji_content": {"id": "999999"}}]},
+            "images": [{"pic_url": media_url("forum-0")}, {"pic_url": media_url("forum-1")}],
+        },
+    }
+}
+
+INBOUND_MESSAGES: Dict[str, Dict[str, Any]] = {
+    "text": _group_message(1000001, [_text("今天吃什么？有没有人一起去楼下新开的那家店试试。")]),
+    "text_private": _private_message(1000002, [_text("/help 私聊命令")]),
+    "at_self": _group_message(1000003, [_at(SELF_ID), _text(" 在吗")]),
+    "at_heavy": _group_message(
+        1000004,
+        [segment for index in range(8) for segment in (_at(str(50000 + index)), _text(" "))]
+        + [_at(str(50000)), _text("开会了")],
+    ),
+    "at_all": _group_message(1000005, [_at("all"), _text(" 全体注意")]),
+    "reply": _group_message(1000006, [{"type": "reply", "data": {"id": "5000001"}}, _text("收到")]),
+    "reply_rich": _group_message(1000007, [{"type": "reply", "data": {"id": "5000002"}}, _at("30001"), _text(" +1")]),
+    "reply_missing": _group_message(1000008, [{"type": "reply", "data": {"id": "5999999"}}, _text("原消息已失效")]),
+    "face": _group_message(
+        1000009,
+        [{"type": "face", "data": {"id": "178"}}, {"type": "face", "data": {"id": "999999"}}, _text("哈哈")],
+    ),
+    "image": _group_message(1000010, [_image("image-single")]),
+    "image_emoji": _group_message(1000011, [_image("image-emoji", sub_type=1)]),
+    "image_text_mix": _group_message(
+        1000012, [_text("三张图"), _image("mix-0"), _image("mix-1"), _image("mix-2")]
+    ),
+    "record": _group_message(
+        1000013,
+        [{"type": "record", "data": {"file": "voice-0.amr", "file_id": "voice-file-0", "file_size": "8192"}}],
+    ),
+    "record_missing": _group_message(1000014, [{"type": "record", "data": {"file": "voice-missing.amr"}}]),
+    "video": _group_message(1000015, [{"type": "video", "data": {"file": "clip.mp4", "file_size": "1048576"}}]),
+    "file": _group_message(
+        1000016,
+        [{"type": "file", "data": {"file": "报告.pdf", "file_size": "204800", "url": "https://example.com/f"}}],
+    ),
+    "xml_share": _group_message(1000017, [{"type": "xml", "data": {"data": "<msg/>"}}, {"type": "share", "data": {}}]),
+    "card_mannounce": _group_message(
+        1000101,
+        [
+            _json_card(
+                "com.tencent.mannounce",
+                {"mannounce": {"title": _b64("群公告"), "text": _b64("周末停机维护"), "encode": 1}},
+            )
+        ],
+    ),
+    "card_music": _group_message(
+        1000102,
+        [
+            _json_card(
+                "com.tencent.music.lua",
+                {"music": {"title": "晴天", "desc": "周杰伦", "tag": "QQ音乐", "preview": media_url("music")}},
+            )
+        ],
+    ),
+    "card_structmsg": _group_message(
+        1000103,
+        [_json_card("com.tencent.structmsg", {"music": {"title": "稻香", "singer": "周杰伦"}})],
+    ),
+    "card_structmsg_news": _group_message(
+        1000104, [_json_card("com.tencent.structmsg", {"news": {"title": "无 music 字段"}}, prompt="[分享]结构化消息")]
+    ),
+    "card_miniapp_01": _group_message(
+        1000105,
+        [
+            _json_card(
+                "com.tencent.miniapp_01",
+                {"detail_1": {"title": "哔哩哔哩", "desc": "视频标题", "preview": media_url("miniapp-01")}},
+                prompt="[QQ小程序]哔哩哔哩",
+            )
+        ],
+    ),
+    "card_giftmall": _group_message(
+        1000106, [_json_card("com.tencent.giftmall.giftark", {"giftark": {"title": "棒棒糖", "desc": "送给你"}})]
+    ),
+    "card_contact": _group_message(
+        1000107, [_json_card("com.tencent.contact.lua", {"contact": {"nickname": "推荐的人", "tag": "推荐好友"}})]
+    ),
+    "card_troopshare": _group_message(
+        1000108, [_json_card("com.tencent.troopsharecard", {"contact": {"nickname": "推荐的群"}})]
+    ),
+    "card_tuwen": _group_message(1000109, [_json_card("com.tencent.tuwen.lua", _NEWS_META)]),
+    "card_feed": _group_message(
+        1000110,
+        [
+            _json_card(
+                "com.tencent.feed.lua",
+                {
+                    "feed": {
+                        "title": "群相册：春游",
+                        "tagName": "群相册",
+                        "forwardMessage": "上传了 12 张照片",
+                        "cover": media_url("feed-cover"),
+                    }
+                },
+            )
+        ],
+    ),
+    "card_qqfavorite": _group_message(
+        1000111,
+        [_json_card("com.tencent.template.qqfavorite.share", {"news": {"desc": "[图片]收藏的笔记", "preview": ""}})],
+    ),
+    "card_miniapp_lua": _group_message(
+        1000112,
+        [
+            _json_card(
+                "com.tencent.miniapp.lua",
+                {"miniapp": {"title": "说说", "tag": "QQ空间", "preview": media_url("qzone")}},
+            )
+        ],
+    ),
+    "card_forum": _group_message(1000113, [_json_card("com.tencent.forum", _FORUM_META)]),
+    "card_map": _group_message(
+        1000114,
+        [_json_card("com.tencent.map", {"Location.Search": {"name": "天安门", "address": "北京市东城区"}})],
+    ),
+    "card_together": _group_message(
+        1000115, [_json_card("com.tencent.together", {"invite": {"title": "一起听歌", "summary": "来听《晴天》"}})]
+    ),
+    "card_fallback": _group_message(
+        1000116, [_json_card("com.tencent.unknown.app", {"foo": {"bar": 1}}, prompt="[未知卡片]")]
+    ),
+    "card_invalid": _group_message(1000117, [{"type": "json", "data": {"data": "{not json"}}]),
+    "forward_inline": _group_message(
+        1000201, [{"type": "forward", "data": {"id": "inline", "content": FORWARD_MESSAGES["fwd-text"][:3]}}]
+    ),
+    "forward_text": _group_message(1000202, [{"type": "forward", "data": {"id": "fwd-text"}}]),
+    "forward_images": _group_message(1000203, [{"type": "forward", "data": {"id": "fwd-images"}}]),
+    "forward_nested": _group_message(1000204, [{"type": "forward", "data": {"id": "fwd-outer"}}]),
+    "forward_missing": _group_message(1000205, [{"type": "forward", "data": {"id": "fwd-gone"}}]),
+}
+
+# 内存基准使用的消息：图片按接近真实的大小生成，不参与编解码黄金结果
+MEMORY_MESSAGES: Dict[str, Dict[str, Any]] = {
+    "text": INBOUND_MESSAGES["text"],
+    "at_heavy": INBOUND_MESSAGES["at_heavy"],
+    "reply_rich": INBOUND_MESSAGES["reply_rich"],
+    "image": _group_message(1000301, [_image("memory-image", size=LARGE_IMAGE_BYTES)]),
+    "image_x3": _group_message(
+        1000302,
+        [_text("三张图")] + [_image(f"memory-mix-{index}", size=LARGE_IMAGE_BYTES) for index in range(3)],
+    ),
+    "record": INBOUND_MESSAGES["record"],
+    "card_forum": INBOUND_MESSAGES["card_forum"],
+    "forward_text": INBOUND_MESSAGES["forward_text"],
+    "forward_images_50": _group_message(1000303, [{"type": "forward", "data": {"id": "fwd-images-50"}}]),
+}
+
+
+def _notice(notice_type: str, sub_type: str = "", **fields: Any) -> Dict[str, Any]:
+    """构造一条通知事件。
+
+    Args:
+        notice_type: ``notice_type`` 字段。
+        sub_type: ``sub_type`` 字段，为空时不写入。
+        **fields: 其余字段。
+
+    Returns:
+        Dict[str, Any]: 与 NapCat 推送结构一致的通知事件。
+    """
+    payload: Dict[str, Any] = {
+        "time": EVENT_TIME,
+        "self_id": int(SELF_ID),
+        "post_type": "notice",
+        "notice_type": notice_type,
+    }
+    if sub_type:
+        payload["sub_type"] = sub_type
+    payload.update(fields)
+    return payload
+
+
+NOTICES: Dict[str, Dict[str, Any]] = {
+    "group_recall": _notice(
+        "group_recall", group_id=int(GROUP_ID), user_id=int(SENDER_ID), operator_id=int(SENDER_ID), message_id=1000001
+    ),
+    "friend_recall": _notice("friend_recall", user_id=int(SENDER_ID), message_id=1000002),
+    "notify_poke": _notice(
+        "notify",
+        "poke",
+        group_id=int(GROUP_ID),
+        user_id=int(SENDER_ID),
+        target_id=int(SELF_ID),
+        raw_info=[{"type": "qq"}],
+    ),
+    "notify_group_name": _notice(
+        "notify", "group_name", group_id=int(GROUP_ID), user_id=int(SENDER_ID), name_new="新群名"
+    ),
+    "group_ban": _notice(
+        "group_ban", "ban", group_id=int(GROUP_ID), operator_id=int(SENDER_ID), user_id=30001, duration=600
+    ),
+    "group_ban_whole": _notice(
+        "group_ban", "ban", group_id=int(GROUP_ID), operator_id=int(SENDER_ID), user_id=0, duration=-1
+    ),
+    "group_whole_lift_ban": _notice(
+        "group_ban", "whole_lift_ban", group_id=int(GROUP_ID), operator_id=int(SENDER_ID), user_id=0, duration=0
+    ),
+    "group_whole_lift_ban_natural": _notice(
+        "group_ban", "whole_lift_ban", group_id=int(GROUP_ID), user_id=0, duration=0, is_natural_lift=True
+    ),
+    "group_lift_ban": _notice(
+        "group_ban", "lift_ban", group_id=int(GROUP_ID), operator_id=int(SENDER_ID), user_id=30001, duration=0
+    ),
+    "group_lift_ban_natural": _notice(
+        "group_ban", "lift_ban", group_id=int(GROUP_ID), operator_id=0, user_id=30001, duration=0, is_natural_lift=True
+    ),
+    "group_upload": _notice(
+        "group_upload",
+        group_id=int(GROUP_ID),
+        user_id=int(SENDER_ID),
+        file={"id": "/abc-123", "name": "会议纪要.docx", "size": 20480, "busid": 102},
+    ),
+    "group_increase": _notice(
+        "group_increase", "approve", group_id=int(GROUP_ID), operator_id=int(SELF_ID), user_id=30004
+    ),
+    "group_decrease": _notice("group_decrease", "leave", group_id=int(GROUP_ID), operator_id=0, user_id=30005),
+    "group_admin": _notice("group_admin", "set", group_id=int(GROUP_ID), user_id=30001),
+    "essence": _notice(
+        "essence", "add", group_id=int(GROUP_ID), operator_id=int(SENDER_ID), sender_id=30001, message_id=1000003
+    ),
+    "group_msg_emoji_like": _notice(
+        "group_msg_emoji_like",
+        group_id=int(GROUP_ID),
+        user_id=int(SENDER_ID),
+        message_id=1000001,
+        likes=[{"emoji_id": "76", "count": 1}],
+        is_add=True,
+    ),
+    "unknown": _notice("group_card", group_id=int(GROUP_ID), user_id=int(SENDER_ID), card_new="新名片", card_old=""),
+}
+
+NOTICE_ACTOR_NAME = "测试用户"
+
+
+def _host_message(raw_message: List[Dict[str, Any]], group: bool = True) -> Dict[str, Any]:
+    """构造 Host 侧出站 ``MessageDict``。
+
+    Args:
+        raw_message: Host 消息段列表。
+        group: 为 ``True`` 时发往群聊，否则发往私聊。
+
+    Returns:
+        Dict[str, Any]: 只包含出站编码所需字段的 ``MessageDict``。
+    """
+    additional_config: Dict[str, Any] = {"self_id": SELF_ID}
+    message_info: Dict[str, Any] = {"additional_config": additional_config}
+    if group:
+        message_info["group_info"] = {"group_id": GROUP_ID, "group_name": "测试群"}
+    else:
+        additional_config["platform_io_target_user_id"] = SENDER_ID
+    return {"message_id": "host-1", "platform": "qq", "message_info": message_info, "raw_message": raw_message}
+
+
+_OUTBOUND_IMAGE_BASE64 = base64.b64encode(deterministic_bytes("outbound-image", IMAGE_BYTES)).decode("ascii")
+_OUTBOUND_VOICE_BASE64 = base64.b64encode(deterministic_bytes("outbound-voice", RECORD_BYTES)).decode("ascii")
+
+OUTBOUND_MESSAGES: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {
+    "text": (_host_message([{"type": "text", "data": "你好，这是一条回复。"}]), {}),
+    "reply_at_text": (
+        _host_message(
+            [
+                {"type": "reply", "data": {"target_message_id": "1000006"}},
+                {"type": "at", "data": {"target_user_id": SENDER_ID, "target_user_nickname": "测试用户"}},
+                {"type": "text", "data": " 收到"},
+            ]
+        ),
+        {},
+    ),
+    "image": (_host_message([{"type": "image", "data": "", "binary_data_base64": _OUTBOUND_IMAGE_BASE64}]), {}),
+    "emoji": (_host_message([{"type": "emoji", "data": "", "binary_data_base64": _OUTBOUND_IMAGE_BASE64}]), {}),
+    "voice": (_host_message([{"type": "voice", "data": "", "binary_data_base64": _OUTBOUND_VOICE_BASE64}]), {}),
+    "media_urls": (
+        _host_message(
+            [
+                {"type": "imageurl", "data": "https://example.com/a.png"},
+                {"type": "videourl", "data": {"url": "https://example.com/a.mp4"}},
+                {"type": "voiceurl", "data": "/tmp/voice.silk"},
+                {"type": "video", "data": "/tmp/clip.mp4"},
+            ]
+        ),
+        {},
+    ),
+    "face_music_file": (
+        _host_message(
+            [
+                {"type": "face", "data": {"id": "178"}},
+                {"type": "music", "data": {"type": "qq", "id": "001"}},
+                {"type": "file", "data": {"path": "/tmp/report.pdf", "name": "report.pdf"}},
+            ]
+        ),
+        {},
+    ),
+    "dict_components": (
+        _host_message(
+            [
+                {"type": "dict", "data": {"type": "music", "data": "12345"}},
+                {"type": "dict", "data": {"type": "face", "data": "14"}},
+                {"type": "dict", "data": {"type": "imageurl", "data": "https://example.com/b.png"}},
+            ]
+        ),
+        {},
+    ),
+    "fallbacks": (
+        _host_message(
+            [
+                {"type": "image", "data": ""},
+                {"type": "at", "data": {}},
+                {"type": "unknown_component", "data": "x"},
+            ]
+        ),
+        {},
+    ),
+    "private_text": (_host_message([{"type": "text", "data": "私聊回复"}], group=False), {}),
+    "private_route_only": (
+        {"message_id": "host-2", "message_info": {}, "raw_message": [{"type": "text", "data": "按路由发送"}]},
+        {"target_user_id": "20003"},
+    ),
+    "group_forward": (
+        _host_message(
+            [
+                {"type": "text", "data": "转发前的说明"},
+                {
+                    "type": "forward",
+                    "data": [
+                        {
+                            "user_id": str(40000 + index),
+                            "user_nickname": f"转发成员{index}",
+                            "content": [{"type": "text", "data": f"第 {index} 条"}],
+                        }
+                        for index in range(10)
+                    ],
+                },
+            ]
+        ),
+        {},
+    ),
+    "private_forward": (
+        _host_message(
+            [
+                {
+                    "type": "forward",
+                    "data": [
+                        {
+                            "user_id": SELF_ID,
+                            "user_nickname": "MaiBot",
+                            "content": [{"type": "image", "data": "", "binary_data_base64": _OUTBOUND_IMAGE_BASE64}],
+                        }
+                    ],
+                }
+            ],
+            group=False,
+        ),
+        {},
+    ),
+}
+
+
+class StubQueryService:
+    """按入参确定性应答的查询服务替身，不访问网络。
+
+    只实现入站与通知编解码器用到的方法；成员、陌生人与群资料由 ID 推导，媒体内容由地址中的
+    ``name`` 与 ``size`` 生成，回复与转发从本模块的语料中查找。
+    """
+
+    def __init__(self) -> None:
+        """初始化调用计数。"""
+        self.calls: Dict[str, int] = {}
+        self.media_bytes: int = 0
+
+    def _count(self, method_name: str) -> None:
+        """记录一次方法调用。"""
+        self.calls[method_name] = self.calls.get(method_name, 0) + 1
+
+    async def download_binary(self, url: str) -> Optional[bytes]:
+        """返回由地址推导出的媒体内容。"""
+        self._count("download_binary")
+        query = dict(part.split("=", 1) for part in url.partition("?")[2].split("&") if "=" in part)
+        name = query.get("name")
+        if not name:
+            return None
+        binary_data = deterministic_bytes(name, int(query.get("size") or IMAGE_BYTES))
+        self.media_bytes += len(binary_data)
+        return binary_data
+
+    async def get_group_member_info(
+        self,
+        group_id: str,
+        user_id: str,
+        no_cache: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """返回由用户号推导出的群成员资料。"""
+        del no_cache
+        self._count("get_group_member_info")
+        if user_id.endswith("9"):
+            return None
+        return {
+            "group_id": int(group_id),
+            "user_id": int(user_id),
+            "nickname": f"昵称{user_id}",
+            "card": f"名片{user_id}" if int(user_id) % 2 else "",
+            "role": "member",
+        }
+
+    def is_group_member_cached(self, group_id: str, user_id: str) -> bool:
+        """成员资料由用户号直接推导，不需要查询，视为全部命中缓存。"""
+        del group_id, user_id
+        return True
+
+    async def get_stranger_info(self, user_id: str, no_cache: bool = False) -> Optional[Dict[str, Any]]:
+        """返回由用户号推导出的陌生人资料。"""
+        del no_cache
+        self._count("get_stranger_info")
+        return {"user_id": int(user_id), "nickname": f"陌生人{user_id}", "sex": "unknown", "age": 0}
+
+    async def get_group_info(self, group_id: str) -> Optional[Dict[str, Any]]:
+        """返回由群号推导出的群资料。"""
+        self._count("get_group_info")
+        return {"group_id": int(group_id), "group_name": f"测试群{group_id}", "member_count": 200}
+
+    async def get_message_detail(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """从语料中查找被回复的消息。"""
+        self._count("get_message_detail")
+        return REPLY_TARGETS.get(message_id)
+
+    async def get_forward_message(
+        self,
+        message_id: Optional[str] = None,
+        forward_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """从语料中查找合并转发内容。"""
+        self._count("get_forward_message")
+        messages = FORWARD_MESSAGES.get(str(message_id or forward_id or ""))
+        return {"messages": messages} if messages is not None else None
+
+    async def get_record_detail(
+        self,
+        file_name: Optional[str] = None,
+        file_id: Optional[str] = None,
+        out_format: str = "wav",
+    ) -> Optional[Dict[str, Any]]:
+        """返回由文件名推导出的语音内容。"""
+        del out_format
+        self._count("get_record_detail")
+        if not file_id:
+            return None
+        record_bytes = deterministic_bytes(str(file_name), RECORD_BYTES)
+        self.media_bytes += len(record_bytes)
+        return {"file": f"/tmp/{file_name}.wav", "base64": base64.b64encode(record_bytes).decode("ascii")}
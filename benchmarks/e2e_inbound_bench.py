@@ -0,0 +1,329 @@
+"""入站全链路延迟与吞吐基准。
+
+对每个场景启动一个本地 NapCat 模拟服务，按插件的启动流程组装运行时并通过真实的 WebSocket 传输层
+连入，事件依次经过 ``transport → NapCatEventRouter → NapCatInboundCodec / NapCatNoticeCodec →
+route_message``，由记录型网关记下每条事件到达 Host 的时间。结果包括每秒处理条数以及
+从模拟服务推送到 ``route_message`` 被调用的 p50 / p95 / p99 延迟。
+
+场景：``plain_text``、``at_heavy``、``reply_chain``、``image_flood``、``nested_forward``、``card_json``、
+``notice_storm``。升级适配器前后以 ``--json`` 输出结果即可直接比较。
+
+用法::
+
+    python benchmarks/e2e_inbound_bench.py
+    python benchmarks/e2e_inbound_bench.py --scenarios plain_text,image_flood --count 2000 --rate 0
+    python benchmarks/e2e_inbound_bench.py --json > bench_output.txt
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import time
+
+from _loader import load_adapter_module
+from napcat_simulator import NOTICE_KINDS, NapCatSimulator, SimulatorOptions
+
+# 事件在模拟服务侧附带的序号字段；通知的原始载荷会随消息写入 additional_config，可据此配对
+BENCH_SEQUENCE_KEY = "napcat_bench_seq"
+# 场景名到事件生成函数的映射，函数参数为模拟服务与事件序号
+SCENARIOS: Dict[str, Callable[[NapCatSimulator, int], Dict[str, Any]]] = {
+    "plain_text": lambda simulator, index: simulator.events.build_message("text"),
+    "at_heavy": lambda simulator, index: simulator.events.build_message("at"),
+    "reply_chain": lambda simulator, index: simulator.events.build_message("reply"),
+    "image_flood": lambda simulator, index: simulator.events.build_message("image"),
+    "nested_forward": lambda simulator, index: simulator.events.build_message("forward"),
+    "card_json": lambda simulator, index: simulator.events.build_message("card"),
+    "notice_storm": lambda simulator, index: simulator.events.build_notice(NOTICE_KINDS[index % len(NOTICE_KINDS)]),
+}
+
+
+class RecordingGateway:
+    """记录每条消息到达 Host 时间的消息网关。"""
+
+    def __init__(self) -> None:
+        """初始化记录表。"""
+        self.arrivals: Dict[str, float] = {}
+        self.ready = asyncio.Event()
+
+    async def route_message(
+        self,
+        gateway_name: str,
+        message: Dict[str, Any],
+        *,
+        route_metadata: Optional[Dict[str, Any]] = None,
+        external_message_id: str = "",
+        dedupe_key: str = "",
+    ) -> bool:
+        """记录一条注入 Host 的消息。
+
+        Args:
+            gateway_name: 消息网关名称。
+            message: 转换后的消息字典。
+            route_metadata: 路由元数据。
+            external_message_id: 平台消息 ID。
+            dedupe_key: 去重键。
+
+        Returns:
+            bool: 始终为 ``True``。
+        """
+        del gateway_name, route_metadata, dedupe_key
+        arrived_at = time.perf_counter()
+        additional_config = message.get("message_info", {}).get("additional_config", {})
+        notice_payload = additional_config.get("napcat_notice_payload")
+        if isinstance(notice_payload, dict) and BENCH_SEQUENCE_KEY in notice_payload:
+            self.arrivals[f"seq:{notice_payload[BENCH_SEQUENCE_KEY]}"] = arrived_at
+        elif external_message_id:
+            self.arrivals[f"msg:{external_message_id}"] = arrived_at
+        return True
+
+    async def update_state(self, gateway_name: str, ready: bool, **kwargs: Any) -> bool:
+        """接受运行时状态上报，连接就绪后放行场景推送。
+
+        Args:
+            gateway_name: 消息网关名称。
+            ready: 连接是否就绪。
+            **kwargs: 其它状态字段。
+
+        Returns:
+            bool: 始终为 ``True``。
+        """
+        del gateway_name, kwargs
+        if ready:
+            self.ready.set()
+        return True
+
+
+def _free_port() -> int:
+    """返回一个当前空闲的本地端口。"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return int(probe.getsockname()[1])
+
+
+def _percentile(sorted_values: List[float], quantile: float) -> Optional[float]:
+    """按最近秩法计算分位数。
+
+    Args:
+        sorted_values: 升序排列的样本。
+        quantile: 0 到 1 之间的分位。
+
+    Returns:
+        Optional[float]: 分位数；无样本时返回 ``None``。
+    """
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(quantile * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    scenario: str,
+    count: int,
+    rate: float,
+    settle_sec: float,
+    simulator_options: SimulatorOptions,
+) -> Dict[str, Any]:
+    """运行一个场景。
+
+    Args:
+        scenario: 场景名称。
+        count: 推送的事件条数。
+        rate: 每秒推送条数；为 0 时一次性全部推送。
+        settle_sec: 推送结束后等待剩余事件到达的最长秒数。
+        simulator_options: 模拟服务参数。
+
+    Returns:
+        Dict[str, Any]: 场景的吞吐、延迟与丢失情况。
+    """
+    config_module = load_adapter_module("config")
+    builder_module = load_adapter_module("runtime.builder")
+    router_module = load_adapter_module("runtime.router")
+    constants_module = load_adapter_module("constants")
+
+    simulator = NapCatSimulator(simulator_options)
+    await simulator.start()
+    # 预先生成一批消息供回复与撤回引用，不推送给适配器
+    for _ in range(50):
+        simulator.events.build_message("text")
+
+    logger = logging.getLogger("napcat_bench")
+    settings = config_module.NapCatPluginSettings.from_mapping(
+        {
+            "plugin": {"enabled": True},
+            "chat": {"enable_chat_list_filter": False},
+            "napcat_server": {"host": simulator_options.host, "port": simulator_options.port},
+        },
+        logger,
+    )
+    gateway = RecordingGateway()
+    router = router_module.NapCatEventRouter(
+        gateway_capability=gateway,
+        logger=logger,
+        gateway_name=constants_module.NAPCAT_GATEWAY_NAME,
+        load_settings=lambda: settings,
+    )
+    runtime = builder_module.NapCatRuntimeBuilder(
+        gateway_capability=gateway,
+        logger=logger,
+        gateway_name=constants_module.NAPCAT_GATEWAY_NAME,
+    ).build(
+        on_connection_opened=router.bootstrap_adapter_runtime_state,
+        on_connection_closed=router.handle_transport_disconnected,
+        on_payload=router.handle_transport_payload,
+        on_natural_lift=router.emit_natural_lift_notice,
+        on_heartbeat_timeout=router.handle_heartbeat_timeout,
+    )
+    router.bind_runtime(runtime)
+    runtime.frame_classifier.compile(settings.chat, settings.notice)
+    runtime.inbound_codec.media_budget.configure(settings.inbound)
+    runtime.query_service.configure_cache(settings.cache)
+    runtime.connections.configure(settings.list_server_configs(), settings.inbound, settings.outbound)
+
+    pushed_at: Dict[str, float] = {}
+    try:
+        await runtime.connections.start()
+        await asyncio.wait_for(gateway.ready.wait(), timeout=15.0)
+
+        build_event = SCENARIOS[scenario]
+        started_at = time.perf_counter()
+        for index in range(count):
+            if rate > 0:
+                delay_sec = started_at + index / rate - time.perf_counter()
+                if delay_sec > 0:
+                    await asyncio.sleep(delay_sec)
+            payload = build_event(simulator, index)
+            if payload.get("post_type") == "notice":
+                payload[BENCH_SEQUENCE_KEY] = index
+                key = f"seq:{index}"
+            else:
+                key = f"msg:{payload['message_id']}"
+            pushed_at[key] = time.perf_counter()
+            await simulator.push(payload)
+
+        deadline = time.perf_counter() + settle_sec
+        while time.perf_counter() < deadline and any(key not in gateway.arrivals for key in pushed_at):
+            await asyncio.sleep(0.05)
+    finally:
+        await runtime.connections.stop()
+        await runtime.scheduler.shutdown()
+        await simulator.stop()
+
+    latencies_ms = sorted(
+        (gateway.arrivals[key] - pushed) * 1000 for key, pushed in pushed_at.items() if key in gateway.arrivals
+    )
+    routed = len(latencies_ms)
+    first_push = min(pushed_at.values()) if pushed_at else 0.0
+    last_arrival = max((gateway.arrivals[key] for key in pushed_at if key in gateway.arrivals), default=first_push)
+    duration_sec = last_arrival - first_push
+    return {
+        "scenario": scenario,
+        "pushed": len(pushed_at),
+        "routed": routed,
+        "lost": len(pushed_at) - routed,
+        "push_rate": rate or None,
+        "duration_sec": round(duration_sec, 3),
+        "msgs_per_sec": round(routed / duration_sec, 1) if duration_sec > 0 else None,
+        "latency_ms": {
+            "p50": _round(_percentile(latencies_ms, 0.50)),
+            "p95": _round(_percentile(latencies_ms, 0.95)),
+            "p99": _round(_percentile(latencies_ms, 0.99)),
+            "max": _round(latencies_ms[-1] if latencies_ms else None),
+            "mean": _round(sum(latencies_ms) / routed if routed else None),
+        },
+        "actions": dict(simulator.stats["actions"]),
+        "media_requests": simulator.stats["media_requests"],
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    """保留三位小数。"""
+    return None if value is None else round(value, 3)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """依次运行选定的场景。
+
+    Args:
+        args: 命令行参数。
+
+    Returns:
+        Dict[str, Any]: 运行环境与各场景结果。
+    """
+    json_codec = load_adapter_module("codecs.json_codec")
+    results: List[Dict[str, Any]] = []
+    for scenario in args.scenarios:
+        options = SimulatorOptions(
+            port=_free_port(),
+            image_bytes=args.image_kb * 1024,
+            latency_ms=args.latency_ms,
+            private_ratio=args.private_ratio,
+            seed=args.seed,
+        )
+        results.append(await run_scenario(scenario, args.count, args.rate, args.settle_sec, options))
+    return {
+        "json_codec": json_codec.create_json_codec().name,
+        "count": args.count,
+        "rate": args.rate,
+        "action_latency_ms": args.latency_ms,
+        "scenarios": results,
+    }
+
+
+def _parse_scenarios(value: str) -> List[str]:
+    """解析逗号分隔的场景列表。
+
+    Args:
+        value: 命令行参数。
+
+    Returns:
+        List[str]: 场景名称列表。
+
+    Raises:
+        argparse.ArgumentTypeError: 场景未知时抛出。
+    """
+    scenarios = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in scenarios if item not in SCENARIOS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"未知场景 {', '.join(unknown)}，可选: {', '.join(SCENARIOS)}")
+    return scenarios
+
+
+def main() -> None:
+    """命令行入口。"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=_parse_scenarios, default=list(SCENARIOS), help="逗号分隔的场景名称")
+    parser.add_argument("--count", type=int, default=1000, help="每个场景推送的事件条数")
+    parser.add_argument("--rate", type=float, default=200.0, help="每秒推送条数，0 表示一次性推送以测最大吞吐")
+    parser.add_argument("--settle-sec", type=float, default=30.0, help="推送结束后等待剩余事件的最长秒数")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="模拟服务的动作响应延迟")
+    parser.add_argument("--image-kb", type=int, default=32, help="图片与预览图大小（KB）")
+    parser.add_argument("--private-ratio", type=float, default=0.1, help="私聊消息比例")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    parser.add_argument("--verbose", action="store_true", help="输出适配器日志")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"{'scenario':<16}{'routed':>8}{'lost':>6}{'msg/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}")
+    for item in report["scenarios"]:
+        latency = item["latency_ms"]
+        print(
+            f"{item['scenario']:<16}{item['routed']:>8}{item['lost']:>6}"
+            f"{item['msgs_per_sec'] or 0:>10.1f}{latency['p50'] or 0:>10.2f}"
+            f"{latency['p95'] or 0:>10.2f}{latency['p99'] or 0:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
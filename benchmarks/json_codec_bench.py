@@ -0,0 +1,175 @@
+"""WebSocket 热路径 JSON 编解码微基准。
+
+对比旧实现（``json.loads(str(data))`` / ``json.dumps(..., ensure_ascii=False)``）
+与当前环境可用的各个 ``NapCatJsonCodec`` 实现。
+
+用法::
+
+    python benchmarks/json_codec_bench.py
+    python benchmarks/json_codec_bench.py --json > bench_output.txt
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List
+
+import argparse
+import base64
+import json
+import os
+import timeit
+
+from _loader import load_adapter_module
+
+
+def build_cases() -> Dict[str, Dict[str, Any]]:
+    """构造具有真实形状的基准载荷。
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 场景名到载荷对象的映射。
+    """
+    group_message = {
+        "self_id": 10001,
+        "user_id": 20002,
+        "time": 1760000000,
+        "message_id": 123456789,
+        "message_seq": 123456789,
+        "real_id": 123456789,
+        "message_type": "group",
+        "sender": {"user_id": 20002, "nickname": "测试用户", "card": "群名片", "role": "member"},
+        "raw_message": "[CQ:at,qq=10001] 今天吃什么？",
+        "font": 14,
+        "sub_type": "normal",
+        "message": [
+            {"type": "at", "data": {"qq": "10001"}},
+            {"type": "text", "data": {"text": " 今天吃什么？"}},
+        ],
+        "message_format": "array",
+        "post_type": "message",
+        "group_id": 30003,
+    }
+    member_list_response = {
+        "status": "ok",
+        "retcode": 0,
+        "data": [
+            {
+                "group_id": 30003,
+                "user_id": 100000 + index,
+                "nickname": f"成员{index}",
+                "card": f"名片{index}" if index % 3 else "",
+                "sex": "unknown",
+                "age": 0,
+                "area": "",
+                "join_time": 1700000000 + index,
+                "last_sent_time": 1760000000 - index,
+                "level": "1",
+                "role": "member",
+                "unfriendly": False,
+                "title": "",
+                "title_expire_time": 0,
+                "card_changeable": True,
+                "shut_up_timestamp": 0,
+            }
+            for index in range(2000)
+        ],
+        "message": "",
+        "wording": "",
+        "echo": "0" * 32,
+    }
+    image_action = {
+        "action": "send_group_msg",
+        "params": {
+            "group_id": 30003,
+            "message": [
+                {"type": "image", "data": {"file": "base64://" + base64.b64encode(os.urandom(768 * 1024)).decode()}}
+            ],
+        },
+        "echo": "0" * 32,
+    }
+    return {
+        "group_message": group_message,
+        "member_list_2000": member_list_response,
+        "image_768k": image_action,
+    }
+
+
+def _time_per_call(func: Callable[[], Any], min_time: float) -> float:
+    """测量单次调用的平均耗时。
+
+    Args:
+        func: 待测量的无参函数。
+        min_time: 每组测量的最短总耗时秒数。
+
+    Returns:
+        float: 单次调用耗时，单位为微秒。
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    repeat_count = max(3, int(min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat_count, number=number)) / number * 1_000_000
+
+
+def run(min_time: float) -> List[Dict[str, Any]]:
+    """执行全部基准。
+
+    Args:
+        min_time: 每个测量项的最短总耗时秒数。
+
+    Returns:
+        List[Dict[str, Any]]: 每个“场景 × 实现 × 方向”的测量结果。
+    """
+    json_codec = load_adapter_module("codecs.json_codec")
+    results: List[Dict[str, Any]] = []
+    for case_name, payload in build_cases().items():
+        text = json.dumps(payload, ensure_ascii=False)
+        raw = text.encode("utf-8")
+
+        baseline_decode = _time_per_call(lambda: json.loads(str(text)), min_time)
+        baseline_encode = _time_per_call(lambda: json.dumps(payload, ensure_ascii=False), min_time)
+        results.append(
+            {"case": case_name, "codec": "baseline", "decode_us": baseline_decode, "encode_us": baseline_encode}
+        )
+
+        for codec_name in json_codec.available_json_codecs():
+            codec = json_codec.create_json_codec(codec_name)
+            if codec.loads(raw) != payload:
+                raise AssertionError(f"{codec_name} 解码结果与标准库不一致: {case_name}")
+            results.append(
+                {
+                    "case": case_name,
+                    "codec": codec_name,
+                    "decode_us": _time_per_call(lambda: codec.loads(raw), min_time),
+                    "encode_us": _time_per_call(lambda: codec.dumps(payload), min_time),
+                }
+            )
+
+    for item in results:
+        baseline = next(row for row in results if row["case"] == item["case"] and row["codec"] == "baseline")
+        item["decode_speedup"] = baseline["decode_us"] / item["decode_us"]
+        item["encode_speedup"] = baseline["encode_us"] / item["encode_us"]
+    return results
+
+
+def main() -> None:
+    """命令行入口。"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    parser.add_argument("--min-time", type=float, default=0.5, help="每个测量项的最短总耗时秒数")
+    args = parser.parse_args()
+
+    results = run(args.min_time)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"{'case':<18}{'codec':<10}{'decode(us)':>14}{'x':>7}{'encode(us)':>14}{'x':>7}")
+    for item in results:
+        print(
+            f"{item['case']:<18}{item['codec']:<10}"
+            f"{item['decode_us']:>14.1f}{item['decode_speedup']:>7.2f}"
+            f"{item['encode_us']:>14.1f}{item['encode_speedup']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
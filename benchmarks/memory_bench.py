@@ -0,0 +1,206 @@
+"""入站消息转换的内存峰值与驻留基准。
+
+用 ``tracemalloc`` 测量 ``NapCatInboundCodec.build_message_dict`` 处理每类消息时的内存：
+
+- ``peak``：转换过程中相对转换前的最高内存增量，包含下载的原始字节、SHA-256 输入与 Base64 文本同时存活的部分；
+- ``retained``：转换完成、仍持有结果 ``MessageDict`` 时的内存增量，即结果本身的大小；
+- ``host_json_peak``：把结果按 Host 侧的方式序列化为 JSON 时额外产生的峰值；
+- ``leaked``：丢弃结果并回收后仍未释放的内存。
+
+媒体内容由 ``codec_corpus.StubQueryService`` 生成，语料见 ``codec_corpus.MEMORY_MESSAGES``，其中
+``forward_images_50`` 为含 50 个 128 KiB 图片节点的合并转发。任一项超过 ``THRESHOLDS_KIB`` 中的上限时
+以退出码 1 结束，用于在低内存部署之前发现内存回退；有意调整时同步修改上限并在评审中说明原因。
+
+用法::
+
+    python benchmarks/memory_bench.py
+    python benchmarks/memory_bench.py --json
+    python benchmarks/memory_bench.py --no-check
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import sys
+import tracemalloc
+
+from _loader import load_adapter_module
+
+import codec_corpus
+
+# 每类消息的 (peak, retained) 上限，单位 KiB；约为当前实测值的 1.25 倍，小项至少留 4 KiB 余量
+THRESHOLDS_KIB: Dict[str, Tuple[float, float]] = {
+    "text": (9.0, 7.0),
+    "at_heavy": (22.0, 19.0),
+    "reply_rich": (86.0, 10.0),
+    "image": (593.0, 217.0),
+    "image_x3": (1022.0, 646.0),
+    "record": (56.0, 18.0),
+    "card_forum": (115.0, 62.0),
+    "forward_text": (16.0, 13.0),
+    "forward_images_50": (11097.0, 10719.0),
+}
+# 丢弃结果后允许残留的内存，单位 KiB
+LEAK_THRESHOLD_KIB = 64.0
+
+
+def _kib(byte_count: int) -> float:
+    """把字节数换算为 KiB。"""
+    return round(byte_count / 1024, 1)
+
+
+def measure_case(
+    loop: asyncio.AbstractEventLoop,
+    inbound_codec: Any,
+    query_service: Any,
+    payload: Dict[str, Any],
+) -> Dict[str, Any]:
+    """测量一条消息的一次转换。
+
+    Args:
+        loop: 执行转换的事件循环。
+        inbound_codec: 入站消息编码器。
+        query_service: 语料查询服务替身，用于统计本次提供的媒体字节数。
+        payload: OneBot 消息事件。
+
+    Returns:
+        Dict[str, Any]: 本次转换的媒体字节数与各项内存增量（字节）。
+    """
+    gc.collect()
+    media_bytes_before = query_service.media_bytes
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    message_dict = loop.run_until_complete(
+        inbound_codec.build_message_dict(payload, codec_corpus.SELF_ID, str(payload["user_id"]), payload["sender"])
+    )
+    held, peak = tracemalloc.get_traced_memory()
+
+    tracemalloc.reset_peak()
+    host_json = json.dumps(message_dict, ensure_ascii=False)
+    _, host_json_peak = tracemalloc.get_traced_memory()
+    host_json_bytes = len(host_json)
+    del host_json
+
+    del message_dict
+    gc.collect()
+    released, _ = tracemalloc.get_traced_memory()
+    return {
+        "media_bytes": query_service.media_bytes - media_bytes_before,
+        "peak": peak - baseline,
+        "retained": held - baseline,
+        "host_json_peak": host_json_peak - held,
+        "host_json_bytes": host_json_bytes,
+        "leaked": max(0, released - baseline),
+    }
+
+
+def run(repeat: int) -> List[Dict[str, Any]]:
+    """测量全部消息类型。
+
+    每类消息先转换一次预热，再测量 ``repeat`` 次并取各项的最小值，排除首次调用时的一次性分配。
+
+    Args:
+        repeat: 每类消息的测量次数。
+
+    Returns:
+        List[Dict[str, Any]]: 每类消息的测量结果，内存单位为 KiB。
+    """
+    inbound_module = load_adapter_module("codecs.inbound.message_codec")
+    query_service = codec_corpus.StubQueryService()
+    inbound_codec = inbound_module.NapCatInboundCodec(logging.getLogger("napcat_memory_bench"), query_service)
+
+    loop = asyncio.new_event_loop()
+    results: List[Dict[str, Any]] = []
+    tracemalloc.start()
+    try:
+        for name, payload in codec_corpus.MEMORY_MESSAGES.items():
+            measure_case(loop, inbound_codec, query_service, payload)
+            samples = [measure_case(loop, inbound_codec, query_service, payload) for _ in range(max(1, repeat))]
+            best = {key: min(sample[key] for sample in samples) for key in samples[0]}
+            media_bytes = best["media_bytes"]
+            results.append(
+                {
+                    "case": name,
+                    "media_kib": _kib(media_bytes),
+                    "peak_kib": _kib(best["peak"]),
+                    "retained_kib": _kib(best["retained"]),
+                    "host_json_peak_kib": _kib(best["host_json_peak"]),
+                    "host_json_kib": _kib(best["host_json_bytes"]),
+                    "leaked_kib": _kib(best["leaked"]),
+                    "peak_per_media_byte": round(best["peak"] / media_bytes, 2) if media_bytes else None,
+                }
+            )
+    finally:
+        tracemalloc.stop()
+        loop.close()
+    return results
+
+
+def check_thresholds(results: List[Dict[str, Any]]) -> List[str]:
+    """检查测量结果是否超过上限。
+
+    Args:
+        results: ``run`` 返回的测量结果。
+
+    Returns:
+        List[str]: 超过上限或缺少上限的消息类型说明。
+    """
+    violations: List[str] = []
+    for item in results:
+        limits = THRESHOLDS_KIB.get(item["case"])
+        if limits is None:
+            violations.append(f"{item['case']}: 缺少内存上限")
+            continue
+        peak_limit, retained_limit = limits
+        if item["peak_kib"] > peak_limit:
+            violations.append(f"{item['case']}: peak {item['peak_kib']} KiB 超过上限 {peak_limit} KiB")
+        if item["retained_kib"] > retained_limit:
+            violations.append(f"{item['case']}: retained {item['retained_kib']} KiB 超过上限 {retained_limit} KiB")
+        if item["leaked_kib"] > LEAK_THRESHOLD_KIB:
+            violations.append(f"{item['case']}: leaked {item['leaked_kib']} KiB 超过上限 {LEAK_THRESHOLD_KIB} KiB")
+    return violations
+
+
+def main() -> None:
+    """命令行入口。"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    parser.add_argument("--repeat", type=int, default=3, help="每类消息的测量次数")
+    parser.add_argument("--no-check", action="store_true", help="只输出结果，不检查内存上限")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    results = run(args.repeat)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print(
+            f"{'case':<20}{'media':>10}{'peak':>10}{'retained':>10}{'json_peak':>11}{'leaked':>9}{'peak/media':>12}"
+        )
+        for item in results:
+            ratio = item["peak_per_media_byte"]
+            print(
+                f"{item['case']:<20}{item['media_kib']:>10.1f}{item['peak_kib']:>10.1f}{item['retained_kib']:>10.1f}"
+                f"{item['host_json_peak_kib']:>11.1f}{item['leaked_kib']:>9.1f}"
+                f"{ratio if ratio is not None else '-':>12}"
+            )
+        print("(单位 KiB)")
+
+    if args.no_check:
+        return
+    violations = check_thresholds(results)
+    for violation in violations:
+        print(violation, file=sys.stderr)
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,911 @@
+"""本地 NapCat OneBot WebSocket 模拟服务。
+
+模拟 NapCat 的正向 WebSocket 服务端，供离线压测与长时间浸泡测试使用：适配器像连接真实 NapCat 一样
+连接到本服务。服务在连接建立时推送 ``lifecycle`` 事件并按间隔推送心跳，按配置的速率推送消息与通知，
+对 ``get_login_info``、``get_group_member_info``、``get_msg``、``get_forward_msg``、``get_record`` 等动作
+返回固定格式的响应，图片与卡片预览图的地址指向本服务的 ``/media/`` 路由。
+
+可注入的故障包括动作响应延迟、按比例返回失败或不响应，以及连接建立一段时间后主动断开。
+既可作为命令行服务运行，也可在其它基准脚本中导入 ``NapCatSimulator`` 按脚本推送事件。
+
+用法::
+
+    python benchmarks/napcat_simulator.py --port 3001 --message-rate 200 --notice-rate 20
+    python benchmarks/napcat_simulator.py --mix text=5,at=2,reply=1,image=1 --latency-ms 30 --error-rate 0.05
+    python benchmarks/napcat_simulator.py --disconnect-after-sec 60 --duration 600
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import hashlib
+import json
+import random
+import time
+
+from aiohttp import WSMsgType, web
+
+MESSAGE_KINDS: Tuple[str, ...] = ("text", "at", "reply", "image", "record", "forward", "card")
+NOTICE_KINDS: Tuple[str, ...] = ("poke", "emoji_like", "group_increase", "group_recall", "group_ban")
+ActionHandler = Callable[[Dict[str, Any]], Any]
+
+
+@dataclass
+class SimulatorOptions:
+    """模拟服务的运行参数。"""
+
+    host: str = "127.0.0.1"
+    port: int = 3001
+    token: str = ""
+    self_id: int = 10001
+    nickname: str = "模拟机器人"
+    group_ids: Tuple[int, ...] = (30001, 30002, 30003)
+    user_count: int = 200
+    heartbeat_interval_sec: float = 30.0
+    message_rate: float = 0.0
+    notice_rate: float = 0.0
+    message_mix: Dict[str, float] = field(default_factory=lambda: {"text": 1.0})
+    notice_mix: Dict[str, float] = field(default_factory=lambda: {kind: 1.0 for kind in NOTICE_KINDS})
+    private_ratio: float = 0.1
+    at_self_ratio: float = 0.1
+    forward_depth: int = 2
+    forward_nodes: int = 5
+    image_bytes: int = 32 * 1024
+    record_bytes: int = 16 * 1024
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    fault_actions: Tuple[str, ...] = ()
+    disconnect_after_sec: float = 0.0
+    seed: int = 0
+
+    @property
+    def base_url(self) -> str:
+        """返回本服务的 HTTP 地址。"""
+        return f"http://{self.host}:{self.port}"
+
+
+class NapCatEventFactory:
+    """生成形状接近真实 NapCat 推送的消息与通知事件，并记住可被后续动作查询的消息。"""
+
+    # 供 get_msg 与 get_forward_msg 查询的消息保留条数
+    _MAX_STORED_MESSAGES = 5000
+
+    def __init__(self, options: SimulatorOptions, rng: random.Random) -> None:
+        """初始化事件工厂。
+
+        Args:
+            options: 模拟服务参数。
+            rng: 随机数生成器，固定种子即可复现同一事件序列。
+        """
+        self._options = options
+        self._rng = rng
+        self._user_ids: List[int] = [20000 + index for index in range(max(1, options.user_count))]
+        self._next_message_id = 1
+        self._next_forward_id = 1
+        self.messages: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self.forwards: Dict[str, List[Dict[str, Any]]] = {}
+
+    @property
+    def user_ids(self) -> List[int]:
+        """返回模拟的用户号列表。"""
+        return self._user_ids
+
+    def build_message(self, kind: str, group_id: Optional[int] = None) -> Dict[str, Any]:
+        """生成一条消息事件。
+
+        Args:
+            kind: 消息类型，取值见 ``MESSAGE_KINDS``。
+            group_id: 目标群号；为空时按 ``private_ratio`` 随机选择私聊或某个群。
+
+        Returns:
+            Dict[str, Any]: NapCat 消息事件。
+        """
+        options = self._options
+        user_id = self._rng.choice(self._user_ids)
+        if group_id is None and self._rng.random() >= options.private_ratio:
+            group_id = self._rng.choice(options.group_ids)
+
+        segments = self._build_segments(kind, group_id)
+        if group_id is not None and self._rng.random() < options.at_self_ratio:
+            segments.insert(0, {"type": "at", "data": {"qq": str(options.self_id)}})
+        message_id = self.allocate_message_id()
+        payload: Dict[str, Any] = {
+            "self_id": options.self_id,
+            "user_id": user_id,
+            "time": int(time.time()),
+            "message_id": message_id,
+            "message_seq": message_id,
+            "real_id": message_id,
+            "message_type": "group" if group_id is not None else "private",
+            "sender": {"user_id": user_id, "nickname": f"用户{user_id}", "card": f"名片{user_id}", "role": "member"},
+            "raw_message": _render_raw_message(segments),
+            "font": 14,
+            "sub_type": "normal" if group_id is not None else "friend",
+            "message": segments,
+            "message_format": "array",
+            "post_type": "message",
+        }
+        if group_id is not None:
+            payload["group_id"] = group_id
+        self._remember(payload)
+        return payload
+
+    def build_notice(self, kind: str) -> Dict[str, Any]:
+        """生成一条通知事件。
+
+        Args:
+            kind: 通知类型，取值见 ``NOTICE_KINDS``。
+
+        Returns:
+            Dict[str, Any]: NapCat 通知事件。
+        """
+        options = self._options
+        group_id = self._rng.choice(options.group_ids)
+        user_id = self._rng.choice(self._user_ids)
+        operator_id = self._rng.choice(self._user_ids)
+        payload: Dict[str, Any] = {
+            "self_id": options.self_id,
+            "time": int(time.time()),
+            "post_type": "notice",
+            "group_id": group_id,
+            "user_id": user_id,
+        }
+        if kind == "poke":
+            payload.update({"notice_type": "notify", "sub_type": "poke", "target_id": options.self_id})
+        elif kind == "emoji_like":
+            payload.update(
+                {
+                    "notice_type": "group_msg_emoji_like",
+                    "message_id": self._pick_message_id(),
+                    "likes": [{"emoji_id": str(self._rng.choice((76, 124, 66))), "count": 1}],
+                }
+            )
+        elif kind == "group_increase":
+            payload.update({"notice_type": "group_increase", "sub_type": "approve", "operator_id": operator_id})
+        elif kind == "group_recall":
+            payload.update(
+                {"notice_type": "group_recall", "operator_id": operator_id, "message_id": self._pick_message_id()}
+            )
+        elif kind == "group_ban":
+            payload.update(
+                {"notice_type": "group_ban", "sub_type": "ban", "operator_id": operator_id, "duration": 60}
+            )
+        else:
+            raise ValueError(f"未知的通知类型: {kind}")
+        return payload
+
+    def build_forward_nodes(self, depth: int) -> List[Dict[str, Any]]:
+        """生成合并转发节点列表，``depth`` 大于 1 时最后一个节点再嵌套一层转发。
+
+        Args:
+            depth: 剩余嵌套层数。
+
+        Returns:
+            List[Dict[str, Any]]: 转发节点列表。
+        """
+        nodes: List[Dict[str, Any]] = []
+        for index in range(max(1, self._options.forward_nodes)):
+            user_id = self._rng.choice(self._user_ids)
+            content: List[Dict[str, Any]] = [{"type": "text", "data": {"text": f"转发内容 {index}"}}]
+            if depth > 1 and index == self._options.forward_nodes - 1:
+                content = [{"type": "forward", "data": {"id": self._register_forward(depth - 1)}}]
+            nodes.append(
+                {
+                    "self_id": self._options.self_id,
+                    "user_id": user_id,
+                    "time": int(time.time()),
+                    "message_id": self.allocate_message_id(),
+                    "message_type": "group",
+                    "sender": {"user_id": user_id, "nickname": f"用户{user_id}", "card": ""},
+                    "message": content,
+                    "message_format": "array",
+                    "post_type": "message",
+                }
+            )
+        return nodes
+
+    def _build_segments(self, kind: str, group_id: Optional[int]) -> List[Dict[str, Any]]:
+        """按消息类型生成消息段。
+
+        Args:
+            kind: 消息类型。
+            group_id: 所在群号；私聊为空。
+
+        Returns:
+            List[Dict[str, Any]]: OneBot 消息段列表。
+        """
+        text = {"type": "text", "data": {"text": f"模拟消息 {self._rng.randrange(1_000_000)}"}}
+        if kind == "text":
+            return [text]
+        if kind == "at":
+            targets = self._rng.sample(self._user_ids, k=min(5, len(self._user_ids))) if group_id is not None else []
+            return [*({"type": "at", "data": {"qq": str(target)}} for target in targets), text]
+        if kind == "reply":
+            return [{"type": "reply", "data": {"id": str(self._pick_message_id())}}, text]
+        if kind == "image":
+            return [self._build_media_segment("image", "image.png", self._options.image_bytes)]
+        if kind == "record":
+            record_name = f"record{self._rng.randrange(1000)}.amr"
+            return [{"type": "record", "data": {"file": record_name, "file_size": str(self._options.record_bytes)}}]
+        if kind == "forward":
+            return [{"type": "forward", "data": {"id": self._register_forward(self._options.forward_depth)}}]
+        if kind == "card":
+            card = {
+                "app": "com.tencent.tuwen.lua",
+                "prompt": "[分享]模拟图文",
+                "meta": {
+                    "news": {
+                        "title": "模拟图文标题",
+                        "desc": "模拟图文摘要",
+                        "tag": "图文分享",
+                        "preview": f"{self._options.base_url}/media/preview.png?size={self._options.image_bytes}",
+                        "jumpUrl": "https://example.com/",
+                    }
+                },
+            }
+            return [{"type": "json", "data": {"data": json.dumps(card, ensure_ascii=False)}}]
+        raise ValueError(f"未知的消息类型: {kind}")
+
+    def _build_media_segment(self, segment_type: str, file_name: str, size: int) -> Dict[str, Any]:
+        """生成指向本服务媒体路由的图片段。
+
+        Args:
+            segment_type: 消息段类型。
+            file_name: 文件名。
+            size: 媒体字节数。
+
+        Returns:
+            Dict[str, Any]: OneBot 媒体消息段。
+        """
+        # 同一尺寸带上随机序号，避免被下游按 URL 缓存
+        nonce = self._rng.randrange(1_000_000)
+        return {
+            "type": segment_type,
+            "data": {
+                "file": f"{nonce}.png",
+                "sub_type": 0,
+                "url": f"{self._options.base_url}/media/{file_name}?size={size}&n={nonce}",
+                "file_size": str(size),
+            },
+        }
+
+    def allocate_message_id(self) -> int:
+        """分配一个新的消息 ID。"""
+        message_id = self._next_message_id
+        self._next_message_id += 1
+        return message_id
+
+    def _pick_message_id(self) -> int:
+        """随机挑选一条已记住的消息 ID；尚无消息时返回一个不存在的 ID。"""
+        if not self.messages:
+            return self._next_message_id + 1_000_000
+        # 只从最近的消息里挑，贴近真实的回复与撤回分布
+        recent_ids = list(self.messages.keys())[-50:]
+        return self._rng.choice(recent_ids)
+
+    def _register_forward(self, depth: int) -> str:
+        """生成并登记一组合并转发节点。
+
+        Args:
+            depth: 嵌套层数。
+
+        Returns:
+            str: 供 ``get_forward_msg`` 查询的转发 ID。
+        """
+        forward_id = f"forward{self._next_forward_id}"
+        self._next_forward_id += 1
+        self.forwards[forward_id] = self.build_forward_nodes(depth)
+        while len(self.forwards) > self._MAX_STORED_MESSAGES:
+            self.forwards.pop(next(iter(self.forwards)))
+        return forward_id
+
+    def _remember(self, payload: Dict[str, Any]) -> None:
+        """记住一条消息以便 ``get_msg`` 查询。
+
+        Args:
+            payload: 消息事件。
+        """
+        self.messages[int(payload["message_id"])] = payload
+        while len(self.messages) > self._MAX_STORED_MESSAGES:
+            self.messages.popitem(last=False)
+
+
+class NapCatSimulator:
+    """可脚本化的 NapCat 正向 WebSocket 模拟服务。"""
+
+    def __init__(self, options: Optional[SimulatorOptions] = None) -> None:
+        """初始化模拟服务。
+
+        Args:
+            options: 运行参数；为空时使用默认值。
+        """
+        self.options = options or SimulatorOptions()
+        self._rng = random.Random(self.options.seed)
+        self.events = NapCatEventFactory(self.options, self._rng)
+        self._handlers: Dict[str, ActionHandler] = self._build_default_handlers()
+        self._clients: Set[web.WebSocketResponse] = set()
+        self._runner: Optional[web.AppRunner] = None
+        self._tasks: Set[asyncio.Task[Any]] = set()
+        self._media_cache: Dict[int, bytes] = {}
+        self.stats: Dict[str, Any] = {
+            "connections": 0,
+            "disconnects_injected": 0,
+            "pushed_messages": 0,
+            "pushed_notices": 0,
+            "actions": {},
+            "errors_injected": 0,
+            "timeouts_injected": 0,
+            "media_requests": 0,
+        }
+
+    @property
+    def ws_url(self) -> str:
+        """返回适配器应连接的 WebSocket 地址。"""
+        return f"ws://{self.options.host}:{self.options.port}"
+
+    @property
+    def client_count(self) -> int:
+        """返回当前已连接的客户端数量。"""
+        return len(self._clients)
+
+    def register_action(self, action_name: str, handler: ActionHandler) -> None:
+        """注册或覆盖一个动作的响应函数。
+
+        Args:
+            action_name: OneBot 动作名称。
+            handler: 接收动作参数的函数，可为协程函数；返回值作为响应的 ``data``，
+                返回带 ``status`` 键的字典时原样作为完整响应。
+        """
+        self._handlers[action_name] = handler
+
+    async def start(self) -> None:
+        """启动 HTTP 与 WebSocket 服务，并按配置开始推送事件。"""
+        app = web.Application()
+        app.router.add_get("/media/{name}", self._handle_media)
+        app.router.add_get("/{tail:.*}", self._handle_websocket)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.options.host, self.options.port).start()
+        if self.options.message_rate > 0:
+            self._spawn(self._push_at_rate(self.options.message_rate, self._next_message_event, "pushed_messages"))
+        if self.options.notice_rate > 0:
+            self._spawn(self._push_at_rate(self.options.notice_rate, self._next_notice_event, "pushed_notices"))
+
+    async def stop(self) -> None:
+        """停止推送并关闭全部连接与服务。"""
+        for task in list(self._tasks):
+            task.cancel()
+        for task in list(self._tasks):
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        for ws in list(self._clients):
+            with contextlib.suppress(Exception):
+                await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def wait_for_client(self, timeout_sec: float = 30.0) -> None:
+        """等待至少一个客户端连入。
+
+        Args:
+            timeout_sec: 最长等待秒数。
+
+        Raises:
+            asyncio.TimeoutError: 超时仍无客户端连入时抛出。
+        """
+        deadline = time.monotonic() + timeout_sec
+        while not self._clients:
+            if time.monotonic() >= deadline:
+                raise asyncio.TimeoutError("等待适配器连入超时")
+            await asyncio.sleep(0.05)
+
+    async def push(self, payload: Mapping[str, Any]) -> int:
+        """向全部已连接客户端推送一条事件。
+
+        Args:
+            payload: 事件载荷。
+
+        Returns:
+            int: 成功推送的客户端数量。
+        """
+        frame = json.dumps(payload, ensure_ascii=False)
+        delivered = 0
+        for ws in list(self._clients):
+            if ws.closed:
+                continue
+            try:
+                await ws.send_str(frame)
+                delivered += 1
+            except ConnectionError:
+                continue
+        return delivered
+
+    async def disconnect_all(self) -> int:
+        """主动断开全部客户端，模拟 NapCat 重启或网络中断。
+
+        Returns:
+            int: 被断开的客户端数量。
+        """
+        clients = list(self._clients)
+        for ws in clients:
+            with contextlib.suppress(Exception):
+                await ws.close()
+        self.stats["disconnects_injected"] += len(clients)
+        return len(clients)
+
+    async def _handle_websocket(self, request: web.Request) -> web.StreamResponse:
+        """处理一条 WebSocket 连接。
+
+        Args:
+            request: HTTP 升级请求。
+
+        Returns:
+            web.StreamResponse: WebSocket 响应；鉴权失败时为 401。
+        """
+        if self.options.token and _extract_token(request) != self.options.token:
+            return web.Response(status=401, text="token verify failed")
+
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        self._clients.add(ws)
+        self.stats["connections"] += 1
+        session_tasks = [self._spawn(self._heartbeat_loop(ws))]
+        if self.options.disconnect_after_sec > 0:
+            session_tasks.append(self._spawn(self._disconnect_later(ws, self.options.disconnect_after_sec)))
+        try:
+            await ws.send_str(json.dumps(self._build_meta_event("lifecycle", sub_type="connect")))
+            async for ws_message in ws:
+                if ws_message.type != WSMsgType.TEXT:
+                    continue
+                with contextlib.suppress(ValueError):
+                    self._spawn(self._answer_action(ws, json.loads(ws_message.data)))
+        finally:
+            self._clients.discard(ws)
+            for task in session_tasks:
+                task.cancel()
+        return ws
+
+    async def _handle_media(self, request: web.Request) -> web.StreamResponse:
+        """返回指定大小的确定性媒体内容。
+
+        Args:
+            request: 媒体请求，``size`` 查询参数指定字节数。
+
+        Returns:
+            web.StreamResponse: 媒体内容。
+        """
+        self.stats["media_requests"] += 1
+        try:
+            size = max(1, int(request.query.get("size") or self.options.image_bytes))
+        except ValueError:
+            size = self.options.image_bytes
+        return web.Response(body=self._media_bytes(size), content_type="image/png")
+
+    async def _answer_action(self, ws: web.WebSocketResponse, request: Any) -> None:
+        """按注入的延迟与故障规则回答一次动作请求。
+
+        Args:
+            ws: 请求所在的连接。
+            request: 解析后的动作请求。
+        """
+        if not isinstance(request, dict):
+            return
+        action_name = str(request.get("action") or "")
+        params = request.get("params") if isinstance(request.get("params"), dict) else {}
+        echo_id = request.get("echo")
+        action_stats: Dict[str, int] = self.stats["actions"]
+        action_stats[action_name] = action_stats.get(action_name, 0) + 1
+
+        options = self.options
+        delay_ms = options.latency_ms + self._rng.uniform(0.0, options.latency_jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        fault_applies = not options.fault_actions or action_name in options.fault_actions
+        if fault_applies and self._rng.random() < options.timeout_rate:
+            self.stats["timeouts_injected"] += 1
+            return
+        if fault_applies and self._rng.random() < options.error_rate:
+            self.stats["errors_injected"] += 1
+            response: Dict[str, Any] = _failed_response("simulated error", retcode=1400)
+        else:
+            response = await self._run_handler(action_name, params)
+
+        if echo_id is not None:
+            response["echo"] = echo_id
+        if not ws.closed:
+            with contextlib.suppress(ConnectionError):
+                await ws.send_str(json.dumps(response, ensure_ascii=False))
+
+    async def _run_handler(self, action_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """调用动作响应函数并包装为 OneBot 响应。
+
+        Args:
+            action_name: OneBot 动作名称。
+            params: 动作参数。
+
+        Returns:
+            Dict[str, Any]: 不含 ``echo`` 的 OneBot 响应。
+        """
+        handler = self._handlers.get(action_name)
+        if handler is None:
+            return _ok_response(None)
+        result = handler(params)
+        if asyncio.iscoroutine(result):
+            result = await result
+        if isinstance(result, dict) and "status" in result:
+            return dict(result)
+        return _ok_response(result)
+
+    def _build_default_handlers(self) -> Dict[str, ActionHandler]:
+        """构造内置的动作响应函数。
+
+        Returns:
+            Dict[str, ActionHandler]: 动作名到响应函数的映射。
+        """
+        options = self.options
+
+        def member_info(params: Dict[str, Any]) -> Dict[str, Any]:
+            user_id = int(params.get("user_id") or 0)
+            return {
+                "group_id": int(params.get("group_id") or 0),
+                "user_id": user_id,
+                "nickname": f"用户{user_id}",
+                "card": f"名片{user_id}",
+                "role": "owner" if user_id == options.self_id else "member",
+                "title": "",
+                "level": "1",
+                "join_time": 1700000000,
+                "last_sent_time": int(time.time()),
+                "shut_up_timestamp": 0,
+                "is_robot": False,
+            }
+
+        def get_msg(params: Dict[str, Any]) -> Any:
+            message = self.events.messages.get(_as_int(params.get("message_id")))
+            return message if message is not None else _failed_response("消息不存在", retcode=1200)
+
+        def get_forward_msg(params: Dict[str, Any]) -> Any:
+            nodes = self.events.forwards.get(str(params.get("id") or params.get("message_id") or ""))
+            return {"messages": nodes} if nodes is not None else _failed_response("转发消息不存在", retcode=1200)
+
+        def get_record(params: Dict[str, Any]) -> Dict[str, Any]:
+            file_name = str(params.get("file") or params.get("file_id") or "record.amr")
+            return {
+                "file": f"/tmp/{file_name}",
+                "file_size": str(options.record_bytes),
+                "base64": base64.b64encode(self._media_bytes(options.record_bytes)).decode("ascii"),
+            }
+
+        def get_image(params: Dict[str, Any]) -> Dict[str, Any]:
+            file_name = str(params.get("file") or "image.png")
+            return {"file": f"/tmp/{file_name}", "url": f"{options.base_url}/media/{file_name}?size={options.image_bytes}"}
+
+        def send_message(params: Dict[str, Any]) -> Dict[str, Any]:
+            del params
+            return {"message_id": self.events.allocate_message_id()}
+
+        return {
+            "get_login_info": lambda params: {"user_id": options.self_id, "nickname": options.nickname},
+            "get_status": lambda params: {"online": True, "good": True},
+            "get_version_info": lambda params: {"app_name": "NapCat.Simulator", "app_version": "0.0.0"},
+            "get_group_member_info": member_info,
+            "get_stranger_info": lambda params: {
+                "user_id": _as_int(params.get("user_id")),
+                "nickname": f"用户{_as_int(params.get('user_id'))}",
+            },
+            "get_group_info": lambda params: {
+                "group_id": _as_int(params.get("group_id")),
+                "group_name": f"模拟群{_as_int(params.get('group_id'))}",
+                "member_count": len(self.events.user_ids),
+                "max_member_count": 2000,
+            },
+            "get_group_list": lambda params: [
+                {"group_id": group_id, "group_name": f"模拟群{group_id}", "member_count": len(self.events.user_ids)}
+                for group_id in options.group_ids
+            ],
+            "get_group_member_list": lambda params: [
+                member_info({"group_id": params.get("group_id"), "user_id": user_id}) for user_id in self.events.user_ids
+            ],
+            "get_friend_list": lambda params: [
+                {"user_id": user_id, "nickname": f"用户{user_id}", "remark": ""} for user_id in self.events.user_ids[:20]
+            ],
+            "get_msg": get_msg,
+            "get_forward_msg": get_forward_msg,
+            "get_record": get_record,
+            "get_image": get_image,
+            "send_group_msg": send_message,
+            "send_private_msg": send_message,
+            "send_msg": send_message,
+        }
+
+    def _build_meta_event(self, meta_event_type: str, **fields: Any) -> Dict[str, Any]:
+        """构造元事件。
+
+        Args:
+            meta_event_type: ``lifecycle`` 或 ``heartbeat``。
+            **fields: 附加字段。
+
+        Returns:
+            Dict[str, Any]: NapCat 元事件。
+        """
+        return {
+            "time": int(time.time()),
+            "self_id": self.options.self_id,
+            "post_type": "meta_event",
+            "meta_event_type": meta_event_type,
+            **fields,
+        }
+
+    async def _heartbeat_loop(self, ws: web.WebSocketResponse) -> None:
+        """按间隔向一个客户端推送心跳。
+
+        Args:
+            ws: 客户端连接。
+        """
+        interval_sec = max(0.1, self.options.heartbeat_interval_sec)
+        while not ws.closed:
+            await asyncio.sleep(interval_sec)
+            heartbeat = self._build_meta_event(
+                "heartbeat",
+                status={"online": True, "good": True},
+                interval=int(interval_sec * 1000),
+            )
+            with contextlib.suppress(ConnectionError):
+                await ws.send_str(json.dumps(heartbeat))
+
+    async def _disconnect_later(self, ws: web.WebSocketResponse, delay_sec: float) -> None:
+        """在连接建立一段时间后主动断开。
+
+        Args:
+            ws: 客户端连接。
+            delay_sec: 延迟秒数。
+        """
+        await asyncio.sleep(delay_sec)
+        if not ws.closed:
+            self.stats["disconnects_injected"] += 1
+            await ws.close()
+
+    async def _push_at_rate(
+        self,
+        rate: float,
+        build_event: Callable[[], Dict[str, Any]],
+        counter_name: str,
+    ) -> None:
+        """以固定速率推送事件；没有客户端时暂停计时。
+
+        Args:
+            rate: 每秒推送条数。
+            build_event: 生成下一条事件的函数。
+            counter_name: 累计推送数的统计键。
+        """
+        tick_sec = min(0.05, 1.0 / rate)
+        sent = 0
+        started_at: Optional[float] = None
+        while True:
+            await asyncio.sleep(tick_sec)
+            if not self._clients:
+                started_at = None
+                continue
+            now = time.monotonic()
+            if started_at is None:
+                started_at, sent = now, 0
+            due = int((now - started_at) * rate) - sent
+            for _ in range(due):
+                await self.push(build_event())
+            sent += due
+            self.stats[counter_name] += due
+
+    def _next_message_event(self) -> Dict[str, Any]:
+        """按消息类型权重生成下一条消息。"""
+        return self.events.build_message(_weighted_choice(self._rng, self.options.message_mix))
+
+    def _next_notice_event(self) -> Dict[str, Any]:
+        """按通知类型权重生成下一条通知。"""
+        return self.events.build_notice(_weighted_choice(self._rng, self.options.notice_mix))
+
+    def _media_bytes(self, size: int) -> bytes:
+        """返回指定大小的确定性字节串。
+
+        Args:
+            size: 字节数。
+
+        Returns:
+            bytes: 以 PNG 文件头开头、按 SHA-256 链填充的内容。
+        """
+        cached = self._media_cache.get(size)
+        if cached is None:
+            chunks = [b"\x89PNG\r\n\x1a\n"]
+            digest = hashlib.sha256(str(size).encode()).digest()
+            while sum(len(chunk) for chunk in chunks) < size:
+                digest = hashlib.sha256(digest).digest()
+                chunks.append(digest)
+            cached = b"".join(chunks)[:size]
+            self._media_cache[size] = cached
+        return cached
+
+    def _spawn(self, coroutine: Awaitable[Any]) -> asyncio.Task[Any]:
+        """创建并跟踪一个后台任务。
+
+        Args:
+            coroutine: 需要执行的协程。
+
+        Returns:
+            asyncio.Task[Any]: 已创建的任务。
+        """
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+
+def _ok_response(data: Any) -> Dict[str, Any]:
+    """构造成功响应。"""
+    return {"status": "ok", "retcode": 0, "data": data, "message": "", "wording": ""}
+
+
+def _failed_response(message: str, retcode: int) -> Dict[str, Any]:
+    """构造失败响应。"""
+    return {"status": "failed", "retcode": retcode, "data": None, "message": message, "wording": message}
+
+
+def _as_int(value: Any) -> int:
+    """把动作参数转换为整数，非法时返回 ``0``。"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _extract_token(request: web.Request) -> str:
+    """从请求头或查询参数中读取访问令牌。"""
+    authorization = request.headers.get("Authorization", "")
+    if authorization.lower().startswith("bearer "):
+        return authorization[7:].strip()
+    return request.query.get("access_token", "")
+
+
+def _render_raw_message(segments: List[Dict[str, Any]]) -> str:
+    """把消息段渲染为 CQ 码文本。"""
+    parts: List[str] = []
+    for segment in segments:
+        data = segment.get("data", {})
+        if segment["type"] == "text":
+            parts.append(str(data.get("text") or ""))
+        else:
+            parts.append(f"[CQ:{segment['type']},{','.join(f'{key}={value}' for key, value in data.items())}]")
+    return "".join(parts)
+
+
+def _weighted_choice(rng: random.Random, weights: Mapping[str, float]) -> str:
+    """按权重随机选择一个键。"""
+    keys = [key for key, weight in weights.items() if weight > 0]
+    return rng.choices(keys, weights=[weights[key] for key in keys])[0]
+
+
+def parse_mix(value: str, allowed: Tuple[str, ...]) -> Dict[str, float]:
+    """解析 ``kind=weight,...`` 形式的类型权重。
+
+    Args:
+        value: 命令行参数。
+        allowed: 可用的类型名称。
+
+    Returns:
+        Dict[str, float]: 类型到权重的映射。
+
+    Raises:
+        argparse.ArgumentTypeError: 类型未知或权重非法时抛出。
+    """
+    mix: Dict[str, float] = {}
+    for item in value.split(","):
+        kind, _, weight = item.strip().partition("=")
+        if kind not in allowed:
+            raise argparse.ArgumentTypeError(f"未知的类型 {kind}，可选: {', '.join(allowed)}")
+        try:
+            mix[kind] = float(weight or 1.0)
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(f"无法识别的权重: {item}") from exc
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("至少需要一个权重大于 0 的类型")
+    return mix
+
+
+async def _serve(options: SimulatorOptions, duration_sec: float) -> Dict[str, Any]:
+    """运行模拟服务直到时长结束或被中断。
+
+    Args:
+        options: 运行参数。
+        duration_sec: 运行秒数；为 0 时一直运行。
+
+    Returns:
+        Dict[str, Any]: 运行统计。
+    """
+    simulator = NapCatSimulator(options)
+    await simulator.start()
+    print(f"NapCat 模拟服务已启动: {simulator.ws_url}", flush=True)
+    try:
+        if duration_sec > 0:
+            await asyncio.sleep(duration_sec)
+        else:
+            await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+    return simulator.stats
+
+
+def main() -> None:
+    """命令行入口。"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--token", default="", help="要求客户端携带的访问令牌")
+    parser.add_argument("--self-id", type=int, default=10001, help="模拟的机器人账号")
+    parser.add_argument("--groups", default="30001,30002,30003", help="逗号分隔的群号")
+    parser.add_argument("--users", type=int, default=200, help="模拟的用户数量")
+    parser.add_argument("--heartbeat-sec", type=float, default=30.0, help="心跳间隔秒数")
+    parser.add_argument("--message-rate", type=float, default=0.0, help="每秒推送的消息数")
+    parser.add_argument("--notice-rate", type=float, default=0.0, help="每秒推送的通知数")
+    parser.add_argument(
+        "--mix",
+        type=lambda value: parse_mix(value, MESSAGE_KINDS),
+        default=None,
+        help=f"消息类型权重，可选: {','.join(MESSAGE_KINDS)}",
+    )
+    parser.add_argument(
+        "--notice-mix",
+        type=lambda value: parse_mix(value, NOTICE_KINDS),
+        default=None,
+        help=f"通知类型权重，可选: {','.join(NOTICE_KINDS)}",
+    )
+    parser.add_argument("--image-kb", type=int, default=32, help="图片与预览图大小（KB）")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="动作响应的固定延迟")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="动作响应的随机附加延迟上限")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="动作返回失败的比例")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="动作不返回响应的比例")
+    parser.add_argument("--fault-actions", default="", help="逗号分隔的动作名，仅对这些动作注入错误与超时")
+    parser.add_argument("--disconnect-after-sec", type=float, default=0.0, help="每条连接建立多少秒后主动断开")
+    parser.add_argument("--duration", type=float, default=0.0, help="运行秒数，0 表示直到中断")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    options = SimulatorOptions(
+        host=args.host,
+        port=args.port,
+        token=args.token,
+        self_id=args.self_id,
+        group_ids=tuple(int(item) for item in args.groups.split(",") if item.strip()),
+        user_count=args.users,
+        heartbeat_interval_sec=args.heartbeat_sec,
+        message_rate=args.message_rate,
+        notice_rate=args.notice_rate,
+        image_bytes=args.image_kb * 1024,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        fault_actions=tuple(item.strip() for item in args.fault_actions.split(",") if item.strip()),
+        disconnect_after_sec=args.disconnect_after_sec,
+        seed=args.seed,
+    )
+    if args.mix:
+        options.message_mix = args.mix
+    if args.notice_mix:
+        options.notice_mix = args.notice_mix
+
+    with contextlib.suppress(KeyboardInterrupt):
+        stats = asyncio.run(_serve(options, args.duration))
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""把帧录制文件回放进 ``NapCatEventRouter``。
+
+录制文件由 ``[capture]`` 配置段开启后写入 ``data/napcat_adapter/capture``。回放时不连接 NapCat：
+事件按录制顺序交给事件路由器，Host 网关换成只计数的假实现，适配器发出的动作按动作名与参数
+从录制中的 ``echo`` 响应里查找答案，找不到时返回失败响应。
+
+回放速度可选 ``real``（按录制时的间隔）、任意倍速（如 ``10`` 表示十倍速）或 ``max``（不等待）。
+旧录制的事件延迟很大，默认配置下入站媒体会进入降级模式而不下载；需要复现媒体处理时，
+可在 ``--config`` 中关闭 ``inbound.media_degradation_enabled``。
+
+用法::
+
+    python benchmarks/replay_capture.py data/napcat_adapter/capture/frames.jsonl.gz
+    python benchmarks/replay_capture.py frames.*.jsonl.gz frames.jsonl.gz --speed max --json
+    python benchmarks/replay_capture.py frames.jsonl.gz --speed 10 --config replay.toml
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import time
+import tomllib
+
+from _loader import load_adapter_module
+
+# 回放默认关闭聊天名单过滤与官方机器人识别，让录制中的全部消息都能走完整条链路
+DEFAULT_REPLAY_CONFIG: Dict[str, Any] = {
+    "plugin": {"enabled": True},
+    "chat": {"enable_chat_list_filter": False, "ban_qq_bot": False},
+}
+
+
+def iter_capture_frames(paths: List[str]) -> Iterator[Tuple[float, str, Dict[str, Any]]]:
+    """按顺序读取一个或多个录制文件。
+
+    Args:
+        paths: 录制文件路径，轮转出的旧文件应排在当前文件之前。
+
+    Yields:
+        Tuple[float, str, Dict[str, Any]]: 时间戳、方向（``in`` 或 ``out``）与原始帧。
+    """
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as capture_file:
+            for line in capture_file:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                frame = record.get("frame")
+                if isinstance(frame, dict):
+                    yield float(record.get("ts") or 0.0), str(record.get("dir") or ""), frame
+
+
+def _params_key(action_name: str, params: Any) -> str:
+    """生成按动作名与参数查找录制响应的键。
+
+    Args:
+        action_name: OneBot 动作名称。
+        params: 动作参数。
+
+    Returns:
+        str: 参数按键排序后的规范 JSON 文本。
+    """
+    return json.dumps([action_name, params], ensure_ascii=False, sort_keys=True, default=str)
+
+
+class RecordedActionResponder:
+    """按录制中的请求与 ``echo`` 响应回答适配器发出的动作。"""
+
+    def __init__(self) -> None:
+        """初始化空的响应表。"""
+        self._responses: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._latest_by_action: Dict[str, Dict[str, Any]] = {}
+        self._pending_requests: Dict[str, Tuple[str, str]] = {}
+        self.answered: int = 0
+        self.answered_by_action: int = 0
+        self.missed: Dict[str, int] = defaultdict(int)
+
+    def add_request(self, frame: Dict[str, Any]) -> None:
+        """登记一条录制的出站动作请求。
+
+        Args:
+            frame: 出站帧。
+        """
+        echo_id = str(frame.get("echo") or "")
+        if echo_id:
+            action_name = str(frame.get("action") or "")
+            self._pending_requests[echo_id] = (action_name, _params_key(action_name, frame.get("params")))
+
+    def add_response(self, frame: Dict[str, Any]) -> bool:
+        """登记一条带 ``echo`` 的动作响应。
+
+        Args:
+            frame: 入站帧。
+
+        Returns:
+            bool: 帧是动作响应时返回 ``True``。
+        """
+        echo_id = str(frame.get("echo") or "")
+        if not echo_id:
+            return False
+        action_name, params_key = self._pending_requests.pop(echo_id, ("", ""))
+        if action_name:
+            response = {key: value for key, value in frame.items() if key != "echo"}
+            self._responses[params_key].append(response)
+            self._latest_by_action[action_name] = response
+        return True
+
+    async def call_action(self, action_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """返回录制中与请求匹配的响应。
+
+        参数完全一致的响应按录制顺序依次使用，用尽后重复最后一条；没有完全一致的响应时退而使用
+        同名动作最近一次的响应。
+
+        Args:
+            action_name: OneBot 动作名称。
+            params: 动作参数。
+
+        Returns:
+            Dict[str, Any]: 录制的响应；找不到时为失败响应。
+        """
+        responses = self._responses.get(_params_key(action_name, params))
+        if responses:
+            self.answered += 1
+            return responses.popleft() if len(responses) > 1 else responses[0]
+        response = self._latest_by_action.get(action_name)
+        if response is not None:
+            self.answered_by_action += 1
+            return response
+        self.missed[action_name] += 1
+        return {"status": "failed", "retcode": 1404, "data": None, "message": "not recorded", "wording": "not recorded"}
+
+
+class CountingGateway:
+    """只记录调用次数的 Host 消息网关。"""
+
+    def __init__(self) -> None:
+        """初始化计数器。"""
+        self.routed_messages: int = 0
+        self.state_updates: int = 0
+
+    async def route_message(self, gateway_name: str, message: Dict[str, Any], **kwargs: Any) -> bool:
+        """接受一条注入 Host 的消息。
+
+        Args:
+            gateway_name: 消息网关名称。
+            message: 转换后的消息字典。
+            **kwargs: 路由元数据等附加参数。
+
+        Returns:
+            bool: 始终为 ``True``。
+        """
+        del gateway_name, message, kwargs
+        self.routed_messages += 1
+        return True
+
+    async def update_state(self, gateway_name: str, **kwargs: Any) -> bool:
+        """接受一次运行时状态上报。
+
+        Args:
+            gateway_name: 消息网关名称。
+            **kwargs: 状态字段。
+
+        Returns:
+            bool: 始终为 ``True``。
+        """
+        del gateway_name, kwargs
+        self.state_updates += 1
+        return True
+
+
+def parse_speed(value: str) -> Optional[float]:
+    """解析回放速度参数。
+
+    Args:
+        value: ``real``、``max`` 或正数倍速。
+
+    Returns:
+        Optional[float]: 倍速；``max`` 返回 ``None``。
+
+    Raises:
+        argparse.ArgumentTypeError: 参数无法识别时抛出。
+    """
+    if value == "real":
+        return 1.0
+    if value == "max":
+        return None
+    try:
+        factor = float(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"无法识别的回放速度: {value}") from exc
+    if factor <= 0:
+        raise argparse.ArgumentTypeError("回放倍速必须大于 0")
+    return factor
+
+
+async def replay(paths: List[str], speed: Optional[float], raw_config: Dict[str, Any]) -> Dict[str, Any]:
+    """回放录制文件并返回统计结果。
+
+    Args:
+        paths: 录制文件路径。
+        speed: 回放倍速；为 ``None`` 时不等待。
+        raw_config: 插件原始配置。
+
+    Returns:
+        Dict[str, Any]: 回放的事件数、耗时、吞吐与动作应答情况。
+    """
+    config_module = load_adapter_module("config")
+    builder_module = load_adapter_module("runtime.builder")
+    router_module = load_adapter_module("runtime.router")
+    constants_module = load_adapter_module("constants")
+
+    logger = logging.getLogger("napcat_replay")
+    settings = config_module.NapCatPluginSettings.from_mapping(raw_config, logger)
+    responder = RecordedActionResponder()
+    events: List[Tuple[float, Dict[str, Any]]] = []
+    for timestamp, direction, frame in iter_capture_frames(paths):
+        if direction == "out":
+            responder.add_request(frame)
+        elif not responder.add_response(frame):
+            events.append((timestamp, frame))
+
+    gateway = CountingGateway()
+    router = router_module.NapCatEventRouter(
+        gateway_capability=gateway,
+        logger=logger,
+        gateway_name=constants_module.NAPCAT_GATEWAY_NAME,
+        load_settings=lambda: settings,
+    )
+    runtime = builder_module.NapCatRuntimeBuilder(
+        gateway_capability=gateway,
+        logger=logger,
+        gateway_name=constants_module.NAPCAT_GATEWAY_NAME,
+    ).build(
+        on_connection_opened=router.bootstrap_adapter_runtime_state,
+        on_connection_closed=router.handle_transport_disconnected,
+        on_payload=router.handle_transport_payload,
+        on_natural_lift=router.emit_natural_lift_notice,
+        on_heartbeat_timeout=router.handle_heartbeat_timeout,
+    )
+    router.bind_runtime(runtime)
+    runtime.frame_classifier.compile(settings.chat, settings.notice)
+    runtime.inbound_codec.media_budget.configure(settings.inbound)
+    runtime.connections.configure(settings.list_server_configs(), settings.inbound, settings.outbound)
+    connection = runtime.connections.default()
+    # 不建立 WebSocket 连接，动作全部由录制响应回答
+    connection.transport.call_action = responder.call_action
+
+    filtered = 0
+    failed = 0
+    max_behind_sec = 0.0
+    started_at = time.perf_counter()
+    first_timestamp = events[0][0] if events else 0.0
+    with runtime.connections.use(connection):
+        for timestamp, payload in events:
+            if speed is not None:
+                delay_sec = (timestamp - first_timestamp) / speed - (time.perf_counter() - started_at)
+                if delay_sec > 0:
+                    await asyncio.sleep(delay_sec)
+                else:
+                    max_behind_sec = max(max_behind_sec, -delay_sec)
+            if runtime.frame_classifier.classify(payload):
+                filtered += 1
+                continue
+            try:
+                await router.handle_transport_payload(payload)
+            except Exception as exc:
+                failed += 1
+                logger.warning(f"回放事件处理失败: {exc}")
+    elapsed_sec = time.perf_counter() - started_at
+    await runtime.scheduler.shutdown()
+
+    return {
+        "events": len(events),
+        "filtered": filtered,
+        "failed": failed,
+        "routed_messages": gateway.routed_messages,
+        "elapsed_sec": round(elapsed_sec, 3),
+        "events_per_sec": round(len(events) / elapsed_sec, 1) if elapsed_sec > 0 else None,
+        "max_behind_sec": round(max_behind_sec, 3),
+        "recorded_span_sec": round(events[-1][0] - first_timestamp, 3) if events else 0.0,
+        "actions_answered": responder.answered,
+        "actions_answered_by_name": responder.answered_by_action,
+        "actions_missed": dict(responder.missed),
+    }
+
+
+def main() -> None:
+    """命令行入口。"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="录制文件，按时间先后排列")
+    parser.add_argument("--speed", type=parse_speed, default=None, help="real、max 或倍速数字，默认 max")
+    parser.add_argument("--config", help="覆盖回放默认配置的插件配置 TOML 文件")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    parser.add_argument("--verbose", action="store_true", help="输出适配器日志")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    raw_config: Dict[str, Any] = json.loads(json.dumps(DEFAULT_REPLAY_CONFIG))
+    if args.config:
+        with open(args.config, "rb") as config_file:
+            for section, values in tomllib.load(config_file).items():
+                if isinstance(values, dict):
+                    raw_config.setdefault(section, {}).update(values)
+                else:
+                    raw_config[section] = values
+
+    result = asyncio.run(replay(args.paths, args.speed, raw_config))
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+    for key, value in result.items():
+        print(f"{key:<28}{value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """NapCat 入站编解码导出。"""
 
+from .media_budget import NapCatMediaBudget
 from .message_codec import NapCatInboundCodec
 
-__all__ = ["NapCatInboundCodec"]
+__all__ = ["NapCatInboundCodec", "NapCatMediaBudget"]
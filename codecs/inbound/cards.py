@@ -13,6 +13,7 @@ from ...types import NapCatSegment, NapCatSegments
 
 if TYPE_CHECKING:
     from ...services import NapCatQueryService
+    from .media_budget import NapCatMediaBudget
 
 
 class NapCatInboundCardMixin:
@@ -20,6 +21,7 @@ class NapCatInboundCardMixin:
 
     if TYPE_CHECKING:
         _query_service: NapCatQueryService
+        _media_budget: NapCatMediaBudget
 
         @staticmethod
         def _build_text_segment(text: str) -> NapCatSegment: ...
@@ -222,10 +224,14 @@ class NapCatInboundCardMixin:
         normalized_url = str(image_url or "").strip()
         if not normalized_url:
             return None
+        if self._media_budget.degraded:
+            self._media_budget.degrade("image", {"url": normalized_url})
+            return None
 
         binary_data = await self._query_service.download_binary(normalized_url)
         if not binary_data:
             return None
+        self._media_budget.record_download(len(binary_data))
 
         return {
             "type": "image",
@@ -0,0 +1,193 @@
+"""NapCat 入站媒体降级控制。"""
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import time
+
+from ...constants import BACKFILLED_PAYLOAD_KEY, DEFAULT_MEDIA_DEGRADATION_MIN_HOLD_SEC
+from ...event_lag import NapCatEventLagEstimator
+
+if TYPE_CHECKING:
+    from ...config import NapCatInboundConfig
+
+_degraded_media_sink: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar(
+    "napcat_adapter_degraded_media_sink",
+    default=None,
+)
+
+
+class NapCatMediaBudget:
+    """依据事件延迟与媒体下载量决定是否跳过入站媒体的下载与 Base64 编码。
+
+    事件延迟由 ``NapCatEventLagEstimator`` 依据消息 ``time`` 字段估计并扣除时钟偏差，媒体下载量按最近一分钟累计。
+    任一指标超过阈值即进入降级模式：图片、表情与语音改为 ``[image]``、``[emoji]``、``[voice]`` 占位文本，
+    原始地址与文件信息随消息写入 ``additional_config``。降级至少持续一段时间，且两项指标都回落到阈值一半以下后
+    自动恢复正常下载。
+    """
+
+    _RECOVER_RATIO = 0.5
+    _WINDOW_SEC = 60.0
+    _BUCKET_SEC = 10.0
+
+    def __init__(
+        self,
+        logger: Any,
+        min_hold_sec: float = DEFAULT_MEDIA_DEGRADATION_MIN_HOLD_SEC,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        """初始化媒体降级控制器。
+
+        Args:
+            logger: 插件日志对象。
+            min_hold_sec: 进入降级后至少保持的秒数。
+            clock: 单调时钟函数，用于统计下载窗口与降级时长。
+            wall_clock: 返回 Unix 时间戳的时钟函数，需与消息的 ``time`` 字段可比。
+        """
+        self._logger = logger
+        self._min_hold_sec = max(0.0, float(min_hold_sec))
+        self._clock = clock
+        self._lag_estimator = NapCatEventLagEstimator(clock=clock, wall_clock=wall_clock)
+        self._enabled: bool = False
+        self._lag_threshold_sec: float = 0.0
+        self._budget_bytes: float = 0.0
+        self._download_buckets: Deque[Tuple[float, int]] = deque()
+        self._degraded_since: Optional[float] = None
+        self._degraded_periods: int = 0
+        self._downloaded_bytes_total: int = 0
+        self._degraded_counts: Dict[str, int] = {}
+
+    def configure(self, inbound_config: "NapCatInboundConfig") -> None:
+        """更新降级阈值；关闭降级时立即恢复正常下载。
+
+        Args:
+            inbound_config: 最新生效的入站调度配置。
+        """
+        self._enabled = inbound_config.media_degradation_enabled
+        self._lag_threshold_sec = inbound_config.media_degradation_lag_sec
+        self._budget_bytes = inbound_config.media_degradation_budget_mb_per_min * 1024 * 1024
+        if not self._enabled:
+            self._degraded_since = None
+
+    @property
+    def degraded(self) -> bool:
+        """返回当前是否处于媒体降级模式。"""
+        return self._degraded_since is not None
+
+    def observe_message(self, payload: Mapping[str, Any]) -> None:
+        """记录一条待转换消息的事件延迟，并重新判断降级状态。
+
+        补收的历史消息本身就是旧消息，不计入事件延迟。
+
+        Args:
+            payload: NapCat 消息事件。
+        """
+        if not self._enabled:
+            return
+
+        if not payload.get(BACKFILLED_PAYLOAD_KEY):
+            self._lag_estimator.observe(payload.get("time"))
+        self._update_state()
+
+    def record_download(self, byte_count: int) -> None:
+        """累计一次媒体下载的字节数。
+
+        Args:
+            byte_count: 下载到的字节数。
+        """
+        if byte_count <= 0:
+            return
+        self._downloaded_bytes_total += byte_count
+        now = self._clock()
+        bucket_start = now - now % self._BUCKET_SEC
+        if self._download_buckets and self._download_buckets[-1][0] == bucket_start:
+            self._download_buckets[-1] = (bucket_start, self._download_buckets[-1][1] + byte_count)
+        else:
+            self._download_buckets.append((bucket_start, byte_count))
+
+    def degrade(self, media_type: str, metadata: Mapping[str, Any]) -> None:
+        """记录一个被降级为占位文本的媒体，并把原始信息交给当前消息收集。
+
+        Args:
+            media_type: 媒体类型，如 ``image``、``emoji`` 或 ``voice``。
+            metadata: 原始地址与文件信息，值为空的字段会被省略。
+        """
+        self._degraded_counts[media_type] = self._degraded_counts.get(media_type, 0) + 1
+        sink = _degraded_media_sink.get()
+        if sink is not None:
+            sink.append({"type": media_type, **{key: value for key, value in metadata.items() if value not in (None, "")}})
+
+    @contextmanager
+    def collect(self) -> Iterator[List[Dict[str, Any]]]:
+        """在当前上下文内收集被降级媒体的原始信息。
+
+        Yields:
+            List[Dict[str, Any]]: 本次消息转换期间被降级的媒体信息列表。
+        """
+        sink: List[Dict[str, Any]] = []
+        token = _degraded_media_sink.set(sink)
+        try:
+            yield sink
+        finally:
+            _degraded_media_sink.reset(token)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回媒体降级的运行指标。
+
+        Returns:
+            Dict[str, Any]: 当前是否降级、平滑后的事件延迟与估计的时钟偏差、最近一分钟下载量与按类型划分的降级计数。
+        """
+        return {
+            "enabled": self._enabled,
+            "degraded": self.degraded,
+            "degraded_periods": self._degraded_periods,
+            "event_lag_sec": round(self._lag_estimator.lag_sec, 3),
+            "clock_offset_sec": round(self._lag_estimator.clock_offset_sec, 3),
+            "window_download_bytes": self._window_download_bytes(),
+            "downloaded_bytes": self._downloaded_bytes_total,
+            "degraded_media": dict(self._degraded_counts),
+        }
+
+    def _update_state(self) -> None:
+        """依据当前指标进入或退出降级模式。"""
+        window_bytes = self._window_download_bytes()
+        lag_sec = self._lag_estimator.lag_sec
+        now = self._clock()
+        if self._degraded_since is None:
+            if lag_sec >= self._lag_threshold_sec or window_bytes >= self._budget_bytes:
+                self._degraded_since = now
+                self._degraded_periods += 1
+                self._logger.warning(
+                    f"NapCat 入站媒体进入降级模式: event_lag={lag_sec:.1f}s "
+                    f"window_download={window_bytes / 1024 / 1024:.1f}MB，图片与语音改为占位文本"
+                )
+            return
+
+        if now - self._degraded_since < self._min_hold_sec:
+            return
+        if (
+            lag_sec < self._lag_threshold_sec * self._RECOVER_RATIO
+            and window_bytes < self._budget_bytes * self._RECOVER_RATIO
+        ):
+            self._logger.info(
+                f"NapCat 入站媒体已恢复正常下载，降级持续 {now - self._degraded_since:.0f} 秒: "
+                f"event_lag={lag_sec:.1f}s"
+            )
+            self._degraded_since = None
+
+    def _window_download_bytes(self) -> int:
+        """返回最近一分钟内的媒体下载字节数，并丢弃过期的统计桶。
+
+        Returns:
+            int: 窗口内的下载字节数。
+        """
+        expire_before = self._clock() - self._WINDOW_SEC
+        buckets = self._download_buckets
+        while buckets and buckets[0][0] + self._BUCKET_SEC <= expire_before:
+            buckets.popleft()
+        return sum(byte_count for _bucket_start, byte_count in buckets)
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Mapping, Optional, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 from uuid import uuid4
 
+import asyncio
 import hashlib
 import time
 
@@ -13,21 +14,35 @@ from ...services import NapCatQueryService
 from ...types import NapCatIncomingSegment, NapCatIncomingSegments, NapCatPayload, NapCatSegment, NapCatSegments
 from ..notice.helpers import normalize_optional_string
 from .cards import NapCatInboundCardMixin
+from .media_budget import NapCatMediaBudget
 from .text import NapCatInboundTextMixin
 
 
 class NapCatInboundCodec(NapCatInboundCardMixin, NapCatInboundTextMixin):
     """NapCat 入站消息编码器。"""
 
-    def __init__(self, logger: Any, query_service: NapCatQueryService) -> None:
+    def __init__(
+        self,
+        logger: Any,
+        query_service: NapCatQueryService,
+        group_name_resolver: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> None:
         """初始化入站消息编码器。
 
         Args:
             logger: 插件日志对象。
             query_service: QQ 查询服务。
+            group_name_resolver: 从群目录读取群名称的函数；事件未携带群名称时使用。
         """
         self._logger = logger
         self._query_service = query_service
+        self._group_name_resolver = group_name_resolver
+        self._media_budget = NapCatMediaBudget(logger)
+
+    @property
+    def media_budget(self) -> NapCatMediaBudget:
+        """返回入站媒体降级控制器。"""
+        return self._media_budget
 
     async def build_message_dict(
         self,
@@ -49,11 +64,16 @@ class NapCatInboundCodec(NapCatInboundCardMixin, NapCatInboundTextMixin):
         """
         message_type = str(payload.get("message_type") or "").strip() or "private"
         group_id = str(payload.get("group_id") or "").strip()
-        group_name = str(payload.get("group_name") or "").strip() or (f"group_{group_id}" if group_id else "")
+        group_name = str(payload.get("group_name") or "").strip()
+        if not group_name and group_id:
+            resolved_group_name = self._group_name_resolver(group_id) if self._group_name_resolver is not None else None
+            group_name = resolved_group_name or f"group_{group_id}"
         user_nickname = str(sender.get("nickname") or sender.get("card") or sender_user_id).strip() or sender_user_id
         user_cardname = str(sender.get("card") or "").strip() or None
 
-        raw_message, is_at, platform_card_payloads = await self.convert_segments_with_metadata(payload, self_id)
+        self._media_budget.observe_message(payload)
+        with self._media_budget.collect() as degraded_media:
+            raw_message, is_at, platform_card_payloads = await self.convert_segments_with_metadata(payload, self_id)
         if not raw_message:
             raw_message = [self._build_text_segment("[unsupported]")]
 
@@ -69,6 +89,8 @@ class NapCatInboundCodec(NapCatInboundCardMixin, NapCatInboundTextMixin):
             additional_config["platform_io_target_user_id"] = sender_user_id
         if platform_card_payloads:
             additional_config["platform_card_payloads"] = platform_card_payloads
+        if degraded_media:
+            additional_config["napcat_degraded_media"] = degraded_media
 
         message_info: Dict[str, Any] = {
             "user_info": {
@@ -206,7 +228,7 @@ class NapCatInboundCodec(NapCatInboundCardMixin, NapCatInboundTextMixin):
             Tuple[NapCatSegments, bool]: 转换后的消息段列表，以及是否 @ 到当前机器人。
         """
         converted_segments: NapCatSegments = []
-        at_target_cache: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        at_target_cache = await self._resolve_at_targets(message_payload, group_id)
         is_at = False
         for segment in message_payload:
             segment_type = str(segment.get("type") or "").strip()
@@ -221,15 +243,7 @@ class NapCatInboundCodec(NapCatInboundCardMixin, NapCatInboundTextMixin):
 
             if segment_type == "at":
                 if target_user_id := str(segment_data.get("qq") or "").strip():
-                    if target_user_id in at_target_cache:
-                        target_user_nickname, target_user_cardname = at_target_cache[target_user_id]
-                    else:
-                        target_user_nickname, target_user_cardname = await self._resolve_at_target_info(
-                            group_id=group_id,
-                            target_user_id=target_user_id,
-                        )
-                        at_target_cache[target_user_id] = (target_user_nickname, target_user_cardname)
-
+                    target_user_nickname, target_user_cardname = at_target_cache[target_user_id]
                     converted_segments.append(
                         {
                             "type": "at",
@@ -288,6 +302,68 @@ class NapCatInboundCodec(NapCatInboundCardMixin, NapCatInboundTextMixin):
 
         return converted_segments, is_at
 
+    async def _resolve_at_targets(
+        self,
+        message_payload: NapCatIncomingSegments,
+        group_id: str,
+    ) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """解析一条消息中全部 @ 目标的昵称与群名片。
+
+        群消息中至少两个 @ 目标需要查询 NapCat 时才并发查询，使查询服务能够合并同群的集中查询；
+        其余情况（单个 @、私聊或资料都已缓存）逐个解析，避免为内存读取创建任务。
+
+        Args:
+            message_payload: NapCat / OneBot 结构化消息段列表。
+            group_id: 当前消息所在群号；私聊消息为空字符串。
+
+        Returns:
+            Dict[str, Tuple[Optional[str], Optional[str]]]: 目标用户号到 ``(昵称, 群名片)`` 的映射。
+        """
+        target_user_ids: List[str] = []
+        for segment in message_payload:
+            if str(segment.get("type") or "").strip() != "at":
+                continue
+            segment_data = segment.get("data", {})
+            if not isinstance(segment_data, Mapping):
+                continue
+            target_user_id = str(segment_data.get("qq") or "").strip()
+            if target_user_id and target_user_id not in target_user_ids:
+                target_user_ids.append(target_user_id)
+
+        if not target_user_ids:
+            return {}
+        if not group_id or not self._has_concurrent_lookups(group_id, target_user_ids):
+            return {
+                target_user_id: await self._resolve_at_target_info(group_id=group_id, target_user_id=target_user_id)
+                for target_user_id in target_user_ids
+            }
+        resolved_targets = await asyncio.gather(
+            *(
+                self._resolve_at_target_info(group_id=group_id, target_user_id=target_user_id)
+                for target_user_id in target_user_ids
+            )
+        )
+        return dict(zip(target_user_ids, resolved_targets))
+
+    def _has_concurrent_lookups(self, group_id: str, target_user_ids: List[str]) -> bool:
+        """判断是否有至少两个 @ 目标需要向 NapCat 查询群成员资料。
+
+        Args:
+            group_id: 当前消息所在群号。
+            target_user_ids: 去重后的 @ 目标用户号。
+
+        Returns:
+            bool: 缓存未命中的目标不少于两个时返回 ``True``。
+        """
+        uncached_count = 0
+        for target_user_id in target_user_ids:
+            if target_user_id == "all" or self._query_service.is_group_member_cached(group_id, target_user_id):
+                continue
+            uncached_count += 1
+            if uncached_count >= 2:
+                return True
+        return False
+
     async def _resolve_at_target_info(
         self,
         group_id: str,
@@ -309,7 +385,7 @@ class NapCatInboundCodec(NapCatInboundCardMixin, NapCatInboundTextMixin):
         target_user_cardname: Optional[str] = None
 
         if group_id:
-            member_info = await self._query_service.get_group_member_info(group_id, target_user_id, no_cache=True)
+            member_info = await self._query_service.get_group_member_info(group_id, target_user_id)
             if member_info is not None:
                 target_user_nickname = normalize_optional_string(member_info.get("nickname"))
                 target_user_cardname = normalize_optional_string(member_info.get("card"))
@@ -399,9 +475,22 @@ class NapCatInboundCodec(NapCatInboundCardMixin, NapCatInboundTextMixin):
         actual_is_emoji = is_emoji or (subtype is not None and subtype not in {0, 4, 9})
 
         image_url = str(segment_data.get("url") or "").strip()
+        if self._media_budget.degraded:
+            self._media_budget.degrade(
+                "emoji" if actual_is_emoji else "image",
+                {
+                    "url": image_url,
+                    "file": segment_data.get("file"),
+                    "file_size": segment_data.get("file_size"),
+                    "summary": segment_data.get("summary"),
+                },
+            )
+            return self._build_text_segment("[emoji]" if actual_is_emoji else "[image]")
+
         binary_data = await self._query_service.download_binary(image_url)
         if not binary_data:
             return self._build_text_segment("[emoji]" if actual_is_emoji else "[image]")
+        self._media_budget.record_download(len(binary_data))
 
         return {
             "type": "emoji" if actual_is_emoji else "image",
@@ -423,6 +512,17 @@ class NapCatInboundCodec(NapCatInboundCardMixin, NapCatInboundTextMixin):
         file_id = str(segment_data.get("file_id") or "").strip() or None
         if not file_name:
             return self._build_text_segment("[voice]")
+        if self._media_budget.degraded:
+            self._media_budget.degrade(
+                "voice",
+                {
+                    "url": segment_data.get("url"),
+                    "file": file_name,
+                    "file_id": file_id,
+                    "file_size": segment_data.get("file_size"),
+                },
+            )
+            return self._build_text_segment("[voice]")
 
         record_detail = await self._query_service.get_record_detail(file_name=file_name, file_id=file_id)
         if record_detail is None:
@@ -436,6 +536,7 @@ class NapCatInboundCodec(NapCatInboundCardMixin, NapCatInboundTextMixin):
             binary_data = self._decode_binary(record_base64)
         except Exception:
             return self._build_text_segment("[voice]")
+        self._media_budget.record_download(len(binary_data))
 
         return {
             "type": "voice",
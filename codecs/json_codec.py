@@ -0,0 +1,162 @@
+"""NapCat WebSocket 热路径 JSON 编解码。
+
+优先使用已安装的 ``orjson`` 或 ``msgspec``，均未安装时回退到标准库 ``json``。
+所有实现都可以直接解码 ``bytes`` 帧数据，无需先转换为 ``str``。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple, Type, Union
+
+import json
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    msgspec = None  # type: ignore[assignment]
+    MSGSPEC_AVAILABLE = False
+
+
+JsonInput = Union[str, bytes, bytearray, memoryview]
+
+
+class NapCatJsonCodec:
+    """标准库 ``json`` 实现，也是其它实现的行为基准。"""
+
+    name: str = "json"
+
+    def loads(self, data: JsonInput) -> Any:
+        """解码 JSON 文本或字节。
+
+        Args:
+            data: WebSocket 帧中的 JSON 文本或 UTF-8 字节。
+
+        Returns:
+            Any: 解码后的 Python 对象。
+        """
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(self, value: Any) -> str:
+        """将对象编码为紧凑的 JSON 文本，保留非 ASCII 字符。
+
+        Args:
+            value: 待编码的对象。
+
+        Returns:
+            str: JSON 文本。
+        """
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class NapCatOrjsonCodec(NapCatJsonCodec):
+    """基于 ``orjson`` 的实现。"""
+
+    name = "orjson"
+
+    def loads(self, data: JsonInput) -> Any:
+        """解码 JSON 文本或字节。
+
+        Args:
+            data: WebSocket 帧中的 JSON 文本或 UTF-8 字节。
+
+        Returns:
+            Any: 解码后的 Python 对象。
+        """
+        return orjson.loads(data)
+
+    def dumps(self, value: Any) -> str:
+        """将对象编码为 JSON 文本。
+
+        ``orjson`` 无法处理超过 64 位的整数等少数取值，遇到时回退到标准库。
+
+        Args:
+            value: 待编码的对象。
+
+        Returns:
+            str: JSON 文本。
+        """
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            return super().dumps(value)
+
+
+class NapCatMsgspecJsonCodec(NapCatJsonCodec):
+    """基于 ``msgspec.json`` 的实现。"""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        """初始化可复用的 ``msgspec`` 编解码器实例。"""
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: JsonInput) -> Any:
+        """解码 JSON 文本或字节。
+
+        Args:
+            data: WebSocket 帧中的 JSON 文本或 UTF-8 字节。
+
+        Returns:
+            Any: 解码后的 Python 对象。
+        """
+        return self._decoder.decode(data)
+
+    def dumps(self, value: Any) -> str:
+        """将对象编码为 JSON 文本。
+
+        ``msgspec`` 不支持的取值会回退到标准库。
+
+        Args:
+            value: 待编码的对象。
+
+        Returns:
+            str: JSON 文本。
+        """
+        try:
+            return self._encoder.encode(value).decode("utf-8")
+        except (TypeError, OverflowError):
+            return super().dumps(value)
+
+
+_CODEC_CLASSES: Dict[str, Tuple[bool, Type[NapCatJsonCodec]]] = {
+    "orjson": (ORJSON_AVAILABLE, NapCatOrjsonCodec),
+    "msgspec": (MSGSPEC_AVAILABLE, NapCatMsgspecJsonCodec),
+    "json": (True, NapCatJsonCodec),
+}
+
+
+def available_json_codecs() -> Tuple[str, ...]:
+    """返回当前环境可用的 JSON 实现名称，按优先级排序。
+
+    Returns:
+        Tuple[str, ...]: 可用实现名称。
+    """
+    return tuple(name for name, (available, _codec_class) in _CODEC_CLASSES.items() if available)
+
+
+def create_json_codec(preferred: str = "auto") -> NapCatJsonCodec:
+    """创建 JSON 编解码器。
+
+    Args:
+        preferred: 期望的实现名称；为 ``auto`` 或对应依赖未安装时按优先级自动选择。
+
+    Returns:
+        NapCatJsonCodec: 可用的 JSON 编解码器实例。
+    """
+    available, codec_class = _CODEC_CLASSES.get(preferred, (False, NapCatJsonCodec))
+    if not available:
+        codec_class = _CODEC_CLASSES[available_json_codecs()[0]][1]
+    return codec_class()
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from ...services import NapCatQueryService
 from .helpers import normalize_optional_string
@@ -11,13 +11,19 @@ from .helpers import normalize_optional_string
 class NapCatNoticeEntityResolver:
     """为通知事件补全用户和群资料。"""
 
-    def __init__(self, query_service: NapCatQueryService) -> None:
+    def __init__(
+        self,
+        query_service: NapCatQueryService,
+        group_name_resolver: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> None:
         """初始化实体补全器。
 
         Args:
             query_service: NapCat 查询服务。
+            group_name_resolver: 从群目录读取群名称的函数；未命中时回退为 ``get_group_info`` 查询。
         """
         self._query_service = query_service
+        self._group_name_resolver = group_name_resolver
 
     async def build_user_info(self, group_id: str, user_id: str) -> Dict[str, Optional[str]]:
         """构造通知消息的用户信息。
@@ -67,6 +73,9 @@ class NapCatNoticeEntityResolver:
         if not group_id:
             return None
 
+        if self._group_name_resolver is not None and (group_name := self._group_name_resolver(group_id)):
+            return {"group_id": group_id, "group_name": group_name}
+
         group_info = await self._query_service.get_group_info(group_id)
         group_name = str(group_info.get("group_name") or f"group_{group_id}") if group_info else f"group_{group_id}"
         return {"group_id": group_id, "group_name": group_name}
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 from uuid import uuid4
 
 import time
@@ -18,14 +18,20 @@ from .renderer import NapCatNoticeTextRenderer
 class NapCatNoticeCodec:
     """NapCat QQ 通知事件编码器。"""
 
-    def __init__(self, logger: Any, query_service: NapCatQueryService) -> None:
+    def __init__(
+        self,
+        logger: Any,
+        query_service: NapCatQueryService,
+        group_name_resolver: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> None:
         """初始化通知事件编码器。
 
         Args:
             logger: 插件日志对象。
             query_service: QQ 查询服务。
+            group_name_resolver: 从群目录读取群名称的函数。
         """
-        self._entity_resolver = NapCatNoticeEntityResolver(query_service)
+        self._entity_resolver = NapCatNoticeEntityResolver(query_service, group_name_resolver)
         self._meta_event_observer = NapCatMetaEventObserver(logger)
         self._renderer = NapCatNoticeTextRenderer()
 
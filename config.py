@@ -13,11 +13,44 @@ from pydantic import ValidationInfo, field_validator, model_validator
 
 from .constants import (
     DEFAULT_ACTION_TIMEOUT_SEC,
+    DEFAULT_CAPTURE_MAX_FILE_MB,
+    DEFAULT_CAPTURE_MAX_FILES,
     DEFAULT_CHAT_LIST_TYPE,
+    DEFAULT_CONTACT_DIRECTORY_REFRESH_INTERVAL_SEC,
+    DEFAULT_GROUP_ROSTER_MIN_MEMBERS,
+    DEFAULT_GROUP_ROSTER_RECONCILE_INTERVAL_SEC,
     DEFAULT_HEARTBEAT_INTERVAL_SEC,
+    DEFAULT_HISTORY_BACKFILL_CONCURRENCY,
+    DEFAULT_HISTORY_BACKFILL_MAX_GAP_SEC,
+    DEFAULT_HISTORY_BACKFILL_PAGE_BUDGET,
+    DEFAULT_HISTORY_BACKFILL_PAGE_SIZE,
+    DEFAULT_HTTP_ACTION_MAX_CONNECTIONS,
+    DEFAULT_HTTP_ACTION_ROUTES,
+    DEFAULT_INBOUND_HIGH_WATER_RATIO,
+    DEFAULT_INBOUND_QUEUE_MAX_SIZE,
+    DEFAULT_INBOUND_WORKER_COUNT,
+    DEFAULT_MEDIA_DEGRADATION_BUDGET_MB_PER_MIN,
+    DEFAULT_MEDIA_DEGRADATION_LAG_SEC,
+    DEFAULT_MEMBER_BATCH_THRESHOLD,
+    DEFAULT_MEMBER_BATCH_WINDOW_MS,
     DEFAULT_NAPCAT_HOST,
     DEFAULT_NAPCAT_PORT,
+    DEFAULT_OFFLINE_OUTBOX_MAX_SIZE,
+    DEFAULT_OFFLINE_OUTBOX_SPILL_MAX_SIZE,
+    DEFAULT_OFFLINE_OUTBOX_TTL_SEC,
+    DEFAULT_OVERLOAD_BUSIEST_GROUP_COUNT,
+    DEFAULT_OVERLOAD_GROUP_LAG_SEC,
+    DEFAULT_OVERLOAD_GROUP_QUEUE_RATIO,
+    DEFAULT_OVERLOAD_NOTICE_LAG_SEC,
+    DEFAULT_OVERLOAD_NOTICE_QUEUE_RATIO,
+    DEFAULT_PRIMARY_PROBE_INTERVAL_SEC,
+    DEFAULT_PROFILE_CACHE_MAX_ENTRIES,
+    DEFAULT_PROFILE_CACHE_MEMBER_TTL_SEC,
+    DEFAULT_PROFILE_CACHE_PROFILE_TTL_SEC,
     DEFAULT_RECONNECT_DELAY_SEC,
+    DEFAULT_RECONNECT_MAX_DELAY_SEC,
+    DEFAULT_RECONNECT_STABLE_AFTER_SEC,
+    DEFAULT_WS_MODE,
     SUPPORTED_CONFIG_VERSION,
 )
 
@@ -152,7 +185,7 @@ class NapCatPluginOptions(PluginConfigBase):
 
 
 class NapCatServerConfig(PluginConfigBase):
-    """NapCat 正向 WebSocket 连接配置。"""
+    """NapCat WebSocket 连接配置。"""
 
     __ui_label__: ClassVar[str] = "NapCat 连接"
     __ui_order__: ClassVar[int] = 1
@@ -227,20 +260,55 @@ class NapCatServerConfig(PluginConfigBase):
     )
     reconnect_delay_sec: float = Field(
         default=DEFAULT_RECONNECT_DELAY_SEC,
-        description="连接断开后的重连等待时间，单位为秒。",
+        description="重连退避的起始等待时间，单位为秒。",
         json_schema_extra={
-            "hint": "连接断开后会等待该时长再尝试重新连接。",
+            "hint": "连接断开后会立即重试一次；仍失败时从该时长开始按指数退避（附带随机抖动）等待后再重连。",
             "i18n": _schema_i18n(
                 label_en="Reconnect delay (sec)",
                 label_ja="再接続待機（秒）",
-                hint_en="After a disconnect, wait this long before trying to reconnect.",
-                hint_ja="接続が切断された後、再接続を試すまでこの時間待機します。",
+                hint_en=(
+                    "After a disconnect the adapter retries once immediately; further failures back off "
+                    "exponentially (with jitter) starting from this delay."
+                ),
+                hint_ja="切断後はまず即座に再試行し、それでも失敗した場合はこの時間を起点に指数的に（揺らぎ付きで）待機時間を延ばします。",
             ),
             "label": "重连等待（秒）",
             "order": 4,
             "step": 1,
         },
     )
+    reconnect_max_delay_sec: float = Field(
+        default=DEFAULT_RECONNECT_MAX_DELAY_SEC,
+        description="重连退避等待时间的上限，单位为秒。",
+        json_schema_extra={
+            "hint": "NapCat 长时间不可用时，两次重连之间最多等待这么久。",
+            "i18n": _schema_i18n(
+                label_en="Max reconnect delay (sec)",
+                label_ja="最大再接続待機（秒）",
+                hint_en="While NapCat stays unavailable, never wait longer than this between reconnect attempts.",
+                hint_ja="NapCat が長時間利用できない場合でも、再接続の間隔はこの時間を超えません。",
+            ),
+            "label": "最大重连等待（秒）",
+            "order": 5,
+            "step": 5,
+        },
+    )
+    reconnect_stable_after_sec: float = Field(
+        default=DEFAULT_RECONNECT_STABLE_AFTER_SEC,
+        description="连接保持多久后视为稳定并重置重连退避，单位为秒。",
+        json_schema_extra={
+            "hint": "连接持续时间不足该值就断开时继续累加退避，避免反复闪断时频繁重连。",
+            "i18n": _schema_i18n(
+                label_en="Stable connection period (sec)",
+                label_ja="安定接続とみなす時間（秒）",
+                hint_en="Connections that drop sooner than this keep backing off, so a flapping NapCat is not hammered.",
+                hint_ja="この時間より早く切断された接続は待機時間の延長を続け、頻繁な再接続を防ぎます。",
+            ),
+            "label": "稳定连接判定（秒）",
+            "order": 6,
+            "step": 5,
+        },
+    )
     action_timeout_sec: float = Field(
         default=DEFAULT_ACTION_TIMEOUT_SEC,
         description="调用 NapCat 动作接口的超时时间，单位为秒。",
@@ -253,7 +321,7 @@ class NapCatServerConfig(PluginConfigBase):
                 hint_ja="メッセージ送信や情報取得などのアクションは、この時間を超えるとエラーになります。",
             ),
             "label": "动作超时（秒）",
-            "order": 5,
+            "order": 7,
             "step": 1,
         },
     )
@@ -271,10 +339,146 @@ class NapCatServerConfig(PluginConfigBase):
                 placeholder_ja="例：primary",
             ),
             "label": "连接标识",
-            "order": 6,
+            "order": 8,
             "placeholder": "例如：primary",
         },
     )
+    standby_endpoints: List[str] = Field(
+        default_factory=list,
+        description="同一账号的备用 NapCat 地址，按优先级排列。",
+        json_schema_extra={
+            "hint": (
+                "主地址断开或无法连接时立即依次切换到这些地址，并在后台定期探测主地址，恢复后自动切回；"
+                "可填写 host:port 或完整的 ws:// 地址，访问令牌与主地址相同。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Standby endpoints",
+                label_ja="予備エンドポイント",
+                hint_en=(
+                    "When the primary address drops or is unreachable, the adapter fails over to these in order and "
+                    "probes the primary in the background, switching back once it recovers. Use host:port or a full "
+                    "ws:// URL; the access token is shared with the primary."
+                ),
+                hint_ja=(
+                    "メインのアドレスが切断または到達不能になると、これらへ順に切り替え、"
+                    "バックグラウンドでメインを定期的に確認し、復旧すると自動で戻ります。"
+                    "host:port または ws:// の完全な URL を指定でき、アクセストークンはメインと共通です。"
+                ),
+                placeholder_en="For example: 10.0.0.2:3001",
+                placeholder_ja="例：10.0.0.2:3001",
+            ),
+            "label": "备用地址",
+            "order": 9,
+            "placeholder": "例如：10.0.0.2:3001",
+        },
+    )
+    primary_probe_interval_sec: float = Field(
+        default=DEFAULT_PRIMARY_PROBE_INTERVAL_SEC,
+        description="使用备用地址期间探测主地址是否恢复的间隔，单位为秒。",
+        json_schema_extra={
+            "hint": "仅在配置了备用地址且当前连接在备用地址上时生效。",
+            "i18n": _schema_i18n(
+                label_en="Primary probe interval (sec)",
+                label_ja="メイン確認間隔（秒）",
+                hint_en="Only used while connected to a standby endpoint.",
+                hint_ja="予備エンドポイントに接続している間のみ使用されます。",
+            ),
+            "label": "主地址探测间隔（秒）",
+            "order": 10,
+            "step": 5,
+        },
+    )
+    http_action_url: str = Field(
+        default="",
+        description="NapCat HTTP API 地址；留空表示所有动作都通过 WebSocket 发送。",
+        json_schema_extra={
+            "hint": (
+                "填写后，命中路由规则的动作会通过保持长连接的 HTTP 连接池发送，不再与事件推送共用 WebSocket 排队；"
+                "HTTP 不可达时自动回退到 WebSocket。访问令牌与 WebSocket 相同。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="HTTP action URL",
+                label_ja="HTTP アクション URL",
+                hint_en=(
+                    "When set, actions matching the routing rules are sent through a pooled keep-alive HTTP client "
+                    "instead of queueing on the event WebSocket, falling back to WebSocket when HTTP is unreachable. "
+                    "The access token is shared with WebSocket."
+                ),
+                hint_ja=(
+                    "設定すると、ルーティング規則に一致するアクションはキープアライブの HTTP 接続プールで送信され、"
+                    "イベント用 WebSocket の順番待ちを避けます。HTTP に到達できない場合は WebSocket に戻ります。"
+                    "アクセストークンは WebSocket と共通です。"
+                ),
+                placeholder_en="For example: http://127.0.0.1:3000",
+                placeholder_ja="例：http://127.0.0.1:3000",
+            ),
+            "label": "HTTP 动作地址",
+            "order": 11,
+            "placeholder": "例如：http://127.0.0.1:3000",
+        },
+    )
+    http_action_routes: List[str] = Field(
+        default_factory=lambda: list(DEFAULT_HTTP_ACTION_ROUTES),
+        description="通过 HTTP 发送的动作名称，支持 * 与 ? 通配符。",
+        json_schema_extra={
+            "hint": "默认只包含成员列表、历史消息、文件上传与媒体获取等较重的动作；发送消息等其它动作仍走 WebSocket。",
+            "i18n": _schema_i18n(
+                label_en="HTTP action routes",
+                label_ja="HTTP で送るアクション",
+                hint_en=(
+                    "Action names, with * and ? wildcards. The default covers heavy actions such as member lists, "
+                    "message history, file uploads and media fetches; everything else stays on WebSocket."
+                ),
+                hint_ja=(
+                    "アクション名（* と ? のワイルドカード可）。既定ではメンバー一覧、履歴、ファイルアップロード、"
+                    "メディア取得などの重いアクションのみで、それ以外は WebSocket のままです。"
+                ),
+            ),
+            "label": "HTTP 动作路由",
+            "order": 12,
+        },
+    )
+    http_action_max_connections: int = Field(
+        default=DEFAULT_HTTP_ACTION_MAX_CONNECTIONS,
+        description="HTTP 动作连接池的最大连接数。",
+        json_schema_extra={
+            "i18n": _schema_i18n(label_en="HTTP pool size", label_ja="HTTP 接続プールの上限"),
+            "label": "HTTP 连接池大小",
+            "order": 13,
+            "step": 1,
+        },
+    )
+    ws_mode: Literal["forward", "reverse"] = Field(
+        default=DEFAULT_WS_MODE,
+        description="WebSocket 连接方向：forward 为适配器主动连接 NapCat，reverse 为 NapCat 连入适配器。",
+        json_schema_extra={
+            "hint": (
+                "reverse 模式下主机地址与端口表示适配器的监听地址（容器内通常填写 0.0.0.0），"
+                "NapCat 需配置反向 WebSocket 指向该地址并携带相同的 token；监听非回环地址时必须配置 token，"
+                "否则不会启动监听。多个账号可以共用同一监听地址，"
+                "按 token 与 X-Self-ID 区分。reverse 模式下备用地址不生效，重连由 NapCat 发起。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="WebSocket mode",
+                label_ja="WebSocket の方向",
+                hint_en=(
+                    "In reverse mode, host and port are the adapter's listening address (usually 0.0.0.0 in a "
+                    "container). Point NapCat's reverse WebSocket at it with the same token; a token is required "
+                    "when listening on a non-loopback address, otherwise the listener is not started. Several "
+                    "accounts can share one listening address and are told apart by token and X-Self-ID. "
+                    "Standby endpoints are ignored and reconnects are driven by NapCat."
+                ),
+                hint_ja=(
+                    "reverse モードではホストとポートがアダプターの待受アドレスになります（コンテナでは通常 0.0.0.0）。"
+                    "NapCat の逆方向 WebSocket を同じ token でこのアドレスに向けてください。ループバック以外で待ち受ける場合は "
+                    "token が必須で、未設定なら待受を開始しません。複数アカウントで同じ待受アドレスを"
+                    "共有でき、token と X-Self-ID で区別します。予備エンドポイントは無視され、再接続は NapCat 側が行います。"
+                ),
+            ),
+            "label": "连接方向",
+            "order": 14,
+        },
+    )
 
     def build_ws_url(self) -> str:
         """构造正向 WebSocket 地址。
@@ -285,6 +489,22 @@ class NapCatServerConfig(PluginConfigBase):
 
         return f"ws://{self.host}:{self.port}"
 
+    def build_ws_urls(self) -> List[str]:
+        """按优先级返回全部可用的 WebSocket 地址。
+
+        Returns:
+            List[str]: 主地址在前，其后依次为去重后的备用地址；反向模式下只有监听地址。
+        """
+
+        ws_urls = [self.build_ws_url()]
+        if self.ws_mode == "reverse":
+            return ws_urls
+        for endpoint in self.standby_endpoints:
+            ws_url = endpoint if "://" in endpoint else f"ws://{endpoint}"
+            if ws_url not in ws_urls:
+                ws_urls.append(ws_url)
+        return ws_urls
+
     @field_validator("host", mode="before")
     @classmethod
     def _normalize_host(cls, value: Any) -> str:
@@ -314,7 +534,7 @@ class NapCatServerConfig(PluginConfigBase):
 
         return _normalize_positive_int(value, DEFAULT_NAPCAT_PORT)
 
-    @field_validator("token", "connection_id", mode="before")
+    @field_validator("token", "connection_id", "http_action_url", mode="before")
     @classmethod
     def _normalize_text_fields(cls, value: Any) -> str:
         """规范化文本字段。
@@ -328,10 +548,55 @@ class NapCatServerConfig(PluginConfigBase):
 
         return _normalize_string(value)
 
+    @field_validator("standby_endpoints", "http_action_routes", mode="before")
+    @classmethod
+    def _normalize_string_list_fields(cls, value: Any) -> List[str]:
+        """规范化字符串列表字段。
+
+        Args:
+            value: 原始配置值。
+
+        Returns:
+            List[str]: 去除空白与重复项后的字符串列表。
+        """
+
+        return _normalize_string_list(value)
+
+    @field_validator("ws_mode", mode="before")
+    @classmethod
+    def _normalize_ws_mode(cls, value: Any) -> Literal["forward", "reverse"]:
+        """规范化连接方向字段。
+
+        Args:
+            value: 原始配置值。
+
+        Returns:
+            Literal["forward", "reverse"]: 合法的连接方向；非法时回退到 ``forward``。
+        """
+
+        return "reverse" if _normalize_string(value).lower() == "reverse" else "forward"
+
+    @field_validator("http_action_max_connections", mode="before")
+    @classmethod
+    def _normalize_http_action_max_connections(cls, value: Any) -> int:
+        """规范化 HTTP 连接池大小。
+
+        Args:
+            value: 原始配置值。
+
+        Returns:
+            int: 合法的正整数；非法时回退到默认值。
+        """
+
+        return _normalize_positive_int(value, DEFAULT_HTTP_ACTION_MAX_CONNECTIONS)
+
     @field_validator(
         "heartbeat_interval",
         "reconnect_delay_sec",
+        "reconnect_max_delay_sec",
+        "reconnect_stable_after_sec",
         "action_timeout_sec",
+        "primary_probe_interval_sec",
         mode="before",
     )
     @classmethod
@@ -349,7 +614,10 @@ class NapCatServerConfig(PluginConfigBase):
         default_values: Dict[str, float] = {
             "action_timeout_sec": DEFAULT_ACTION_TIMEOUT_SEC,
             "heartbeat_interval": DEFAULT_HEARTBEAT_INTERVAL_SEC,
+            "primary_probe_interval_sec": DEFAULT_PRIMARY_PROBE_INTERVAL_SEC,
             "reconnect_delay_sec": DEFAULT_RECONNECT_DELAY_SEC,
+            "reconnect_max_delay_sec": DEFAULT_RECONNECT_MAX_DELAY_SEC,
+            "reconnect_stable_after_sec": DEFAULT_RECONNECT_STABLE_AFTER_SEC,
         }
         return _normalize_positive_float(value, default_values[str(info.field_name)])
 
@@ -700,34 +968,1038 @@ class NapCatNoticeConfig(PluginConfigBase):
     )
 
 
-class NapCatPluginSettings(PluginConfigBase):
-    """NapCat 插件完整配置。"""
+class NapCatInboundConfig(PluginConfigBase):
+    """入站事件调度配置。"""
 
-    plugin: NapCatPluginOptions = Field(default_factory=NapCatPluginOptions)
-    napcat_server: NapCatServerConfig = Field(default_factory=NapCatServerConfig)
-    chat: NapCatChatConfig = Field(default_factory=NapCatChatConfig)
-    notice: NapCatNoticeConfig = Field(default_factory=NapCatNoticeConfig)
-    filters: NapCatFilterConfig = Field(default_factory=NapCatFilterConfig)
+    __ui_label__: ClassVar[str] = "入站调度"
+    __ui_order__: ClassVar[int] = 5
 
-    @model_validator(mode="before")
+    queue_max_size: int = Field(
+        default=DEFAULT_INBOUND_QUEUE_MAX_SIZE,
+        description="入站事件队列的最大长度。",
+        json_schema_extra={
+            "hint": (
+                "所有分片通道合计的容量；写满后新到达的事件会被丢弃并计入运行指标，"
+                "WebSocket 仍持续读取，保证动作响应不会因事件积压而超时。其中 10% 只留给私聊消息与 @ 机器人的消息，"
+                "单条通道最多占用四分之一，单个会话最多占用单条通道的一半。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Inbound queue size",
+                label_ja="受信キューの長さ",
+                hint_en=(
+                    "Total capacity across all lanes. When it is full, newly arriving events are dropped and counted "
+                    "in the runtime stats. The WebSocket keeps being read so action responses never time out behind "
+                    "queued events. 10% is reserved for private messages and messages that mention the bot; one lane "
+                    "can use at most a quarter, and one conversation at most half of a lane."
+                ),
+                hint_ja=(
+                    "全レーン合計の容量です。満杯になると新しく届いたイベントは破棄され、実行時メトリクスに計上されます。"
+                    "WebSocket の読み取りは続けるため、キューに溜まったイベントのせいでアクションの応答がタイムアウトすることはありません。"
+                    "10% はプライベートメッセージとボットへのメンションにのみ使われ、1 レーンは最大 4 分の 1、"
+                    "1 会話はレーン上限の半分までしか使えません。"
+                ),
+            ),
+            "label": "入站队列长度",
+            "order": 0,
+            "step": 100,
+        },
+    )
+    worker_count: int = Field(
+        default=DEFAULT_INBOUND_WORKER_COUNT,
+        description="入站事件分片通道数量，每条通道由一个工作协程顺序处理。",
+        json_schema_extra={
+            "hint": (
+                "同一群聊或私聊的事件总是进入同一条通道并按到达顺序处理，不同会话在各通道间并行；"
+                "该值同时决定最多有多少条事件在并发做资料补全、媒体下载与注入 Host。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Inbound lanes",
+                label_ja="受信レーン数",
+                hint_en=(
+                    "Events from the same group or private chat always use the same lane and keep their order; "
+                    "different conversations run in parallel across lanes. This also caps concurrent enrichment, "
+                    "media downloads and Host routing."
+                ),
+                hint_ja=(
+                    "同じグループまたは個人チャットのイベントは常に同じレーンに入り、到着順に処理されます。"
+                    "異なる会話はレーン間で並列に処理され、同時に処理されるイベント数の上限にもなります。"
+                ),
+            ),
+            "label": "入站分片通道数",
+            "order": 1,
+            "step": 1,
+        },
+    )
+    queue_high_water_ratio: float = Field(
+        default=DEFAULT_INBOUND_HIGH_WATER_RATIO,
+        description="入站队列高水位比例，取值范围 (0, 1]。",
+        json_schema_extra={
+            "hint": "队列深度达到“队列长度 × 该比例”时记录一次高水位告警。",
+            "i18n": _schema_i18n(
+                label_en="High-water ratio",
+                label_ja="高水位の割合",
+                hint_en="A high-water warning is logged once queue depth reaches queue size × this ratio.",
+                hint_ja="キューの深さが「キュー長 × この割合」に達すると高水位警告を記録します。",
+            ),
+            "label": "高水位比例",
+            "order": 2,
+            "step": 0.05,
+        },
+    )
+    history_backfill_enabled: bool = Field(
+        default=False,
+        description="重连后是否通过历史消息接口补收断线期间的消息。",
+        json_schema_extra={
+            "hint": (
+                "开启后，适配器会记录每个群聊与私聊最后收到的消息；重连并完成账号初始化后，"
+                "对这些会话调用 get_group_msg_history / get_friend_msg_history 补收断线期间的消息，"
+                "补收的消息与实时消息走相同的过滤与注入流程，并按消息 ID 去重。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Backfill missed messages",
+                label_ja="取りこぼしメッセージの補完",
+                hint_en=(
+                    "When enabled, the adapter remembers the last message seen in each group and private chat. After "
+                    "a reconnect it fetches the gap with get_group_msg_history / get_friend_msg_history and feeds the "
+                    "messages through the normal filters and routing, deduplicated by message ID."
+                ),
+                hint_ja=(
+                    "有効にすると、各グループと個人チャットで最後に受信したメッセージを記録し、再接続後に "
+                    "get_group_msg_history / get_friend_msg_history で切断中のメッセージを取得して、"
+                    "通常と同じフィルターとルーティングで処理します（メッセージ ID で重複排除）。"
+                ),
+            ),
+            "label": "重连后补收消息",
+            "order": 3,
+        },
+    )
+    history_backfill_concurrency: int = Field(
+        default=DEFAULT_HISTORY_BACKFILL_CONCURRENCY,
+        description="补收历史消息时同时查询的会话数。",
+        json_schema_extra={
+            "hint": "数值越大补收越快，但重连瞬间对 NapCat 的查询压力也越大。",
+            "i18n": _schema_i18n(
+                label_en="Backfill concurrency",
+                label_ja="補完の同時実行数",
+                hint_en="Higher values finish sooner but put more query load on NapCat right after reconnecting.",
+                hint_ja="値を大きくすると早く終わりますが、再接続直後の NapCat への負荷が増えます。",
+            ),
+            "label": "补收并发数",
+            "order": 4,
+            "step": 1,
+        },
+    )
+    history_backfill_page_budget: int = Field(
+        default=DEFAULT_HISTORY_BACKFILL_PAGE_BUDGET,
+        description="每次重连补收最多请求的历史消息页数（所有会话合计）。",
+        json_schema_extra={
+            "hint": "最近活跃的会话优先补收；预算用尽后其余会话不再补收。",
+            "i18n": _schema_i18n(
+                label_en="Backfill page budget",
+                label_ja="補完ページ予算",
+                hint_en="Most recently active chats are backfilled first; the rest are skipped once the budget is spent.",
+                hint_ja="最近アクティブな会話から順に補完し、予算を使い切ると残りはスキップします。",
+            ),
+            "label": "补收页数预算",
+            "order": 5,
+            "step": 10,
+        },
+    )
+    history_backfill_page_size: int = Field(
+        default=DEFAULT_HISTORY_BACKFILL_PAGE_SIZE,
+        description="每页请求的历史消息条数。",
+        json_schema_extra={
+            "i18n": _schema_i18n(label_en="Backfill page size", label_ja="補完ページサイズ"),
+            "label": "补收每页条数",
+            "order": 6,
+            "step": 5,
+        },
+    )
+    history_backfill_max_gap_sec: float = Field(
+        default=DEFAULT_HISTORY_BACKFILL_MAX_GAP_SEC,
+        description="只补收该时长以内的消息，单位为秒。",
+        json_schema_extra={
+            "hint": "断线时间较长时，更早的消息不再补收，避免机器人回复早已过时的对话。",
+            "i18n": _schema_i18n(
+                label_en="Backfill window (sec)",
+                label_ja="補完対象期間（秒）",
+                hint_en="Older messages are not backfilled after a long outage, so the bot does not answer stale talk.",
+                hint_ja="長時間の切断後でも、これより古いメッセージは補完せず、古い会話への返信を防ぎます。",
+            ),
+            "label": "补收时间窗口（秒）",
+            "order": 7,
+            "step": 60,
+        },
+    )
+    overload_shedding_enabled: bool = Field(
+        default=True,
+        description="入站持续过载时是否按层级丢弃低价值事件。",
+        json_schema_extra={
+            "hint": (
+                "依据入站队列深度与事件延迟（当前时间减去事件的 time 字段）判断过载程度：第一级丢弃表情回应、"
+                "戳一戳等低价值通知；第二级再丢弃最繁忙几个群里未 @ 机器人的消息。私聊与 @ 机器人的消息始终保留。"
+                "事件延迟会扣除最近 10 分钟内估计出的本机与 NapCat 之间的时钟偏差，两端时钟不同步也不会误判。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Shed load under overload",
+                label_ja="過負荷時の負荷制限",
+                hint_en=(
+                    "Overload is judged from inbound queue depth and event lag (now minus the event time field). "
+                    "Tier 1 drops low-value notices such as emoji reactions and pokes; tier 2 also drops messages "
+                    "that do not mention the bot in the busiest groups. Private messages and messages that @ the bot "
+                    "are always kept. Event lag subtracts the clock offset between this host and NapCat estimated "
+                    "over the last 10 minutes, so unsynchronised clocks do not cause false overload."
+                ),
+                hint_ja=(
+                    "受信キューの深さとイベント遅延（現在時刻からイベントの time を引いた値）で過負荷を判定します。"
+                    "第 1 段階ではリアクションやつつくなどの低価値な通知を破棄し、第 2 段階では最も活発なグループで"
+                    "ボットをメンションしていないメッセージも破棄します。個人チャットとボットへのメンションは常に保持します。"
+                    "イベント遅延は直近 10 分間で推定したこのホストと NapCat の時計のずれを差し引くため、"
+                    "時計が同期していなくても誤判定しません。"
+                ),
+            ),
+            "label": "过载时分级丢弃",
+            "order": 8,
+        },
+    )
+    overload_notice_queue_ratio: float = Field(
+        default=DEFAULT_OVERLOAD_NOTICE_QUEUE_RATIO,
+        description="进入第一级过载的队列占用比例，取值范围 (0, 1]。",
+        json_schema_extra={
+            "hint": (
+                "最繁忙通道达到“单通道上限（队列长度的四分之一）× 该比例”、合计深度达到“队列长度 × 该比例”"
+                "或事件延迟超过第一级阈值时，开始丢弃低价值通知。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Tier 1 queue ratio",
+                label_ja="第 1 段階のキュー割合",
+                hint_en=(
+                    "Low-value notices are dropped once the busiest lane reaches the per-lane cap (a quarter of "
+                    "the queue size) × this ratio, total depth reaches queue size × this ratio, or lag exceeds the "
+                    "tier 1 threshold."
+                ),
+                hint_ja=(
+                    "最も混雑したレーンが「レーン上限（キュー長の 4 分の 1）× この割合」、合計の深さが「キュー長 × この割合」に"
+                    "達するか、遅延が第 1 段階の閾値を超えると、低価値な通知を破棄します。"
+                ),
+            ),
+            "label": "第一级队列比例",
+            "order": 9,
+            "step": 0.05,
+        },
+    )
+    overload_notice_lag_sec: float = Field(
+        default=DEFAULT_OVERLOAD_NOTICE_LAG_SEC,
+        description="进入第一级过载的事件延迟阈值，单位为秒。",
+        json_schema_extra={
+            "i18n": _schema_i18n(label_en="Tier 1 lag (sec)", label_ja="第 1 段階の遅延（秒）"),
+            "label": "第一级延迟阈值（秒）",
+            "order": 10,
+            "step": 5,
+        },
+    )
+    overload_group_queue_ratio: float = Field(
+        default=DEFAULT_OVERLOAD_GROUP_QUEUE_RATIO,
+        description="进入第二级过载的队列占用比例，取值范围 (0, 1]。",
+        json_schema_extra={
+            "hint": (
+                "最繁忙通道达到“单通道上限（队列长度的四分之一）× 该比例”、合计深度达到“队列长度 × 该比例”"
+                "或事件延迟超过第二级阈值时，开始丢弃繁忙群里未 @ 机器人的消息。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Tier 2 queue ratio",
+                label_ja="第 2 段階のキュー割合",
+                hint_en=(
+                    "Messages that do not mention the bot in the busiest groups are dropped once the busiest lane "
+                    "reaches the per-lane cap (a quarter of the queue size) × this ratio, total depth reaches "
+                    "queue size × this ratio, or lag exceeds the tier 2 threshold."
+                ),
+                hint_ja=(
+                    "最も混雑したレーンが「レーン上限（キュー長の 4 分の 1）× この割合」、合計の深さが「キュー長 × この割合」に"
+                    "達するか、遅延が第 2 段階の閾値を超えると、活発なグループでボットをメンションしていないメッセージを破棄します。"
+                ),
+            ),
+            "label": "第二级队列比例",
+            "order": 11,
+            "step": 0.05,
+        },
+    )
+    overload_group_lag_sec: float = Field(
+        default=DEFAULT_OVERLOAD_GROUP_LAG_SEC,
+        description="进入第二级过载的事件延迟阈值，单位为秒。",
+        json_schema_extra={
+            "i18n": _schema_i18n(label_en="Tier 2 lag (sec)", label_ja="第 2 段階の遅延（秒）"),
+            "label": "第二级延迟阈值（秒）",
+            "order": 12,
+            "step": 5,
+        },
+    )
+    overload_busiest_group_count: int = Field(
+        default=DEFAULT_OVERLOAD_BUSIEST_GROUP_COUNT,
+        description="第二级过载时参与丢弃的最繁忙群数量。",
+        json_schema_extra={
+            "hint": "按最近一段时间的消息数排序，只有排名靠前的这些群会被丢弃未 @ 机器人的消息。",
+            "i18n": _schema_i18n(
+                label_en="Busiest groups to shed",
+                label_ja="制限対象の活発なグループ数",
+                hint_en="Only the groups with the most recent messages have their non-mentioning messages dropped.",
+                hint_ja="直近のメッセージ数が多い上位のグループだけが、メンションなしのメッセージを破棄されます。",
+            ),
+            "label": "丢弃的繁忙群数量",
+            "order": 13,
+            "step": 1,
+        },
+    )
+    media_degradation_enabled: bool = Field(
+        default=True,
+        description="入站负载过高时是否暂停下载图片与语音。",
+        json_schema_extra={
+            "hint": (
+                "事件延迟或最近一分钟的媒体下载量超过阈值时，图片、表情与语音不再下载和 Base64 编码，"
+                "改为 [image]、[emoji]、[voice] 占位文本，原始地址与文件信息写入消息的 additional_config"
+                "（napcat_degraded_media）；负载回落后自动恢复下载，优先保证文字消息的吞吐。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Degrade media under load",
+                label_ja="高負荷時のメディア簡略化",
+                hint_en=(
+                    "When event lag or media downloaded in the last minute crosses its threshold, images, stickers "
+                    "and voice are no longer downloaded and base64-encoded; they become [image], [emoji] and [voice] "
+                    "placeholders with the original URL and file info in additional_config (napcat_degraded_media). "
+                    "Downloads resume automatically once load drops, keeping text throughput first."
+                ),
+                hint_ja=(
+                    "イベント遅延または直近 1 分間のメディアダウンロード量が閾値を超えると、画像・スタンプ・音声を"
+                    "ダウンロードせず [image]、[emoji]、[voice] のプレースホルダーに置き換え、元の URL とファイル情報を "
+                    "additional_config（napcat_degraded_media）に記録します。負荷が下がると自動的に元に戻ります。"
+                ),
+            ),
+            "label": "高负载时媒体降级",
+            "order": 14,
+        },
+    )
+    media_degradation_lag_sec: float = Field(
+        default=DEFAULT_MEDIA_DEGRADATION_LAG_SEC,
+        description="触发媒体降级的事件延迟阈值，单位为秒。",
+        json_schema_extra={
+            "hint": (
+                "事件延迟为处理消息时的当前时间减去消息的 time 字段，扣除估计的时钟偏差后按滑动平均计算；"
+                "补收的历史消息不计入。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Media degradation lag (sec)",
+                label_ja="メディア簡略化の遅延閾値（秒）",
+                hint_en=(
+                    "Lag is now minus the message time field when it is processed, less the estimated clock offset, "
+                    "smoothed; backfilled history is ignored."
+                ),
+                hint_ja=(
+                    "遅延は処理時の現在時刻からメッセージの time を引き、推定した時計のずれを差し引いた値の移動平均で、"
+                    "補完した履歴は含みません。"
+                ),
+            ),
+            "label": "媒体降级延迟阈值（秒）",
+            "order": 15,
+            "step": 5,
+        },
+    )
+    media_degradation_budget_mb_per_min: float = Field(
+        default=DEFAULT_MEDIA_DEGRADATION_BUDGET_MB_PER_MIN,
+        description="每分钟允许下载的入站媒体总量，单位为 MB。",
+        json_schema_extra={
+            "hint": "最近一分钟内下载的图片与语音总量超过该值时进入媒体降级。",
+            "i18n": _schema_i18n(
+                label_en="Media budget (MB/min)",
+                label_ja="メディア予算（MB/分）",
+                hint_en="Media degradation starts once images and voice downloaded in the last minute exceed this amount.",
+                hint_ja="直近 1 分間にダウンロードした画像と音声の合計がこの値を超えると簡略化を開始します。",
+            ),
+            "label": "每分钟媒体预算（MB）",
+            "order": 16,
+            "step": 10,
+        },
+    )
+
+    @field_validator(
+        "queue_max_size",
+        "worker_count",
+        "history_backfill_concurrency",
+        "history_backfill_page_budget",
+        "history_backfill_page_size",
+        "overload_busiest_group_count",
+        mode="before",
+    )
     @classmethod
-    def _upgrade_legacy_config(cls, raw_config: Any) -> Dict[str, Any]:
-        """将旧版配置结构迁移为当前配置模型。
+    def _normalize_positive_int_fields(cls, value: Any, info: ValidationInfo) -> int:
+        """规范化正整数字段。
 
         Args:
-            raw_config: Runner 注入的原始配置内容。
+            value: 原始配置值。
+            info: Pydantic 字段校验上下文。
 
         Returns:
-            Dict[str, Any]: 适配到当前配置模型后的字典结构。
+            int: 合法的正整数；非法时回退到对应默认值。
         """
 
-        raw_mapping = _as_mapping(raw_config)
-        plugin_section = _as_mapping(raw_mapping.get("plugin"))
-        server_section = _as_mapping(raw_mapping.get("napcat_server"))
-        legacy_connection_section = _as_mapping(raw_mapping.get("connection"))
-        chat_section = _as_mapping(raw_mapping.get("chat"))
+        default_values: Dict[str, int] = {
+            "history_backfill_concurrency": DEFAULT_HISTORY_BACKFILL_CONCURRENCY,
+            "history_backfill_page_budget": DEFAULT_HISTORY_BACKFILL_PAGE_BUDGET,
+            "history_backfill_page_size": DEFAULT_HISTORY_BACKFILL_PAGE_SIZE,
+            "overload_busiest_group_count": DEFAULT_OVERLOAD_BUSIEST_GROUP_COUNT,
+            "queue_max_size": DEFAULT_INBOUND_QUEUE_MAX_SIZE,
+            "worker_count": DEFAULT_INBOUND_WORKER_COUNT,
+        }
+        return _normalize_positive_int(value, default_values[str(info.field_name)])
+
+    @field_validator(
+        "history_backfill_max_gap_sec",
+        "overload_notice_lag_sec",
+        "overload_group_lag_sec",
+        "media_degradation_lag_sec",
+        "media_degradation_budget_mb_per_min",
+        mode="before",
+    )
+    @classmethod
+    def _normalize_positive_float_fields(cls, value: Any, info: ValidationInfo) -> float:
+        """规范化正浮点数字段。
+
+        Args:
+            value: 原始配置值。
+            info: Pydantic 字段校验上下文。
+
+        Returns:
+            float: 合法的正浮点数；非法时回退到对应默认值。
+        """
+
+        default_values: Dict[str, float] = {
+            "history_backfill_max_gap_sec": DEFAULT_HISTORY_BACKFILL_MAX_GAP_SEC,
+            "media_degradation_budget_mb_per_min": DEFAULT_MEDIA_DEGRADATION_BUDGET_MB_PER_MIN,
+            "media_degradation_lag_sec": DEFAULT_MEDIA_DEGRADATION_LAG_SEC,
+            "overload_group_lag_sec": DEFAULT_OVERLOAD_GROUP_LAG_SEC,
+            "overload_notice_lag_sec": DEFAULT_OVERLOAD_NOTICE_LAG_SEC,
+        }
+        return _normalize_positive_float(value, default_values[str(info.field_name)])
+
+    @field_validator(
+        "queue_high_water_ratio",
+        "overload_notice_queue_ratio",
+        "overload_group_queue_ratio",
+        mode="before",
+    )
+    @classmethod
+    def _normalize_ratio_fields(cls, value: Any, info: ValidationInfo) -> float:
+        """规范化比例字段。
+
+        Args:
+            value: 原始配置值。
+            info: Pydantic 字段校验上下文。
+
+        Returns:
+            float: 位于 (0, 1] 区间内的比例；非法时回退到对应默认值。
+        """
+
+        default_values: Dict[str, float] = {
+            "overload_group_queue_ratio": DEFAULT_OVERLOAD_GROUP_QUEUE_RATIO,
+            "overload_notice_queue_ratio": DEFAULT_OVERLOAD_NOTICE_QUEUE_RATIO,
+            "queue_high_water_ratio": DEFAULT_INBOUND_HIGH_WATER_RATIO,
+        }
+        return _normalize_ratio(value, default_values[str(info.field_name)])
+
+    def resolve_high_water_mark(self) -> int:
+        """计算入站队列的高水位深度。
+
+        Returns:
+            int: 触发高水位告警的队列深度，至少为 1。
+        """
+
+        return max(1, int(self.queue_max_size * self.queue_high_water_ratio))
+
+
+class NapCatOutboundConfig(PluginConfigBase):
+    """出站投递配置。"""
+
+    __ui_label__: ClassVar[str] = "出站投递"
+    __ui_order__: ClassVar[int] = 6
+
+    offline_buffer_enabled: bool = Field(
+        default=False,
+        description="是否在连接不可用时暂存出站消息。",
+        json_schema_extra={
+            "hint": (
+                "开启后，NapCat 断线或心跳超时期间 Host 发出的消息会先放入缓冲区并向 Host 报告已受理，"
+                "连接恢复且账号信息初始化完成后按原顺序补发。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Offline outbound buffer",
+                label_ja="オフライン送信バッファ",
+                hint_en=(
+                    "When enabled, messages sent by the Host while NapCat is disconnected or its heartbeat has timed "
+                    "out are buffered and reported as accepted, then resent in order once the connection is back and "
+                    "account bootstrap has finished."
+                ),
+                hint_ja=(
+                    "有効にすると、NapCat の切断中やハートビートのタイムアウト中に Host が送信したメッセージを"
+                    "バッファに保持して受理済みと報告し、接続が復旧してアカウント初期化が完了した後に順番どおり再送します。"
+                ),
+            ),
+            "label": "启用离线出站缓冲",
+            "order": 0,
+        },
+    )
+    offline_buffer_max_size: int = Field(
+        default=DEFAULT_OFFLINE_OUTBOX_MAX_SIZE,
+        description="每条连接在内存中暂存的出站消息上限。",
+        json_schema_extra={
+            "hint": "缓冲区写满且未开启磁盘溢出时，新的出站消息会直接向 Host 返回发送失败。",
+            "i18n": _schema_i18n(
+                label_en="Buffer size",
+                label_ja="バッファサイズ",
+                hint_en="When the buffer is full and disk spill is off, new outbound messages fail immediately.",
+                hint_ja="バッファが満杯でディスク退避が無効な場合、新しい送信メッセージは即座に失敗として返されます。",
+            ),
+            "label": "内存缓冲上限",
+            "order": 1,
+            "step": 50,
+        },
+    )
+    offline_buffer_ttl_sec: float = Field(
+        default=DEFAULT_OFFLINE_OUTBOX_TTL_SEC,
+        description="暂存消息的有效期，单位为秒。",
+        json_schema_extra={
+            "hint": "超过有效期仍未补发的消息会被丢弃，避免连接恢复后发出早已过时的回复。",
+            "i18n": _schema_i18n(
+                label_en="Message TTL (sec)",
+                label_ja="メッセージ有効期限（秒）",
+                hint_en="Messages still unsent after this long are dropped so stale replies are not sent after recovery.",
+                hint_ja="この時間を過ぎても再送されていないメッセージは破棄され、復旧後に古い返信が送られるのを防ぎます。",
+            ),
+            "label": "消息有效期（秒）",
+            "order": 2,
+            "step": 30,
+        },
+    )
+    offline_buffer_spill_enabled: bool = Field(
+        default=False,
+        description="内存缓冲写满后是否溢出到磁盘。",
+        json_schema_extra={
+            "hint": (
+                "开启后，超出内存上限的消息会追加写入 data/napcat_adapter 下的 JSONL 文件；"
+                "插件卸载时尚未补发的消息也会写入该文件，下次启动后继续补发。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Spill to disk",
+                label_ja="ディスクへ退避",
+                hint_en=(
+                    "Messages beyond the in-memory limit are appended to a JSONL file under data/napcat_adapter; "
+                    "unsent messages are also written there on unload and resent after the next start."
+                ),
+                hint_ja=(
+                    "メモリ上限を超えたメッセージは data/napcat_adapter 配下の JSONL ファイルに追記され、"
+                    "アンロード時に未送信のメッセージもそこへ書き込まれ、次回起動後に再送されます。"
+                ),
+            ),
+            "label": "溢出到磁盘",
+            "order": 3,
+        },
+    )
+    offline_buffer_spill_max_size: int = Field(
+        default=DEFAULT_OFFLINE_OUTBOX_SPILL_MAX_SIZE,
+        description="每条连接溢出到磁盘的出站消息上限。",
+        json_schema_extra={
+            "hint": "仅在开启磁盘溢出时生效。",
+            "i18n": _schema_i18n(
+                label_en="Spill size",
+                label_ja="ディスク退避の上限",
+                hint_en="Only used when spilling to disk is enabled.",
+                hint_ja="ディスクへの退避が有効な場合のみ使用されます。",
+            ),
+            "label": "磁盘溢出上限",
+            "order": 4,
+            "step": 500,
+        },
+    )
+
+    @field_validator("offline_buffer_max_size", "offline_buffer_spill_max_size", mode="before")
+    @classmethod
+    def _normalize_positive_int_fields(cls, value: Any, info: ValidationInfo) -> int:
+        """规范化正整数字段。
+
+        Args:
+            value: 原始配置值。
+            info: Pydantic 字段校验上下文。
+
+        Returns:
+            int: 合法的正整数；非法时回退到对应默认值。
+        """
+
+        default_values: Dict[str, int] = {
+            "offline_buffer_max_size": DEFAULT_OFFLINE_OUTBOX_MAX_SIZE,
+            "offline_buffer_spill_max_size": DEFAULT_OFFLINE_OUTBOX_SPILL_MAX_SIZE,
+        }
+        return _normalize_positive_int(value, default_values[str(info.field_name)])
+
+    @field_validator("offline_buffer_ttl_sec", mode="before")
+    @classmethod
+    def _normalize_ttl(cls, value: Any) -> float:
+        """规范化暂存消息有效期。
+
+        Args:
+            value: 原始配置值。
+
+        Returns:
+            float: 合法的正浮点数；非法时回退到默认值。
+        """
+
+        return _normalize_positive_float(value, DEFAULT_OFFLINE_OUTBOX_TTL_SEC)
+
+
+class NapCatCaptureConfig(PluginConfigBase):
+    """帧录制配置。"""
+
+    __ui_label__: ClassVar[str] = "帧录制"
+    __ui_order__: ClassVar[int] = 7
+
+    enabled: bool = Field(
+        default=False,
+        description="是否录制原始入站帧与动作响应。",
+        json_schema_extra={
+            "hint": (
+                "开启后，每条连接收到的原始帧与发出的动作请求会带上时间戳写入 data/napcat_adapter/capture 下的"
+                " gzip 压缩 JSONL 文件，可用 benchmarks/replay_capture.py 离线回放，用于复现问题与性能测试。"
+                "录制内容包含完整聊天记录，仅应在排查问题时临时开启。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Record frames",
+                label_ja="フレームを記録",
+                hint_en=(
+                    "When enabled, raw inbound frames and outgoing action requests of every connection are written "
+                    "with timestamps to gzip-compressed JSONL files under data/napcat_adapter/capture, which "
+                    "benchmarks/replay_capture.py can replay offline for debugging and benchmarking. Captures "
+                    "contain full chat history, so only enable this temporarily while investigating an issue."
+                ),
+                hint_ja=(
+                    "有効にすると、各接続で受信した生フレームと送信したアクション要求がタイムスタンプ付きで "
+                    "data/napcat_adapter/capture 配下の gzip 圧縮 JSONL ファイルに書き込まれ、"
+                    "benchmarks/replay_capture.py でオフライン再生できます。記録にはチャット履歴がすべて含まれるため、"
+                    "問題調査の間だけ一時的に有効にしてください。"
+                ),
+            ),
+            "label": "启用帧录制",
+            "order": 0,
+        },
+    )
+    max_file_mb: float = Field(
+        default=DEFAULT_CAPTURE_MAX_FILE_MB,
+        description="单个录制文件的大小上限，单位为 MB。",
+        json_schema_extra={
+            "hint": "按压缩后的大小计算，超过上限后轮转到新文件。",
+            "i18n": _schema_i18n(
+                label_en="File size limit (MB)",
+                label_ja="ファイルサイズ上限（MB）",
+                hint_en="Measured after compression; a new file is started once the limit is exceeded.",
+                hint_ja="圧縮後のサイズで計算し、上限を超えると新しいファイルに切り替えます。",
+            ),
+            "label": "单文件上限（MB）",
+            "order": 1,
+            "step": 4,
+        },
+    )
+    max_files: int = Field(
+        default=DEFAULT_CAPTURE_MAX_FILES,
+        description="每条连接保留的录制文件数量上限。",
+        json_schema_extra={
+            "hint": "轮转后超出数量的最旧录制文件会被删除。",
+            "i18n": _schema_i18n(
+                label_en="Files to keep",
+                label_ja="保持するファイル数",
+                hint_en="The oldest capture files beyond this count are deleted after rotation.",
+                hint_ja="ローテーション後、この数を超えた最も古い記録ファイルは削除されます。",
+            ),
+            "label": "保留文件数",
+            "order": 2,
+            "step": 1,
+        },
+    )
+
+    @field_validator("max_file_mb", mode="before")
+    @classmethod
+    def _normalize_max_file_mb(cls, value: Any) -> float:
+        """规范化单个录制文件的大小上限。
+
+        Args:
+            value: 原始配置值。
+
+        Returns:
+            float: 合法的正浮点数；非法时回退到默认值。
+        """
+
+        return _normalize_positive_float(value, DEFAULT_CAPTURE_MAX_FILE_MB)
+
+    @field_validator("max_files", mode="before")
+    @classmethod
+    def _normalize_max_files(cls, value: Any) -> int:
+        """规范化录制文件保留数量。
+
+        Args:
+            value: 原始配置值。
+
+        Returns:
+            int: 合法的正整数；非法时回退到默认值。
+        """
+
+        return _normalize_positive_int(value, DEFAULT_CAPTURE_MAX_FILES)
+
+
+class NapCatCacheConfig(PluginConfigBase):
+    """资料缓存配置。"""
+
+    __ui_label__: ClassVar[str] = "资料缓存"
+    __ui_order__: ClassVar[int] = 8
+
+    enabled: bool = Field(
+        default=True,
+        description="是否缓存群成员、陌生人与群资料。",
+        json_schema_extra={
+            "hint": (
+                "开启后，解析 @ 目标、通知操作者与群名称时优先读取内存缓存，不再每次都向 NapCat 查询；"
+                "入群、退群、管理员变更、群名片与群名称变更通知会立即使对应条目失效。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Cache profiles",
+                label_ja="プロフィールをキャッシュ",
+                hint_en=(
+                    "When enabled, @ targets, notice actors and group names are resolved from an in-memory cache "
+                    "instead of querying NapCat every time. Join, leave, admin, card and group name notices "
+                    "invalidate the affected entries immediately."
+                ),
+                hint_ja=(
+                    "有効にすると、@ 対象・通知の操作者・グループ名はメモリキャッシュから解決され、"
+                    "毎回 NapCat に問い合わせることはなくなります。参加・退出・管理者変更・グループ名刺・"
+                    "グループ名変更の通知で該当エントリは即座に無効化されます。"
+                ),
+            ),
+            "label": "启用资料缓存",
+            "order": 0,
+        },
+    )
+    member_ttl_sec: float = Field(
+        default=DEFAULT_PROFILE_CACHE_MEMBER_TTL_SEC,
+        description="群成员资料的缓存有效期，单位为秒。",
+        json_schema_extra={
+            "hint": "群名片等成员资料的变更并不总有通知，过期后会重新查询。",
+            "i18n": _schema_i18n(
+                label_en="Member TTL (seconds)",
+                label_ja="メンバー情報の有効期間（秒）",
+                hint_en="Not every member profile change produces a notice, so entries are re-queried once expired.",
+                hint_ja="メンバー情報の変更は必ずしも通知されないため、期限切れ後に再取得します。",
+            ),
+            "label": "成员资料有效期（秒）",
+            "order": 1,
+            "step": 60,
+        },
+    )
+    profile_ttl_sec: float = Field(
+        default=DEFAULT_PROFILE_CACHE_PROFILE_TTL_SEC,
+        description="陌生人与群资料的缓存有效期，单位为秒。",
+        json_schema_extra={
+            "hint": "QQ 昵称与群资料变化较少，可以比成员资料保留更久。",
+            "i18n": _schema_i18n(
+                label_en="User and group TTL (seconds)",
+                label_ja="ユーザー・グループ情報の有効期間（秒）",
+                hint_en="Nicknames and group profiles change rarely and can be kept longer than member profiles.",
+                hint_ja="ニックネームやグループ情報はあまり変わらないため、メンバー情報より長く保持できます。",
+            ),
+            "label": "用户与群资料有效期（秒）",
+            "order": 2,
+            "step": 300,
+        },
+    )
+    max_entries: int = Field(
+        default=DEFAULT_PROFILE_CACHE_MAX_ENTRIES,
+        description="资料缓存的条目数上限。",
+        json_schema_extra={
+            "hint": "超过上限时淘汰最久未使用的条目。",
+            "i18n": _schema_i18n(
+                label_en="Max entries",
+                label_ja="最大エントリ数",
+                hint_en="The least recently used entries are evicted beyond this limit.",
+                hint_ja="上限を超えると、最も長く使われていないエントリから削除されます。",
+            ),
+            "label": "条目数上限",
+            "order": 3,
+            "step": 1000,
+        },
+    )
+    member_batch_enabled: bool = Field(
+        default=True,
+        description="是否把同一群内短时间集中出现的成员资料查询合并为一次成员列表查询。",
+        json_schema_extra={
+            "hint": (
+                "开启后，缓存未命中的成员查询会按群收集一小段时间；同一群内待查询的成员数达到阈值时，"
+                "改用一次 get_group_member_list 获取整群成员并写入缓存，适合批量 @ 或大群集中发言的场景。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Batch member lookups",
+                label_ja="メンバー照会をまとめる",
+                hint_en=(
+                    "When enabled, member lookups that miss the cache are collected per group for a short window. "
+                    "Once enough distinct members of one group are waiting, a single get_group_member_list call "
+                    "fetches the whole group and fills the cache. Useful for mass mentions and busy large groups."
+                ),
+                hint_ja=(
+                    "有効にすると、キャッシュにないメンバー照会をグループごとに短時間集めます。同じグループで"
+                    "待機中のメンバー数がしきい値に達すると、get_group_member_list を 1 回だけ呼び出して"
+                    "グループ全体を取得し、キャッシュに書き込みます。一斉メンションや大規模グループで有効です。"
+                ),
+            ),
+            "label": "合并成员查询",
+            "order": 4,
+        },
+    )
+    member_batch_window_ms: float = Field(
+        default=DEFAULT_MEMBER_BATCH_WINDOW_MS,
+        description="收集同一群成员查询的时间窗口，单位为毫秒。",
+        json_schema_extra={
+            "hint": "每次缓存未命中的成员查询最多因此多等待该时长。",
+            "i18n": _schema_i18n(
+                label_en="Batch window (ms)",
+                label_ja="収集ウィンドウ（ミリ秒）",
+                hint_en="Each member lookup that misses the cache waits at most this long.",
+                hint_ja="キャッシュにないメンバー照会は、最大でこの時間だけ待機します。",
+            ),
+            "label": "收集窗口（毫秒）",
+            "order": 5,
+            "step": 1,
+        },
+    )
+    member_batch_threshold: int = Field(
+        default=DEFAULT_MEMBER_BATCH_THRESHOLD,
+        description="改用成员列表查询所需的同群待查询成员数。",
+        json_schema_extra={
+            "hint": "窗口结束时待查询的不同成员数低于该值，仍逐个查询成员资料。",
+            "i18n": _schema_i18n(
+                label_en="List fetch threshold",
+                label_ja="一覧取得のしきい値",
+                hint_en="Below this many distinct members at the end of the window, members are still looked up one by one.",
+                hint_ja="ウィンドウ終了時の待機メンバー数がこの値未満なら、従来どおり個別に照会します。",
+            ),
+            "label": "改用成员列表的阈值",
+            "order": 6,
+            "step": 1,
+        },
+    )
+    directory_refresh_interval_sec: float = Field(
+        default=DEFAULT_CONTACT_DIRECTORY_REFRESH_INTERVAL_SEC,
+        description="群与好友目录的后台全量刷新间隔，单位为秒。",
+        json_schema_extra={
+            "hint": (
+                "连接完成初始化后会立即拉取群列表与好友列表，用于填写群名称；"
+                "两次刷新之间依据入群、退群、群名称变更与新增好友通知增量更新。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Directory refresh interval (seconds)",
+                label_ja="ディレクトリ更新間隔（秒）",
+                hint_en=(
+                    "The group and friend lists are fetched right after the connection is initialized and used to "
+                    "fill in group names. Between refreshes, join, leave, group name and new friend notices keep "
+                    "the directory up to date."
+                ),
+                hint_ja=(
+                    "接続の初期化直後にグループ一覧と友だち一覧を取得し、グループ名の補完に使います。"
+                    "更新の合間は参加・退出・グループ名変更・友だち追加の通知で差分更新します。"
+                ),
+            ),
+            "label": "目录刷新间隔（秒）",
+            "order": 7,
+            "step": 300,
+        },
+    )
+    roster_enabled: bool = Field(
+        default=True,
+        description="是否为成员数较多的群维护内存成员名册。",
+        json_schema_extra={
+            "hint": (
+                "开启后，成员数达到阈值的群会加载一次整群成员列表，之后依据入群、退群、管理员与群名片变更通知，"
+                "以及消息中观察到的群名片变化增量更新，该群的成员资料查询直接读取内存。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Large group rosters",
+                label_ja="大規模グループの名簿",
+                hint_en=(
+                    "When enabled, groups at or above the size threshold load their member list once and then keep "
+                    "it current from join, leave, admin and card change notices and from cards seen in messages. "
+                    "Member lookups in those groups are served from memory."
+                ),
+                hint_ja=(
+                    "有効にすると、メンバー数がしきい値以上のグループはメンバー一覧を一度だけ取得し、以降は参加・退出・"
+                    "管理者変更・グループ名刺変更の通知とメッセージ中の名刺の変化で差分更新します。"
+                    "これらのグループのメンバー照会はメモリから返します。"
+                ),
+            ),
+            "label": "大群成员名册",
+            "order": 8,
+        },
+    )
+    roster_min_members: int = Field(
+        default=DEFAULT_GROUP_ROSTER_MIN_MEMBERS,
+        description="为群建立成员名册所需的最少成员数。",
+        json_schema_extra={
+            "hint": "成员数取自群与好友目录；成员查询合并取得的成员列表达到该规模时也会直接建立名册。",
+            "i18n": _schema_i18n(
+                label_en="Roster size threshold",
+                label_ja="名簿を作るメンバー数",
+                hint_en=(
+                    "Group sizes come from the group and friend directory. A member list fetched by batched "
+                    "lookups that reaches this size also becomes a roster."
+                ),
+                hint_ja=(
+                    "メンバー数はグループと友だちのディレクトリから取得します。まとめ照会で取得したメンバー一覧が"
+                    "この規模に達した場合も名簿になります。"
+                ),
+            ),
+            "label": "建立名册的成员数",
+            "order": 9,
+            "step": 100,
+        },
+    )
+    roster_reconcile_interval_sec: float = Field(
+        default=DEFAULT_GROUP_ROSTER_RECONCILE_INTERVAL_SEC,
+        description="成员名册全量对账的最短间隔，单位为秒。",
+        json_schema_extra={
+            "hint": "名册被查询且距上次全量加载超过该时长时，在后台重新拉取整群成员列表，期间仍读取现有名册。",
+            "i18n": _schema_i18n(
+                label_en="Roster reconcile interval (seconds)",
+                label_ja="名簿の照合間隔（秒）",
+                hint_en=(
+                    "When a roster is read and its last full load is older than this, the member list is fetched "
+                    "again in the background while reads keep using the current roster."
+                ),
+                hint_ja=(
+                    "名簿の参照時に前回の全件取得からこの時間が経過していれば、バックグラウンドでメンバー一覧を"
+                    "再取得します。その間も現在の名簿を参照します。"
+                ),
+            ),
+            "label": "名册对账间隔（秒）",
+            "order": 10,
+            "step": 3600,
+        },
+    )
+
+    @field_validator(
+        "member_ttl_sec",
+        "profile_ttl_sec",
+        "member_batch_window_ms",
+        "directory_refresh_interval_sec",
+        "roster_reconcile_interval_sec",
+        mode="before",
+    )
+    @classmethod
+    def _normalize_positive_float_fields(cls, value: Any, info: ValidationInfo) -> float:
+        """规范化缓存有效期、合并窗口、目录刷新与名册对账间隔字段。
+
+        Args:
+            value: 原始配置值。
+            info: Pydantic 字段校验上下文。
+
+        Returns:
+            float: 合法的正浮点数；非法时回退到对应默认值。
+        """
+
+        default_values: Dict[str, float] = {
+            "member_ttl_sec": DEFAULT_PROFILE_CACHE_MEMBER_TTL_SEC,
+            "profile_ttl_sec": DEFAULT_PROFILE_CACHE_PROFILE_TTL_SEC,
+            "member_batch_window_ms": DEFAULT_MEMBER_BATCH_WINDOW_MS,
+            "directory_refresh_interval_sec": DEFAULT_CONTACT_DIRECTORY_REFRESH_INTERVAL_SEC,
+            "roster_reconcile_interval_sec": DEFAULT_GROUP_ROSTER_RECONCILE_INTERVAL_SEC,
+        }
+        return _normalize_positive_float(value, default_values[str(info.field_name)])
+
+    @field_validator("max_entries", "member_batch_threshold", "roster_min_members", mode="before")
+    @classmethod
+    def _normalize_positive_int_fields(cls, value: Any, info: ValidationInfo) -> int:
+        """规范化条目数上限、合并阈值与名册成员数阈值字段。
+
+        Args:
+            value: 原始配置值。
+            info: Pydantic 字段校验上下文。
+
+        Returns:
+            int: 合法的正整数；非法时回退到对应默认值。
+        """
+
+        default_values: Dict[str, int] = {
+            "max_entries": DEFAULT_PROFILE_CACHE_MAX_ENTRIES,
+            "member_batch_threshold": DEFAULT_MEMBER_BATCH_THRESHOLD,
+            "roster_min_members": DEFAULT_GROUP_ROSTER_MIN_MEMBERS,
+        }
+        return _normalize_positive_int(value, default_values[str(info.field_name)])
+
+
+class NapCatPluginSettings(PluginConfigBase):
+    """NapCat 插件完整配置。"""
+
+    plugin: NapCatPluginOptions = Field(default_factory=NapCatPluginOptions)
+    napcat_server: NapCatServerConfig = Field(default_factory=NapCatServerConfig)
+    chat: NapCatChatConfig = Field(default_factory=NapCatChatConfig)
+    notice: NapCatNoticeConfig = Field(default_factory=NapCatNoticeConfig)
+    filters: NapCatFilterConfig = Field(default_factory=NapCatFilterConfig)
+    inbound: NapCatInboundConfig = Field(default_factory=NapCatInboundConfig)
+    outbound: NapCatOutboundConfig = Field(default_factory=NapCatOutboundConfig)
+    capture: NapCatCaptureConfig = Field(default_factory=NapCatCaptureConfig)
+    cache: NapCatCacheConfig = Field(default_factory=NapCatCacheConfig)
+    additional_servers: List[NapCatServerConfig] = Field(
+        default_factory=list,
+        description="额外的 NapCat 连接，每项对应一个独立登录的 QQ 账号。",
+        json_schema_extra={
+            "hint": (
+                "每条连接拥有独立的 WebSocket、心跳监测与路由作用域，缓存与媒体处理在所有连接间共享；"
+                "每项都必须填写互不相同的连接标识。"
+            ),
+            "i18n": _schema_i18n(
+                label_en="Additional accounts",
+                label_ja="追加アカウント",
+                hint_en=(
+                    "Each entry gets its own WebSocket, heartbeat monitor and routing scope, while caches and media "
+                    "handling are shared. Every entry needs a unique connection ID."
+                ),
+                hint_ja=(
+                    "各接続は独自の WebSocket、ハートビート監視、ルーティングスコープを持ち、"
+                    "キャッシュとメディア処理は共有されます。各項目に重複しない接続識別子が必要です。"
+                ),
+            ),
+            "label": "额外账号连接",
+        },
+    )
+
+    @model_validator(mode="before")
+    @classmethod
+    def _upgrade_legacy_config(cls, raw_config: Any) -> Dict[str, Any]:
+        """将旧版配置结构迁移为当前配置模型。
+
+        Args:
+            raw_config: Runner 注入的原始配置内容。
+
+        Returns:
+            Dict[str, Any]: 适配到当前配置模型后的字典结构。
+        """
+
+        raw_mapping = _as_mapping(raw_config)
+        plugin_section = _as_mapping(raw_mapping.get("plugin"))
+        server_section = _as_mapping(raw_mapping.get("napcat_server"))
+        legacy_connection_section = _as_mapping(raw_mapping.get("connection"))
+        chat_section = _as_mapping(raw_mapping.get("chat"))
         filters_section = _as_mapping(raw_mapping.get("filters"))
         notice_section = _as_mapping(raw_mapping.get("notice"))
+        inbound_section = _as_mapping(raw_mapping.get("inbound"))
+        outbound_section = _as_mapping(raw_mapping.get("outbound"))
+        capture_section = _as_mapping(raw_mapping.get("capture"))
+        cache_section = _as_mapping(raw_mapping.get("cache"))
+        raw_additional_servers = raw_mapping.get("additional_servers")
+        additional_servers = (
+            [_as_mapping(item) for item in raw_additional_servers if isinstance(item, Mapping)]
+            if isinstance(raw_additional_servers, list)
+            else []
+        )
 
         if legacy_connection_section:
             LOGGER.warning("NapCat 适配器检测到旧版 [connection] 配置段，已自动迁移到 [napcat_server]")
@@ -765,10 +2037,15 @@ class NapCatPluginSettings(PluginConfigBase):
             normalized_server_section["heartbeat_interval"] = legacy_heartbeat
 
         return {
+            "additional_servers": additional_servers,
+            "cache": cache_section,
+            "capture": capture_section,
             "chat": chat_section,
             "filters": filters_section,
+            "inbound": inbound_section,
             "notice": notice_section,
             "napcat_server": normalized_server_section,
+            "outbound": outbound_section,
             "plugin": plugin_section,
         }
 
@@ -796,6 +2073,15 @@ class NapCatPluginSettings(PluginConfigBase):
 
         return self.plugin.should_connect()
 
+    def list_server_configs(self) -> List[NapCatServerConfig]:
+        """返回需要建立的全部 NapCat 连接配置。
+
+        Returns:
+            List[NapCatServerConfig]: 主连接配置在前，其后依次为额外账号连接配置。
+        """
+
+        return [self.napcat_server, *self.additional_servers]
+
     def validate_runtime_config(self, logger: Any) -> bool:
         """校验当前配置是否满足启动连接的前提条件。
 
@@ -825,6 +2111,19 @@ class NapCatPluginSettings(PluginConfigBase):
             logger.warning("NapCat 适配器已启用，但 napcat_server.port 不是正整数")
             return False
 
+        seen_connection_ids = {self.napcat_server.connection_id}
+        for index, server_config in enumerate(self.additional_servers):
+            field_name = f"additional_servers[{index}]"
+            if not server_config.connection_id:
+                logger.warning(f"NapCat 适配器已启用，但 {field_name}.connection_id 为空，额外账号连接必须填写连接标识")
+                return False
+            if server_config.connection_id in seen_connection_ids:
+                logger.warning(
+                    f"NapCat 适配器已启用，但 {field_name}.connection_id={server_config.connection_id} 与其它连接重复"
+                )
+                return False
+            seen_connection_ids.add(server_config.connection_id)
+
         return True
 
 
@@ -884,6 +2183,21 @@ def _normalize_positive_float(value: Any, default: float) -> float:
     return default
 
 
+def _normalize_ratio(value: Any, default: float) -> float:
+    """规范化 (0, 1] 区间内的比例配置值。
+
+    Args:
+        value: 原始配置值。
+        default: 非法取值时使用的默认值。
+
+    Returns:
+        float: 合法的比例值；非法时回退到默认值。
+    """
+
+    normalized_value = _normalize_positive_float(value, default)
+    return normalized_value if normalized_value <= 1.0 else default
+
+
 def _normalize_positive_int(value: Any, default: int) -> int:
     """规范化正整数配置值。
 
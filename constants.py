@@ -4,8 +4,65 @@ NAPCAT_GATEWAY_NAME = "napcat_gateway"
 SUPPORTED_CONFIG_VERSION = "0.1.0"
 DEFAULT_NAPCAT_HOST = "127.0.0.1"
 DEFAULT_NAPCAT_PORT = 3001
+DEFAULT_WS_MODE = "forward"
 DEFAULT_RECONNECT_DELAY_SEC = 5.0
+DEFAULT_RECONNECT_MAX_DELAY_SEC = 60.0
+DEFAULT_RECONNECT_STABLE_AFTER_SEC = 60.0
+DEFAULT_RECONNECT_JITTER_RATIO = 0.2
 DEFAULT_HEARTBEAT_INTERVAL_SEC = 30.0
 DEFAULT_ACTION_TIMEOUT_SEC = 15.0
+DEFAULT_PRIMARY_PROBE_INTERVAL_SEC = 30.0
+DEFAULT_HTTP_ACTION_MAX_CONNECTIONS = 8
+DEFAULT_HTTP_ACTION_RETRY_AFTER_SEC = 30.0
+DEFAULT_HTTP_ACTION_ROUTES = (
+    "get_group_member_list",
+    "get_group_list",
+    "get_friend_list",
+    "get_group_msg_history",
+    "get_friend_msg_history",
+    "get_forward_msg",
+    "get_record",
+    "get_image",
+    "get_file",
+    "upload_group_file",
+    "upload_private_file",
+)
 DEFAULT_CHAT_LIST_TYPE = "whitelist"
 PRIVATE_CHAT_TOOL_BYPASS_SECONDS = 15 * 60
+DEFAULT_INBOUND_QUEUE_MAX_SIZE = 2000
+DEFAULT_INBOUND_WORKER_COUNT = 8
+DEFAULT_INBOUND_HIGH_WATER_RATIO = 0.8
+DEFAULT_HISTORY_BACKFILL_CONCURRENCY = 2
+DEFAULT_HISTORY_BACKFILL_PAGE_BUDGET = 40
+DEFAULT_HISTORY_BACKFILL_PAGE_SIZE = 20
+DEFAULT_HISTORY_BACKFILL_MAX_GAP_SEC = 1800.0
+DEFAULT_HISTORY_BACKFILL_MAX_CHATS = 1000
+DEFAULT_OVERLOAD_NOTICE_QUEUE_RATIO = 0.5
+DEFAULT_OVERLOAD_NOTICE_LAG_SEC = 15.0
+DEFAULT_OVERLOAD_GROUP_QUEUE_RATIO = 0.8
+DEFAULT_OVERLOAD_GROUP_LAG_SEC = 60.0
+DEFAULT_OVERLOAD_BUSIEST_GROUP_COUNT = 3
+DEFAULT_OVERLOAD_GROUP_WINDOW_SEC = 10.0
+DEFAULT_EVENT_LAG_BASELINE_WINDOW_SEC = 600.0
+DEFAULT_MEDIA_DEGRADATION_LAG_SEC = 20.0
+DEFAULT_MEDIA_DEGRADATION_BUDGET_MB_PER_MIN = 50.0
+DEFAULT_MEDIA_DEGRADATION_MIN_HOLD_SEC = 30.0
+BACKFILLED_PAYLOAD_KEY = "napcat_backfilled"
+DEFAULT_OUTBOUND_BULK_FRAME_BYTES = 64 * 1024
+DEFAULT_OUTBOUND_BULK_MAX_WAIT_MS = 200.0
+DEFAULT_OUTBOUND_BULK_MAX_BYPASS = 64
+DEFAULT_OUTBOUND_LATENCY_SAMPLE_SIZE = 512
+DEFAULT_OFFLINE_OUTBOX_MAX_SIZE = 200
+DEFAULT_OFFLINE_OUTBOX_TTL_SEC = 300.0
+DEFAULT_OFFLINE_OUTBOX_SPILL_MAX_SIZE = 5000
+DEFAULT_CAPTURE_MAX_FILE_MB = 16.0
+DEFAULT_CAPTURE_MAX_FILES = 5
+DEFAULT_CAPTURE_FLUSH_INTERVAL_SEC = 1.0
+DEFAULT_PROFILE_CACHE_MEMBER_TTL_SEC = 600.0
+DEFAULT_PROFILE_CACHE_PROFILE_TTL_SEC = 3600.0
+DEFAULT_PROFILE_CACHE_MAX_ENTRIES = 20000
+DEFAULT_MEMBER_BATCH_WINDOW_MS = 5.0
+DEFAULT_MEMBER_BATCH_THRESHOLD = 8
+DEFAULT_CONTACT_DIRECTORY_REFRESH_INTERVAL_SEC = 1800.0
+DEFAULT_GROUP_ROSTER_MIN_MEMBERS = 2000
+DEFAULT_GROUP_ROSTER_RECONCILE_INTERVAL_SEC = 21600.0
@@ -0,0 +1,93 @@
+"""NapCat 入站事件延迟估计。"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Tuple
+
+import time
+
+from .constants import DEFAULT_EVENT_LAG_BASELINE_WINDOW_SEC
+
+
+class NapCatEventLagEstimator:
+    """依据事件的 ``time`` 字段估计入站事件的延迟，并扣除两端时钟偏差。
+
+    事件的 ``time`` 来自 NapCat 所在主机的时钟，本机时间减去该值得到的原始差值同时包含真实延迟与两台主机的
+    时钟偏差。估计器把最近一个窗口内原始差值的最小值视为时钟偏差（窗口内总有事件几乎没有排队），扣除后再做
+    指数滑动平均，因此时钟偏差不会被误判为持续延迟。持续时间超过窗口的延迟会逐渐被计入偏差，窗口因此取得较长。
+    """
+
+    _BUCKET_COUNT = 10
+
+    def __init__(
+        self,
+        window_sec: float = DEFAULT_EVENT_LAG_BASELINE_WINDOW_SEC,
+        smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        """初始化事件延迟估计器。
+
+        Args:
+            window_sec: 估计时钟偏差所用的窗口秒数。
+            smoothing: 延迟的指数滑动平均系数。
+            clock: 单调时钟函数，用于划分偏差统计窗口。
+            wall_clock: 返回 Unix 时间戳的时钟函数，与事件的 ``time`` 字段相减得到原始差值。
+        """
+        self._window_sec = max(1.0, float(window_sec))
+        self._bucket_sec = self._window_sec / self._BUCKET_COUNT
+        self._smoothing = smoothing
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._min_buckets: Deque[Tuple[float, float]] = deque()
+        self._lag_sec: float = 0.0
+
+    @property
+    def lag_sec(self) -> float:
+        """返回平滑后的事件延迟秒数。"""
+        return self._lag_sec
+
+    @property
+    def clock_offset_sec(self) -> float:
+        """返回当前估计的时钟偏差秒数；尚无样本时为 ``0``。"""
+        self._expire_buckets()
+        return min((raw_lag for _bucket_start, raw_lag in self._min_buckets), default=0.0)
+
+    def observe(self, event_time: Any) -> Optional[float]:
+        """记录一条事件并更新平滑后的延迟。
+
+        Args:
+            event_time: 事件的 ``time`` 字段。
+
+        Returns:
+            Optional[float]: 扣除时钟偏差后该事件的延迟；``time`` 无法解析时返回 ``None`` 且不更新。
+        """
+        try:
+            raw_lag = self._wall_clock() - float(event_time)
+        except (TypeError, ValueError):
+            return None
+
+        now = self._clock()
+        bucket_start = now - now % self._bucket_sec
+        buckets = self._min_buckets
+        if buckets and buckets[-1][0] == bucket_start:
+            if raw_lag < buckets[-1][1]:
+                buckets[-1] = (bucket_start, raw_lag)
+        else:
+            buckets.append((bucket_start, raw_lag))
+
+        lag_sec = max(0.0, raw_lag - self.clock_offset_sec)
+        self._lag_sec += (lag_sec - self._lag_sec) * self._smoothing
+        return lag_sec
+
+    def reset_lag(self) -> None:
+        """把平滑后的延迟清零，保留已估计的时钟偏差。"""
+        self._lag_sec = 0.0
+
+    def _expire_buckets(self) -> None:
+        """丢弃已滑出窗口的偏差统计桶。"""
+        expire_before = self._clock() - self._window_sec
+        buckets = self._min_buckets
+        while buckets and buckets[0][0] + self._bucket_sec <= expire_before:
+            buckets.popleft()
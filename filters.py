@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import re
 import time
-from typing import Any, Collection, List, Pattern
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, FrozenSet, List, Mapping, Optional, Pattern
 
 from .config import NapCatChatConfig, NapCatFilterConfig, NapCatNoticeConfig
 from .constants import PRIVATE_CHAT_TOOL_BYPASS_SECONDS
@@ -183,6 +184,17 @@ class NapCatChatFilter:
             return False
         return True
 
+    def has_private_chat_bypass(self, user_id: str) -> bool:
+        """判断指定用户当前是否处于主动私聊临时放行窗口内。
+
+        Args:
+            user_id: 私聊用户 ID。
+
+        Returns:
+            bool: 若处于放行窗口内，则返回 ``True``。
+        """
+        return self._has_active_private_chat_bypass(user_id)
+
     def _get_private_chat_bypass_remaining_seconds(self, user_id: str) -> float:
         """获取指定用户临时私聊放行窗口的剩余秒数。"""
 
@@ -286,3 +298,193 @@ class NapCatNoticeFilter:
             # 未在配置中列出的通知类型默认不传递
             return False
         return bool(getattr(notice_config, field_name))
+
+
+@dataclass(frozen=True)
+class NapCatFilterSnapshot:
+    """聊天名单与通知过滤配置的预编译快照。"""
+
+    chat_list_enabled: bool
+    group_whitelist: bool
+    group_ids: FrozenSet[str]
+    private_whitelist: bool
+    private_ids: FrozenSet[str]
+    banned_user_ids: FrozenSet[str]
+    allowed_notice_keys: FrozenSet[str]
+    log_dropped_chat: bool
+
+
+class NapCatFrameClassifier:
+    """在入站事件进入调度队列前做廉价预分类，提前丢弃必然会被过滤的事件。
+
+    只读取 ``post_type``、``notice_type``、``sub_type``、``group_id`` 与 ``user_id`` 几个顶层字段，
+    依据配置重载时编译好的 :class:`NapCatFilterSnapshot` 判断；结论与路由器中的完整过滤保持一致，
+    拿不准的事件一律放行交给完整过滤链路处理。
+    """
+
+    DROP_UNHANDLED_POST_TYPE = "unhandled_post_type"
+    DROP_NOTICE_DISABLED = "notice_disabled"
+    DROP_GROUP_NOT_ALLOWED = "group_not_allowed"
+    DROP_PRIVATE_NOT_ALLOWED = "private_not_allowed"
+    DROP_USER_BANNED = "user_banned"
+
+    # 这些通知即使不转发给 Host，也要交给适配器内部组件消费（如禁言跟踪、资料缓存失效与群目录更新）
+    _INTERNAL_NOTICE_KEYS = frozenset(
+        {
+            "friend_add",
+            "group_ban",
+            "group_increase",
+            "group_decrease",
+            "group_admin",
+            "group_card",
+            "notify.group_name",
+        }
+    )
+    _HANDLED_POST_TYPES = frozenset({"message", "notice", "meta_event"})
+
+    def __init__(self, logger: Any, chat_filter: NapCatChatFilter) -> None:
+        """初始化事件预分类器。
+
+        Args:
+            logger: 插件日志对象。
+            chat_filter: 聊天名单过滤器，用于查询主动私聊临时放行状态。
+        """
+        self._logger = logger
+        self._chat_filter = chat_filter
+        self._snapshot: Optional[NapCatFilterSnapshot] = None
+        self._inspected_total: int = 0
+        self._drop_counts: Dict[str, int] = {}
+
+    def compile(self, chat_config: NapCatChatConfig, notice_config: NapCatNoticeConfig) -> NapCatFilterSnapshot:
+        """按当前配置编译过滤快照，并原子替换正在使用的快照。
+
+        Args:
+            chat_config: 当前生效的聊天配置。
+            notice_config: 当前生效的通知事件配置。
+
+        Returns:
+            NapCatFilterSnapshot: 新编译的快照。
+        """
+        allowed_notice_keys = set()
+        if notice_config.enabled:
+            if notice_config.enable_poke:
+                allowed_notice_keys.add("notify.poke")
+            if notice_config.enable_group_name:
+                allowed_notice_keys.add("notify.group_name")
+            for notice_type, field_name in NapCatNoticeFilter._NOTICE_TYPE_FIELDS.items():
+                if getattr(notice_config, field_name):
+                    allowed_notice_keys.add(notice_type)
+
+        snapshot = NapCatFilterSnapshot(
+            chat_list_enabled=chat_config.enable_chat_list_filter,
+            group_whitelist=chat_config.group_list_type == "whitelist",
+            group_ids=frozenset(chat_config.group_list),
+            private_whitelist=chat_config.private_list_type == "whitelist",
+            private_ids=frozenset(chat_config.private_list),
+            banned_user_ids=frozenset(chat_config.ban_user_id),
+            allowed_notice_keys=frozenset(allowed_notice_keys),
+            log_dropped_chat=chat_config.show_dropped_chat_list_messages,
+        )
+        self._snapshot = snapshot
+        return snapshot
+
+    def classify(self, payload: Mapping[str, Any]) -> str:
+        """判断一条非 echo 事件是否可以提前丢弃。
+
+        Args:
+            payload: NapCat 推送的事件载荷。
+
+        Returns:
+            str: 丢弃原因；应当继续处理时返回空字符串。
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return ""
+
+        self._inspected_total += 1
+        post_type = payload.get("post_type")
+        if post_type == "meta_event":
+            return ""
+        if post_type == "message":
+            reason = self._classify_message(payload, snapshot)
+        elif post_type == "notice":
+            reason = self._classify_notice(payload, snapshot)
+        elif post_type not in self._HANDLED_POST_TYPES:
+            reason = self.DROP_UNHANDLED_POST_TYPE
+        else:
+            reason = ""
+
+        if reason:
+            self._drop_counts[reason] = self._drop_counts.get(reason, 0) + 1
+        return reason
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回预分类的运行指标。
+
+        Returns:
+            Dict[str, Any]: 检查总数、提前丢弃总数与按原因划分的丢弃计数。
+        """
+        dropped_total = sum(self._drop_counts.values())
+        return {
+            "compiled": self._snapshot is not None,
+            "inspected": self._inspected_total,
+            "dropped": dropped_total,
+            "passed": self._inspected_total - dropped_total,
+            "dropped_by_reason": dict(self._drop_counts),
+        }
+
+    def _classify_message(self, payload: Mapping[str, Any], snapshot: NapCatFilterSnapshot) -> str:
+        """对消息事件做名单预判。
+
+        Args:
+            payload: 消息事件载荷。
+            snapshot: 当前过滤快照。
+
+        Returns:
+            str: 丢弃原因；应当继续处理时返回空字符串。
+        """
+        user_id = str(payload.get("user_id") or "")
+        if user_id and user_id in snapshot.banned_user_ids:
+            self._logger.warning(f"NapCat 用户 {user_id} 在全局禁止名单中，消息被丢弃")
+            return self.DROP_USER_BANNED
+        if not snapshot.chat_list_enabled:
+            return ""
+
+        group_id = payload.get("group_id")
+        if group_id:
+            group_id = str(group_id)
+            if (group_id in snapshot.group_ids) != snapshot.group_whitelist:
+                if snapshot.log_dropped_chat:
+                    self._logger.warning(f"NapCat 群聊 {group_id} 未通过聊天名单过滤，消息被丢弃")
+                return self.DROP_GROUP_NOT_ALLOWED
+            return ""
+
+        if not user_id or (user_id in snapshot.private_ids) == snapshot.private_whitelist:
+            return ""
+        if self._chat_filter.has_private_chat_bypass(user_id):
+            return ""
+        if snapshot.log_dropped_chat:
+            self._logger.warning(f"NapCat 私聊用户 {user_id} 未通过聊天名单过滤，消息被丢弃")
+        return self.DROP_PRIVATE_NOT_ALLOWED
+
+    def _classify_notice(self, payload: Mapping[str, Any], snapshot: NapCatFilterSnapshot) -> str:
+        """对通知事件做类型与群名单预判。
+
+        Args:
+            payload: 通知事件载荷。
+            snapshot: 当前过滤快照。
+
+        Returns:
+            str: 丢弃原因；应当继续处理时返回空字符串。
+        """
+        notice_type = str(payload.get("notice_type") or "")
+        notice_key = f"notify.{payload.get('sub_type') or ''}" if notice_type == "notify" else notice_type
+        if notice_key in self._INTERNAL_NOTICE_KEYS:
+            return ""
+        if notice_key not in snapshot.allowed_notice_keys:
+            return self.DROP_NOTICE_DISABLED
+
+        group_id = payload.get("group_id")
+        if snapshot.chat_list_enabled and group_id and (str(group_id) in snapshot.group_ids) != snapshot.group_whitelist:
+            return self.DROP_GROUP_NOT_ALLOWED
+        return ""
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Any, Awaitable, Callable, Mapping, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Mapping, Optional
 
 import asyncio
 import time
 
+if TYPE_CHECKING:
+    from .runtime.scheduler import NapCatRuntimeScheduler, NapCatScheduledJob
+
 
 class NapCatHeartbeatMonitor:
     """NapCat 心跳状态监测器。"""
@@ -15,19 +18,22 @@ class NapCatHeartbeatMonitor:
         self,
         logger: Any,
         on_timeout: Callable[[str], Awaitable[None]],
+        scheduler: "NapCatRuntimeScheduler",
     ) -> None:
         """初始化心跳监测器。
 
         Args:
             logger: 插件日志对象。
             on_timeout: 当心跳长时间未更新时触发的异步回调。
+            scheduler: 运行时统一调度器，用于登记周期性心跳检查。
         """
         self._logger = logger
         self._on_timeout = on_timeout
+        self._scheduler = scheduler
         self._last_heartbeat_at: float = 0.0
         self._interval_sec: float = 30.0
         self._self_id: str = ""
-        self._check_task: Optional[asyncio.Task[None]] = None
+        self._check_job: Optional["NapCatScheduledJob"] = None
         self._timeout_reported: bool = False
 
     async def start(self, self_id: str, default_interval_sec: float) -> None:
@@ -42,24 +48,23 @@ class NapCatHeartbeatMonitor:
             self._self_id = normalized_self_id
         self._interval_sec = max(float(default_interval_sec or 30.0), 1.0)
         self._touch()
-        if self._check_task is None or self._check_task.done():
-            self._check_task = asyncio.create_task(
-                self._check_loop(),
-                name="napcat_adapter.heartbeat_monitor",
+        if self._check_job is None or not self._check_job.active:
+            self._check_job = self._scheduler.every(
+                self._interval_sec,
+                self._check_heartbeat,
+                name="heartbeat_monitor.check",
             )
+        else:
+            self._check_job.interval_sec = self._interval_sec
 
     async def stop(self) -> None:
         """停止当前心跳监测循环。"""
-        check_task = self._check_task
-        self._check_task = None
+        check_job = self._check_job
+        self._check_job = None
         self._timeout_reported = False
         self._last_heartbeat_at = 0.0
-        if check_task is not None:
-            check_task.cancel()
-            try:
-                await check_task
-            except asyncio.CancelledError:
-                pass
+        if check_job is not None:
+            check_job.cancel()
 
     async def observe_meta_event(
         self,
@@ -92,7 +97,6 @@ class NapCatHeartbeatMonitor:
         is_good = bool(status.get("good", False))
 
         await self.start(self_id, interval_sec)
-        self._interval_sec = interval_sec
 
         if is_online and is_good:
             self._touch()
@@ -124,25 +128,23 @@ class NapCatHeartbeatMonitor:
         self._last_heartbeat_at = time.time()
         self._timeout_reported = False
 
-    async def _check_loop(self) -> None:
-        """持续检查心跳是否超时。"""
-        while True:
-            await asyncio.sleep(max(self._interval_sec, 1.0))
-            if self._last_heartbeat_at <= 0:
-                continue
-
-            elapsed_sec = time.time() - self._last_heartbeat_at
-            if elapsed_sec <= self._interval_sec * 2:
-                continue
-
-            if self._timeout_reported:
-                continue
-
-            self._timeout_reported = True
-            self._logger.error(f"Bot {self._self_id or 'unknown'} 可能发生了连接断开、被下线，或者 NapCat 心跳卡死")
-            try:
-                await self._on_timeout(self._self_id)
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                self._logger.warning(f"NapCat 心跳超时回调执行失败: {exc}")
+    async def _check_heartbeat(self) -> None:
+        """检查心跳是否超时，由调度器按心跳间隔周期调用。"""
+        if self._last_heartbeat_at <= 0:
+            return
+
+        elapsed_sec = time.time() - self._last_heartbeat_at
+        if elapsed_sec <= self._interval_sec * 2:
+            return
+
+        if self._timeout_reported:
+            return
+
+        self._timeout_reported = True
+        self._logger.error(f"Bot {self._self_id or 'unknown'} 可能发生了连接断开、被下线，或者 NapCat 心跳卡死")
+        try:
+            await self._on_timeout(self._self_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._logger.warning(f"NapCat 心跳超时回调执行失败: {exc}")
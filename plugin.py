@@ -23,7 +23,7 @@ from .apis import (
 )
 from .config import NapCatPluginSettings
 from .constants import NAPCAT_GATEWAY_NAME, PRIVATE_CHAT_TOOL_BYPASS_SECONDS
-from .runtime import NapCatEventRouter, NapCatRuntimeBuilder, NapCatRuntimeBundle
+from .runtime import NapCatConnection, NapCatEventRouter, NapCatRuntimeBuilder, NapCatRuntimeBundle
 from .services import NapCatActionService, NapCatQueryService
 
 
@@ -55,6 +55,8 @@ class NapCatAdapterPlugin(
     async def on_unload(self) -> None:
         """在插件卸载时关闭连接。"""
         await self._stop_connection()
+        if self._runtime_bundle is not None:
+            await self._runtime_bundle.scheduler.shutdown()
 
     async def on_config_update(self, scope: str, config_data: Dict[str, Any], version: str) -> None:
         """在配置更新后重载连接状态。
@@ -115,18 +117,19 @@ class NapCatAdapterPlugin(
             return {"success": False, "error": "私聊消息不能为空"}
 
         runtime_bundle = self._require_runtime_bundle()
-        login_info = await runtime_bundle.query_service.get_login_info()
+        connection = runtime_bundle.connections.current()
+        with runtime_bundle.connections.use(connection):
+            login_info = await runtime_bundle.query_service.get_login_info()
         account_id = str((login_info or {}).get("user_id") or "").strip()
         if not account_id:
             return {"success": False, "error": "无法获取当前 NapCat 登录账号"}
 
-        settings = self._load_settings()
         open_session_result = await self.ctx.chat.open_session(
             platform="qq",
             chat_type="private",
             user_id=normalized_user_id,
             account_id=account_id,
-            scope=settings.napcat_server.connection_id,
+            scope=connection.connection_id,
         )
         if not isinstance(open_session_result, Mapping) or not bool(open_session_result.get("success", False)):
             error = str(open_session_result.get("error") or "").strip() if isinstance(open_session_result, Mapping) else ""
@@ -137,13 +140,14 @@ class NapCatAdapterPlugin(
             }
 
         try:
-            response = await runtime_bundle.action_service.call_action(
-                "send_private_msg",
-                {
-                    "user_id": int(normalized_user_id),
-                    "message": [{"type": "text", "data": {"text": normalized_message}}],
-                },
-            )
+            with runtime_bundle.connections.use(connection):
+                response = await runtime_bundle.action_service.call_action(
+                    "send_private_msg",
+                    {
+                        "user_id": int(normalized_user_id),
+                        "message": [{"type": "text", "data": {"text": normalized_message}}],
+                    },
+                )
         except Exception as exc:
             return {"success": False, "error": str(exc)}
 
@@ -247,13 +251,15 @@ class NapCatAdapterPlugin(
         Returns:
             Dict[str, Any]: 标准化后的发送结果。
         """
-        del metadata
         del kwargs
 
         runtime_bundle = self._require_runtime_bundle()
         try:
+            connection = runtime_bundle.connections.resolve_route(route, metadata)
             action_name, params = runtime_bundle.outbound_codec.build_outbound_action(message, route or {})
-            response = await runtime_bundle.transport.call_action(action_name, params)
+            if connection.outbox.should_hold(connection.is_ready):
+                return self._hold_outbound_action(connection, action_name, params)
+            response = await connection.transport.call_action(action_name, params)
         except Exception as exc:
             return {"success": False, "error": str(exc)}
 
@@ -291,6 +297,38 @@ class NapCatAdapterPlugin(
             "metadata": {
                 "action": action_name,
                 "adapter_callbacks": adapter_callbacks,
+                "connection_id": connection.connection_id,
+            },
+        }
+
+    @staticmethod
+    def _hold_outbound_action(
+        connection: NapCatConnection,
+        action_name: str,
+        params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """将出站动作放入连接的离线缓冲，并构造对应的发送结果。
+
+        暂存的消息在补发前没有平台消息 ID，因此不会产生 ``message_id_echo`` 回调。
+
+        Args:
+            connection: 出站消息所属连接。
+            action_name: OneBot 动作名称。
+            params: 动作参数。
+
+        Returns:
+            Dict[str, Any]: 已受理时为成功结果，缓冲已满时为失败结果。
+        """
+        if not connection.outbox.enqueue(action_name, params):
+            return {"success": False, "error": "NapCat is not connected and the offline outbound buffer is full"}
+        return {
+            "success": True,
+            "external_message_id": None,
+            "metadata": {
+                "action": action_name,
+                "adapter_callbacks": [],
+                "connection_id": connection.connection_id,
+                "queued": True,
             },
         }
 
@@ -368,7 +406,7 @@ class NapCatAdapterPlugin(
             return
         if not settings.validate_runtime_config(self.ctx.logger):
             return
-        if not runtime_bundle.transport.is_available():
+        if not runtime_bundle.connections.is_available():
             self.ctx.logger.error("NapCat 适配器依赖 aiohttp，但当前环境未安装该依赖")
             return
 
@@ -386,8 +424,18 @@ class NapCatAdapterPlugin(
         if not settings.notice.enabled:
             self.ctx.logger.info("NapCat 通知事件转发已整体关闭：所有通知都不会传入 Host")
 
-        runtime_bundle.transport.configure(settings.napcat_server)
-        await runtime_bundle.transport.start()
+        runtime_bundle.frame_classifier.compile(settings.chat, settings.notice)
+        runtime_bundle.inbound_codec.media_budget.configure(settings.inbound)
+        runtime_bundle.query_service.configure_cache(settings.cache)
+        runtime_bundle.connections.configure(
+            settings.list_server_configs(),
+            settings.inbound,
+            settings.outbound,
+            settings.capture,
+        )
+        if settings.additional_servers:
+            self.ctx.logger.info(f"NapCat 适配器将同时维护 {len(settings.additional_servers) + 1} 条账号连接")
+        await runtime_bundle.connections.start()
 
     async def _stop_connection(self) -> None:
         """停止当前连接并清理运行时缓存。"""
@@ -395,7 +443,7 @@ class NapCatAdapterPlugin(
         if runtime_bundle is None:
             return
 
-        await runtime_bundle.transport.stop()
+        await runtime_bundle.connections.stop()
         if self._event_router is not None:
             self._event_router.reset_caches()
 
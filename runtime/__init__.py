@@ -2,6 +2,15 @@
 
 from .builder import NapCatRuntimeBuilder
 from .bundle import NapCatRuntimeBundle
+from .connections import NapCatConnection, NapCatConnectionManager
 from .router import NapCatEventRouter
+from .scheduler import NapCatRuntimeScheduler
 
-__all__ = ["NapCatEventRouter", "NapCatRuntimeBuilder", "NapCatRuntimeBundle"]
+__all__ = [
+    "NapCatConnection",
+    "NapCatConnectionManager",
+    "NapCatEventRouter",
+    "NapCatRuntimeBuilder",
+    "NapCatRuntimeBundle",
+    "NapCatRuntimeScheduler",
+]
@@ -7,18 +7,27 @@ from typing import Any, Awaitable, Callable, Coroutine
 from ..codecs.inbound import NapCatInboundCodec
 from ..codecs.notice import NapCatNoticeCodec
 from ..codecs.outbound import NapCatOutboundCodec
-from ..filters import NapCatChatFilter, NapCatNoticeFilter, NapCatRegexFilter
+from ..config import NapCatServerConfig
+from ..filters import NapCatChatFilter, NapCatFrameClassifier, NapCatNoticeFilter, NapCatRegexFilter
 from ..heartbeat_monitor import NapCatHeartbeatMonitor
 from ..runtime_state import NapCatRuntimeStateManager
 from ..services import (
     NapCatActionService,
     NapCatBanStateStore,
     NapCatBanTracker,
+    NapCatContactDirectory,
+    NapCatHistoryBackfill,
     NapCatOfficialBotGuard,
+    NapCatOfflineOutbox,
+    NapCatProfileCache,
     NapCatQueryService,
+    build_ban_state_storage_path,
+    build_outbox_spill_path,
 )
-from ..transport import NapCatTransportClient
+from ..transport import NapCatReverseServer, NapCatReverseTransport, NapCatTransportClient
 from .bundle import NapCatRuntimeBundle
+from .connections import NapCatConnection, NapCatConnectionManager
+from .scheduler import NapCatRuntimeScheduler
 
 
 class NapCatRuntimeBuilder:
@@ -46,6 +55,9 @@ class NapCatRuntimeBuilder:
     ) -> NapCatRuntimeBundle:
         """创建一套完整的运行时组件。
 
+        共享组件只创建一份；每条账号连接的组件在连接管理器按配置同步连接时由工厂创建，
+        其回调都会在所属连接的上下文中执行。
+
         Args:
             on_connection_opened: 连接建立回调。
             on_connection_closed: 连接断开回调。
@@ -56,44 +68,94 @@ class NapCatRuntimeBuilder:
         Returns:
             NapCatRuntimeBundle: 已完成依赖注入的运行时组件集合。
         """
+        scheduler = NapCatRuntimeScheduler(self._logger)
         chat_filter = NapCatChatFilter(self._logger)
         notice_filter = NapCatNoticeFilter(self._logger)
         regex_filter = NapCatRegexFilter(self._logger)
-        transport = NapCatTransportClient(
-            logger=self._logger,
-            on_connection_opened=on_connection_opened,
-            on_connection_closed=on_connection_closed,
-            on_payload=on_payload,
-        )
-        action_service = NapCatActionService(self._logger, transport)
-        query_service = NapCatQueryService(action_service, self._logger)
-        ban_state_store = NapCatBanStateStore(self._logger)
-        inbound_codec = NapCatInboundCodec(self._logger, query_service)
-        notice_codec = NapCatNoticeCodec(self._logger, query_service)
-        runtime_state = NapCatRuntimeStateManager(
-            gateway_capability=self._gateway_capability,
-            logger=self._logger,
-            gateway_name=self._gateway_name,
-        )
-        ban_tracker = NapCatBanTracker(
-            logger=self._logger,
-            query_service=query_service,
-            on_natural_lift=on_natural_lift,
-            state_store=ban_state_store,
-        )
-        heartbeat_monitor = NapCatHeartbeatMonitor(
-            logger=self._logger,
-            on_timeout=on_heartbeat_timeout,
+        frame_classifier = NapCatFrameClassifier(self._logger, chat_filter)
+        reverse_server = NapCatReverseServer(self._logger)
+
+        def create_connection(server_config: NapCatServerConfig, is_primary: bool) -> NapCatConnection:
+            connection_id = server_config.connection_id
+            transport: NapCatTransportClient
+            if server_config.ws_mode == "reverse":
+                transport = NapCatReverseTransport(
+                    logger=self._logger,
+                    on_connection_opened=connections.bind(connection_id, on_connection_opened),
+                    on_connection_closed=connections.bind(connection_id, on_connection_closed),
+                    on_payload=connections.bind(connection_id, on_payload),
+                    scheduler=scheduler,
+                    reverse_server=reverse_server,
+                    frame_classifier=frame_classifier,
+                )
+            else:
+                transport = NapCatTransportClient(
+                    logger=self._logger,
+                    on_connection_opened=connections.bind(connection_id, on_connection_opened),
+                    on_connection_closed=connections.bind(connection_id, on_connection_closed),
+                    on_payload=connections.bind(connection_id, on_payload),
+                    scheduler=scheduler,
+                    frame_classifier=frame_classifier,
+                )
+            ban_state_store = NapCatBanStateStore(
+                self._logger,
+                build_ban_state_storage_path("" if is_primary else connection_id),
+            )
+            return NapCatConnection(
+                connection_id=connection_id,
+                is_primary=is_primary,
+                server_config=server_config,
+                transport=transport,
+                heartbeat_monitor=NapCatHeartbeatMonitor(
+                    logger=self._logger,
+                    on_timeout=connections.bind(connection_id, on_heartbeat_timeout),
+                    scheduler=scheduler,
+                ),
+                runtime_state=NapCatRuntimeStateManager(
+                    gateway_capability=self._gateway_capability,
+                    logger=self._logger,
+                    gateway_name=self._gateway_name,
+                ),
+                ban_state_store=ban_state_store,
+                ban_tracker=NapCatBanTracker(
+                    logger=self._logger,
+                    query_service=query_service,
+                    on_natural_lift=connections.bind(connection_id, on_natural_lift),
+                    state_store=ban_state_store,
+                    scheduler=scheduler,
+                ),
+                outbox=NapCatOfflineOutbox(
+                    logger=self._logger,
+                    send_action=transport.call_action,
+                    spill_path=build_outbox_spill_path("" if is_primary else connection_id),
+                ),
+                history_backfill=NapCatHistoryBackfill(
+                    logger=self._logger,
+                    query_service=query_service,
+                    submit_payload=transport.submit_payload,
+                ),
+                directory=NapCatContactDirectory(self._logger, query_service, scheduler),
+            )
+
+        connections = NapCatConnectionManager(self._logger, create_connection)
+        action_service = NapCatActionService(self._logger, connections)
+        profile_cache = NapCatProfileCache(clock=scheduler.time)
+        query_service = NapCatQueryService(
+            action_service,
+            self._logger,
+            profile_cache,
+            group_size_resolver=connections.resolve_group_member_count,
         )
-        official_bot_guard = NapCatOfficialBotGuard(self._logger, query_service)
+        inbound_codec = NapCatInboundCodec(self._logger, query_service, connections.resolve_group_name)
+        notice_codec = NapCatNoticeCodec(self._logger, query_service, connections.resolve_group_name)
+        official_bot_guard = NapCatOfficialBotGuard(self._logger, query_service, scheduler)
         outbound_codec = NapCatOutboundCodec()
 
         return NapCatRuntimeBundle(
             action_service=action_service,
-            ban_state_store=ban_state_store,
-            ban_tracker=ban_tracker,
             chat_filter=chat_filter,
-            heartbeat_monitor=heartbeat_monitor,
+            connections=connections,
+            frame_classifier=frame_classifier,
             inbound_codec=inbound_codec,
             notice_codec=notice_codec,
             notice_filter=notice_filter,
@@ -101,6 +163,6 @@ class NapCatRuntimeBuilder:
             outbound_codec=outbound_codec,
             query_service=query_service,
             regex_filter=regex_filter,
-            runtime_state=runtime_state,
-            transport=transport,
+            reverse_server=reverse_server,
+            scheduler=scheduler,
         )
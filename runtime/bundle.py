@@ -3,38 +3,54 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any, Dict
 
 from ..codecs.inbound import NapCatInboundCodec
 from ..codecs.notice import NapCatNoticeCodec
 from ..codecs.outbound import NapCatOutboundCodec
-from ..filters import NapCatChatFilter, NapCatNoticeFilter, NapCatRegexFilter
-from ..heartbeat_monitor import NapCatHeartbeatMonitor
-from ..runtime_state import NapCatRuntimeStateManager
-from ..services import (
-    NapCatActionService,
-    NapCatBanStateStore,
-    NapCatBanTracker,
-    NapCatOfficialBotGuard,
-    NapCatQueryService,
-)
-from ..transport import NapCatTransportClient
+from ..filters import NapCatChatFilter, NapCatFrameClassifier, NapCatNoticeFilter, NapCatRegexFilter
+from ..services import NapCatActionService, NapCatOfficialBotGuard, NapCatQueryService
+from ..transport import NapCatReverseServer
+from .connections import NapCatConnectionManager
+from .scheduler import NapCatRuntimeScheduler
 
 
 @dataclass
 class NapCatRuntimeBundle:
-    """NapCat 运行时依赖集合。"""
+    """NapCat 运行时依赖集合。
+
+    ``connections`` 持有每个账号独占的传输层、心跳监测、路由状态与禁言跟踪；
+    其余组件在全部账号连接间共享。
+    """
 
     action_service: NapCatActionService
-    ban_state_store: NapCatBanStateStore
-    ban_tracker: NapCatBanTracker
     chat_filter: NapCatChatFilter
-    heartbeat_monitor: NapCatHeartbeatMonitor
+    connections: NapCatConnectionManager
+    frame_classifier: NapCatFrameClassifier
     inbound_codec: NapCatInboundCodec
     notice_codec: NapCatNoticeCodec
     notice_filter: NapCatNoticeFilter
     official_bot_guard: NapCatOfficialBotGuard
     outbound_codec: NapCatOutboundCodec
     query_service: NapCatQueryService
-    runtime_state: NapCatRuntimeStateManager
     regex_filter: NapCatRegexFilter
-    transport: NapCatTransportClient
+    reverse_server: NapCatReverseServer
+    scheduler: NapCatRuntimeScheduler
+
+    def collect_stats(self) -> Dict[str, Any]:
+        """汇总运行时各组件的监控指标。
+
+        Returns:
+            Dict[str, Any]: 以组件名为键的指标字典。
+        """
+        return {
+            "action_service": self.action_service.get_stats(),
+            "connections": self.connections.get_stats(),
+            "frame_classifier": self.frame_classifier.get_stats(),
+            "media_budget": self.inbound_codec.media_budget.get_stats(),
+            "member_batcher": self.query_service.member_batcher.get_stats(),
+            "profile_cache": self.query_service.profile_cache.get_stats(),
+            "reverse_server": self.reverse_server.get_stats(),
+            "roster_store": self.query_service.roster_store.get_stats(),
+            "scheduler": self.scheduler.get_stats(),
+        }
@@ -0,0 +1,428 @@
+"""NapCat 多账号连接管理。"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+
+from ..config import NapCatCaptureConfig, NapCatInboundConfig, NapCatOutboundConfig, NapCatServerConfig
+from ..heartbeat_monitor import NapCatHeartbeatMonitor
+from ..runtime_state import NapCatRuntimeStateManager
+from ..services import (
+    NapCatBanStateStore,
+    NapCatBanTracker,
+    NapCatContactDirectory,
+    NapCatContactDirectorySnapshot,
+    NapCatGroupEntry,
+    NapCatHistoryBackfill,
+    NapCatOfflineOutbox,
+)
+from ..transport import NapCatTransportClient
+
+_current_connection: ContextVar[Optional["NapCatConnection"]] = ContextVar(
+    "napcat_adapter_current_connection",
+    default=None,
+)
+
+
+@dataclass
+class NapCatConnection:
+    """单个 NapCat 账号连接及其独占的运行时组件。"""
+
+    connection_id: str
+    is_primary: bool
+    server_config: NapCatServerConfig
+    transport: NapCatTransportClient
+    heartbeat_monitor: NapCatHeartbeatMonitor
+    runtime_state: NapCatRuntimeStateManager
+    ban_state_store: NapCatBanStateStore
+    ban_tracker: NapCatBanTracker
+    outbox: NapCatOfflineOutbox
+    history_backfill: NapCatHistoryBackfill
+    directory: NapCatContactDirectory
+
+    @property
+    def self_id(self) -> str:
+        """返回当前连接已激活路由的机器人账号 ID。"""
+        return self.runtime_state.account_id
+
+    @property
+    def known_self_id(self) -> str:
+        """返回当前连接所属的机器人账号 ID；连接断开后仍为最近一次激活路由的账号。"""
+        return self.runtime_state.account_id or self.runtime_state.last_account_id
+
+    @property
+    def label(self) -> str:
+        """返回用于日志与指标的连接名称。"""
+        return self.connection_id or "default"
+
+    @property
+    def is_ready(self) -> bool:
+        """判断当前连接是否可以直接发送出站消息。
+
+        Returns:
+            bool: WebSocket 已连接且路由处于激活状态（未断线、未心跳超时）时返回 ``True``。
+        """
+        return self.transport.is_connected and bool(self.self_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回当前连接的运行指标。
+
+        Returns:
+            Dict[str, Any]: 账号、地址与传输层指标。
+        """
+        return {
+            "connection_id": self.connection_id,
+            "primary": self.is_primary,
+            "self_id": self.self_id,
+            "ws_url": self.transport.active_ws_url or self.server_config.build_ws_url(),
+            "transport": self.transport.get_stats(),
+            "outbox": self.outbox.get_stats(),
+            "history_backfill": self.history_backfill.get_stats(),
+            "directory": self.directory.get_stats(),
+        }
+
+
+NapCatConnectionFactory = Callable[[NapCatServerConfig, bool], NapCatConnection]
+
+
+class NapCatConnectionManager:
+    """维护全部 NapCat 账号连接，并为共享组件解析当前应使用的连接。
+
+    每条连接的传输层回调都在绑定了该连接的上下文中执行，因此入站处理链路上
+    共享的查询服务、编解码器与调度器任务都会自动作用于事件所属的账号。
+    不处于任何连接上下文时，动作会发往默认连接：优先主连接，主连接未就绪时选择第一条已连接的连接。
+    """
+
+    def __init__(self, logger: Any, connection_factory: NapCatConnectionFactory) -> None:
+        """初始化连接管理器。
+
+        Args:
+            logger: 插件日志对象。
+            connection_factory: 按服务端配置创建连接组件的工厂，第二个参数表示是否为主连接。
+        """
+        self._logger = logger
+        self._connection_factory = connection_factory
+        self._connections: Dict[str, NapCatConnection] = {}
+
+    @staticmethod
+    def is_available() -> bool:
+        """判断当前环境是否安装了传输层依赖。
+
+        Returns:
+            bool: 若已安装 ``aiohttp``，则返回 ``True``。
+        """
+        return NapCatTransportClient.is_available()
+
+    def configure(
+        self,
+        server_configs: Sequence[NapCatServerConfig],
+        inbound_config: Optional[NapCatInboundConfig] = None,
+        outbound_config: Optional[NapCatOutboundConfig] = None,
+        capture_config: Optional[NapCatCaptureConfig] = None,
+    ) -> None:
+        """按配置同步连接集合，连接标识不变的连接会被复用。
+
+        调用前应先停止全部连接。
+
+        Args:
+            server_configs: 全部连接配置，第一项为主连接。
+            inbound_config: 入站调度配置。
+            outbound_config: 出站投递配置。
+            capture_config: 帧录制配置。
+        """
+        outbound_config = outbound_config or NapCatOutboundConfig()
+        connections: Dict[str, NapCatConnection] = {}
+        for index, server_config in enumerate(server_configs):
+            connection_id = server_config.connection_id
+            is_primary = index == 0
+            connection = self._connections.get(connection_id)
+            if (
+                connection is None
+                or connection.is_primary != is_primary
+                or connection.server_config.ws_mode != server_config.ws_mode
+            ):
+                connection = self._connection_factory(server_config, is_primary)
+            connection.server_config = server_config
+            connection.transport.configure(server_config, inbound_config, capture_config)
+            connection.outbox.configure(
+                enabled=outbound_config.offline_buffer_enabled,
+                max_size=outbound_config.offline_buffer_max_size,
+                ttl_sec=outbound_config.offline_buffer_ttl_sec,
+                spill_enabled=outbound_config.offline_buffer_spill_enabled,
+                spill_max_size=outbound_config.offline_buffer_spill_max_size,
+            )
+            connections[connection_id] = connection
+        self._connections = connections
+
+    async def start(self) -> None:
+        """启动全部连接。"""
+        for connection in self._connections.values():
+            await connection.outbox.load()
+            await connection.transport.start()
+
+    async def stop(self) -> None:
+        """停止全部连接。"""
+        for connection in self._connections.values():
+            with self.use(connection):
+                await connection.transport.stop()
+            await connection.outbox.close()
+
+    def list_connections(self) -> List[NapCatConnection]:
+        """返回全部连接，主连接在前。
+
+        Returns:
+            List[NapCatConnection]: 连接列表。
+        """
+        return list(self._connections.values())
+
+    def get(self, connection_id: str) -> Optional[NapCatConnection]:
+        """按连接标识查找连接。
+
+        Args:
+            connection_id: 连接标识。
+
+        Returns:
+            Optional[NapCatConnection]: 找到时返回连接，否则返回 ``None``。
+        """
+        return self._connections.get(connection_id)
+
+    def current(self) -> NapCatConnection:
+        """返回当前上下文绑定的连接；未绑定时返回默认连接。
+
+        Returns:
+            NapCatConnection: 当前应使用的连接。
+
+        Raises:
+            RuntimeError: 当尚未配置任何连接时抛出。
+        """
+        connection = _current_connection.get()
+        if connection is not None:
+            return connection
+        return self.default()
+
+    def default(self) -> NapCatConnection:
+        """返回默认连接。
+
+        Returns:
+            NapCatConnection: 主连接就绪时为主连接，否则为第一条已激活路由的连接，都没有时为主连接。
+
+        Raises:
+            RuntimeError: 当尚未配置任何连接时抛出。
+        """
+        connections = list(self._connections.values())
+        if not connections:
+            raise RuntimeError("NapCat 尚未配置任何连接")
+        for connection in connections:
+            if connection.self_id:
+                return connection
+        return connections[0]
+
+    def resolve_route(
+        self,
+        route: Optional[Mapping[str, Any]] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+    ) -> NapCatConnection:
+        """根据出站路由信息选择连接。
+
+        依次读取 ``route_metadata.connection_id`` / ``self_id``，再回退到路由信息顶层的
+        ``connection_id`` / ``scope`` 与 ``self_id`` / ``account_id``。连接标识优先于账号 ID；
+        账号 ID 按连接所属账号匹配，连接离线时仍使用其最近一次激活路由的账号，使消息进入该连接的离线缓冲，
+        而不是改由其他账号发出。只有路由信息既没有连接标识也没有账号 ID 时才使用默认连接。
+
+        Args:
+            route: Platform IO 生成的路由信息。
+            metadata: Platform IO 附带的投递元数据。
+
+        Returns:
+            NapCatConnection: 出站消息应使用的连接。
+
+        Raises:
+            RuntimeError: 路由指定的连接或账号不属于任何已配置的连接时抛出。
+        """
+        route = route or {}
+        metadata = metadata or {}
+        route_metadata: Mapping[str, Any] = {}
+        for source in (route.get("route_metadata"), metadata.get("route_metadata")):
+            if isinstance(source, Mapping) and source:
+                route_metadata = source
+                break
+
+        connection_id = self._first_text(
+            route_metadata.get("connection_id"),
+            route.get("connection_id"),
+            route.get("scope"),
+        )
+        self_id = self._first_text(
+            route_metadata.get("self_id"),
+            route.get("self_id"),
+            route.get("account_id"),
+        )
+
+        if not connection_id and not self_id:
+            return self.default()
+        if connection_id and (connection := self._connections.get(connection_id)) is not None:
+            return connection
+        if self_id:
+            for connection in self._connections.values():
+                if connection.known_self_id == self_id:
+                    return connection
+            # 尚未激活过路由的连接只剩一条时，该账号只可能属于这条连接
+            unknown_connections = [
+                connection for connection in self._connections.values() if not connection.known_self_id
+            ]
+            if len(unknown_connections) == 1:
+                return unknown_connections[0]
+        raise RuntimeError(
+            f"NapCat 出站路由指定的连接或账号不可用: connection_id={connection_id or '-'} self_id={self_id or '-'}"
+        )
+
+    @contextmanager
+    def use(self, connection: NapCatConnection) -> Iterator[NapCatConnection]:
+        """在当前上下文中临时绑定连接。
+
+        Args:
+            connection: 需要绑定的连接。
+
+        Yields:
+            NapCatConnection: 已绑定的连接。
+        """
+        token = _current_connection.set(connection)
+        try:
+            yield connection
+        finally:
+            _current_connection.reset(token)
+
+    def bind(self, connection_id: str, callback: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """包装回调，使其在指定连接的上下文中执行。
+
+        Args:
+            connection_id: 回调所属连接的标识。
+            callback: 原始异步回调。
+
+        Returns:
+            Callable[..., Awaitable[Any]]: 包装后的异步回调。
+        """
+
+        async def _bound_callback(*args: Any) -> Any:
+            connection = self._connections.get(connection_id)
+            if connection is None:
+                return await callback(*args)
+            with self.use(connection):
+                return await callback(*args)
+
+        return _bound_callback
+
+    async def call_action(self, action_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """通过当前连接发送 OneBot 动作。
+
+        Args:
+            action_name: OneBot 动作名称。
+            params: 动作参数。
+
+        Returns:
+            Dict[str, Any]: NapCat 返回的原始响应字典。
+        """
+        return await self.current().transport.call_action(action_name, params)
+
+    def get_contact_directory(self, connection_id: str = "") -> NapCatContactDirectorySnapshot:
+        """返回指定连接的群与好友目录快照。
+
+        Args:
+            connection_id: 连接标识；为空时使用当前上下文绑定的连接或默认连接。
+
+        Returns:
+            NapCatContactDirectorySnapshot: 目录快照。
+
+        Raises:
+            ValueError: 当连接标识不存在时抛出。
+        """
+        connection = self._connections.get(connection_id) if connection_id else self.current()
+        if connection is None:
+            raise ValueError(f"connection_id 不存在: {connection_id}")
+        return connection.directory.snapshot()
+
+    def resolve_group_name(self, group_id: str) -> Optional[str]:
+        """从群与好友目录中查找群名称。
+
+        先查当前上下文绑定的连接，再查其他连接；群名称与账号无关，任一账号所在的群都可以提供。
+
+        Args:
+            group_id: 群号。
+
+        Returns:
+            Optional[str]: 群名称；所有目录中都没有该群时返回 ``None``。
+        """
+        for group_entry in self._iter_group_entries(group_id):
+            if group_entry.group_name:
+                return group_entry.group_name
+        return None
+
+    def resolve_group_member_count(self, group_id: str) -> Optional[int]:
+        """从群与好友目录中查找群成员数。
+
+        Args:
+            group_id: 群号。
+
+        Returns:
+            Optional[int]: 群成员数；所有目录中都没有该群或成员数未知时返回 ``None``。
+        """
+        for group_entry in self._iter_group_entries(group_id):
+            if group_entry.member_count:
+                return group_entry.member_count
+        return None
+
+    def _iter_group_entries(self, group_id: str) -> Iterator[NapCatGroupEntry]:
+        """先在当前连接、再在其他连接的目录中依次查找群条目。
+
+        某个目录中的条目缺少群名称或成员数时，调用方应继续查看后续目录，因此这里逐个产出而不是只返回第一项。
+
+        Args:
+            group_id: 群号。
+
+        Yields:
+            NapCatGroupEntry: 各目录中该群的条目，当前连接的条目在前。
+        """
+        current_connection = _current_connection.get()
+        if current_connection is not None and (group_entry := current_connection.directory.get_group(group_id)):
+            yield group_entry
+        for connection in self._connections.values():
+            if connection is not current_connection and (group_entry := connection.directory.get_group(group_id)):
+                yield group_entry
+
+    def current_connection_id(self) -> str:
+        """返回当前上下文绑定的连接标识。
+
+        Returns:
+            str: 当前连接的标识；尚未配置任何连接时为空字符串。
+        """
+        try:
+            return self.current().connection_id
+        except RuntimeError:
+            return ""
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回全部连接的运行指标。
+
+        Returns:
+            Dict[str, Any]: 以连接名称为键的指标字典。
+        """
+        return {connection.label: connection.get_stats() for connection in self._connections.values()}
+
+    @staticmethod
+    def _first_text(*values: Any) -> str:
+        """返回第一个非空的字符串值。
+
+        Args:
+            *values: 候选值。
+
+        Returns:
+            str: 第一个去除空白后非空的字符串；都为空时返回空字符串。
+        """
+        for value in values:
+            text = str(value or "").strip()
+            if text:
+                return text
+        return ""
@@ -61,11 +61,17 @@ class NapCatEventRouter:
         self._runtime = runtime
 
     def reset_caches(self) -> None:
-        """重置与路由相关的短期缓存。"""
+        """重置与路由相关的短期缓存。
+
+        资料缓存与群成员名册由全部连接共享，这里不清空，只将其标记为过期或待对账，
+        避免一条连接断开就让其他账号的查询全部回落到 NapCat。
+        """
         runtime = self._runtime
         if runtime is None:
             return
         runtime.official_bot_guard.clear_cache()
+        runtime.query_service.profile_cache.mark_stale()
+        runtime.query_service.roster_store.mark_for_reconcile()
 
     async def handle_transport_payload(self, payload: NapCatPayloadDict) -> None:
         """处理来自传输层的非 echo 载荷。
@@ -91,10 +97,14 @@ class NapCatEventRouter:
         """
         runtime = self._require_runtime()
         settings = self._load_settings()
+        connection = runtime.connections.current()
 
+        connection.history_backfill.observe(payload)
         self_id = str(payload.get("self_id") or "").strip()
         if self_id:
-            await runtime.runtime_state.report_connected(self_id, settings.napcat_server)
+            await connection.runtime_state.report_connected(
+                self_id, connection.server_config, connection.transport.active_ws_url
+            )
 
         sender = payload.get("sender", {})
         if not isinstance(sender, Mapping):
@@ -105,6 +115,8 @@ class NapCatEventRouter:
             return
 
         group_id = str(payload.get("group_id") or "").strip()
+        if group_id:
+            runtime.query_service.roster_store.observe_sender(group_id, sender_user_id, sender)
         if self_id and sender_user_id == self_id and settings.filters.ignore_self_message:
             return
         if not runtime.chat_filter.is_inbound_chat_allowed(sender_user_id, group_id, settings.chat):
@@ -126,7 +138,7 @@ class NapCatEventRouter:
         if not runtime.regex_filter.is_message_allowed(plain_text, settings.filters):
             return
 
-        route_metadata = self._build_route_metadata(self_id, settings.napcat_server.connection_id)
+        route_metadata = self._build_route_metadata(self_id, connection.connection_id)
         external_message_id = str(payload.get("message_id") or "").strip()
         accepted = await self._gateway_capability.route_message(
             gateway_name=self._gateway_name,
@@ -145,14 +157,19 @@ class NapCatEventRouter:
             payload: NapCat 推送的通知事件。
         """
         runtime = self._require_runtime()
-        settings = self._load_settings()
+        connection = runtime.connections.current()
 
         self_id = str(payload.get("self_id") or "").strip()
         if self_id:
-            await runtime.runtime_state.report_connected(self_id, settings.napcat_server)
+            await connection.runtime_state.report_connected(
+                self_id, connection.server_config, connection.transport.active_ws_url
+            )
 
-        await runtime.ban_tracker.record_notice(payload)
-        await self.route_notice_payload(payload, self_id, settings.napcat_server.connection_id)
+        runtime.query_service.profile_cache.invalidate_from_notice(payload)
+        runtime.query_service.roster_store.apply_notice(payload)
+        connection.directory.apply_notice(payload)
+        await connection.ban_tracker.record_notice(payload)
+        await self.route_notice_payload(payload, self_id, connection.connection_id)
 
     async def route_notice_payload(
         self,
@@ -212,9 +229,9 @@ class NapCatEventRouter:
         Args:
             payload: 合成后的 NapCat 通知载荷。
         """
-        settings = self._load_settings()
-        self_id = str(payload.get("self_id") or "").strip()
-        await self.route_notice_payload(payload, self_id, settings.napcat_server.connection_id)
+        connection = self._require_runtime().connections.current()
+        self_id = str(payload.get("self_id") or "").strip() or connection.self_id
+        await self.route_notice_payload(payload, self_id, connection.connection_id)
 
     async def handle_meta_event(self, payload: NapCatPayloadDict) -> None:
         """处理 NapCat ``meta_event`` 事件。
@@ -223,7 +240,8 @@ class NapCatEventRouter:
             payload: NapCat 推送的元事件。
         """
         runtime = self._require_runtime()
-        settings = self._load_settings()
+        connection = runtime.connections.current()
+        server_config = connection.server_config
 
         meta_event_type = str(payload.get("meta_event_type") or "").strip()
         self_id = str(payload.get("self_id") or "").strip()
@@ -237,17 +255,22 @@ class NapCatEventRouter:
             should_report_connected = bool(status.get("online", False)) and bool(status.get("good", False))
 
         if self_id and should_report_connected:
-            await runtime.runtime_state.report_connected(self_id, settings.napcat_server)
+            await connection.runtime_state.report_connected(
+                self_id, server_config, connection.transport.active_ws_url
+            )
+            connection.outbox.resume()
         elif meta_event_type == "heartbeat" and not should_report_connected:
-            await runtime.runtime_state.report_disconnected()
+            await connection.runtime_state.report_disconnected()
 
-        await runtime.heartbeat_monitor.observe_meta_event(payload, settings.napcat_server.heartbeat_interval)
+        await connection.heartbeat_monitor.observe_meta_event(payload, server_config.heartbeat_interval)
         await runtime.notice_codec.handle_meta_event(payload)
 
     async def bootstrap_adapter_runtime_state(self) -> None:
         """在连接建立后主动获取账号信息并激活消息网关路由。"""
         runtime = self._require_runtime()
         settings = self._load_settings()
+        connection = runtime.connections.current()
+        server_config = connection.server_config
 
         max_attempts = 3
         last_error: Optional[Exception] = None
@@ -255,28 +278,40 @@ class NapCatEventRouter:
             try:
                 login_info = await runtime.query_service.get_login_info()
                 self_id = self._extract_self_id_from_login_response(login_info)
-                await runtime.runtime_state.report_connected(self_id, settings.napcat_server)
-                await runtime.heartbeat_monitor.start(self_id, settings.napcat_server.heartbeat_interval)
-                await runtime.ban_tracker.start()
+                await connection.runtime_state.report_connected(
+                    self_id, server_config, connection.transport.active_ws_url
+                )
+                await connection.heartbeat_monitor.start(self_id, server_config.heartbeat_interval)
+                await connection.ban_tracker.start()
+                connection.outbox.activate()
+                connection.history_backfill.schedule(settings.inbound, self_id)
+                connection.directory.start(settings.cache)
                 return
             except asyncio.CancelledError:
                 raise
             except Exception as exc:
                 last_error = exc
-                self._logger.warning(f"NapCat 消息网关获取登录信息失败，第 {attempt}/{max_attempts} 次重试: {exc}")
+                self._logger.warning(
+                    f"NapCat 消息网关获取登录信息失败 [{connection.label}]，第 {attempt}/{max_attempts} 次重试: {exc}"
+                )
                 if attempt < max_attempts:
                     await asyncio.sleep(1.0)
 
         if last_error is not None:
-            self._logger.error(f"NapCat 消息网关未能完成路由激活，连接将保持只接收状态: {last_error}")
+            self._logger.error(
+                f"NapCat 消息网关未能完成路由激活 [{connection.label}]，连接将保持只接收状态: {last_error}"
+            )
 
     async def handle_transport_disconnected(self) -> None:
         """处理传输层断开事件。"""
-        runtime = self._require_runtime()
-        await runtime.heartbeat_monitor.stop()
-        await runtime.ban_tracker.stop()
+        connection = self._require_runtime().connections.current()
+        connection.outbox.deactivate()
+        connection.history_backfill.mark_disconnected()
+        connection.directory.stop()
+        await connection.heartbeat_monitor.stop()
+        await connection.ban_tracker.stop()
         self.reset_caches()
-        await runtime.runtime_state.report_disconnected()
+        await connection.runtime_state.report_disconnected()
 
     async def handle_heartbeat_timeout(self, self_id: str) -> None:
         """处理 NapCat 心跳长时间未更新的情况。
@@ -284,12 +319,13 @@ class NapCatEventRouter:
         Args:
             self_id: 当前机器人账号 ID。
         """
-        runtime = self._require_runtime()
+        connection = self._require_runtime().connections.current()
         if self_id:
             self._logger.warning(f"NapCat Bot {self_id} 心跳超时，暂时将消息网关标记为未就绪")
         else:
-            self._logger.warning("NapCat 心跳超时，暂时将消息网关标记为未就绪")
-        await runtime.runtime_state.report_disconnected()
+            self._logger.warning(f"NapCat 心跳超时 [{connection.label}]，暂时将消息网关标记为未就绪")
+        connection.outbox.pause()
+        await connection.runtime_state.report_disconnected()
 
     def _require_runtime(self) -> NapCatRuntimeBundle:
         """返回当前已绑定的运行时依赖。
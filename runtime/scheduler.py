@@ -0,0 +1,360 @@
+"""NapCat 运行时统一定时调度器。"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import inspect
+import itertools
+
+_HEAP_COMPACT_MIN_CANCELLED = 64
+
+
+class NapCatScheduledJob:
+    """调度器中的单个定时任务句柄。"""
+
+    __slots__ = (
+        "_scheduler",
+        "args",
+        "callback",
+        "cancelled",
+        "context",
+        "deadline",
+        "in_heap",
+        "interval_sec",
+        "name",
+        "running",
+    )
+
+    def __init__(
+        self,
+        scheduler: "NapCatRuntimeScheduler",
+        name: str,
+        deadline: float,
+        callback: Callable[..., Any],
+        args: Tuple[Any, ...],
+        interval_sec: Optional[float],
+    ) -> None:
+        """初始化定时任务句柄。
+
+        Args:
+            scheduler: 所属调度器。
+            name: 任务名，用于统计与日志。
+            deadline: 下次触发的事件循环时间。
+            callback: 到期时调用的回调；返回可等待对象时会作为后台任务执行。
+                回调总在登记任务时的上下文副本中运行，与 ``loop.call_at`` 的行为一致。
+            args: 传给回调的位置参数。
+            interval_sec: 周期任务的间隔秒数；一次性任务为 ``None``。
+        """
+        self._scheduler = scheduler
+        self.name = name
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.interval_sec = interval_sec
+        self.context = contextvars.copy_context()
+        self.cancelled: bool = False
+        self.in_heap: bool = False
+        self.running: bool = False
+
+    @property
+    def active(self) -> bool:
+        """返回任务是否仍会在未来触发或正在执行。"""
+        return not self.cancelled and (self.in_heap or self.running)
+
+    def cancel(self) -> None:
+        """取消任务；已取消的任务再次调用不会产生影响。"""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        self._scheduler._handle_job_cancelled(self)
+
+
+class NapCatRuntimeScheduler:
+    """以单个最小堆与单个事件循环定时器驱动全部运行时定时任务。
+
+    动作超时、心跳检查、禁言自然解除与缓存过期等任务都登记在同一个堆中，
+    事件循环上始终只挂一个指向最早到期时间的定时器。取消任务只做标记，
+    已取消条目在出堆时跳过，数量过多时整体压缩。
+    """
+
+    def __init__(self, logger: Any) -> None:
+        """初始化调度器。
+
+        Args:
+            logger: 插件日志对象。
+        """
+        self._logger = logger
+        self._heap: List[Tuple[float, int, NapCatScheduledJob]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending_by_name: Counter[str] = Counter()
+        self._periodic_jobs: Set[NapCatScheduledJob] = set()
+        self._running_tasks: Set[asyncio.Task[Any]] = set()
+        self._cancelled_in_heap: int = 0
+        self._fired_total: int = 0
+        self._failed_total: int = 0
+
+    def time(self) -> float:
+        """返回调度器使用的单调时钟时间。
+
+        Returns:
+            float: 当前事件循环时间。
+        """
+        return self._get_loop().time()
+
+    def call_at(self, deadline: float, callback: Callable[..., Any], *args: Any, name: str) -> NapCatScheduledJob:
+        """在指定事件循环时间执行一次回调。
+
+        Args:
+            deadline: 触发时间，与 ``time()`` 同一时钟。
+            callback: 到期时调用的回调。
+            *args: 传给回调的位置参数。
+            name: 任务名。
+
+        Returns:
+            NapCatScheduledJob: 可用于取消的任务句柄。
+        """
+        job = NapCatScheduledJob(self, name, deadline, callback, args, None)
+        self._push(job)
+        return job
+
+    def call_later(self, delay_sec: float, callback: Callable[..., Any], *args: Any, name: str) -> NapCatScheduledJob:
+        """在指定秒数后执行一次回调。
+
+        Args:
+            delay_sec: 延迟秒数，小于 ``0`` 时按 ``0`` 处理。
+            callback: 到期时调用的回调。
+            *args: 传给回调的位置参数。
+            name: 任务名。
+
+        Returns:
+            NapCatScheduledJob: 可用于取消的任务句柄。
+        """
+        return self.call_at(self.time() + max(0.0, float(delay_sec)), callback, *args, name=name)
+
+    def every(
+        self,
+        interval_sec: float,
+        callback: Callable[..., Any],
+        *args: Any,
+        name: str,
+        initial_delay_sec: Optional[float] = None,
+    ) -> NapCatScheduledJob:
+        """按固定间隔重复执行回调。
+
+        异步回调上一轮结束后才会安排下一轮，因此同一周期任务不会重叠执行。
+        修改句柄的 ``interval_sec`` 会从下一轮开始生效。
+
+        Args:
+            interval_sec: 间隔秒数。
+            callback: 每轮调用的回调。
+            *args: 传给回调的位置参数。
+            name: 任务名。
+            initial_delay_sec: 首轮延迟秒数；为空时等于 ``interval_sec``。
+
+        Returns:
+            NapCatScheduledJob: 可用于取消或调整间隔的任务句柄。
+        """
+        interval_sec = max(0.001, float(interval_sec))
+        first_delay_sec = interval_sec if initial_delay_sec is None else max(0.0, float(initial_delay_sec))
+        job = NapCatScheduledJob(self, name, self.time() + first_delay_sec, callback, args, interval_sec)
+        self._periodic_jobs.add(job)
+        self._push(job)
+        return job
+
+    async def shutdown(self) -> None:
+        """取消全部任务与仍在执行的回调。"""
+        for _deadline, _sequence, job in self._heap:
+            job.cancelled = True
+            job.in_heap = False
+        for job in self._periodic_jobs:
+            job.cancelled = True
+        self._heap.clear()
+        self._periodic_jobs.clear()
+        self._pending_by_name.clear()
+        self._cancelled_in_heap = 0
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        running_tasks = list(self._running_tasks)
+        for task in running_tasks:
+            task.cancel()
+        if running_tasks:
+            with contextlib.suppress(Exception):
+                await asyncio.gather(*running_tasks, return_exceptions=True)
+        self._running_tasks.clear()
+        self._loop = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回调度器的运行指标。
+
+        Returns:
+            Dict[str, Any]: 待触发任务数量、按任务名分组的计数、周期任务列表与触发计数。
+        """
+        now = self._loop.time() if self._loop is not None else 0.0
+        next_deadline = self._heap[0][0] if self._heap else None
+        periodic_jobs = sorted(self._periodic_jobs, key=lambda job: job.name)
+        return {
+            "pending_jobs": sum(self._pending_by_name.values()),
+            "pending_by_name": dict(sorted(self._pending_by_name.items())),
+            "heap_size": len(self._heap),
+            "cancelled_in_heap": self._cancelled_in_heap,
+            "next_due_in_sec": round(max(0.0, next_deadline - now), 3) if next_deadline is not None else None,
+            "periodic_jobs": [
+                {
+                    "name": job.name,
+                    "interval_sec": job.interval_sec,
+                    "due_in_sec": None if job.running else round(max(0.0, job.deadline - now), 3),
+                    "running": job.running,
+                }
+                for job in periodic_jobs
+            ],
+            "running_callbacks": len(self._running_tasks),
+            "fired": self._fired_total,
+            "failed": self._failed_total,
+        }
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """返回当前运行中的事件循环。
+
+        Returns:
+            asyncio.AbstractEventLoop: 调度器绑定的事件循环。
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return self._loop
+
+    def _push(self, job: NapCatScheduledJob) -> None:
+        """将任务放入堆中并按需重新挂载定时器。
+
+        Args:
+            job: 待登记的任务。
+        """
+        heapq.heappush(self._heap, (job.deadline, next(self._sequence), job))
+        job.in_heap = True
+        self._pending_by_name[job.name] += 1
+        self._arm()
+
+    def _handle_job_cancelled(self, job: NapCatScheduledJob) -> None:
+        """处理任务句柄的取消。
+
+        Args:
+            job: 被取消的任务。
+        """
+        self._periodic_jobs.discard(job)
+        if not job.in_heap:
+            return
+
+        self._decrement_pending(job.name)
+        self._cancelled_in_heap += 1
+        if self._cancelled_in_heap >= _HEAP_COMPACT_MIN_CANCELLED and self._cancelled_in_heap * 2 >= len(self._heap):
+            for _deadline, _sequence, cancelled_job in self._heap:
+                if cancelled_job.cancelled:
+                    cancelled_job.in_heap = False
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled_in_heap = 0
+
+    def _decrement_pending(self, name: str) -> None:
+        """减少指定任务名的待触发计数。
+
+        Args:
+            name: 任务名。
+        """
+        remaining = self._pending_by_name[name] - 1
+        if remaining > 0:
+            self._pending_by_name[name] = remaining
+        else:
+            self._pending_by_name.pop(name, None)
+
+    def _arm(self) -> None:
+        """让事件循环定时器指向堆中最早的未取消任务。"""
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)[2].in_heap = False
+            self._cancelled_in_heap = max(0, self._cancelled_in_heap - 1)
+
+        if not heap:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            return
+
+        next_deadline = heap[0][0]
+        if self._timer is not None:
+            if self._timer.when() <= next_deadline:
+                return
+            self._timer.cancel()
+        self._timer = self._get_loop().call_at(next_deadline, self._run_due_jobs)
+
+    def _run_due_jobs(self) -> None:
+        """执行所有已到期的任务。"""
+        self._timer = None
+        loop = self._get_loop()
+        now = loop.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _deadline, _sequence, job = heapq.heappop(heap)
+            job.in_heap = False
+            if job.cancelled:
+                self._cancelled_in_heap = max(0, self._cancelled_in_heap - 1)
+                continue
+            self._decrement_pending(job.name)
+            self._fire(job)
+        self._arm()
+
+    def _fire(self, job: NapCatScheduledJob) -> None:
+        """执行单个到期任务，并为周期任务安排下一轮。
+
+        Args:
+            job: 已到期的任务。
+        """
+        self._fired_total += 1
+        try:
+            result = job.context.run(job.callback, *job.args)
+        except Exception as exc:
+            self._failed_total += 1
+            self._logger.error(f"NapCat 定时任务 {job.name} 执行失败: {exc}", exc_info=True)
+            result = None
+
+        if inspect.isawaitable(result):
+            job.running = True
+            task = job.context.run(asyncio.ensure_future, result)
+            self._running_tasks.add(task)
+            task.add_done_callback(lambda finished_task: self._handle_callback_done(job, finished_task))
+            return
+
+        self._reschedule_periodic(job)
+
+    def _handle_callback_done(self, job: NapCatScheduledJob, task: asyncio.Future[Any]) -> None:
+        """处理异步回调结束后的异常记录与周期续排。
+
+        Args:
+            job: 回调所属任务。
+            task: 已结束的回调任务。
+        """
+        self._running_tasks.discard(task)  # type: ignore[arg-type]
+        job.running = False
+        if not task.cancelled() and task.exception() is not None:
+            self._failed_total += 1
+            self._logger.error(f"NapCat 定时任务 {job.name} 执行失败: {task.exception()}", exc_info=task.exception())
+        self._reschedule_periodic(job)
+
+    def _reschedule_periodic(self, job: NapCatScheduledJob) -> None:
+        """为仍然有效的周期任务安排下一轮。
+
+        Args:
+            job: 刚执行完成的任务。
+        """
+        if job.interval_sec is None or job.cancelled:
+            return
+        job.deadline = self.time() + job.interval_sec
+        self._push(job)
@@ -45,13 +45,45 @@ class NapCatRuntimeStateManager:
         self._runtime_state_connected: bool = False
         self._reported_account_id: Optional[str] = None
         self._reported_scope: Optional[str] = None
+        self._reported_ws_url: Optional[str] = None
+        self._last_account_id: str = ""
 
-    async def report_connected(self, account_id: str, server_config: NapCatServerConfig) -> bool:
+    @property
+    def account_id(self) -> str:
+        """返回当前已上报就绪的机器人账号 ID。
+
+        Returns:
+            str: 已激活路由的账号 ID；尚未激活时为空字符串。
+        """
+
+        if not self._runtime_state_connected:
+            return ""
+        return self._reported_account_id or ""
+
+    @property
+    def last_account_id(self) -> str:
+        """返回最近一次激活路由的机器人账号 ID，连接断开后仍保留。
+
+        Returns:
+            str: 最近一次上报就绪的账号 ID；从未激活过路由时为空字符串。
+        """
+
+        return self._last_account_id
+
+    async def report_connected(
+        self,
+        account_id: str,
+        server_config: NapCatServerConfig,
+        ws_url: str = "",
+    ) -> bool:
         """向 Host 上报当前消息网关连接已就绪。
 
+        当前使用的地址发生切换时会重新上报，以便 Host 侧元数据始终反映实际连接的地址。
+
         Args:
             account_id: 当前 NapCat 连接对应的机器人账号 ID。
             server_config: 当前生效的 NapCat 服务端配置。
+            ws_url: 实际连接的 WebSocket 地址；为空时视为主地址。
 
         Returns:
             bool: 若 Host 接受了运行时状态更新，则返回 ``True``。
@@ -62,10 +94,13 @@ class NapCatRuntimeStateManager:
             return False
 
         scope = server_config.connection_id or None
+        primary_ws_url = server_config.build_ws_url()
+        active_ws_url = ws_url or primary_ws_url
         if (
             self._runtime_state_connected
             and self._reported_account_id == normalized_account_id
             and self._reported_scope == scope
+            and self._reported_ws_url == active_ws_url
         ):
             return True
 
@@ -77,7 +112,11 @@ class NapCatRuntimeStateManager:
                 platform="qq",
                 account_id=normalized_account_id,
                 scope=server_config.connection_id,
-                metadata={"ws_url": server_config.build_ws_url()},
+                metadata={
+                    "ws_url": active_ws_url,
+                    "primary_ws_url": primary_ws_url,
+                    "failover": active_ws_url != primary_ws_url,
+                },
             )
         except Exception as exc:
             self._logger.warning(f"NapCat 消息网关上报连接就绪状态失败: {exc}")
@@ -90,9 +129,11 @@ class NapCatRuntimeStateManager:
         self._runtime_state_connected = True
         self._reported_account_id = normalized_account_id
         self._reported_scope = scope
+        self._reported_ws_url = active_ws_url
+        self._last_account_id = normalized_account_id
         self._logger.info(
             f"NapCat 消息网关已激活路由: platform=qq account_id={normalized_account_id} "
-            f"scope={self._reported_scope or '*'}"
+            f"scope={self._reported_scope or '*'} ws_url={active_ws_url}"
         )
         return True
 
@@ -102,6 +143,7 @@ class NapCatRuntimeStateManager:
         if not self._runtime_state_connected:
             self._reported_account_id = None
             self._reported_scope = None
+            self._reported_ws_url = None
             return
 
         try:
@@ -109,6 +151,8 @@ class NapCatRuntimeStateManager:
                 gateway_name=self._gateway_name,
                 ready=False,
                 platform="qq",
+                account_id=self._reported_account_id or "",
+                scope=self._reported_scope or "",
             )
         except Exception as exc:
             self._logger.warning(f"NapCat 消息网关上报断开状态失败: {exc}")
@@ -116,3 +160,4 @@ class NapCatRuntimeStateManager:
             self._runtime_state_connected = False
             self._reported_account_id = None
             self._reported_scope = None
+            self._reported_ws_url = None
@@ -2,8 +2,19 @@
 
 from .action_service import NapCatActionService
 from .ban_tracker import NapCatBanTracker
-from .ban_state_store import NapCatBanRecord, NapCatBanStateStore
+from .ban_state_store import NapCatBanRecord, NapCatBanStateStore, build_ban_state_storage_path
+from .contact_directory import (
+    NapCatContactDirectory,
+    NapCatContactDirectorySnapshot,
+    NapCatFriendEntry,
+    NapCatGroupEntry,
+)
+from .group_roster import NapCatGroupRoster, NapCatGroupRosterStore
+from .history_backfill import NapCatChatCursor, NapCatHistoryBackfill
+from .member_batcher import NapCatMemberLookupBatcher
 from .official_bot_guard import NapCatOfficialBotGuard
+from .offline_outbox import NapCatOfflineOutbox, NapCatOutboxEntry, build_outbox_spill_path
+from .profile_cache import NapCatProfileCache
 from .query_service import NapCatQueryService
 
 __all__ = [
@@ -11,6 +22,20 @@ __all__ = [
     "NapCatBanRecord",
     "NapCatBanStateStore",
     "NapCatBanTracker",
+    "NapCatChatCursor",
+    "NapCatContactDirectory",
+    "NapCatContactDirectorySnapshot",
+    "NapCatFriendEntry",
+    "NapCatGroupEntry",
+    "NapCatGroupRoster",
+    "NapCatGroupRosterStore",
+    "NapCatHistoryBackfill",
+    "NapCatMemberLookupBatcher",
     "NapCatOfficialBotGuard",
+    "NapCatOfflineOutbox",
+    "NapCatOutboxEntry",
+    "NapCatProfileCache",
     "NapCatQueryService",
+    "build_ban_state_storage_path",
+    "build_outbox_spill_path",
 ]
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional
+from typing import Any, Dict, Mapping, Optional, Protocol, Tuple
 
 import asyncio
+import copy
+import json
 
 try:
     from aiohttp import ClientSession, ClientTimeout
@@ -15,22 +17,79 @@ except ImportError:
     ClientTimeout = None  # type: ignore[assignment]
     AIOHTTP_AVAILABLE = False
 
-if TYPE_CHECKING:
-    from ..transport import NapCatTransportClient
 
+class _ActionTransportProtocol(Protocol):
+    """可发送 OneBot 动作的传输层协议。"""
 
-class NapCatActionService:
-    """NapCat 底层动作与资源访问服务。"""
+    async def call_action(self, action_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """发送 OneBot 动作并等待对应的 echo 响应。"""
+        ...
+
+    def current_connection_id(self) -> str:
+        """返回当前上下文中动作将发往的连接标识。"""
+        ...
+
+
+class _SharedRequest:
+    """一次在途的只读动作请求及其等待方数量。"""
+
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: "asyncio.Future[Dict[str, Any]]") -> None:
+        """初始化在途请求。
 
-    def __init__(self, logger: Any, transport: "NapCatTransportClient") -> None:
+        Args:
+            future: 实际发送动作的任务。
+        """
+        self.future = future
+        self.waiters = 1
+
+
+class NapCatActionService:
+    """NapCat 底层动作与资源访问服务。
+
+    只读查询动作按“连接 + 动作名 + 参数”合并：同一时刻已有相同请求在途时，后来的调用直接等待
+    在途请求的结果，不再向 NapCat 重复发送。发生合并时每个等待方拿到的是响应的独立副本。
+    """
+
+    # 可以合并的只读动作；写操作与每次结果都可能不同的动作（如获取凭证）不在此列
+    _COALESCED_ACTIONS = frozenset(
+        {
+            "get_essence_msg_list",
+            "get_file",
+            "get_forward_msg",
+            "get_friend_list",
+            "get_friend_msg_history",
+            "get_group_detail_info",
+            "get_group_honor_info",
+            "get_group_info",
+            "get_group_info_ex",
+            "get_group_list",
+            "get_group_member_info",
+            "get_group_member_list",
+            "get_group_msg_history",
+            "get_group_shut_list",
+            "get_image",
+            "get_login_info",
+            "get_msg",
+            "get_record",
+            "get_status",
+            "get_stranger_info",
+            "get_version_info",
+        }
+    )
+
+    def __init__(self, logger: Any, transport: _ActionTransportProtocol) -> None:
         """初始化底层动作服务。
 
         Args:
             logger: 插件日志对象。
-            transport: NapCat 传输层客户端。
+            transport: 动作发送入口，通常为按当前上下文选择账号连接的连接管理器。
         """
         self._logger = logger
         self._transport = transport
+        self._in_flight: Dict[Tuple[str, str, str], _SharedRequest] = {}
+        self._coalesce_counts: Dict[str, Dict[str, int]] = {}
 
     async def call_action(self, action_name: str, params: Mapping[str, Any]) -> Dict[str, Any]:
         """调用 OneBot 动作并要求返回成功结果。
@@ -47,7 +106,10 @@ class NapCatActionService:
         """
         normalized_params = {str(key): value for key, value in params.items()}
         try:
-            response = await self._transport.call_action(action_name, normalized_params)
+            if action_name in self._COALESCED_ACTIONS:
+                response = await self._call_coalesced(action_name, normalized_params)
+            else:
+                response = await self._transport.call_action(action_name, normalized_params)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
@@ -89,6 +151,74 @@ class NapCatActionService:
             self._logger.warning(f"NapCat 查询动作执行失败: action={action_name} error={exc}")
             return None
 
+    def get_stats(self) -> Dict[str, Any]:
+        """返回只读动作合并的运行指标。
+
+        Returns:
+            Dict[str, Any]: 当前在途的合并请求数，以及每个动作的调用数、被合并的调用数与合并比例。
+        """
+        actions: Dict[str, Dict[str, Any]] = {}
+        for action_name, counts in sorted(self._coalesce_counts.items()):
+            requests = counts["requests"]
+            coalesced = counts["coalesced"]
+            actions[action_name] = {
+                "requests": requests,
+                "coalesced": coalesced,
+                "sent": requests - coalesced,
+                "coalesce_ratio": round(coalesced / requests, 4) if requests else 0.0,
+            }
+        return {"in_flight": len(self._in_flight), "actions": actions}
+
+    async def _call_coalesced(self, action_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """发送只读动作；已有相同请求在途时等待其结果。
+
+        实际请求放在独立任务中执行，任一等待方被取消都不会影响其他等待方。
+
+        Args:
+            action_name: OneBot 动作名称。
+            params: 规范化后的动作参数。
+
+        Returns:
+            Dict[str, Any]: NapCat 返回的原始响应字典的副本。
+        """
+        request_key = (
+            self._transport.current_connection_id(),
+            action_name,
+            json.dumps(params, ensure_ascii=False, sort_keys=True, default=str),
+        )
+        counts = self._coalesce_counts.setdefault(action_name, {"requests": 0, "coalesced": 0})
+        counts["requests"] += 1
+
+        shared_request = self._in_flight.get(request_key)
+        is_leader = shared_request is None
+        if shared_request is None:
+            shared_request = _SharedRequest(asyncio.ensure_future(self._transport.call_action(action_name, params)))
+            self._in_flight[request_key] = shared_request
+            shared_request.future.add_done_callback(lambda future: self._finish_shared_request(request_key, future))
+        else:
+            shared_request.waiters += 1
+            counts["coalesced"] += 1
+
+        response = await asyncio.shield(shared_request.future)
+        # 无人合并时直接返回原始响应，避免复制大列表
+        if is_leader and shared_request.waiters == 1:
+            return response
+        return copy.deepcopy(response)
+
+    def _finish_shared_request(self, request_key: Tuple[str, str, str], future: "asyncio.Future[Any]") -> None:
+        """移除已结束的合并请求，并取走其异常。
+
+        全部等待方都已被取消时没有人读取共享任务的结果，这里读取一次异常，避免事件循环记录
+        ``Task exception was never retrieved``；等待方仍会通过 ``shield`` 收到同一异常。
+
+        Args:
+            request_key: 合并请求的键。
+            future: 已结束的共享请求任务。
+        """
+        self._in_flight.pop(request_key, None)
+        if not future.cancelled():
+            future.exception()
+
     async def download_binary(self, url: str) -> Optional[bytes]:
         """下载远程二进制资源。
 
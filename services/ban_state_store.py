@@ -14,6 +14,21 @@ _PROJECT_ROOT = Path(__file__).resolve().parents[2]
 _DEFAULT_STORAGE_PATH = _PROJECT_ROOT / "data" / "napcat_adapter" / "ban_state.json"
 
 
+def build_ban_state_storage_path(connection_id: str = "") -> Path:
+    """返回指定连接的禁言状态持久化文件路径。
+
+    Args:
+        connection_id: 连接标识；为空时返回主连接沿用的默认路径。
+
+    Returns:
+        Path: 禁言状态 JSON 文件路径。
+    """
+    if not connection_id:
+        return _DEFAULT_STORAGE_PATH
+    safe_connection_id = "".join(char if char.isalnum() or char in "-_" else "_" for char in connection_id)
+    return _DEFAULT_STORAGE_PATH.with_name(f"ban_state.{safe_connection_id}.json")
+
+
 @dataclass
 class NapCatBanRecord:
     """NapCat 禁言记录。"""
@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Mapping, Optional
 
-import asyncio
-import contextlib
 import time
 
 from .ban_state_store import NapCatBanRecord, NapCatBanStateStore
 from .query_service import NapCatQueryService
 
+if TYPE_CHECKING:
+    from ..runtime.scheduler import NapCatRuntimeScheduler, NapCatScheduledJob
+
+_WHOLE_BAN_REFRESH_INTERVAL_SEC = 5.0
+
 
 class NapCatBanTracker:
     """NapCat 群禁言状态跟踪器。"""
@@ -21,6 +24,7 @@ class NapCatBanTracker:
         query_service: NapCatQueryService,
         on_natural_lift: Callable[[Dict[str, Any]], Awaitable[None]],
         state_store: NapCatBanStateStore,
+        scheduler: "NapCatRuntimeScheduler",
     ) -> None:
         """初始化群禁言状态跟踪器。
 
@@ -29,28 +33,38 @@ class NapCatBanTracker:
             query_service: NapCat 查询服务。
             on_natural_lift: 检测到自然解除禁言后的回调。
             state_store: 禁言状态存储仓库。
+            scheduler: 运行时统一调度器，用于登记解除时间与全体禁言刷新。
         """
         self._logger = logger
         self._query_service = query_service
         self._on_natural_lift = on_natural_lift
         self._state_store = state_store
-        self._poll_task: Optional[asyncio.Task[None]] = None
+        self._scheduler = scheduler
+        self._whole_ban_refresh_job: Optional["NapCatScheduledJob"] = None
+        self._lift_jobs: Dict[str, "NapCatScheduledJob"] = {}
 
     async def start(self) -> None:
         """启动禁言状态跟踪。"""
         await self._state_store.load()
         await self._refresh_records_from_remote()
-        if self._poll_task is None or self._poll_task.done():
-            self._poll_task = asyncio.create_task(self._poll_loop(), name="napcat_adapter.ban_tracker")
+        for record in await self._state_store.snapshot():
+            self._schedule_lift(record)
+        if self._whole_ban_refresh_job is None or not self._whole_ban_refresh_job.active:
+            self._whole_ban_refresh_job = self._scheduler.every(
+                _WHOLE_BAN_REFRESH_INTERVAL_SEC,
+                self._refresh_whole_ban_records,
+                name="ban_tracker.whole_ban_refresh",
+            )
 
     async def stop(self) -> None:
         """停止禁言状态跟踪并落盘当前记录。"""
-        poll_task = self._poll_task
-        self._poll_task = None
-        if poll_task is not None:
-            poll_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await poll_task
+        whole_ban_refresh_job = self._whole_ban_refresh_job
+        self._whole_ban_refresh_job = None
+        if whole_ban_refresh_job is not None:
+            whole_ban_refresh_job.cancel()
+        for lift_job in self._lift_jobs.values():
+            lift_job.cancel()
+        self._lift_jobs.clear()
         await self._state_store.persist()
 
     async def record_notice(self, payload: Mapping[str, Any]) -> None:
@@ -72,11 +86,14 @@ class NapCatBanTracker:
         if sub_type == "ban":
             duration = self._normalize_int(payload.get("duration"), default=-1)
             lift_time = -1 if user_id == "0" or duration <= 0 else int(time.time()) + duration
-            await self._state_store.upsert(NapCatBanRecord(group_id=group_id, user_id=user_id, lift_time=lift_time))
+            record = NapCatBanRecord(group_id=group_id, user_id=user_id, lift_time=lift_time)
+            await self._state_store.upsert(record)
+            self._schedule_lift(record)
             return
 
         if sub_type in {"lift_ban", "whole_lift_ban"}:
             await self._state_store.remove(group_id=group_id, user_id=user_id)
+            self._cancel_lift(f"{group_id}:{user_id}")
 
     async def _refresh_records_from_remote(self) -> None:
         """基于当前 QQ 平台状态校正本地禁言记录。"""
@@ -92,7 +109,7 @@ class NapCatBanTracker:
         Args:
             record: 待刷新的禁言记录。
         """
-        group_info = await self._query_service.get_group_info(record.group_id)
+        group_info = await self._query_service.get_group_info(record.group_id, no_cache=True)
         if group_info is None:
             await self._emit_natural_lift(record)
             return
@@ -118,21 +135,58 @@ class NapCatBanTracker:
             return
 
         if shut_up_timestamp != record.lift_time:
-            await self._state_store.upsert(
-                NapCatBanRecord(group_id=record.group_id, user_id=record.user_id, lift_time=shut_up_timestamp)
+            refreshed_record = NapCatBanRecord(
+                group_id=record.group_id,
+                user_id=record.user_id,
+                lift_time=shut_up_timestamp,
             )
+            await self._state_store.upsert(refreshed_record)
+            self._schedule_lift(refreshed_record)
+
+    async def _refresh_whole_ban_records(self) -> None:
+        """刷新全体禁言记录，由调度器周期调用。
+
+        全体禁言没有解除时间，只能定期查询群信息确认是否已被解除。
+        """
+        for record in await self._state_store.snapshot():
+            if record.user_id == "0":
+                await self._refresh_whole_ban_record(record)
+
+    def _schedule_lift(self, record: NapCatBanRecord) -> None:
+        """按记录的解除时间登记自然解除任务。
 
-    async def _poll_loop(self) -> None:
-        """后台轮询自然解除禁言。"""
-        while True:
-            await asyncio.sleep(5.0)
-            current_timestamp = int(time.time())
-            for record in await self._state_store.snapshot():
-                if record.user_id == "0":
-                    await self._refresh_whole_ban_record(record)
-                    continue
-                if record.lift_time != -1 and record.lift_time <= current_timestamp:
-                    await self._emit_natural_lift(record)
+        Args:
+            record: 禁言记录；全体禁言或无解除时间的记录不会登记。
+        """
+        self._cancel_lift(record.record_key)
+        if record.user_id == "0" or record.lift_time == -1:
+            return
+
+        self._lift_jobs[record.record_key] = self._scheduler.call_later(
+            record.lift_time - time.time(),
+            self._handle_lift_due,
+            record,
+            name="ban_tracker.natural_lift",
+        )
+
+    def _cancel_lift(self, record_key: str) -> None:
+        """取消已登记的自然解除任务。
+
+        Args:
+            record_key: 禁言记录键。
+        """
+        lift_job = self._lift_jobs.pop(record_key, None)
+        if lift_job is not None:
+            lift_job.cancel()
+
+    async def _handle_lift_due(self, record: NapCatBanRecord) -> None:
+        """在解除时间到达后上报自然解除。
+
+        Args:
+            record: 到期的禁言记录。
+        """
+        self._lift_jobs.pop(record.record_key, None)
+        await self._emit_natural_lift(record)
 
     async def _emit_natural_lift(self, record: NapCatBanRecord) -> None:
         """上报自然解除禁言事件。
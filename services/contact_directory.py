@@ -0,0 +1,331 @@
+"""NapCat 账号的群与好友目录。"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, replace
+from typing import TYPE_CHECKING, Any, Coroutine, Dict, Mapping, Optional, Tuple
+
+import asyncio
+import time
+
+from .query_service import NapCatQueryService
+
+if TYPE_CHECKING:
+    from ..config import NapCatCacheConfig
+    from ..runtime.scheduler import NapCatRuntimeScheduler, NapCatScheduledJob
+
+
+@dataclass(frozen=True)
+class NapCatGroupEntry:
+    """目录中的一个群。"""
+
+    group_id: str
+    group_name: str
+    member_count: int
+    max_member_count: int
+
+
+@dataclass(frozen=True)
+class NapCatFriendEntry:
+    """目录中的一个好友。"""
+
+    user_id: str
+    nickname: str
+    remark: str
+
+
+@dataclass(frozen=True)
+class NapCatContactDirectorySnapshot:
+    """某一时刻的群与好友目录。"""
+
+    groups: Tuple[NapCatGroupEntry, ...]
+    friends: Tuple[NapCatFriendEntry, ...]
+    groups_loaded_at: Optional[float]
+    friends_loaded_at: Optional[float]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """将快照转换为可序列化字典。
+
+        Returns:
+            Dict[str, Any]: ``groups``、``friends`` 列表与两者最近一次全量加载的 Unix 时间戳（未加载时为 ``None``）。
+        """
+        return {
+            "groups": [asdict(entry) for entry in self.groups],
+            "friends": [asdict(entry) for entry in self.friends],
+            "groups_loaded_at": self.groups_loaded_at,
+            "friends_loaded_at": self.friends_loaded_at,
+        }
+
+
+class NapCatContactDirectory:
+    """单个账号所在群与好友的内存目录。
+
+    连接完成账号初始化后并发拉取 ``get_group_list`` 与 ``get_friend_list`` 建立目录，之后按
+    ``directory_refresh_interval_sec`` 在后台全量刷新；两次刷新之间依据入群、退群、群名称变更与新增好友通知
+    增量更新。入站消息与通知据此填写群名称，不再逐条查询 ``get_group_info``。
+    断开连接时停止刷新但保留已有条目，重连后的首次刷新会整体替换。
+    """
+
+    def __init__(self, logger: Any, query_service: NapCatQueryService, scheduler: "NapCatRuntimeScheduler") -> None:
+        """初始化群与好友目录。
+
+        Args:
+            logger: 插件日志对象。
+            query_service: NapCat 查询服务。
+            scheduler: 运行时统一调度器，用于登记后台刷新。
+        """
+        self._logger = logger
+        self._query_service = query_service
+        self._scheduler = scheduler
+        self._groups: Dict[str, NapCatGroupEntry] = {}
+        self._friends: Dict[str, NapCatFriendEntry] = {}
+        self._groups_loaded_at: Optional[float] = None
+        self._friends_loaded_at: Optional[float] = None
+        self._refresh_job: Optional["NapCatScheduledJob"] = None
+        self._pending_lookups: Dict[str, "asyncio.Task[None]"] = {}
+        self._refreshes_total: int = 0
+        self._refresh_failures_total: int = 0
+        self._notice_updates_total: int = 0
+
+    def start(self, cache_config: "NapCatCacheConfig") -> None:
+        """立即在后台建立目录，并登记周期刷新。
+
+        Args:
+            cache_config: 当前生效的资料缓存配置。
+        """
+        self.stop()
+        self._refresh_job = self._scheduler.every(
+            cache_config.directory_refresh_interval_sec,
+            self.refresh,
+            name="contact_directory.refresh",
+            initial_delay_sec=0.0,
+        )
+
+    def stop(self) -> None:
+        """停止后台刷新与尚未完成的单项查询，保留已有条目。"""
+        if self._refresh_job is not None:
+            self._refresh_job.cancel()
+            self._refresh_job = None
+        for lookup_task in self._pending_lookups.values():
+            lookup_task.cancel()
+        self._pending_lookups.clear()
+
+    async def refresh(self) -> None:
+        """并发拉取群列表与好友列表，并整体替换对应目录。
+
+        某一列表获取失败时保留该列表的原有条目。
+        """
+        self._refreshes_total += 1
+        group_list, friend_list = await asyncio.gather(
+            self._query_service.get_group_list(),
+            self._query_service.get_friend_list(),
+        )
+        now = time.time()
+        if group_list is not None:
+            groups = (self._build_group_entry(item) for item in group_list)
+            self._groups = {entry.group_id: entry for entry in groups if entry is not None}
+            self._groups_loaded_at = now
+        if friend_list is not None:
+            friends = (self._build_friend_entry(item) for item in friend_list)
+            self._friends = {entry.user_id: entry for entry in friends if entry is not None}
+            self._friends_loaded_at = now
+        if group_list is None or friend_list is None:
+            self._refresh_failures_total += 1
+            self._logger.warning(
+                f"NapCat 群与好友目录刷新不完整: groups={'ok' if group_list is not None else 'failed'} "
+                f"friends={'ok' if friend_list is not None else 'failed'}"
+            )
+
+    def group_name(self, group_id: str) -> Optional[str]:
+        """返回目录中的群名称。
+
+        Args:
+            group_id: 群号。
+
+        Returns:
+            Optional[str]: 群名称；目录中没有该群或名称为空时返回 ``None``。
+        """
+        entry = self._groups.get(str(group_id))
+        if entry is None or not entry.group_name:
+            return None
+        return entry.group_name
+
+    def get_group(self, group_id: str) -> Optional[NapCatGroupEntry]:
+        """返回目录中的群条目。
+
+        Args:
+            group_id: 群号。
+
+        Returns:
+            Optional[NapCatGroupEntry]: 群条目；不存在时返回 ``None``。
+        """
+        return self._groups.get(str(group_id))
+
+    def get_friend(self, user_id: str) -> Optional[NapCatFriendEntry]:
+        """返回目录中的好友条目。
+
+        Args:
+            user_id: 好友 QQ 号。
+
+        Returns:
+            Optional[NapCatFriendEntry]: 好友条目；不存在时返回 ``None``。
+        """
+        return self._friends.get(str(user_id))
+
+    def apply_notice(self, payload: Mapping[str, Any]) -> None:
+        """依据通知事件增量更新目录。
+
+        Args:
+            payload: NapCat 通知事件。
+        """
+        notice_type = str(payload.get("notice_type") or "").strip()
+        sub_type = str(payload.get("sub_type") or "").strip()
+        group_id = str(payload.get("group_id") or "").strip()
+        user_id = str(payload.get("user_id") or "").strip()
+        is_self = bool(user_id) and user_id == str(payload.get("self_id") or "").strip()
+
+        if notice_type == "notify" and sub_type == "group_name" and group_id:
+            group_name = str(payload.get("name_new") or "").strip()
+            entry = self._groups.get(group_id)
+            if group_name and entry is not None:
+                self._groups[group_id] = replace(entry, group_name=group_name)
+                self._notice_updates_total += 1
+            else:
+                self._schedule_lookup(f"group:{group_id}", self._lookup_group(group_id))
+        elif notice_type == "group_increase" and group_id:
+            entry = self._groups.get(group_id)
+            if is_self or entry is None:
+                self._schedule_lookup(f"group:{group_id}", self._lookup_group(group_id))
+            else:
+                self._groups[group_id] = replace(entry, member_count=entry.member_count + 1)
+                self._notice_updates_total += 1
+        elif notice_type == "group_decrease" and group_id:
+            entry = self._groups.get(group_id)
+            if is_self or sub_type == "kick_me":
+                self._groups.pop(group_id, None)
+                self._notice_updates_total += 1
+            elif entry is not None:
+                self._groups[group_id] = replace(entry, member_count=max(0, entry.member_count - 1))
+                self._notice_updates_total += 1
+        elif notice_type == "friend_add" and user_id:
+            self._schedule_lookup(f"friend:{user_id}", self._lookup_friend(user_id))
+
+    def snapshot(self) -> NapCatContactDirectorySnapshot:
+        """返回目录快照。
+
+        Returns:
+            NapCatContactDirectorySnapshot: 当前的群与好友条目以及两者最近一次全量加载的时间。
+        """
+        return NapCatContactDirectorySnapshot(
+            groups=tuple(self._groups.values()),
+            friends=tuple(self._friends.values()),
+            groups_loaded_at=self._groups_loaded_at,
+            friends_loaded_at=self._friends_loaded_at,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回目录的运行指标。
+
+        Returns:
+            Dict[str, Any]: 群与好友条目数、是否已加载以及刷新与增量更新计数。
+        """
+        return {
+            "groups": len(self._groups),
+            "friends": len(self._friends),
+            "loaded": self._groups_loaded_at is not None and self._friends_loaded_at is not None,
+            "refreshing": self._refresh_job is not None and self._refresh_job.active,
+            "refreshes": self._refreshes_total,
+            "refresh_failures": self._refresh_failures_total,
+            "notice_updates": self._notice_updates_total,
+        }
+
+    def _schedule_lookup(self, lookup_key: str, lookup: Coroutine[Any, Any, None]) -> None:
+        """在后台执行单项查询；同一条目已有查询在途时丢弃新的查询。
+
+        Args:
+            lookup_key: 查询条目的标识。
+            lookup: 待执行的协程。
+        """
+        if lookup_key in self._pending_lookups:
+            lookup.close()
+            return
+        lookup_task = asyncio.ensure_future(lookup)
+        self._pending_lookups[lookup_key] = lookup_task
+        lookup_task.add_done_callback(lambda _task: self._pending_lookups.pop(lookup_key, None))
+
+    async def _lookup_group(self, group_id: str) -> None:
+        """查询单个群的资料并写入目录。
+
+        Args:
+            group_id: 群号。
+        """
+        group_info = await self._query_service.get_group_info(group_id)
+        entry = self._build_group_entry(group_info) if group_info is not None else None
+        if entry is not None:
+            self._groups[entry.group_id] = entry
+            self._notice_updates_total += 1
+
+    async def _lookup_friend(self, user_id: str) -> None:
+        """查询新好友的资料并写入目录。
+
+        Args:
+            user_id: 好友 QQ 号。
+        """
+        stranger_info = await self._query_service.get_stranger_info(user_id)
+        nickname = str((stranger_info or {}).get("nickname") or "").strip()
+        self._friends[user_id] = NapCatFriendEntry(user_id=user_id, nickname=nickname or user_id, remark="")
+        self._notice_updates_total += 1
+
+    @classmethod
+    def _build_group_entry(cls, item: Mapping[str, Any]) -> Optional[NapCatGroupEntry]:
+        """把 NapCat 群信息转换为目录条目。
+
+        Args:
+            item: ``get_group_list`` 或 ``get_group_info`` 返回的群信息。
+
+        Returns:
+            Optional[NapCatGroupEntry]: 目录条目；缺少群号时返回 ``None``。
+        """
+        group_id = str(item.get("group_id") or "").strip()
+        if not group_id:
+            return None
+        return NapCatGroupEntry(
+            group_id=group_id,
+            group_name=str(item.get("group_name") or "").strip(),
+            member_count=cls._coerce_count(item.get("member_count")),
+            max_member_count=cls._coerce_count(item.get("max_member_count")),
+        )
+
+    @staticmethod
+    def _build_friend_entry(item: Mapping[str, Any]) -> Optional[NapCatFriendEntry]:
+        """把 NapCat 好友信息转换为目录条目。
+
+        Args:
+            item: ``get_friend_list`` 返回的好友信息。
+
+        Returns:
+            Optional[NapCatFriendEntry]: 目录条目；缺少 QQ 号时返回 ``None``。
+        """
+        user_id = str(item.get("user_id") or "").strip()
+        if not user_id:
+            return None
+        return NapCatFriendEntry(
+            user_id=user_id,
+            nickname=str(item.get("nickname") or "").strip(),
+            remark=str(item.get("remark") or "").strip(),
+        )
+
+    @staticmethod
+    def _coerce_count(value: Any) -> int:
+        """把人数字段转换为非负整数。
+
+        Args:
+            value: 原始字段值。
+
+        Returns:
+            int: 非负整数；无法转换时为 ``0``。
+        """
+        try:
+            return max(0, int(value))
+        except (TypeError, ValueError):
+            return 0
@@ -0,0 +1,427 @@
+"""NapCat 大群成员名册。"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Mapping, Optional, Set
+
+import asyncio
+import time
+
+from ..constants import DEFAULT_GROUP_ROSTER_MIN_MEMBERS, DEFAULT_GROUP_ROSTER_RECONCILE_INTERVAL_SEC
+from ..types import NapCatPayloadDict, NapCatPayloadList
+
+if TYPE_CHECKING:
+    from ..config import NapCatCacheConfig
+
+# 从消息 ``sender`` 中同步到名册的成员字段
+_SENDER_FIELDS = ("nickname", "card", "role", "title")
+
+
+@dataclass
+class NapCatGroupRoster:
+    """单个群的成员名册。
+
+    ``generation`` 在每次全量加载或增量变更后递增，调用方可据此判断名册自上次读取后是否变化。
+    全量对账进行期间发生的增量变更记录在 ``changes_during_reload`` 中，对账完成后重新应用，
+    避免较早发出的成员列表请求覆盖更新的通知。``departed`` 记录自上次全量加载以来退群的成员，
+    渲染退群通知时逐个查询到的旧资料不会把他们重新写回名册。
+    """
+
+    group_id: str
+    members: Dict[str, NapCatPayloadDict] = field(default_factory=dict)
+    generation: int = 0
+    reconciled_at: float = 0.0
+    changes_during_reload: Optional[Dict[str, Optional[NapCatPayloadDict]]] = None
+    departed: Set[str] = field(default_factory=set)
+
+
+class NapCatGroupRosterStore:
+    """为成员数较多的群维护内存成员名册，使成员资料查询成为内存读取。
+
+    群成员数达到 ``roster_min_members`` 时，首次查询该群成员会在后台加载整群成员列表；
+    成员查询合并器取得的成员列表达到同样规模时也会直接采用。之后依据入群、退群、管理员与群名片变更通知，
+    以及入站消息 ``sender`` 中观察到的名片变化增量更新，并在查询时发现距上次全量加载已超过
+    ``roster_reconcile_interval_sec`` 时在后台重新对账。名册中没有的成员（如刚入群）仍按普通路径查询，
+    查询结果会写回名册。名册数量超过上限时淘汰最久未使用的群。
+    """
+
+    # 同时保留名册的群数量上限
+    _MAX_ROSTERS = 32
+
+    def __init__(
+        self,
+        logger: Any,
+        load_members: Callable[[str], Awaitable[Optional[NapCatPayloadList]]],
+        group_size_resolver: Optional[Callable[[str], Optional[int]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """初始化成员名册存储。
+
+        Args:
+            logger: 插件日志对象。
+            load_members: 获取整群成员列表的函数。
+            group_size_resolver: 从群目录读取群成员数的函数；为空时只采用合并查询取得的成员列表。
+            clock: 单调时钟函数，用于计算对账间隔。
+        """
+        self._logger = logger
+        self._load_members = load_members
+        self._group_size_resolver = group_size_resolver
+        self._clock = clock
+        self._enabled: bool = True
+        self._min_members: int = DEFAULT_GROUP_ROSTER_MIN_MEMBERS
+        self._reconcile_interval_sec: float = DEFAULT_GROUP_ROSTER_RECONCILE_INTERVAL_SEC
+        self._rosters: "OrderedDict[str, NapCatGroupRoster]" = OrderedDict()
+        self._loading: Dict[str, "asyncio.Task[None]"] = {}
+        self._ignored_groups: Set[str] = set()
+        self._hits_total: int = 0
+        self._misses_total: int = 0
+        self._initial_loads_total: int = 0
+        self._reconciles_total: int = 0
+        self._load_failures_total: int = 0
+        self._incremental_updates_total: int = 0
+        self._evictions_total: int = 0
+
+    def configure(self, cache_config: "NapCatCacheConfig") -> None:
+        """应用最新的名册配置；关闭时清空全部名册。
+
+        Args:
+            cache_config: 最新生效的资料缓存配置。
+        """
+        self._enabled = cache_config.enabled and cache_config.roster_enabled
+        self._min_members = cache_config.roster_min_members
+        self._reconcile_interval_sec = cache_config.roster_reconcile_interval_sec
+        self._ignored_groups.clear()
+        if not self._enabled:
+            self.clear()
+
+    @property
+    def enabled(self) -> bool:
+        """返回成员名册是否启用。"""
+        return self._enabled
+
+    def get_member(self, group_id: str, user_id: str) -> Optional[NapCatPayloadDict]:
+        """从名册读取一名群成员的资料。
+
+        该群尚未建立名册但成员数足够多时在后台开始首次加载；名册已到对账时间时在后台重新对账。
+
+        Args:
+            group_id: 群号。
+            user_id: 用户号。
+
+        Returns:
+            Optional[NapCatPayloadDict]: 成员资料副本；没有名册或名册中没有该成员时返回 ``None``。
+        """
+        if not self._enabled:
+            return None
+        roster = self._rosters.get(group_id)
+        if roster is None:
+            if self._is_large_group(group_id):
+                self._schedule_load(group_id)
+            return None
+
+        self._rosters.move_to_end(group_id)
+        if self._clock() - roster.reconciled_at >= self._reconcile_interval_sec:
+            self._schedule_load(group_id)
+        member = roster.members.get(user_id)
+        if member is None:
+            self._misses_total += 1
+            return None
+        self._hits_total += 1
+        return dict(member)
+
+    def contains_member(self, group_id: str, user_id: str) -> bool:
+        """判断名册中是否有该成员，不计入命中统计，也不触发加载或对账。
+
+        Args:
+            group_id: 群号。
+            user_id: 用户号。
+
+        Returns:
+            bool: 读取该成员会命中名册时返回 ``True``。
+        """
+        if not self._enabled:
+            return False
+        roster = self._rosters.get(group_id)
+        return roster is not None and user_id in roster.members
+
+    def generation(self, group_id: str) -> Optional[int]:
+        """返回群名册的当前代数。
+
+        Args:
+            group_id: 群号。
+
+        Returns:
+            Optional[int]: 代数；该群没有名册时返回 ``None``。
+        """
+        roster = self._rosters.get(group_id)
+        return roster.generation if roster is not None else None
+
+    def adopt(self, group_id: str, members: NapCatPayloadList) -> None:
+        """采用其他途径取得的整群成员列表。
+
+        只有已建立名册的群，或成员数达到阈值的群才会采用。
+
+        Args:
+            group_id: 群号。
+            members: ``get_group_member_list`` 返回的成员列表。
+        """
+        if not self._enabled:
+            return
+        if group_id in self._rosters or len(members) >= self._min_members:
+            self._replace_members(group_id, members)
+
+    def observe_member(self, group_id: str, member: Mapping[str, Any]) -> None:
+        """把逐个查询取得的成员资料写回已建立的名册。
+
+        Args:
+            group_id: 群号。
+            member: ``get_group_member_info`` 返回的成员资料。
+        """
+        user_id = str(member.get("user_id") or "").strip()
+        roster = self._rosters.get(group_id)
+        if roster is None or not user_id or user_id in roster.departed or roster.members.get(user_id) == member:
+            return
+        self._apply_change(roster, user_id, dict(member))
+
+    def observe_sender(self, group_id: str, user_id: str, sender: Mapping[str, Any]) -> None:
+        """依据入站消息的 ``sender`` 同步成员的昵称、群名片、角色与头衔。
+
+        只更新名册中已有的成员，且只在字段确有变化时递增代数。
+
+        Args:
+            group_id: 群号。
+            user_id: 发送者用户号。
+            sender: 消息事件中的 ``sender`` 字典。
+        """
+        roster = self._rosters.get(group_id)
+        if roster is None:
+            return
+        member = roster.members.get(user_id)
+        if member is None:
+            return
+        changed_fields = {
+            field_name: sender[field_name]
+            for field_name in _SENDER_FIELDS
+            if field_name in sender and sender[field_name] is not None and sender[field_name] != member.get(field_name)
+        }
+        if changed_fields:
+            self._apply_change(roster, user_id, {**member, **changed_fields})
+
+    def apply_notice(self, payload: Mapping[str, Any]) -> None:
+        """依据通知事件增量更新名册。
+
+        Args:
+            payload: NapCat 通知事件。
+        """
+        notice_type = str(payload.get("notice_type") or "").strip()
+        group_id = str(payload.get("group_id") or "").strip()
+        user_id = str(payload.get("user_id") or "").strip()
+        roster = self._rosters.get(group_id)
+        if roster is None or not user_id:
+            return
+
+        if notice_type in {"group_increase", "group_decrease"}:
+            if notice_type == "group_decrease" and user_id == str(payload.get("self_id") or "").strip():
+                self.discard(group_id)
+                return
+            if notice_type == "group_decrease":
+                roster.departed.add(user_id)
+            else:
+                roster.departed.discard(user_id)
+            # 新成员的资料不在通知中，移除后由下一次查询逐个获取并写回名册
+            self._apply_change(roster, user_id, None)
+            return
+
+        member = roster.members.get(user_id)
+        if member is None:
+            return
+        if notice_type == "group_admin":
+            role = "admin" if str(payload.get("sub_type") or "").strip() == "set" else "member"
+            self._apply_change(roster, user_id, {**member, "role": role})
+        elif notice_type == "group_card":
+            self._apply_change(roster, user_id, {**member, "card": str(payload.get("card_new") or "")})
+
+    def discard(self, group_id: str) -> None:
+        """丢弃指定群的名册，并取消其进行中的加载。
+
+        Args:
+            group_id: 群号。
+        """
+        self._rosters.pop(group_id, None)
+        load_task = self._loading.pop(group_id, None)
+        if load_task is not None:
+            load_task.cancel()
+
+    def mark_for_reconcile(self) -> None:
+        """保留全部名册，但要求下次读取时在后台重新对账，并取消进行中的加载。
+
+        连接断开期间错过的入群与退群通知无法补回，名册可能已经过时；保留名册可以避免重连后大群在重新加载完成前
+        的成员查询全部回落到 NapCat。
+        """
+        for group_id, load_task in list(self._loading.items()):
+            self._loading.pop(group_id, None)
+            load_task.cancel()
+        # 单调时钟的起点不确定，回拨一个完整对账间隔才能保证下次读取时到期
+        due_at = self._clock() - self._reconcile_interval_sec
+        for roster in self._rosters.values():
+            roster.changes_during_reload = None
+            roster.reconciled_at = min(roster.reconciled_at, due_at)
+
+    def clear(self) -> None:
+        """清空全部名册，并取消进行中的加载。"""
+        for group_id in list(self._loading):
+            self.discard(group_id)
+        self._rosters.clear()
+        self._ignored_groups.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回成员名册的运行指标。
+
+        Returns:
+            Dict[str, Any]: 每个群的成员数与代数，以及命中、未命中、首次加载、对账、加载失败、增量更新与淘汰计数。
+        """
+        return {
+            "enabled": self._enabled,
+            "groups": {
+                group_id: {"members": len(roster.members), "generation": roster.generation}
+                for group_id, roster in self._rosters.items()
+            },
+            "loading": len(self._loading),
+            "hits": self._hits_total,
+            "misses": self._misses_total,
+            "initial_loads": self._initial_loads_total,
+            "reconciles": self._reconciles_total,
+            "load_failures": self._load_failures_total,
+            "incremental_updates": self._incremental_updates_total,
+            "evictions": self._evictions_total,
+        }
+
+    def _is_large_group(self, group_id: str) -> bool:
+        """判断群成员数是否达到建立名册的阈值。
+
+        Args:
+            group_id: 群号。
+
+        Returns:
+            bool: 群目录中的成员数达到阈值时返回 ``True``。
+        """
+        if self._group_size_resolver is None or group_id in self._ignored_groups:
+            return False
+        member_count = self._group_size_resolver(group_id)
+        return member_count is not None and member_count >= self._min_members
+
+    def _schedule_load(self, group_id: str) -> None:
+        """在后台加载或对账指定群的名册；同一群已有加载在途时不重复发起。
+
+        Args:
+            group_id: 群号。
+        """
+        if group_id in self._loading:
+            return
+        roster = self._rosters.get(group_id)
+        if roster is not None:
+            roster.changes_during_reload = {}
+        load_task = asyncio.ensure_future(self._load(group_id))
+        self._loading[group_id] = load_task
+        load_task.add_done_callback(lambda _task: self._finish_load(group_id, _task))
+
+    def _finish_load(self, group_id: str, load_task: "asyncio.Task[None]") -> None:
+        """清理已结束的加载任务。
+
+        Args:
+            group_id: 群号。
+            load_task: 已结束的加载任务。
+        """
+        if self._loading.get(group_id) is not load_task:
+            return
+        self._loading.pop(group_id, None)
+        roster = self._rosters.get(group_id)
+        if roster is not None:
+            roster.changes_during_reload = None
+
+    async def _load(self, group_id: str) -> None:
+        """获取整群成员列表并替换名册。
+
+        Args:
+            group_id: 群号。
+        """
+        try:
+            members = await self._load_members(group_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._logger.warning(f"NapCat 群成员名册加载失败: group_id={group_id} error={exc}")
+            members = None
+
+        roster = self._rosters.get(group_id)
+        if members is None:
+            self._load_failures_total += 1
+            if roster is not None:
+                # 对账失败时沿用现有名册，等下一个对账间隔再重试
+                roster.reconciled_at = self._clock()
+            return
+        if roster is None and len(members) < self._min_members:
+            # 群目录中的成员数已过时，群实际规模不足时不再为其建立名册
+            self._ignored_groups.add(group_id)
+            return
+        self._replace_members(group_id, members)
+
+    def _replace_members(self, group_id: str, members: NapCatPayloadList) -> None:
+        """用整群成员列表替换名册，并重新应用加载期间的增量变更。
+
+        Args:
+            group_id: 群号。
+            members: 整群成员列表。
+        """
+        roster = self._rosters.get(group_id)
+        if roster is None:
+            roster = NapCatGroupRoster(group_id=group_id)
+            self._rosters[group_id] = roster
+            self._initial_loads_total += 1
+            self._evict_overflow()
+        else:
+            self._reconciles_total += 1
+        self._rosters.move_to_end(group_id)
+
+        roster.members = {
+            str(member.get("user_id") or ""): dict(member) for member in members if member.get("user_id")
+        }
+        # 加载开始前退群的成员已不在新列表中，只需继续记录加载期间退群的成员
+        roster.departed.intersection_update(roster.changes_during_reload or {})
+        for user_id, member in (roster.changes_during_reload or {}).items():
+            if member is None:
+                roster.members.pop(user_id, None)
+            else:
+                roster.members[user_id] = member
+        # 仍有加载在途时继续记录变更，留给该次加载完成后重新应用
+        roster.changes_during_reload = {} if group_id in self._loading else None
+        roster.generation += 1
+        roster.reconciled_at = self._clock()
+
+    def _apply_change(self, roster: NapCatGroupRoster, user_id: str, member: Optional[NapCatPayloadDict]) -> None:
+        """写入一项增量变更并递增名册代数。
+
+        Args:
+            roster: 目标名册。
+            user_id: 用户号。
+            member: 新的成员资料；为 ``None`` 时移除该成员。
+        """
+        if member is None:
+            roster.members.pop(user_id, None)
+        else:
+            roster.members[user_id] = member
+        if roster.changes_during_reload is not None:
+            roster.changes_during_reload[user_id] = member
+        roster.generation += 1
+        self._incremental_updates_total += 1
+
+    def _evict_overflow(self) -> None:
+        """按最久未使用顺序淘汰超出上限的名册。"""
+        while len(self._rosters) > self._MAX_ROSTERS:
+            group_id, _roster = self._rosters.popitem(last=False)
+            load_task = self._loading.pop(group_id, None)
+            if load_task is not None:
+                load_task.cancel()
+            self._evictions_total += 1
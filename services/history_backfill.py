@@ -0,0 +1,296 @@
+"""NapCat 断线期间消息补收。"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
+
+import asyncio
+import time
+
+from ..constants import BACKFILLED_PAYLOAD_KEY, DEFAULT_HISTORY_BACKFILL_MAX_CHATS
+from ..types import NapCatPayloadDict, NapCatPayloadList
+from .query_service import NapCatQueryService
+
+if TYPE_CHECKING:
+    from ..config import NapCatInboundConfig
+
+
+@dataclass(frozen=True)
+class NapCatChatCursor:
+    """单个会话最后一条已收到消息的位置。"""
+
+    message_id: str
+    time: int
+
+
+class NapCatHistoryBackfill:
+    """记录各会话最后收到的消息，并在重连后通过历史消息接口补收断线期间的消息。
+
+    断开连接时对当前游标做一次快照，重连后以快照为起点逐页向前翻历史消息，
+    直到遇到快照中的消息、超出补收时间窗口或页数预算用尽。补收到的消息按时间顺序重新放入
+    入站调度队列，与实时消息走相同的处理链路，并依靠 ``message_id`` 去重键避免重复注入。
+    """
+
+    def __init__(
+        self,
+        logger: Any,
+        query_service: NapCatQueryService,
+        submit_payload: Callable[[NapCatPayloadDict], Awaitable[None]],
+        max_chats: int = DEFAULT_HISTORY_BACKFILL_MAX_CHATS,
+    ) -> None:
+        """初始化消息补收器。
+
+        Args:
+            logger: 插件日志对象。
+            query_service: NapCat 查询服务。
+            submit_payload: 将补收消息放回入站调度队列的函数。
+            max_chats: 最多跟踪的会话数量，超出时淘汰最久未活跃的会话。
+        """
+        self._logger = logger
+        self._query_service = query_service
+        self._submit_payload = submit_payload
+        self._max_chats = max(1, max_chats)
+        self._cursors: "OrderedDict[str, NapCatChatCursor]" = OrderedDict()
+        self._pending_gap: Dict[str, NapCatChatCursor] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+        self._runs_total: int = 0
+        self._pages_fetched_total: int = 0
+        self._messages_backfilled_total: int = 0
+        self._chats_backfilled_total: int = 0
+        self._chats_truncated_total: int = 0
+
+    def observe(self, payload: NapCatPayloadDict) -> None:
+        """记录一条入站消息，推进所属会话的游标。
+
+        Args:
+            payload: NapCat 消息事件。
+        """
+        message_id = str(payload.get("message_id") or "").strip()
+        chat_key = self._resolve_chat_key(payload)
+        if not message_id or not chat_key:
+            return
+
+        message_time = self._coerce_time(payload.get("time"))
+        cursor = self._cursors.get(chat_key)
+        if cursor is not None and message_time < cursor.time:
+            return
+
+        self._cursors[chat_key] = NapCatChatCursor(message_id=message_id, time=message_time)
+        self._cursors.move_to_end(chat_key)
+        while len(self._cursors) > self._max_chats:
+            self._cursors.popitem(last=False)
+
+    def mark_disconnected(self) -> None:
+        """在连接断开时记录补收起点，并停止正在进行的补收。"""
+        task = self._task
+        self._task = None
+        if task is not None and not task.done():
+            task.cancel()
+        self._merge_gap(self._cursors)
+
+    def schedule(self, inbound_config: "NapCatInboundConfig", self_id: str) -> None:
+        """在连接完成账号初始化后启动一次补收。
+
+        Args:
+            inbound_config: 当前生效的入站调度配置。
+            self_id: 当前机器人账号 ID，写入缺少 ``self_id`` 的补收消息。
+        """
+        if not inbound_config.history_backfill_enabled:
+            self._pending_gap.clear()
+            return
+        if not self._pending_gap or (self._task is not None and not self._task.done()):
+            return
+
+        gap = self._pending_gap
+        self._pending_gap = {}
+        self._task = asyncio.create_task(
+            self._run(gap, inbound_config, self_id),
+            name="napcat_adapter.history_backfill",
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回消息补收的运行指标。
+
+        Returns:
+            Dict[str, Any]: 跟踪会话数、待补收会话数以及补收页数与消息计数。
+        """
+        return {
+            "tracked_chats": len(self._cursors),
+            "pending_gap_chats": len(self._pending_gap),
+            "running": self._task is not None and not self._task.done(),
+            "runs": self._runs_total,
+            "pages_fetched": self._pages_fetched_total,
+            "messages_backfilled": self._messages_backfilled_total,
+            "chats_backfilled": self._chats_backfilled_total,
+            "chats_truncated": self._chats_truncated_total,
+        }
+
+    async def _run(
+        self,
+        gap: Dict[str, NapCatChatCursor],
+        inbound_config: "NapCatInboundConfig",
+        self_id: str,
+    ) -> None:
+        """按预算补收全部待补收会话。
+
+        Args:
+            gap: 以会话键为键的补收起点。
+            inbound_config: 当前生效的入站调度配置。
+            self_id: 当前机器人账号 ID。
+        """
+        self._runs_total += 1
+        started_at = time.time()
+        floor_time = int(started_at - inbound_config.history_backfill_max_gap_sec)
+        page_budget = [inbound_config.history_backfill_page_budget]
+        semaphore = asyncio.Semaphore(inbound_config.history_backfill_concurrency)
+        remaining = dict(gap)
+        messages_before = self._messages_backfilled_total
+
+        async def _backfill_chat(chat_key: str, cursor: NapCatChatCursor) -> None:
+            async with semaphore:
+                if page_budget[0] <= 0:
+                    self._chats_truncated_total += 1
+                    return
+                payloads = await self._fetch_gap(
+                    chat_key,
+                    cursor,
+                    floor_time=max(cursor.time, floor_time),
+                    ceiling_time=int(started_at),
+                    page_size=inbound_config.history_backfill_page_size,
+                    page_budget=page_budget,
+                )
+                remaining.pop(chat_key, None)
+                if payloads:
+                    self._chats_backfilled_total += 1
+                for payload in payloads:
+                    payload.setdefault("post_type", "message")
+                    payload[BACKFILLED_PAYLOAD_KEY] = True
+                    if self_id:
+                        payload.setdefault("self_id", self_id)
+                    await self._submit_payload(payload)
+                    self._messages_backfilled_total += 1
+
+        # 最近活跃的会话优先消耗页数预算
+        ordered_chats = sorted(gap.items(), key=lambda item: item[1].time, reverse=True)
+        try:
+            await asyncio.gather(*(_backfill_chat(chat_key, cursor) for chat_key, cursor in ordered_chats))
+        except asyncio.CancelledError:
+            self._merge_gap(remaining)
+            raise
+
+        backfilled_count = self._messages_backfilled_total - messages_before
+        if backfilled_count:
+            self._logger.info(
+                f"NapCat 已补收断线期间的 {backfilled_count} 条消息，"
+                f"耗时 {time.time() - started_at:.1f} 秒，剩余页数预算 {page_budget[0]}"
+            )
+
+    async def _fetch_gap(
+        self,
+        chat_key: str,
+        cursor: NapCatChatCursor,
+        floor_time: int,
+        ceiling_time: int,
+        page_size: int,
+        page_budget: List[int],
+    ) -> NapCatPayloadList:
+        """从最新消息开始向前翻页，收集游标之后的消息。
+
+        Args:
+            chat_key: 会话键。
+            cursor: 补收起点。
+            floor_time: 早于该时间戳的消息不再补收。
+            ceiling_time: 晚于该时间戳的消息已由实时链路接收，不再补收。
+            page_size: 单页条数。
+            page_budget: 剩余页数预算，以单元素列表在并发任务间共享。
+
+        Returns:
+            NapCatPayloadList: 按时间升序排列的待补收消息。
+        """
+        chat_type, _, peer_id = chat_key.partition(":")
+        collected: Dict[str, NapCatPayloadDict] = {}
+        message_seq = ""
+        reached_cursor = False
+        while page_budget[0] > 0:
+            page_budget[0] -= 1
+            self._pages_fetched_total += 1
+            if chat_type == "group":
+                page = await self._query_service.get_group_msg_history(peer_id, message_seq, page_size)
+            else:
+                page = await self._query_service.get_friend_msg_history(peer_id, message_seq, page_size)
+            if not page:
+                reached_cursor = True
+                break
+
+            oldest_payload: Optional[NapCatPayloadDict] = None
+            for item in page:
+                message_id = str(item.get("message_id") or "").strip()
+                message_time = self._coerce_time(item.get("time"))
+                if not message_id:
+                    continue
+                if oldest_payload is None or message_time < self._coerce_time(oldest_payload.get("time")):
+                    oldest_payload = item
+                if message_id == cursor.message_id or message_time < floor_time:
+                    reached_cursor = True
+                    continue
+                if message_time <= ceiling_time:
+                    collected.setdefault(message_id, item)
+
+            if reached_cursor or oldest_payload is None or len(page) < page_size:
+                reached_cursor = True
+                break
+            next_seq = str(oldest_payload.get("message_seq") or oldest_payload.get("message_id") or "").strip()
+            if not next_seq or next_seq == message_seq:
+                reached_cursor = True
+                break
+            message_seq = next_seq
+
+        if not reached_cursor:
+            self._chats_truncated_total += 1
+        return sorted(collected.values(), key=lambda item: self._coerce_time(item.get("time")))
+
+    def _merge_gap(self, cursors: Dict[str, NapCatChatCursor]) -> None:
+        """将补收起点并入待补收集合，同一会话保留更早的起点。
+
+        Args:
+            cursors: 待并入的补收起点。
+        """
+        for chat_key, cursor in cursors.items():
+            pending_cursor = self._pending_gap.get(chat_key)
+            if pending_cursor is None or cursor.time < pending_cursor.time:
+                self._pending_gap[chat_key] = cursor
+
+    @staticmethod
+    def _resolve_chat_key(payload: NapCatPayloadDict) -> str:
+        """解析消息所属会话的键。
+
+        Args:
+            payload: NapCat 消息事件。
+
+        Returns:
+            str: 形如 ``group:<群号>`` 或 ``private:<对方 QQ 号>`` 的会话键；无法归属时为空字符串。
+        """
+        group_id = str(payload.get("group_id") or "").strip()
+        if group_id:
+            return f"group:{group_id}"
+        if str(payload.get("message_type") or "").strip() != "private":
+            return ""
+        user_id = str(payload.get("user_id") or "").strip()
+        return f"private:{user_id}" if user_id else ""
+
+    @staticmethod
+    def _coerce_time(value: Any) -> int:
+        """将消息时间戳转换为整数。
+
+        Args:
+            value: 原始时间戳。
+
+        Returns:
+            int: 秒级时间戳；无法解析时为 ``0``。
+        """
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return 0
@@ -0,0 +1,204 @@
+"""NapCat 群成员资料查询合并。"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import asyncio
+
+from ..constants import DEFAULT_MEMBER_BATCH_THRESHOLD, DEFAULT_MEMBER_BATCH_WINDOW_MS
+from ..types import NapCatPayloadDict, NapCatPayloadList
+
+if TYPE_CHECKING:
+    from ..config import NapCatCacheConfig
+
+
+class NapCatMemberLookupBatcher:
+    """按群收集并发的缓存未命中成员查询，数量足够时改用一次成员列表查询。
+
+    同一群没有其他查询在途时直接逐个查询，不增加等待；已有查询在途时说明出现了集中查询，
+    后续查询开启或加入该群的收集窗口。窗口结束时若待查询的不同成员数达到阈值，
+    以一次 ``get_group_member_list`` 取得整群成员并分发给全部等待方；未达到阈值、
+    列表查询失败或成员不在列表中时，各等待方在自身的连接上下文中逐个查询。
+    """
+
+    def __init__(
+        self,
+        logger: Any,
+        load_members: Callable[[str], Awaitable[Optional[NapCatPayloadList]]],
+    ) -> None:
+        """初始化成员查询合并器。
+
+        Args:
+            logger: 插件日志对象。
+            load_members: 获取整群成员列表并写入资料缓存的函数。
+        """
+        self._logger = logger
+        self._load_members = load_members
+        self._enabled: bool = True
+        self._window_sec: float = DEFAULT_MEMBER_BATCH_WINDOW_MS / 1000
+        self._threshold: int = DEFAULT_MEMBER_BATCH_THRESHOLD
+        self._pending: Dict[str, Dict[str, List["asyncio.Future[Optional[NapCatPayloadDict]]"]]] = {}
+        self._active_lookups: Dict[str, int] = {}
+        self._window_full: Dict[str, asyncio.Event] = {}
+        self._flush_tasks: Set["asyncio.Task[None]"] = set()
+        self._windows_total: int = 0
+        self._list_fetches_total: int = 0
+        self._list_failures_total: int = 0
+        self._members_resolved_total: int = 0
+        self._lookups_deferred_total: int = 0
+
+    def configure(self, cache_config: "NapCatCacheConfig") -> None:
+        """应用最新的合并配置。
+
+        Args:
+            cache_config: 最新生效的资料缓存配置。
+        """
+        self._enabled = cache_config.enabled and cache_config.member_batch_enabled
+        self._window_sec = cache_config.member_batch_window_ms / 1000
+        self._threshold = cache_config.member_batch_threshold
+
+    @property
+    def enabled(self) -> bool:
+        """返回成员查询合并是否启用。"""
+        return self._enabled
+
+    async def lookup(
+        self,
+        group_id: str,
+        user_id: str,
+        fetch_single: Callable[[], Awaitable[Optional[NapCatPayloadDict]]],
+    ) -> Optional[NapCatPayloadDict]:
+        """查询一名群成员的资料，必要时与同群的其他查询合并。
+
+        Args:
+            group_id: 群号。
+            user_id: 用户号。
+            fetch_single: 逐个查询该成员资料的函数。
+
+        Returns:
+            Optional[NapCatPayloadDict]: 成员资料；失败时返回 ``None``。
+        """
+        if self._enabled and (self._active_lookups.get(group_id) or group_id in self._pending):
+            batched_value = await self._wait_for_window(group_id, user_id)
+            if batched_value is not None:
+                return batched_value
+
+        self._active_lookups[group_id] = self._active_lookups.get(group_id, 0) + 1
+        try:
+            return await fetch_single()
+        finally:
+            remaining = self._active_lookups.pop(group_id, 1) - 1
+            if remaining > 0:
+                self._active_lookups[group_id] = remaining
+
+    async def _wait_for_window(self, group_id: str, user_id: str) -> Optional[NapCatPayloadDict]:
+        """登记一次成员查询并等待所在收集窗口的结果。
+
+        Args:
+            group_id: 群号。
+            user_id: 用户号。
+
+        Returns:
+            Optional[NapCatPayloadDict]: 从成员列表中取得的资料副本；未能批量取得时返回 ``None``。
+        """
+        group_pending = self._pending.get(group_id)
+        if group_pending is None:
+            group_pending = {}
+            self._pending[group_id] = group_pending
+            flush_task = asyncio.ensure_future(self._flush_after_window(group_id))
+            self._flush_tasks.add(flush_task)
+            flush_task.add_done_callback(self._flush_tasks.discard)
+
+        waiter: "asyncio.Future[Optional[NapCatPayloadDict]]" = asyncio.get_running_loop().create_future()
+        group_pending.setdefault(user_id, []).append(waiter)
+        if len(group_pending) >= self._threshold:
+            self._window_full.setdefault(group_id, asyncio.Event()).set()
+        return await waiter
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回成员查询合并的运行指标。
+
+        Returns:
+            Dict[str, Any]: 当前收集中的群数，以及窗口数、列表查询次数、失败次数、
+            由列表取得的成员查询数与转为逐个查询的次数。
+        """
+        return {
+            "enabled": self._enabled,
+            "pending_groups": len(self._pending),
+            "windows": self._windows_total,
+            "list_fetches": self._list_fetches_total,
+            "list_failures": self._list_failures_total,
+            "members_resolved": self._members_resolved_total,
+            "lookups_deferred": self._lookups_deferred_total,
+        }
+
+    async def _flush_after_window(self, group_id: str) -> None:
+        """等待收集窗口结束后处理指定群的全部待查询成员。
+
+        Args:
+            group_id: 群号。
+        """
+        window_full = self._window_full.setdefault(group_id, asyncio.Event())
+        try:
+            # 待查询成员数提前达到阈值时不必等满窗口
+            await asyncio.wait_for(window_full.wait(), timeout=self._window_sec)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            self._window_full.pop(group_id, None)
+            self._resolve_waiters(self._pending.pop(group_id, {}), {})
+            raise
+
+        self._window_full.pop(group_id, None)
+        group_pending = self._pending.pop(group_id, {})
+        self._windows_total += 1
+        members_by_id: Dict[str, NapCatPayloadDict] = {}
+        try:
+            if len(group_pending) >= self._threshold:
+                members_by_id = await self._fetch_members(group_id)
+        finally:
+            self._resolve_waiters(group_pending, members_by_id)
+
+    async def _fetch_members(self, group_id: str) -> Dict[str, NapCatPayloadDict]:
+        """获取整群成员列表。
+
+        Args:
+            group_id: 群号。
+
+        Returns:
+            Dict[str, NapCatPayloadDict]: 用户号到成员资料的映射；查询失败时为空。
+        """
+        self._list_fetches_total += 1
+        try:
+            members = await self._load_members(group_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._logger.warning(f"NapCat 群成员列表合并查询失败: group_id={group_id} error={exc}")
+            members = None
+        if members is None:
+            self._list_failures_total += 1
+            return {}
+        return {str(member.get("user_id") or ""): member for member in members}
+
+    def _resolve_waiters(
+        self,
+        group_pending: Dict[str, List["asyncio.Future[Optional[NapCatPayloadDict]]"]],
+        members_by_id: Dict[str, NapCatPayloadDict],
+    ) -> None:
+        """把批量结果分发给等待方。
+
+        Args:
+            group_pending: 用户号到等待方列表的映射。
+            members_by_id: 用户号到成员资料的映射。
+        """
+        for user_id, waiters in group_pending.items():
+            member = members_by_id.get(user_id)
+            if member is None:
+                self._lookups_deferred_total += len(waiters)
+            else:
+                self._members_resolved_total += len(waiters)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(dict(member) if member is not None else None)
@@ -2,28 +2,40 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 from .query_service import NapCatQueryService
 
+if TYPE_CHECKING:
+    from ..runtime.scheduler import NapCatRuntimeScheduler, NapCatScheduledJob
+
+_CACHE_TTL_SEC = 3600.0
+_CACHE_SWEEP_INTERVAL_SEC = 600.0
+
 
 class NapCatOfficialBotGuard:
     """根据群成员资料判断是否应拦截 QQ 官方机器人消息。"""
 
-    def __init__(self, logger: Any, query_service: NapCatQueryService) -> None:
+    def __init__(self, logger: Any, query_service: NapCatQueryService, scheduler: "NapCatRuntimeScheduler") -> None:
         """初始化官方机器人拦截服务。
 
         Args:
             logger: 插件日志对象。
             query_service: NapCat 查询服务。
+            scheduler: 运行时统一调度器，用于登记缓存过期清理。
         """
         self._logger = logger
         self._query_service = query_service
-        self._cache: Dict[str, bool] = {}
+        self._scheduler = scheduler
+        self._cache: Dict[str, Tuple[bool, float]] = {}
+        self._sweep_job: Optional["NapCatScheduledJob"] = None
 
     def clear_cache(self) -> None:
         """清空机器人识别缓存。"""
         self._cache.clear()
+        if self._sweep_job is not None:
+            self._sweep_job.cancel()
+            self._sweep_job = None
 
     async def should_reject(self, sender_user_id: str, group_id: str, ban_qq_bot: bool) -> bool:
         """判断是否应拦截当前消息。
@@ -40,20 +52,46 @@ class NapCatOfficialBotGuard:
             return False
 
         cache_key = f"{group_id}:{sender_user_id}"
-        cached_result = self._cache.get(cache_key)
-        if cached_result is not None:
+        cached_entry = self._cache.get(cache_key)
+        if cached_entry is not None and cached_entry[1] > self._scheduler.time():
+            cached_result = cached_entry[0]
             if cached_result:
                 self._logger.warning("QQ 官方机器人消息拦截已启用，消息被丢弃")
             return cached_result
 
-        member_info = await self._query_service.get_group_member_info(group_id, sender_user_id, no_cache=True)
+        member_info = await self._query_service.get_group_member_info(group_id, sender_user_id)
         if member_info is None:
             self._logger.warning("无法获取用户是否为机器人，默认放行当前消息")
-            self._cache[cache_key] = False
+            self._store(cache_key, False)
             return False
 
         should_reject = bool(member_info.get("is_robot"))
-        self._cache[cache_key] = should_reject
+        self._store(cache_key, should_reject)
         if should_reject:
             self._logger.warning("QQ 官方机器人消息拦截已启用，消息被丢弃")
         return should_reject
+
+    def _store(self, cache_key: str, should_reject: bool) -> None:
+        """写入识别结果，并确保过期清理任务已登记。
+
+        Args:
+            cache_key: 由群号和用户号组成的缓存键。
+            should_reject: 识别结果。
+        """
+        self._cache[cache_key] = (should_reject, self._scheduler.time() + _CACHE_TTL_SEC)
+        if self._sweep_job is None or not self._sweep_job.active:
+            self._sweep_job = self._scheduler.every(
+                _CACHE_SWEEP_INTERVAL_SEC,
+                self._sweep_expired,
+                name="official_bot_guard.cache_expiry",
+            )
+
+    def _sweep_expired(self) -> None:
+        """清理已过期的识别结果，由调度器周期调用。"""
+        now = self._scheduler.time()
+        expired_keys = [cache_key for cache_key, (_result, expires_at) in self._cache.items() if expires_at <= now]
+        for cache_key in expired_keys:
+            self._cache.pop(cache_key, None)
+        if not self._cache and self._sweep_job is not None:
+            self._sweep_job.cancel()
+            self._sweep_job = None
@@ -0,0 +1,435 @@
+"""NapCat 离线出站缓冲。"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Mapping, Optional
+
+import asyncio
+import contextlib
+import json
+import time
+
+from ..constants import (
+    DEFAULT_OFFLINE_OUTBOX_MAX_SIZE,
+    DEFAULT_OFFLINE_OUTBOX_SPILL_MAX_SIZE,
+    DEFAULT_OFFLINE_OUTBOX_TTL_SEC,
+)
+from ..transport.writer import NapCatNotConnectedError
+
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_DEFAULT_SPILL_PATH = _PROJECT_ROOT / "data" / "napcat_adapter" / "outbox.jsonl"
+
+
+def build_outbox_spill_path(connection_id: str = "") -> Path:
+    """返回指定连接的离线出站溢出文件路径。
+
+    Args:
+        connection_id: 连接标识；为空时返回主连接使用的默认路径。
+
+    Returns:
+        Path: 溢出 JSONL 文件路径。
+    """
+    if not connection_id:
+        return _DEFAULT_SPILL_PATH
+    safe_connection_id = "".join(char if char.isalnum() or char in "-_" else "_" for char in connection_id)
+    return _DEFAULT_SPILL_PATH.with_name(f"outbox.{safe_connection_id}.jsonl")
+
+
+@dataclass
+class NapCatOutboxEntry:
+    """一条暂存的出站动作。"""
+
+    action_name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    enqueued_at: float = 0.0
+    expires_at: float = 0.0
+
+    def is_expired(self, now: float) -> bool:
+        """判断当前条目是否已超过有效期。
+
+        Args:
+            now: 当前 Unix 时间戳。
+
+        Returns:
+            bool: 若已过期，则返回 ``True``。
+        """
+        return now >= self.expires_at
+
+    @classmethod
+    def from_mapping(cls, payload: Mapping[str, Any]) -> Optional["NapCatOutboxEntry"]:
+        """从字典构造暂存条目。
+
+        Args:
+            payload: 原始条目字典。
+
+        Returns:
+            Optional[NapCatOutboxEntry]: 构造成功时返回条目，否则返回 ``None``。
+        """
+        action_name = str(payload.get("action_name") or "").strip()
+        params = payload.get("params")
+        if not action_name or not isinstance(params, Mapping):
+            return None
+
+        try:
+            enqueued_at = float(payload.get("enqueued_at", 0.0))
+            expires_at = float(payload.get("expires_at", 0.0))
+        except (TypeError, ValueError):
+            return None
+        return cls(action_name=action_name, params=dict(params), enqueued_at=enqueued_at, expires_at=expires_at)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """将条目转换为可序列化字典。
+
+        Returns:
+            Dict[str, Any]: 可直接写入 JSON 的条目字典。
+        """
+        return asdict(self)
+
+
+class NapCatOfflineOutbox:
+    """在连接不可用期间暂存出站动作，并在连接恢复后按序补发。
+
+    条目先进入内存队列；内存写满且开启磁盘溢出时追加写入 JSONL 文件。磁盘上的条目总是
+    比内存中的条目更晚入队，补发时先清空内存队列，再分批从文件读回，保证整体先进先出。
+    连接建立并完成账号初始化后由 :meth:`activate` 开始补发，断开时由 :meth:`deactivate` 停止；
+    心跳超时期间由 :meth:`pause` 暂停，心跳恢复后由 :meth:`resume` 继续。
+    只有确定没有发出的条目（连接不可用）才留在队首等待重试；发出后超时或连接中断的条目可能已被执行，
+    直接丢弃并计入失败，避免重复发送群消息。
+    """
+
+    def __init__(
+        self,
+        logger: Any,
+        send_action: Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        spill_path: Path = _DEFAULT_SPILL_PATH,
+    ) -> None:
+        """初始化离线出站缓冲。
+
+        Args:
+            logger: 插件日志对象。
+            send_action: 补发时使用的动作发送函数，通常为所属连接传输层的 ``call_action``。
+            spill_path: 磁盘溢出文件路径。
+        """
+        self._logger = logger
+        self._send_action = send_action
+        self._spill_path = spill_path
+        self._enabled: bool = False
+        self._max_size: int = DEFAULT_OFFLINE_OUTBOX_MAX_SIZE
+        self._ttl_sec: float = DEFAULT_OFFLINE_OUTBOX_TTL_SEC
+        self._spill_enabled: bool = False
+        self._spill_max_size: int = DEFAULT_OFFLINE_OUTBOX_SPILL_MAX_SIZE
+        self._entries: Deque[NapCatOutboxEntry] = deque()
+        self._spilled_count: int = 0
+        self._activated: bool = False
+        self._paused: bool = False
+        self._replay_task: Optional[asyncio.Task[None]] = None
+        self._enqueued_total: int = 0
+        self._spilled_total: int = 0
+        self._rejected_total: int = 0
+        self._expired_total: int = 0
+        self._replayed_total: int = 0
+        self._replay_failed_total: int = 0
+
+    def configure(
+        self,
+        enabled: bool,
+        max_size: int = DEFAULT_OFFLINE_OUTBOX_MAX_SIZE,
+        ttl_sec: float = DEFAULT_OFFLINE_OUTBOX_TTL_SEC,
+        spill_enabled: bool = False,
+        spill_max_size: int = DEFAULT_OFFLINE_OUTBOX_SPILL_MAX_SIZE,
+    ) -> None:
+        """更新缓冲参数，已暂存的条目保持不变。
+
+        Args:
+            enabled: 是否启用缓冲。
+            max_size: 内存队列上限。
+            ttl_sec: 条目有效期。
+            spill_enabled: 内存写满后是否溢出到磁盘。
+            spill_max_size: 磁盘溢出条目上限。
+        """
+        self._enabled = enabled
+        self._max_size = max(1, int(max_size))
+        self._ttl_sec = max(0.0, float(ttl_sec))
+        self._spill_enabled = spill_enabled
+        self._spill_max_size = max(1, int(spill_max_size))
+
+    @property
+    def enabled(self) -> bool:
+        """返回缓冲是否启用。"""
+        return self._enabled
+
+    @property
+    def pending_count(self) -> int:
+        """返回尚未补发的条目数量，包括磁盘上的条目。"""
+        return len(self._entries) + self._spilled_count
+
+    def should_hold(self, connection_ready: bool) -> bool:
+        """判断新的出站动作是否应进入缓冲而不是直接发送。
+
+        连接未就绪时需要缓冲；连接已就绪但仍有未补发条目时也进入缓冲，避免新消息越过旧消息。
+
+        Args:
+            connection_ready: 所属连接当前是否可以直接发送。
+
+        Returns:
+            bool: 若应进入缓冲，则返回 ``True``。
+        """
+        if not self._enabled:
+            return False
+        return not connection_ready or self.pending_count > 0
+
+    def enqueue(self, action_name: str, params: Dict[str, Any]) -> bool:
+        """暂存一条出站动作。
+
+        Args:
+            action_name: OneBot 动作名称。
+            params: 动作参数。
+
+        Returns:
+            bool: 若已暂存，则返回 ``True``；缓冲已满时返回 ``False``。
+        """
+        now = time.time()
+        self._drop_expired_head(now)
+        entry = NapCatOutboxEntry(
+            action_name=action_name,
+            params=params,
+            enqueued_at=now,
+            expires_at=now + self._ttl_sec,
+        )
+
+        # 已有条目溢出到磁盘时，新条目也必须写入磁盘，才能保持先进先出
+        if self._spilled_count == 0 and len(self._entries) < self._max_size:
+            self._entries.append(entry)
+        elif self._spill_enabled and self._spilled_count < self._spill_max_size and self._append_spill([entry]):
+            self._spilled_count += 1
+            self._spilled_total += 1
+        else:
+            self._rejected_total += 1
+            return False
+
+        self._enqueued_total += 1
+        self.schedule_replay()
+        return True
+
+    async def load(self) -> None:
+        """读取上次运行遗留的磁盘溢出条目数量。"""
+        if not self._spill_enabled or not self._spill_path.exists():
+            return
+
+        try:
+            with self._spill_path.open("r", encoding="utf-8") as spill_file:
+                spilled_count = sum(1 for line in spill_file if line.strip())
+        except Exception as exc:
+            self._logger.warning(f"NapCat 离线出站溢出文件读取失败，将忽略旧条目: {exc}")
+            return
+
+        self._spilled_count = spilled_count
+        if spilled_count:
+            self._logger.info(f"NapCat 离线出站缓冲已从磁盘恢复 {spilled_count} 条待补发消息")
+
+    def activate(self) -> None:
+        """在连接完成账号初始化后允许补发，并在有待补发条目时立即开始。"""
+        self._activated = True
+        self._paused = False
+        self.schedule_replay()
+
+    def deactivate(self) -> None:
+        """在连接断开后停止补发，直到下一次 :meth:`activate`。"""
+        self._activated = False
+        self._paused = False
+
+    def pause(self) -> None:
+        """暂停补发；正在发送的条目会在本次发送结束后停止。"""
+        self._paused = True
+
+    def resume(self) -> None:
+        """解除 :meth:`pause`；连接尚未完成初始化时不会开始补发。"""
+        self._paused = False
+        self.schedule_replay()
+
+    def schedule_replay(self) -> None:
+        """在允许补发且存在待补发条目时启动补发任务。"""
+        if not self._can_replay() or self.pending_count == 0:
+            return
+        if self._replay_task is not None and not self._replay_task.done():
+            return
+        self._replay_task = asyncio.create_task(self._replay_loop(), name="napcat_adapter.offline_outbox_replay")
+
+    async def close(self) -> None:
+        """停止补发；开启磁盘溢出时把内存中的条目写回文件以便下次启动继续补发。"""
+        self.deactivate()
+        replay_task = self._replay_task
+        self._replay_task = None
+        if replay_task is not None and not replay_task.done():
+            replay_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await replay_task
+
+        if not self._entries:
+            return
+
+        if self._spill_enabled:
+            entries = list(self._entries)
+            if self._prepend_spill(entries):
+                self._spilled_count += len(entries)
+                self._entries.clear()
+                return
+
+        self._logger.warning(f"NapCat 离线出站缓冲中仍有 {len(self._entries)} 条消息未补发，已随插件停止丢弃")
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回离线出站缓冲的运行指标。
+
+        Returns:
+            Dict[str, Any]: 队列深度与入队、溢出、拒绝、过期、补发计数。
+        """
+        return {
+            "enabled": self._enabled,
+            "memory_depth": len(self._entries),
+            "spilled_depth": self._spilled_count,
+            "replaying": self._replay_task is not None and not self._replay_task.done(),
+            "enqueued": self._enqueued_total,
+            "spilled": self._spilled_total,
+            "rejected": self._rejected_total,
+            "expired": self._expired_total,
+            "replayed": self._replayed_total,
+            "replay_failed": self._replay_failed_total,
+        }
+
+    async def _replay_loop(self) -> None:
+        """按入队顺序补发暂存条目，直到缓冲清空、补发被暂停或连接再次不可用。"""
+        replayed_before = self._replayed_total
+        while self._can_replay():
+            entry = self._peek()
+            if entry is None:
+                break
+            if entry.is_expired(time.time()):
+                self._entries.popleft()
+                self._expired_total += 1
+                continue
+
+            try:
+                response = await self._send_action(entry.action_name, entry.params)
+            except asyncio.CancelledError:
+                raise
+            except NapCatNotConnectedError as exc:
+                # 条目确定没有发出，保留在队首，等待下一次恢复连接后重试
+                self._logger.warning(f"NapCat 离线出站补发中断，剩余 {self.pending_count} 条待补发: {exc}")
+                break
+            except Exception as exc:
+                self._entries.popleft()
+                self._replay_failed_total += 1
+                self._logger.warning(
+                    f"NapCat 离线出站补发结果未知，可能已送达，不再重试: action={entry.action_name} error={exc}"
+                )
+                continue
+
+            self._entries.popleft()
+            if str(response.get("status") or "").lower() == "ok":
+                self._replayed_total += 1
+                continue
+            self._replay_failed_total += 1
+            error_message = str(response.get("wording") or response.get("message") or "unknown")
+            self._logger.warning(f"NapCat 离线出站补发被拒绝: action={entry.action_name} message={error_message}")
+
+        replayed_count = self._replayed_total - replayed_before
+        if replayed_count:
+            self._logger.info(f"NapCat 离线出站缓冲已补发 {replayed_count} 条消息")
+
+    def _can_replay(self) -> bool:
+        """判断当前是否允许补发。
+
+        Returns:
+            bool: 连接已完成初始化且未处于暂停状态时返回 ``True``。
+        """
+        return self._activated and not self._paused
+
+    def _peek(self) -> Optional[NapCatOutboxEntry]:
+        """返回队首条目；内存队列为空时先从磁盘读回一批。
+
+        Returns:
+            Optional[NapCatOutboxEntry]: 队首条目；缓冲为空时返回 ``None``。
+        """
+        if not self._entries and self._spilled_count > 0:
+            self._refill_from_spill()
+        return self._entries[0] if self._entries else None
+
+    def _drop_expired_head(self, now: float) -> None:
+        """丢弃内存队列头部已过期的条目。
+
+        Args:
+            now: 当前 Unix 时间戳。
+        """
+        while self._entries and self._entries[0].is_expired(now):
+            self._entries.popleft()
+            self._expired_total += 1
+
+    def _refill_from_spill(self) -> None:
+        """从磁盘溢出文件读回最多一个内存队列容量的条目，其余条目写回文件。"""
+        try:
+            lines = [line for line in self._spill_path.read_text(encoding="utf-8").splitlines() if line.strip()]
+        except Exception as exc:
+            self._logger.warning(f"NapCat 离线出站溢出文件读取失败，将丢弃磁盘条目: {exc}")
+            lines = []
+
+        head, remaining = lines[: self._max_size], lines[self._max_size :]
+        try:
+            if remaining:
+                self._spill_path.write_text("\n".join(remaining) + "\n", encoding="utf-8")
+            else:
+                self._spill_path.unlink(missing_ok=True)
+        except Exception as exc:
+            self._logger.warning(f"NapCat 离线出站溢出文件写回失败: {exc}")
+
+        self._spilled_count = len(remaining)
+        for line in head:
+            try:
+                payload = json.loads(line)
+            except ValueError:
+                continue
+            entry = NapCatOutboxEntry.from_mapping(payload) if isinstance(payload, Mapping) else None
+            if entry is not None:
+                self._entries.append(entry)
+
+    def _append_spill(self, entries: List[NapCatOutboxEntry]) -> bool:
+        """将条目追加到磁盘溢出文件末尾。
+
+        Args:
+            entries: 待写入的条目。
+
+        Returns:
+            bool: 写入成功时返回 ``True``。
+        """
+        try:
+            self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._spill_path.open("a", encoding="utf-8") as spill_file:
+                for entry in entries:
+                    spill_file.write(json.dumps(entry.to_dict(), ensure_ascii=False) + "\n")
+        except Exception as exc:
+            self._logger.warning(f"NapCat 离线出站溢出文件写入失败: {exc}")
+            return False
+        return True
+
+    def _prepend_spill(self, entries: List[NapCatOutboxEntry]) -> bool:
+        """将条目写到磁盘溢出文件开头，保持它们先于已溢出条目补发。
+
+        Args:
+            entries: 待写入的条目。
+
+        Returns:
+            bool: 写入成功时返回 ``True``。
+        """
+        try:
+            existing = self._spill_path.read_text(encoding="utf-8") if self._spill_path.exists() else ""
+            self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+            head = "".join(json.dumps(entry.to_dict(), ensure_ascii=False) + "\n" for entry in entries)
+            self._spill_path.write_text(head + existing, encoding="utf-8")
+        except Exception as exc:
+            self._logger.warning(f"NapCat 离线出站溢出文件写入失败: {exc}")
+            return False
+        return True
@@ -0,0 +1,275 @@
+"""NapCat 群成员、陌生人与群资料缓存。"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping, Optional, Tuple
+
+import time
+
+from ..constants import (
+    DEFAULT_PROFILE_CACHE_MAX_ENTRIES,
+    DEFAULT_PROFILE_CACHE_MEMBER_TTL_SEC,
+    DEFAULT_PROFILE_CACHE_PROFILE_TTL_SEC,
+)
+from ..types import NapCatPayloadDict
+
+if TYPE_CHECKING:
+    from ..config import NapCatCacheConfig
+
+NapCatProfileCacheKey = Tuple[str, ...]
+
+PROFILE_KIND_MEMBER = "member"
+PROFILE_KIND_STRANGER = "stranger"
+PROFILE_KIND_GROUP = "group"
+_PROFILE_KINDS = (PROFILE_KIND_MEMBER, PROFILE_KIND_STRANGER, PROFILE_KIND_GROUP)
+
+
+def member_key(group_id: Any, user_id: Any) -> NapCatProfileCacheKey:
+    """构造群成员资料的缓存键。
+
+    Args:
+        group_id: 群号。
+        user_id: 用户号。
+
+    Returns:
+        NapCatProfileCacheKey: 缓存键。
+    """
+    return (PROFILE_KIND_MEMBER, str(group_id), str(user_id))
+
+
+def stranger_key(user_id: Any) -> NapCatProfileCacheKey:
+    """构造陌生人资料的缓存键。
+
+    Args:
+        user_id: 用户号。
+
+    Returns:
+        NapCatProfileCacheKey: 缓存键。
+    """
+    return (PROFILE_KIND_STRANGER, str(user_id))
+
+
+def group_key(group_id: Any) -> NapCatProfileCacheKey:
+    """构造群资料的缓存键。
+
+    Args:
+        group_id: 群号。
+
+    Returns:
+        NapCatProfileCacheKey: 缓存键。
+    """
+    return (PROFILE_KIND_GROUP, str(group_id))
+
+
+class NapCatProfileCache:
+    """位于 ``NapCatQueryService`` 之前的 TTL + LRU 资料缓存。
+
+    群成员资料与陌生人、群资料分别使用不同的有效期，全部条目共享同一个 LRU 上限。
+    条目过期后不会立即删除：过期只说明资料可能陈旧，重新查询时仍允许 NapCat 使用其自身缓存；
+    只有从未缓存过的键，或被入群、退群、管理员变更、群名片与群名称变更通知显式失效的键，
+    才要求以 ``no_cache=True`` 向 QQ 服务器查询最新资料。
+    """
+
+    # 被显式失效的键最多记录的数量；超出后最早的失效记录按普通未命中处理
+    _MAX_INVALIDATED_KEYS = 4096
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """初始化资料缓存。
+
+        Args:
+            clock: 单调时钟函数，用于计算条目有效期。
+        """
+        self._clock = clock
+        self._enabled: bool = True
+        self._member_ttl_sec: float = DEFAULT_PROFILE_CACHE_MEMBER_TTL_SEC
+        self._profile_ttl_sec: float = DEFAULT_PROFILE_CACHE_PROFILE_TTL_SEC
+        self._max_entries: int = DEFAULT_PROFILE_CACHE_MAX_ENTRIES
+        self._entries: "OrderedDict[NapCatProfileCacheKey, Tuple[NapCatPayloadDict, float]]" = OrderedDict()
+        self._invalidated: "OrderedDict[NapCatProfileCacheKey, None]" = OrderedDict()
+        self._counters: Dict[str, Dict[str, int]] = {
+            kind: {"hits": 0, "stale": 0, "misses": 0, "forced_refreshes": 0, "invalidations": 0, "evictions": 0}
+            for kind in _PROFILE_KINDS
+        }
+
+    def configure(self, cache_config: "NapCatCacheConfig") -> None:
+        """应用最新的缓存配置；关闭缓存时清空全部条目。
+
+        Args:
+            cache_config: 最新生效的资料缓存配置。
+        """
+        self._enabled = cache_config.enabled
+        self._member_ttl_sec = cache_config.member_ttl_sec
+        self._profile_ttl_sec = cache_config.profile_ttl_sec
+        self._max_entries = max(1, cache_config.max_entries)
+        if not self._enabled:
+            self.clear()
+            return
+        self._evict_overflow()
+
+    @property
+    def enabled(self) -> bool:
+        """返回资料缓存是否启用。"""
+        return self._enabled
+
+    def get(self, key: NapCatProfileCacheKey) -> Optional[NapCatPayloadDict]:
+        """读取未过期的缓存条目。
+
+        Args:
+            key: 缓存键。
+
+        Returns:
+            Optional[NapCatPayloadDict]: 条目副本；未命中、已过期或缓存关闭时返回 ``None``。
+        """
+        if not self._enabled:
+            return None
+        counters = self._counters[key[0]]
+        entry = self._entries.get(key)
+        if entry is None:
+            counters["forced_refreshes" if key in self._invalidated else "misses"] += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= self._clock():
+            counters["stale"] += 1
+            return None
+        self._entries.move_to_end(key)
+        counters["hits"] += 1
+        return dict(value)
+
+    def contains_fresh(self, key: NapCatProfileCacheKey) -> bool:
+        """判断条目是否存在且未过期，不计入命中统计。
+
+        Args:
+            key: 缓存键。
+
+        Returns:
+            bool: 读取该键会命中缓存时返回 ``True``。
+        """
+        if not self._enabled:
+            return False
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] > self._clock()
+
+    def requires_fresh(self, key: NapCatProfileCacheKey) -> bool:
+        """判断重新查询该键时是否需要绕过 NapCat 自身的缓存。
+
+        Args:
+            key: 缓存键。
+
+        Returns:
+            bool: 从未缓存、已被显式失效或缓存关闭时返回 ``True``；仅是过期时返回 ``False``。
+        """
+        return not self._enabled or key not in self._entries
+
+    def is_invalidated(self, key: NapCatProfileCacheKey) -> bool:
+        """判断条目是否已被通知显式失效且尚未重新查询。
+
+        Args:
+            key: 缓存键。
+
+        Returns:
+            bool: 已失效时返回 ``True``。
+        """
+        return key in self._invalidated
+
+    def put(self, key: NapCatProfileCacheKey, value: Mapping[str, Any]) -> None:
+        """写入查询结果。
+
+        Args:
+            key: 缓存键。
+            value: NapCat 返回的资料字典。
+        """
+        if not self._enabled:
+            return
+        ttl_sec = self._member_ttl_sec if key[0] == PROFILE_KIND_MEMBER else self._profile_ttl_sec
+        self._entries[key] = (dict(value), self._clock() + ttl_sec)
+        self._entries.move_to_end(key)
+        self._invalidated.pop(key, None)
+        self._evict_overflow()
+
+    def invalidate(self, key: NapCatProfileCacheKey) -> None:
+        """显式失效一个条目，下次查询将以 ``no_cache=True`` 获取最新资料。
+
+        Args:
+            key: 缓存键。
+        """
+        if not self._enabled:
+            return
+        self._entries.pop(key, None)
+        self._invalidated[key] = None
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self._MAX_INVALIDATED_KEYS:
+            self._invalidated.popitem(last=False)
+        self._counters[key[0]]["invalidations"] += 1
+
+    def invalidate_group_members(self, group_id: Any) -> None:
+        """失效指定群的全部成员资料。
+
+        Args:
+            group_id: 群号。
+        """
+        group_id_text = str(group_id)
+        member_keys = [key for key in self._entries if key[0] == PROFILE_KIND_MEMBER and key[1] == group_id_text]
+        for key in member_keys:
+            self.invalidate(key)
+
+    def invalidate_from_notice(self, payload: Mapping[str, Any]) -> None:
+        """根据通知事件失效受影响的条目。
+
+        Args:
+            payload: NapCat 通知事件。
+        """
+        if not self._enabled:
+            return
+        notice_type = str(payload.get("notice_type") or "").strip()
+        group_id = str(payload.get("group_id") or "").strip()
+        user_id = str(payload.get("user_id") or "").strip()
+        if not group_id:
+            return
+
+        if notice_type in {"group_increase", "group_decrease"}:
+            self.invalidate(group_key(group_id))
+            if user_id and user_id == str(payload.get("self_id") or "").strip():
+                self.invalidate_group_members(group_id)
+            elif user_id:
+                self.invalidate(member_key(group_id, user_id))
+        elif notice_type in {"group_admin", "group_card"}:
+            if user_id:
+                self.invalidate(member_key(group_id, user_id))
+        elif notice_type == "notify" and str(payload.get("sub_type") or "").strip() == "group_name":
+            self.invalidate(group_key(group_id))
+
+    def mark_stale(self) -> None:
+        """保留全部条目但将其视为过期。
+
+        连接断开期间错过的通知无法补回，条目只能视为可能陈旧；保留条目使重新查询时仍允许 NapCat 使用其自身缓存，
+        而不会让所有账号的资料查询都以 ``no_cache=True`` 打到 QQ 服务器。
+        """
+        for key, (value, _expires_at) in self._entries.items():
+            self._entries[key] = (value, 0.0)
+
+    def clear(self) -> None:
+        """清空全部缓存条目与失效记录。"""
+        self._entries.clear()
+        self._invalidated.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回资料缓存的运行指标。
+
+        Returns:
+            Dict[str, Any]: 是否启用、条目总数，以及每类资料的命中、过期、未命中、强制刷新、失效与淘汰计数。
+        """
+        sizes = {kind: 0 for kind in _PROFILE_KINDS}
+        for key in self._entries:
+            sizes[key[0]] += 1
+        return {
+            "enabled": self._enabled,
+            "entries": len(self._entries),
+            "kinds": {kind: {**self._counters[kind], "size": sizes[kind]} for kind in _PROFILE_KINDS},
+        }
+
+    def _evict_overflow(self) -> None:
+        """按最久未使用顺序淘汰超出上限的条目。"""
+        while len(self._entries) > self._max_entries:
+            key, _entry = self._entries.popitem(last=False)
+            self._counters[key[0]]["evictions"] += 1
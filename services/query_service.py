@@ -2,24 +2,66 @@
 
 from __future__ import annotations
 
-from typing import Any, List, Mapping, Optional
+from typing import TYPE_CHECKING, Any, Callable, List, Mapping, Optional
 
 from ..types import NapCatActionParams, NapCatActionResponse, NapCatPayloadDict, NapCatPayloadList
 from .action_service import NapCatActionService
+from .group_roster import NapCatGroupRosterStore
+from .member_batcher import NapCatMemberLookupBatcher
+from .profile_cache import NapCatProfileCache, NapCatProfileCacheKey, group_key, member_key, stranger_key
+
+if TYPE_CHECKING:
+    from ..config import NapCatCacheConfig
 
 
 class NapCatQueryService:
     """NapCat QQ 平台查询与管理动作服务。"""
 
-    def __init__(self, action_service: NapCatActionService, logger: Any) -> None:
+    def __init__(
+        self,
+        action_service: NapCatActionService,
+        logger: Any,
+        profile_cache: Optional[NapCatProfileCache] = None,
+        group_size_resolver: Optional[Callable[[str], Optional[int]]] = None,
+    ) -> None:
         """初始化查询服务。
 
         Args:
             action_service: NapCat 底层动作服务。
             logger: 插件日志对象。
+            profile_cache: 群成员、陌生人与群资料缓存；为空时创建一个使用默认配置的缓存。
+            group_size_resolver: 从群目录读取群成员数的函数，用于决定哪些群需要维护成员名册。
         """
         self._action_service = action_service
         self._logger = logger
+        self._profile_cache = profile_cache or NapCatProfileCache()
+        self._member_batcher = NapCatMemberLookupBatcher(logger, self._load_group_members)
+        self._roster_store = NapCatGroupRosterStore(logger, self.get_group_member_list, group_size_resolver)
+
+    @property
+    def profile_cache(self) -> NapCatProfileCache:
+        """返回资料缓存。"""
+        return self._profile_cache
+
+    @property
+    def member_batcher(self) -> NapCatMemberLookupBatcher:
+        """返回群成员查询合并器。"""
+        return self._member_batcher
+
+    @property
+    def roster_store(self) -> NapCatGroupRosterStore:
+        """返回大群成员名册。"""
+        return self._roster_store
+
+    def configure_cache(self, cache_config: "NapCatCacheConfig") -> None:
+        """应用资料缓存、成员查询合并与成员名册配置。
+
+        Args:
+            cache_config: 最新生效的资料缓存配置。
+        """
+        self._profile_cache.configure(cache_config)
+        self._member_batcher.configure(cache_config)
+        self._roster_store.configure(cache_config)
 
     async def call_action(self, action_name: str, params: NapCatActionParams) -> NapCatActionResponse:
         """调用 OneBot 动作并要求返回成功结果。
@@ -59,16 +101,17 @@ class NapCatQueryService:
 
         Args:
             user_id: 用户号。
-            no_cache: 是否禁用缓存。
+            no_cache: 是否跳过资料缓存并要求 NapCat 查询最新资料。
 
         Returns:
             Optional[NapCatPayloadDict]: 陌生人信息字典；失败时返回 ``None``。
         """
-        response_data = await self._safe_call_action_data(
+        return await self._get_cached_profile(
+            stranger_key(user_id),
             "get_stranger_info",
-            {"user_id": user_id, "no_cache": bool(no_cache)},
+            {"user_id": user_id},
+            no_cache,
         )
-        return response_data if isinstance(response_data, dict) else None
 
     async def get_friend_list(self, no_cache: bool = False) -> Optional[NapCatPayloadList]:
         """获取好友列表。
@@ -82,17 +125,17 @@ class NapCatQueryService:
         response_data = await self._safe_call_action_data("get_friend_list", {"no_cache": bool(no_cache)})
         return self._normalize_payload_list(response_data, action_name="get_friend_list")
 
-    async def get_group_info(self, group_id: str) -> Optional[NapCatPayloadDict]:
+    async def get_group_info(self, group_id: str, no_cache: bool = False) -> Optional[NapCatPayloadDict]:
         """获取群信息。
 
         Args:
             group_id: 群号。
+            no_cache: 是否跳过资料缓存并要求 NapCat 查询最新资料。
 
         Returns:
             Optional[NapCatPayloadDict]: 群信息字典；失败时返回 ``None``。
         """
-        response_data = await self._safe_call_action_data("get_group_info", {"group_id": group_id})
-        return response_data if isinstance(response_data, dict) else None
+        return await self._get_cached_profile(group_key(group_id), "get_group_info", {"group_id": group_id}, no_cache)
 
     async def get_group_detail_info(self, group_id: str) -> Optional[NapCatPayloadDict]:
         """获取群详细信息。
@@ -134,23 +177,56 @@ class NapCatQueryService:
         self,
         group_id: str,
         user_id: str,
-        no_cache: bool = True,
+        no_cache: bool = False,
     ) -> Optional[NapCatPayloadDict]:
         """获取群成员信息。
 
         Args:
             group_id: 群号。
             user_id: 用户号。
-            no_cache: 是否禁用缓存。
+            no_cache: 是否跳过资料缓存并要求 NapCat 查询最新资料。
 
         Returns:
             Optional[NapCatPayloadDict]: 群成员信息字典；失败时返回 ``None``。
         """
-        response_data = await self._safe_call_action_data(
-            "get_group_member_info",
-            {"group_id": group_id, "user_id": user_id, "no_cache": bool(no_cache)},
+        cache_key = member_key(group_id, user_id)
+        if not no_cache:
+            roster_member = self._roster_store.get_member(str(group_id), str(user_id))
+            if roster_member is not None:
+                return roster_member
+            cached_value = self._profile_cache.get(cache_key)
+            if cached_value is not None:
+                return cached_value
+
+        async def fetch_single() -> Optional[NapCatPayloadDict]:
+            member_info = await self._fetch_profile(
+                cache_key,
+                "get_group_member_info",
+                {"group_id": group_id, "user_id": user_id},
+                no_cache,
+            )
+            if member_info is not None:
+                self._roster_store.observe_member(str(group_id), member_info)
+            return member_info
+
+        # 被通知失效的成员需要最新资料，不走可能仍是旧数据的成员列表
+        if no_cache or self._profile_cache.is_invalidated(cache_key):
+            return await fetch_single()
+        return await self._member_batcher.lookup(str(group_id), str(user_id), fetch_single)
+
+    def is_group_member_cached(self, group_id: str, user_id: str) -> bool:
+        """判断群成员资料能否直接由名册或资料缓存取得，不访问 NapCat。
+
+        Args:
+            group_id: 群号。
+            user_id: 用户号。
+
+        Returns:
+            bool: ``get_group_member_info`` 不需要查询 NapCat 时返回 ``True``。
+        """
+        return self._roster_store.contains_member(str(group_id), str(user_id)) or self._profile_cache.contains_fresh(
+            member_key(group_id, user_id)
         )
-        return response_data if isinstance(response_data, dict) else None
 
     async def get_group_member_list(self, group_id: str, no_cache: bool = False) -> Optional[NapCatPayloadList]:
         """获取群成员列表。
@@ -180,6 +256,50 @@ class NapCatQueryService:
         response_data = await self._safe_call_action_data("get_msg", {"message_id": message_id})
         return response_data if isinstance(response_data, dict) else None
 
+    async def get_group_msg_history(
+        self,
+        group_id: str,
+        message_seq: str = "",
+        count: int = 20,
+    ) -> Optional[NapCatPayloadList]:
+        """获取群历史消息。
+
+        Args:
+            group_id: 群号。
+            message_seq: 起始消息序号；为空时从最新一条消息开始向前获取。
+            count: 单页条数。
+
+        Returns:
+            Optional[NapCatPayloadList]: 消息事件列表；失败时返回 ``None``。
+        """
+        params: NapCatActionParams = {"group_id": group_id, "count": count, "reverseOrder": False}
+        if message_seq:
+            params["message_seq"] = message_seq
+        response_data = await self._safe_call_action_data("get_group_msg_history", params)
+        return self._normalize_payload_list(response_data, action_name="get_group_msg_history")
+
+    async def get_friend_msg_history(
+        self,
+        user_id: str,
+        message_seq: str = "",
+        count: int = 20,
+    ) -> Optional[NapCatPayloadList]:
+        """获取好友历史消息。
+
+        Args:
+            user_id: 好友 QQ 号。
+            message_seq: 起始消息序号；为空时从最新一条消息开始向前获取。
+            count: 单页条数。
+
+        Returns:
+            Optional[NapCatPayloadList]: 消息事件列表；失败时返回 ``None``。
+        """
+        params: NapCatActionParams = {"user_id": user_id, "count": count, "reverseOrder": False}
+        if message_seq:
+            params["message_seq"] = message_seq
+        response_data = await self._safe_call_action_data("get_friend_msg_history", params)
+        return self._normalize_payload_list(response_data, action_name="get_friend_msg_history")
+
     async def get_forward_message(
         self,
         message_id: Optional[str] = None,
@@ -435,6 +555,77 @@ class NapCatQueryService:
         """
         return await self._action_service.download_binary(url)
 
+    async def _get_cached_profile(
+        self,
+        cache_key: NapCatProfileCacheKey,
+        action_name: str,
+        params: NapCatActionParams,
+        no_cache: bool,
+    ) -> Optional[NapCatPayloadDict]:
+        """先读资料缓存，未命中时查询 NapCat 并写回缓存。
+
+        只有调用方显式要求、缓存中从未有过该条目或条目已被通知失效时，才向 NapCat 传入 ``no_cache=True``；
+        条目仅是过期时仍允许 NapCat 使用其自身缓存。
+
+        Args:
+            cache_key: 资料缓存键。
+            action_name: OneBot 动作名称。
+            params: 不含 ``no_cache`` 的动作参数。
+            no_cache: 是否跳过资料缓存并要求 NapCat 查询最新资料。
+
+        Returns:
+            Optional[NapCatPayloadDict]: 资料字典；失败时返回 ``None``。
+        """
+        if not no_cache:
+            cached_value = self._profile_cache.get(cache_key)
+            if cached_value is not None:
+                return cached_value
+        return await self._fetch_profile(cache_key, action_name, params, no_cache)
+
+    async def _fetch_profile(
+        self,
+        cache_key: NapCatProfileCacheKey,
+        action_name: str,
+        params: NapCatActionParams,
+        no_cache: bool,
+    ) -> Optional[NapCatPayloadDict]:
+        """查询 NapCat 并写回资料缓存。
+
+        Args:
+            cache_key: 资料缓存键。
+            action_name: OneBot 动作名称。
+            params: 不含 ``no_cache`` 的动作参数。
+            no_cache: 调用方是否要求 NapCat 查询最新资料。
+
+        Returns:
+            Optional[NapCatPayloadDict]: 资料字典；失败时返回 ``None``。
+        """
+        fetch_fresh = bool(no_cache) or self._profile_cache.requires_fresh(cache_key)
+        response_data = await self._safe_call_action_data(action_name, {**params, "no_cache": fetch_fresh})
+        if not isinstance(response_data, dict):
+            return None
+        self._profile_cache.put(cache_key, response_data)
+        return response_data
+
+    async def _load_group_members(self, group_id: str) -> Optional[NapCatPayloadList]:
+        """获取整群成员列表并写入资料缓存与成员名册，供成员查询合并器使用。
+
+        Args:
+            group_id: 群号。
+
+        Returns:
+            Optional[NapCatPayloadList]: 群成员信息列表；失败时返回 ``None``。
+        """
+        members = await self.get_group_member_list(group_id)
+        if members is None:
+            return None
+        for member in members:
+            member_user_id = str(member.get("user_id") or "")
+            if member_user_id:
+                self._profile_cache.put(member_key(group_id, member_user_id), member)
+        self._roster_store.adopt(str(group_id), members)
+        return members
+
     async def _safe_call_action_data(self, action_name: str, params: NapCatActionParams) -> Any:
         """安全调用 OneBot 动作并返回 ``data`` 字段。
 
@@ -477,6 +668,7 @@ class NapCatQueryService:
             "list",
             "items",
             "members",
+            "messages",
             "member_list",
             "group_list",
             "friend_list",
@@ -0,0 +1,29 @@
+"""测试共用的适配器包加载辅助。
+
+与基准脚本相同，仓库根目录含有与标准库同名的模块，测试需从仓库以外的目录运行，
+并通过 ``benchmarks/_loader.py`` 以 ``napcat_adapter`` 别名导入子模块。
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import logging
+import sys
+
+BENCHMARKS_DIR = Path(__file__).resolve().parents[1] / "benchmarks"
+if str(BENCHMARKS_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCHMARKS_DIR))
+
+from _loader import load_adapter_module  # noqa: E402
+
+__all__ = ["load_adapter_module", "test_logger"]
+
+
+def test_logger() -> Any:
+    """返回测试使用的日志对象。"""
+    return logging.getLogger("napcat_adapter_tests")
+
+
+test_logger.__test__ = False  # type: ignore[attr-defined]
@@ -0,0 +1,70 @@
+"""只读动作合并的测试。"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import asyncio
+import gc
+
+from conftest import load_adapter_module, test_logger
+
+action_service_module = load_adapter_module("services.action_service")
+
+
+class _BlockingTransport:
+    """在放行前挂起全部动作的传输层替身。"""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.error: BaseException = RuntimeError("NapCat connection interrupted")
+        self.calls: int = 0
+
+    async def call_action(self, action_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        del action_name, params
+        self.calls += 1
+        await self.release.wait()
+        raise self.error
+
+    def current_connection_id(self) -> str:
+        return ""
+
+
+def test_shared_failure_is_retrieved_after_all_waiters_cancelled() -> None:
+    unhandled: List[Dict[str, Any]] = []
+
+    async def scenario() -> None:
+        asyncio.get_running_loop().set_exception_handler(lambda _loop, context: unhandled.append(context))
+        transport = _BlockingTransport()
+        service = action_service_module.NapCatActionService(test_logger(), transport)
+        waiters = [asyncio.ensure_future(service.call_action("get_group_info", {"group_id": 1})) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
+        transport.release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert transport.calls == 1
+        assert service.get_stats()["in_flight"] == 0
+        gc.collect()
+
+    asyncio.run(scenario())
+    gc.collect()
+    assert not unhandled
+
+
+def test_waiters_share_one_failure() -> None:
+    async def scenario() -> None:
+        transport = _BlockingTransport()
+        service = action_service_module.NapCatActionService(test_logger(), transport)
+        waiters = [asyncio.ensure_future(service.call_action("get_group_info", {"group_id": 1})) for _ in range(3)]
+        await asyncio.sleep(0)
+        transport.release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert transport.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    asyncio.run(scenario())
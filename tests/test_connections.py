@@ -0,0 +1,120 @@
+"""出站路由选择连接的测试。"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import asyncio
+
+import pytest
+
+from conftest import load_adapter_module, test_logger
+
+connections_module = load_adapter_module("runtime.connections")
+config_module = load_adapter_module("config")
+runtime_state_module = load_adapter_module("runtime_state")
+directory_module = load_adapter_module("services.contact_directory")
+
+
+class _GatewayCapability:
+    """总是接受状态上报的消息网关能力替身。"""
+
+    async def update_state(self, gateway_name: str, **kwargs: Any) -> bool:
+        del gateway_name, kwargs
+        return True
+
+
+class _QueryService:
+    """返回固定群列表与好友列表的查询服务替身。"""
+
+    async def get_group_list(self) -> List[Dict[str, Any]]:
+        return [{"group_id": 1001, "group_name": "测试群", "member_count": 3, "max_member_count": 200}]
+
+    async def get_friend_list(self) -> List[Dict[str, Any]]:
+        return [{"user_id": 2002, "nickname": "好友", "remark": ""}]
+
+
+def _build_connection(connection_id: str, is_primary: bool) -> Any:
+    server_config = config_module.NapCatServerConfig(connection_id=connection_id)
+    runtime_state = runtime_state_module.NapCatRuntimeStateManager(_GatewayCapability(), test_logger(), "napcat")
+    return connections_module.NapCatConnection(
+        connection_id=connection_id,
+        is_primary=is_primary,
+        server_config=server_config,
+        transport=SimpleNamespace(is_connected=True),
+        heartbeat_monitor=None,
+        runtime_state=runtime_state,
+        ban_state_store=None,
+        ban_tracker=None,
+        outbox=None,
+        history_backfill=None,
+        directory=None,
+    )
+
+
+def _build_manager(connection_ids: List[str]) -> Any:
+    manager = connections_module.NapCatConnectionManager(test_logger(), _build_connection)
+    connections: Dict[str, Any] = {}
+    for index, connection_id in enumerate(connection_ids):
+        connections[connection_id] = _build_connection(connection_id, index == 0)
+    manager._connections = connections
+    return manager
+
+
+def _activate(connection: Any, account_id: str) -> None:
+    asyncio.run(connection.runtime_state.report_connected(account_id, connection.server_config))
+
+
+def test_offline_primary_keeps_its_replies() -> None:
+    manager = _build_manager(["", "alt"])
+    primary, alternate = manager.get(""), manager.get("alt")
+    _activate(primary, "111")
+    _activate(alternate, "222")
+    asyncio.run(primary.runtime_state.report_disconnected())
+
+    route = {"route_metadata": {"self_id": "111", "connection_id": ""}}
+    assert manager.resolve_route(route) is primary
+    assert manager.resolve_route({"route_metadata": {"self_id": "222"}}) is alternate
+
+
+def test_unknown_account_is_not_sent_from_another_account() -> None:
+    manager = _build_manager(["", "alt", "third"])
+    _activate(manager.get("alt"), "222")
+    _activate(manager.get(""), "111")
+    _activate(manager.get("third"), "333")
+
+    with pytest.raises(RuntimeError):
+        manager.resolve_route({"route_metadata": {"self_id": "999"}})
+    with pytest.raises(RuntimeError):
+        manager.resolve_route({"route_metadata": {"connection_id": "missing"}})
+
+
+def test_single_never_activated_connection_owns_unknown_account() -> None:
+    manager = _build_manager(["", "alt"])
+    _activate(manager.get("alt"), "222")
+
+    assert manager.resolve_route({"route_metadata": {"self_id": "111"}}) is manager.get("")
+
+
+def test_route_without_account_uses_default_connection() -> None:
+    manager = _build_manager(["", "alt"])
+    _activate(manager.get("alt"), "222")
+
+    assert manager.resolve_route({}) is manager.get("alt")
+
+
+def test_contact_directory_snapshot_is_typed() -> None:
+    manager = _build_manager(["", "alt"])
+    directory = directory_module.NapCatContactDirectory(test_logger(), _QueryService(), None)
+    manager.get("alt").directory = directory
+    asyncio.run(directory.refresh())
+
+    snapshot = manager.get_contact_directory("alt")
+    assert isinstance(snapshot, directory_module.NapCatContactDirectorySnapshot)
+    assert snapshot.groups == (directory_module.NapCatGroupEntry("1001", "测试群", 3, 200),)
+    assert snapshot.friends == (directory_module.NapCatFriendEntry("2002", "好友", ""),)
+    assert snapshot.groups_loaded_at is not None and snapshot.friends_loaded_at is not None
+    assert snapshot.to_dict()["groups"][0]["group_name"] == "测试群"
+    with pytest.raises(ValueError):
+        manager.get_contact_directory("missing")
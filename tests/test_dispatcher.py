@@ -0,0 +1,94 @@
+"""入站调度器容量分配的测试。"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import asyncio
+import zlib
+
+from conftest import load_adapter_module, test_logger
+
+dispatcher_module = load_adapter_module("transport.dispatcher")
+
+SELF_ID = "10000"
+
+
+def _group_message(group_id: int, mention_self: bool = False) -> Dict[str, Any]:
+    message: List[Dict[str, Any]] = [{"type": "text", "data": {"text": "hello"}}]
+    if mention_self:
+        message.insert(0, {"type": "at", "data": {"qq": SELF_ID}})
+    return {
+        "post_type": "message",
+        "message_type": "group",
+        "group_id": group_id,
+        "user_id": 20000,
+        "self_id": SELF_ID,
+        "message": message,
+    }
+
+
+def _private_message(user_id: int) -> Dict[str, Any]:
+    return {"post_type": "message", "message_type": "private", "user_id": user_id, "self_id": SELF_ID, "message": []}
+
+
+def _same_lane_user(group_id: int, worker_count: int) -> int:
+    target_lane = zlib.crc32(f"group:{group_id}".encode("utf-8")) % worker_count
+    user_id = 30000
+    while zlib.crc32(f"user:{user_id}".encode("utf-8")) % worker_count != target_lane:
+        user_id += 1
+    return user_id
+
+
+def _same_lane_group(group_id: int, worker_count: int) -> int:
+    target_lane = zlib.crc32(f"group:{group_id}".encode("utf-8")) % worker_count
+    other_group_id = group_id + 1
+    while zlib.crc32(f"group:{other_group_id}".encode("utf-8")) % worker_count != target_lane:
+        other_group_id += 1
+    return other_group_id
+
+
+async def _blocked_dispatcher(max_size: int, worker_count: int) -> Any:
+    release = asyncio.Event()
+
+    async def on_payload(payload: Dict[str, Any]) -> None:
+        del payload
+        await release.wait()
+
+    dispatcher = dispatcher_module.NapCatInboundDispatcher(test_logger(), on_payload)
+    dispatcher.configure(max_size=max_size, worker_count=worker_count, high_water_mark=max_size)
+    await dispatcher.start()
+    return dispatcher
+
+
+def test_hot_group_cannot_crowd_out_private_and_mentions() -> None:
+    async def scenario() -> None:
+        dispatcher = await _blocked_dispatcher(max_size=200, worker_count=4)
+        hot_group_id = 123456
+        accepted = sum(dispatcher.offer(_group_message(hot_group_id)) for _ in range(500))
+        stats = dispatcher.get_stats()
+
+        assert accepted == stats["conversation_limit"] < stats["lane_limit"]
+        assert dispatcher.offer(_group_message(_same_lane_group(hot_group_id, 4)))
+        assert dispatcher.offer(_private_message(_same_lane_user(hot_group_id, 4)))
+        assert dispatcher.offer(_group_message(hot_group_id, mention_self=True))
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_reserve_keeps_room_for_priority_messages() -> None:
+    async def scenario() -> None:
+        dispatcher = await _blocked_dispatcher(max_size=100, worker_count=4)
+        for group_id in range(1, 201):
+            dispatcher.offer(_group_message(group_id))
+        stats = dispatcher.get_stats()
+
+        assert dispatcher.queue_depth == dispatcher.queue_capacity - stats["priority_reserve"]
+        assert not dispatcher.offer(_group_message(201))
+        for user_id in range(stats["priority_reserve"]):
+            assert dispatcher.offer(_private_message(user_id + 1))
+        assert not dispatcher.offer(_private_message(99999))
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
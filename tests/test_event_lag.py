@@ -0,0 +1,64 @@
+"""入站事件延迟估计的测试。"""
+
+from __future__ import annotations
+
+from typing import Any, List
+
+from conftest import load_adapter_module, test_logger
+
+event_lag_module = load_adapter_module("event_lag")
+overload_module = load_adapter_module("transport.overload")
+config_module = load_adapter_module("config")
+
+
+class _Clock:
+    """可手动推进的时钟替身。"""
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_clock_offset_is_not_reported_as_lag() -> None:
+    wall_clock = _Clock(1_700_000_300.0)
+    monotonic = _Clock(1000.0)
+    estimator = event_lag_module.NapCatEventLagEstimator(smoothing=1.0, clock=monotonic, wall_clock=wall_clock)
+
+    # NapCat 主机时钟比本机慢 300 秒
+    for _ in range(5):
+        assert estimator.observe(wall_clock.now - 300) == 0.0
+        wall_clock.now += 1
+        monotonic.now += 1
+    assert estimator.clock_offset_sec == 300.0
+
+    # 真实的 20 秒排队仍能体现出来
+    assert estimator.observe(wall_clock.now - 320) == 20.0
+    assert estimator.lag_sec == 20.0
+
+
+def test_clock_offset_follows_window() -> None:
+    wall_clock = _Clock(1_700_000_000.0)
+    monotonic = _Clock(0.0)
+    estimator = event_lag_module.NapCatEventLagEstimator(window_sec=100, clock=monotonic, wall_clock=wall_clock)
+    estimator.observe(wall_clock.now - 5)
+    monotonic.now += 200
+    estimator.observe(wall_clock.now - 60)
+
+    assert estimator.clock_offset_sec == 60.0
+
+
+def test_skewed_clock_does_not_trigger_overload() -> None:
+    wall_clock = _Clock(1_700_000_000.0)
+    controller = overload_module.NapCatOverloadController(test_logger(), clock=wall_clock)
+    controller.configure(config_module.NapCatInboundConfig())
+    payloads: List[Any] = [
+        {"post_type": "notice", "notice_type": "notify", "sub_type": "poke", "time": wall_clock.now - 3600 + index}
+        for index in range(50)
+    ]
+    shed = [controller.inspect(payload, queue_fill_ratio=0.0) for payload in payloads]
+
+    assert not any(shed)
+    assert controller.tier == overload_module.NapCatOverloadController.TIER_NONE
+    assert controller.get_stats()["event_lag_sec"] == 0.0
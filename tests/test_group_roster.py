@@ -0,0 +1,106 @@
+"""大群成员名册对账的测试。"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import asyncio
+
+from conftest import load_adapter_module, test_logger
+
+roster_module = load_adapter_module("services.group_roster")
+config_module = load_adapter_module("config")
+
+_RECONCILE_INTERVAL_SEC = 3600.0
+
+
+class _Clock:
+    """可手动推进的单调时钟替身。"""
+
+    def __init__(self) -> None:
+        self.now = 10_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _MemberLoader:
+    """在测试放行前一直挂起的整群成员列表获取替身。"""
+
+    def __init__(self, members: Optional[List[Dict[str, Any]]]) -> None:
+        self.members = members
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def __call__(self, group_id: str) -> Optional[List[Dict[str, Any]]]:
+        del group_id
+        self.calls += 1
+        await self.release.wait()
+        return self.members
+
+
+def _member(user_id: str, card: str = "") -> Dict[str, Any]:
+    return {"user_id": user_id, "nickname": f"user{user_id}", "card": card, "role": "member"}
+
+
+def _build_store(loader: _MemberLoader, clock: _Clock) -> Any:
+    store = roster_module.NapCatGroupRosterStore(test_logger(), loader, clock=clock)
+    store.configure(
+        config_module.NapCatCacheConfig(roster_min_members=2, roster_reconcile_interval_sec=_RECONCILE_INTERVAL_SEC)
+    )
+    store.adopt("100", [_member("1", "old"), _member("2")])
+    return store
+
+
+def test_changes_during_reload_survive_stale_member_list() -> None:
+    async def scenario() -> None:
+        clock = _Clock()
+        # 对账请求在变更之前发出，返回的成员列表仍是旧资料
+        loader = _MemberLoader([_member("1", "old"), _member("2"), _member("3")])
+        store = _build_store(loader, clock)
+        clock.now += _RECONCILE_INTERVAL_SEC
+        assert store.get_member("100", "1") is not None
+        await asyncio.sleep(0)
+        assert loader.calls == 1
+
+        store.apply_notice({"notice_type": "group_card", "group_id": 100, "user_id": 1, "card_new": "new"})
+        store.apply_notice({"notice_type": "group_decrease", "group_id": 100, "user_id": 2, "self_id": 999})
+        loader.release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert store.get_member("100", "1")["card"] == "new"
+        assert store.get_member("100", "2") is None
+        assert store.get_member("100", "3") is not None
+        store.observe_member("100", _member("2"))
+        assert not store.contains_member("100", "2")
+        assert store.get_stats()["reconciles"] == 1
+        assert store.get_stats()["loading"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_mark_for_reconcile_cancels_load_and_discards_pending_changes() -> None:
+    async def scenario() -> None:
+        clock = _Clock()
+        loader = _MemberLoader([_member("1", "reloaded"), _member("2")])
+        store = _build_store(loader, clock)
+        clock.now += _RECONCILE_INTERVAL_SEC
+        store.get_member("100", "1")
+        await asyncio.sleep(0)
+
+        store.mark_for_reconcile()
+        await asyncio.sleep(0)
+        assert store.get_stats()["loading"] == 0
+        # 取消的加载不再记录变更，下一次读取重新发起对账
+        store.get_member("100", "1")
+        await asyncio.sleep(0)
+        assert loader.calls == 2
+        loader.release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert store.get_member("100", "1")["card"] == "reloaded"
+        assert store.get_stats()["reconciles"] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+"""离线出站缓冲补发的测试。"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+import asyncio
+
+from conftest import load_adapter_module, test_logger
+
+outbox_module = load_adapter_module("services.offline_outbox")
+writer_module = load_adapter_module("transport.writer")
+
+
+class _Sender:
+    """按预设结果应答的动作发送替身，记录每次发送的消息。"""
+
+    def __init__(self, outcomes: List[Any]) -> None:
+        self.outcomes = outcomes
+        self.sent: List[Tuple[str, Dict[str, Any]]] = []
+
+    async def __call__(self, action_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.sent.append((action_name, params))
+        outcome = self.outcomes.pop(0) if self.outcomes else {"status": "ok"}
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def _build_outbox(sender: _Sender) -> Any:
+    outbox = outbox_module.NapCatOfflineOutbox(test_logger(), sender)
+    outbox.configure(enabled=True, max_size=10)
+    return outbox
+
+
+async def _drain(outbox: Any) -> None:
+    for _ in range(20):
+        await asyncio.sleep(0)
+    replay_task = outbox._replay_task
+    if replay_task is not None:
+        await replay_task
+
+
+def test_ambiguous_failure_is_not_resent() -> None:
+    async def scenario() -> None:
+        sender = _Sender([RuntimeError("NapCat action timeout: send_group_msg")])
+        outbox = _build_outbox(sender)
+        outbox.enqueue("send_group_msg", {"message": "first"})
+        outbox.activate()
+        await _drain(outbox)
+        outbox.enqueue("send_group_msg", {"message": "second"})
+        await _drain(outbox)
+
+        assert [params["message"] for _action, params in sender.sent] == ["first", "second"]
+        assert outbox.pending_count == 0
+        assert not outbox.should_hold(True)
+        assert outbox.get_stats()["replay_failed"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_not_connected_failure_keeps_head_for_next_activation() -> None:
+    async def scenario() -> None:
+        sender = _Sender([writer_module.NapCatNotConnectedError("NapCat is not connected")])
+        outbox = _build_outbox(sender)
+        outbox.enqueue("send_group_msg", {"message": "first"})
+        outbox.enqueue("send_group_msg", {"message": "second"})
+        outbox.activate()
+        await _drain(outbox)
+        assert outbox.pending_count == 2
+
+        outbox.deactivate()
+        outbox.activate()
+        await _drain(outbox)
+
+        assert [params["message"] for _action, params in sender.sent] == ["first", "first", "second"]
+        assert outbox.pending_count == 0
+        assert outbox.get_stats()["replayed"] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,62 @@
+"""出站帧写协程调度的测试。"""
+
+from __future__ import annotations
+
+from typing import List
+
+import asyncio
+
+from conftest import load_adapter_module, test_logger
+
+writer_module = load_adapter_module("transport.writer")
+
+
+class _WebSocket:
+    """记录写出帧的 WebSocket 替身，每次写出都会让出事件循环。"""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self.frames: List[str] = []
+
+    async def send_str(self, frame: str) -> None:
+        await asyncio.sleep(0)
+        self.frames.append(frame)
+
+
+def test_bulk_frame_is_promoted_under_control_flood() -> None:
+    async def scenario() -> None:
+        writer = writer_module.NapCatOutboundWriter(
+            test_logger(), bulk_frame_threshold=16, bulk_max_wait_ms=60_000, bulk_max_bypass=4
+        )
+        ws = _WebSocket()
+        writer.attach(ws)
+        bulk = writer.enqueue("B" * 32)
+        # 每写出一帧都有新的小帧到达，小帧队列始终不为空
+        for index in range(12):
+            writer.enqueue(f"c{index}")
+            await asyncio.sleep(0)
+        await bulk
+
+        assert ws.frames.index("B" * 32) == 4
+        assert writer.get_stats()["bulk_promoted"] == 1
+        await writer.detach("test finished")
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_frame_is_not_written() -> None:
+    async def scenario() -> None:
+        writer = writer_module.NapCatOutboundWriter(test_logger(), bulk_frame_threshold=16)
+        ws = _WebSocket()
+        writer.attach(ws)
+        expired = writer.enqueue("B" * 32)
+        expired.cancel()
+        await writer.send("c0")
+        await asyncio.sleep(0)
+
+        assert ws.frames == ["c0"]
+        assert writer.get_stats()["queue_depth"] == 0
+        await writer.detach("test finished")
+
+    asyncio.run(scenario())
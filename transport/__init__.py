@@ -0,0 +1,23 @@
+"""NapCat 传输层导出。"""
+
+from .client import NapCatTransportClient
+from .dispatcher import NapCatInboundDispatcher
+from .http_channel import NapCatHttpActionChannel
+from .overload import NapCatOverloadController
+from .reconnect import NapCatReconnectPolicy
+from .recorder import NapCatFrameRecorder, build_capture_path
+from .reverse import NapCatReverseServer, NapCatReverseTransport
+from .writer import NapCatNotConnectedError
+
+__all__ = [
+    "NapCatFrameRecorder",
+    "NapCatHttpActionChannel",
+    "NapCatInboundDispatcher",
+    "NapCatNotConnectedError",
+    "NapCatOverloadController",
+    "NapCatReconnectPolicy",
+    "NapCatReverseServer",
+    "NapCatReverseTransport",
+    "NapCatTransportClient",
+    "build_capture_path",
+]
@@ -0,0 +1,747 @@
+"""NapCat 正向 WebSocket 客户端。"""
+
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Dict, Optional, Set, cast
+from uuid import uuid4
+
+import asyncio
+import contextlib
+
+from ..codecs.json_codec import create_json_codec
+from ..config import NapCatCaptureConfig, NapCatInboundConfig, NapCatServerConfig
+from ..filters import NapCatFrameClassifier
+from .dispatcher import NapCatInboundDispatcher
+from .http_channel import NapCatHttpActionChannel
+from .overload import NapCatOverloadController
+from .reconnect import NapCatReconnectPolicy
+from .recorder import NapCatFrameRecorder, build_capture_path
+from .writer import NapCatNotConnectedError, NapCatOutboundWriter
+
+if TYPE_CHECKING:
+    from aiohttp import ClientWebSocketResponse as AiohttpClientWebSocketResponse
+
+    from ..runtime.scheduler import NapCatRuntimeScheduler, NapCatScheduledJob
+
+try:
+    from aiohttp import ClientSession, ClientTimeout, WSMsgType
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    ClientSession = cast(Any, None)
+    ClientTimeout = cast(Any, None)
+    WSMsgType = cast(Any, None)
+    AIOHTTP_AVAILABLE = False
+
+if not TYPE_CHECKING:
+    AiohttpClientWebSocketResponse = Any
+
+
+class NapCatTransportClient:
+    """NapCat 正向 WebSocket 客户端。"""
+
+    def __init__(
+        self,
+        logger: Any,
+        on_connection_opened: Callable[[], Coroutine[Any, Any, None]],
+        on_connection_closed: Callable[[], Coroutine[Any, Any, None]],
+        on_payload: Callable[[Dict[str, Any]], Coroutine[Any, Any, None]],
+        scheduler: "NapCatRuntimeScheduler",
+        frame_classifier: Optional[NapCatFrameClassifier] = None,
+    ) -> None:
+        """初始化传输层客户端。
+
+        Args:
+            logger: 插件日志对象。
+            on_connection_opened: 连接建立后的异步回调。
+            on_connection_closed: 连接断开后的异步回调。
+            on_payload: 收到非 echo 载荷后的异步回调。
+            scheduler: 运行时统一调度器，用于登记动作响应超时与主地址探测。
+            frame_classifier: 入站事件预分类器；为空时所有事件都进入调度队列。
+        """
+        self._logger = logger
+        self._scheduler = scheduler
+        self._frame_classifier = frame_classifier
+        self._on_connection_opened = on_connection_opened
+        self._on_connection_closed = on_connection_closed
+        self._dispatcher = NapCatInboundDispatcher(logger, on_payload)
+        self._json_codec = create_json_codec()
+        self._http_channel = NapCatHttpActionChannel(logger, self._json_codec)
+        self._writer = NapCatOutboundWriter(logger)
+        self._reconnect_policy = NapCatReconnectPolicy()
+        self._overload_controller = NapCatOverloadController(logger)
+        self._recorder = NapCatFrameRecorder(logger, scheduler, self._json_codec)
+        self._server_config: Optional[NapCatServerConfig] = None
+        self._connection_task: Optional[asyncio.Task[None]] = None
+        self._pending_actions: Dict[str, asyncio.Future[Dict[str, Any]]] = {}
+        self._background_tasks: Set[asyncio.Task[Any]] = set()
+        self._ws: Optional[AiohttpClientWebSocketResponse] = None
+        self._stop_requested: bool = False
+        self._connection_active: bool = False
+        self._warned_missing_token_for_ws_url: Optional[str] = None
+        self._endpoint_index: int = 0
+        self._active_ws_url: str = ""
+        self._failback_requested: bool = False
+        self._primary_probe_job: Optional["NapCatScheduledJob"] = None
+        self._failover_count: int = 0
+        self._failback_count: int = 0
+        self._primary_probe_count: int = 0
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """判断当前环境是否安装了传输层依赖。
+
+        Returns:
+            bool: 若已安装 ``aiohttp``，则返回 ``True``。
+        """
+        return AIOHTTP_AVAILABLE
+
+    @property
+    def active_ws_url(self) -> str:
+        """返回当前已连接的 WebSocket 地址。
+
+        Returns:
+            str: 正在使用的主地址或备用地址；未连接时为空字符串。
+        """
+        return self._active_ws_url
+
+    @property
+    def is_connected(self) -> bool:
+        """判断 WebSocket 连接当前是否可用。
+
+        Returns:
+            bool: 若连接已建立且尚未关闭，则返回 ``True``。
+        """
+        return self._ws is not None and not self._ws.closed
+
+    def configure(
+        self,
+        server_config: NapCatServerConfig,
+        inbound_config: Optional[NapCatInboundConfig] = None,
+        capture_config: Optional[NapCatCaptureConfig] = None,
+    ) -> None:
+        """更新当前传输层使用的 NapCat 服务端配置。
+
+        Args:
+            server_config: 最新生效的 NapCat 服务端配置。
+            inbound_config: 最新生效的入站调度配置；为空时使用默认值。
+            capture_config: 最新生效的帧录制配置；为空时不录制。
+        """
+        inbound_config = inbound_config or NapCatInboundConfig()
+        self._server_config = server_config
+        self._warned_missing_token_for_ws_url = None
+        self._reconnect_policy.configure(
+            base_delay_sec=server_config.reconnect_delay_sec,
+            max_delay_sec=server_config.reconnect_max_delay_sec,
+            stable_after_sec=server_config.reconnect_stable_after_sec,
+        )
+        self._endpoint_index = 0
+        self._failback_requested = False
+        self._http_channel.configure(server_config)
+        self._dispatcher.configure(
+            max_size=inbound_config.queue_max_size,
+            worker_count=inbound_config.worker_count,
+            high_water_mark=inbound_config.resolve_high_water_mark(),
+        )
+        self._overload_controller.configure(inbound_config)
+        self._recorder.configure(
+            capture_config or NapCatCaptureConfig(),
+            build_capture_path(server_config.connection_id),
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回传输层的运行指标。
+
+        Returns:
+            Dict[str, Any]: 以组件名为键的指标字典。
+        """
+        return {
+            "connected": self.is_connected,
+            "json_codec": self._json_codec.name,
+            "pending_actions": len(self._pending_actions),
+            "endpoint": self._get_endpoint_stats(),
+            "reconnect": self._reconnect_policy.get_stats(),
+            "inbound": self._dispatcher.get_stats(),
+            "overload": self._overload_controller.get_stats(),
+            "outbound": self._writer.get_stats(),
+            "http_actions": self._http_channel.get_stats(),
+            "capture": self._recorder.get_stats(),
+        }
+
+    async def start(self) -> None:
+        """启动 NapCat 正向 WebSocket 连接循环。
+
+        Raises:
+            RuntimeError: 当缺少配置或依赖时抛出。
+        """
+        if not self.is_available():
+            raise RuntimeError("NapCat 适配器依赖 aiohttp，但当前环境未安装该依赖")
+        if self._server_config is None:
+            raise RuntimeError("NapCat 适配器尚未配置 napcat_server")
+        if self._connection_task is not None and not self._connection_task.done():
+            return
+
+        self._stop_requested = False
+        self._logger.debug(f"NapCat 传输层 JSON 编解码实现: {self._json_codec.name}")
+        await self._dispatcher.start()
+        self._recorder.start()
+        self._connection_task = asyncio.create_task(self._connection_loop(), name="napcat_adapter.connection")
+
+    async def stop(self) -> None:
+        """停止当前连接并清理所有后台任务。"""
+        self._stop_requested = True
+        self._cancel_primary_probe()
+        connection_task = self._connection_task
+        self._connection_task = None
+
+        ws = self._ws
+        if ws is not None and not ws.closed:
+            with contextlib.suppress(Exception):
+                await ws.close()
+        self._ws = None
+
+        if connection_task is not None:
+            connection_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await connection_task
+
+        await self._writer.detach("NapCat connection closed")
+        await self._http_channel.close()
+        await self._dispatcher.stop()
+        await self._recorder.stop()
+        await self._cancel_background_tasks()
+        await self._notify_connection_closed()
+        self._fail_pending_actions("NapCat connection closed")
+
+    async def submit_payload(self, payload: Dict[str, Any]) -> None:
+        """将一条非 echo 载荷放入入站调度队列，与 WebSocket 收到的事件走同一处理链路。
+
+        Args:
+            payload: 需要处理的事件载荷，例如补收到的历史消息。
+        """
+        await self._dispatcher.submit(payload)
+
+    async def call_action(self, action_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """发送 OneBot 动作并等待对应的 echo 响应。
+
+        命中 HTTP 路由规则的动作优先通过 HTTP 动作通道发送，HTTP 不可用时回退到 WebSocket。
+
+        Args:
+            action_name: OneBot 动作名称。
+            params: 动作参数。
+
+        Returns:
+            Dict[str, Any]: NapCat 返回的原始响应字典。
+
+        Raises:
+            NapCatNotConnectedError: 当连接不可用、动作确定没有发出时抛出。
+            RuntimeError: 当动作发出后连接中断、响应超时等无法确认是否已执行时抛出。
+        """
+        if self._http_channel.should_route(action_name):
+            http_response = await self._http_channel.call_action(action_name, params)
+            if http_response is not None:
+                self._recorder.record_http_action(action_name, params, http_response)
+                return http_response
+
+        ws = self._ws
+        server_config = self._server_config
+        if ws is None or ws.closed or server_config is None:
+            raise NapCatNotConnectedError("NapCat is not connected")
+
+        echo_id = uuid4().hex
+        loop = asyncio.get_running_loop()
+        response_future: asyncio.Future[Dict[str, Any]] = loop.create_future()
+        self._pending_actions[echo_id] = response_future
+
+        request_payload = {"action": action_name, "params": params, "echo": echo_id}
+        deadline_job = self._scheduler.call_later(
+            server_config.action_timeout_sec,
+            self._expire_pending_action,
+            echo_id,
+            name="transport.action_deadline",
+        )
+        send_future: Optional[asyncio.Future[None]] = None
+        try:
+            request_text = self._json_codec.dumps(request_payload)
+            self._recorder.record_outbound(request_text)
+            # 响应时限从入队时开始计算；时限到达时帧仍在出站队列中则直接撤回，不再写出
+            send_future = self._writer.enqueue(request_text)
+            await asyncio.wait((send_future, response_future), return_when=asyncio.FIRST_COMPLETED)
+            if send_future.done():
+                send_future.result()
+            return await response_future
+        finally:
+            if send_future is not None:
+                send_future.cancel()
+            deadline_job.cancel()
+            self._pending_actions.pop(echo_id, None)
+
+    async def _connection_loop(self) -> None:
+        """维护单个 WebSocket 连接，并在断开后按配置重连。
+
+        配置了备用地址时，当前地址失败后立即尝试下一个地址；全部地址轮询一遍后才交由
+        重连策略决定等待时长。连接在备用地址上时会后台探测主地址，恢复后主动切回。
+        """
+        assert ClientSession is not None
+        assert ClientTimeout is not None
+
+        while not self._stop_requested:
+            server_config = self._server_config
+            if server_config is None:
+                return
+
+            ws_urls = server_config.build_ws_urls()
+            if self._endpoint_index >= len(ws_urls):
+                self._endpoint_index = 0
+            ws_url = ws_urls[self._endpoint_index]
+            timeout = ClientTimeout(total=None, connect=10)
+            self._log_connection_attempt(ws_url, server_config)
+            self._reconnect_policy.record_attempt()
+
+            end_reason = ""
+            connected = False
+            try:
+                async with ClientSession(headers=self._build_headers(server_config), timeout=timeout) as session:
+                    async with session.ws_connect(ws_url, heartbeat=server_config.heartbeat_interval or None) as ws:
+                        connected = True
+                        self._reconnect_policy.record_connected()
+                        if self._endpoint_index > 0:
+                            self._logger.info(f"NapCat 适配器已连接到备用地址: {ws_url}")
+                            self._start_primary_probe(server_config)
+                        else:
+                            self._logger.info(f"NapCat 适配器已连接: {ws_url}")
+                        end_reason = await self._run_session(ws, ws_url)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                end_reason = str(exc)
+            finally:
+                self._cancel_primary_probe()
+                if connected:
+                    self._reconnect_policy.record_disconnected()
+
+            if self._stop_requested:
+                self._log_connection_ended(ws_url, server_config, connected, end_reason, None)
+                break
+
+            delay_sec = 0.0 if self._advance_endpoint(len(ws_urls)) else self._reconnect_policy.next_delay()
+            self._log_connection_ended(ws_url, server_config, connected, end_reason, delay_sec)
+            if delay_sec > 0:
+                await asyncio.sleep(delay_sec)
+
+    def _advance_endpoint(self, endpoint_count: int) -> bool:
+        """在连接结束后选择下一次要连接的地址。
+
+        Args:
+            endpoint_count: 当前配置的地址总数。
+
+        Returns:
+            bool: 若应立即连接所选地址而不等待重连间隔，则返回 ``True``。
+        """
+        if self._failback_requested:
+            self._failback_requested = False
+            self._endpoint_index = 0
+            self._failback_count += 1
+            return True
+
+        if endpoint_count <= 1:
+            self._endpoint_index = 0
+            return False
+
+        self._endpoint_index = (self._endpoint_index + 1) % endpoint_count
+        if self._endpoint_index == 0:
+            return False
+        self._failover_count += 1
+        return True
+
+    def _start_primary_probe(self, server_config: NapCatServerConfig) -> None:
+        """在连接到备用地址后登记主地址探测任务。
+
+        Args:
+            server_config: 当前生效的 NapCat 服务端配置。
+        """
+        self._cancel_primary_probe()
+        self._primary_probe_job = self._scheduler.every(
+            server_config.primary_probe_interval_sec,
+            self._probe_primary_endpoint,
+            name="transport.primary_probe",
+        )
+
+    def _cancel_primary_probe(self) -> None:
+        """取消尚未结束的主地址探测任务。"""
+        probe_job = self._primary_probe_job
+        self._primary_probe_job = None
+        if probe_job is not None:
+            probe_job.cancel()
+
+    async def _probe_primary_endpoint(self) -> None:
+        """探测主地址是否恢复，恢复后关闭备用连接以便连接循环切回主地址。"""
+        assert ClientSession is not None
+        assert ClientTimeout is not None
+
+        ws = self._ws
+        server_config = self._server_config
+        if ws is None or ws.closed or server_config is None or self._endpoint_index == 0:
+            return
+
+        primary_ws_url = server_config.build_ws_url()
+        self._primary_probe_count += 1
+        try:
+            timeout = ClientTimeout(total=10)
+            async with ClientSession(headers=self._build_headers(server_config), timeout=timeout) as session:
+                async with session.ws_connect(primary_ws_url) as probe_ws:
+                    await probe_ws.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._logger.debug(f"NapCat 主地址仍不可用: {primary_ws_url}，{exc}")
+            return
+
+        if self._ws is not ws or ws.closed:
+            return
+
+        self._logger.info(f"NapCat 主地址已恢复，准备从备用地址 {self._active_ws_url} 切回: {primary_ws_url}")
+        self._failback_requested = True
+        self._cancel_primary_probe()
+        await ws.close()
+
+    async def _run_session(self, ws: AiohttpClientWebSocketResponse, ws_url: str) -> str:
+        """在一条已建立的 WebSocket 连接上收发数据，直到连接结束。
+
+        Args:
+            ws: 已建立的 WebSocket 连接对象。
+            ws_url: 连接对应的地址，用于状态上报与指标。
+
+        Returns:
+            str: 当前连接结束时的简要原因描述。
+        """
+        self._ws = ws
+        self._active_ws_url = ws_url
+        self._writer.attach(ws)
+        try:
+            return await self._receive_loop(ws)
+        finally:
+            self._ws = None
+            self._active_ws_url = ""
+            await self._writer.detach("NapCat connection interrupted")
+            await self._notify_connection_closed()
+            self._fail_pending_actions("NapCat connection interrupted")
+
+    async def _receive_loop(self, ws: AiohttpClientWebSocketResponse) -> str:
+        """持续消费 WebSocket 消息并分发处理。
+
+        Args:
+            ws: 当前活跃的 WebSocket 连接对象。
+
+        Returns:
+            str: 当前连接结束时的简要原因描述。
+        """
+        assert WSMsgType is not None
+
+        disconnect_reason = "未收到更多 WebSocket 消息，连接已结束"
+        bootstrap_task = self._create_background_task(
+            self._notify_connection_opened(),
+            "napcat_adapter.bootstrap",
+        )
+        try:
+            async for ws_message in ws:
+                if ws_message.type not in (WSMsgType.TEXT, WSMsgType.BINARY):
+                    if ws_message.type == WSMsgType.CLOSE:
+                        disconnect_reason = self._describe_terminal_ws_message(
+                            ws=ws,
+                            ws_message=ws_message,
+                            message_label="收到服务端 CLOSE 帧",
+                        )
+                        break
+                    if ws_message.type == WSMsgType.CLOSED:
+                        disconnect_reason = self._describe_terminal_ws_message(
+                            ws=ws,
+                            ws_message=ws_message,
+                            message_label="WebSocket 已关闭",
+                        )
+                        break
+                    if ws_message.type == WSMsgType.ERROR:
+                        disconnect_reason = self._describe_terminal_ws_message(
+                            ws=ws,
+                            ws_message=ws_message,
+                            message_label="WebSocket 进入错误状态",
+                        )
+                        break
+                    continue
+
+                payload = self._parse_json_message(ws_message.data)
+                if payload is None:
+                    continue
+
+                self._recorder.record_inbound(ws_message.data, payload)
+
+                if echo_id := str(payload.get("echo") or "").strip():
+                    self._resolve_pending_action(echo_id, payload)
+                    continue
+
+                # 在占用调度队列之前丢弃必然会被过滤的事件
+                if self._frame_classifier is not None and self._frame_classifier.classify(payload):
+                    continue
+
+                # 持续过载时按层级丢弃低价值事件，私聊与 @ 机器人的消息始终保留
+                if self._overload_controller.inspect(payload, queue_fill_ratio=self._dispatcher.fill_ratio):
+                    continue
+
+                # 不能在此等待队列空位：本循环也是 echo 响应的唯一读取方
+                self._dispatcher.offer(payload)
+        finally:
+            if bootstrap_task is not None and not bootstrap_task.done():
+                bootstrap_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await bootstrap_task
+
+        return disconnect_reason
+
+    def _create_background_task(self, coroutine: Coroutine[Any, Any, Any], name: str) -> asyncio.Task[Any]:
+        """创建并跟踪一个后台任务。
+
+        Args:
+            coroutine: 待执行的协程对象。
+            name: 任务名。
+
+        Returns:
+            asyncio.Task[Any]: 已创建的后台任务。
+        """
+        task = asyncio.create_task(coroutine, name=name)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._handle_background_task_completion)
+        return task
+
+    def _handle_background_task_completion(self, task: asyncio.Task[Any]) -> None:
+        """处理后台任务结束后的清理与异常记录。
+
+        Args:
+            task: 已结束的后台任务。
+        """
+        self._background_tasks.discard(task)
+        if task.cancelled():
+            return
+
+        exception = task.exception()
+        if exception is not None:
+            self._logger.error(f"NapCat 适配器后台任务异常: {exception}", exc_info=True)
+
+    async def _cancel_background_tasks(self) -> None:
+        """取消所有仍在运行的后台任务。"""
+        background_tasks = list(self._background_tasks)
+        for task in background_tasks:
+            task.cancel()
+        if background_tasks:
+            with contextlib.suppress(Exception):
+                await asyncio.gather(*background_tasks, return_exceptions=True)
+        self._background_tasks.clear()
+
+    async def _notify_connection_opened(self) -> None:
+        """在连接建立后触发上层回调。"""
+        if self._connection_active:
+            return
+
+        self._connection_active = True
+        try:
+            await self._on_connection_opened()
+        except Exception as exc:
+            self._logger.warning(f"NapCat 适配器连接建立回调失败: {exc}")
+
+    async def _notify_connection_closed(self) -> None:
+        """在连接断开后触发上层回调。"""
+        if not self._connection_active:
+            return
+
+        self._connection_active = False
+        try:
+            await self._on_connection_closed()
+        except Exception as exc:
+            self._logger.warning(f"NapCat 适配器断连回调失败: {exc}")
+
+    def _resolve_pending_action(self, echo_id: str, payload: Dict[str, Any]) -> None:
+        """解析等待中的动作响应。
+
+        Args:
+            echo_id: 动作请求对应的 echo 标识。
+            payload: NapCat 返回的响应载荷。
+        """
+        response_future = self._pending_actions.get(echo_id)
+        if response_future is None or response_future.done():
+            return
+        response_future.set_result(payload)
+
+    def _expire_pending_action(self, echo_id: str) -> None:
+        """让超过响应时限的动作以超时异常结束。
+
+        Args:
+            echo_id: 动作请求对应的 echo 标识。
+        """
+        response_future = self._pending_actions.get(echo_id)
+        if response_future is None or response_future.done():
+            return
+        response_future.set_exception(asyncio.TimeoutError())
+
+    def _fail_pending_actions(self, error_message: str) -> None:
+        """让所有等待中的动作以异常方式结束。
+
+        Args:
+            error_message: 写入异常中的错误信息。
+        """
+        for response_future in self._pending_actions.values():
+            if not response_future.done():
+                response_future.set_exception(RuntimeError(error_message))
+        self._pending_actions.clear()
+
+    def _build_headers(self, server_config: NapCatServerConfig) -> Dict[str, str]:
+        """构造连接 NapCat 所需的请求头。
+
+        Args:
+            server_config: 当前生效的 NapCat 服务端配置。
+
+        Returns:
+            Dict[str, str]: WebSocket 握手请求头。
+        """
+        return {"Authorization": f"Bearer {server_config.token}"} if server_config.token else {}
+
+    def _log_connection_attempt(self, ws_url: str, server_config: NapCatServerConfig) -> None:
+        """记录一次连接尝试的诊断信息。
+
+        Args:
+            ws_url: 即将连接的 WebSocket 地址。
+            server_config: 当前生效的 NapCat 服务端配置。
+        """
+        auth_mode = "已配置 token" if server_config.token else "未配置 token"
+        self._logger.debug(f"NapCat 适配器开始连接: {ws_url}（鉴权: {auth_mode}）")
+
+        if not server_config.token and self._warned_missing_token_for_ws_url != ws_url:
+            self._logger.warning(
+                "NapCat 适配器当前未配置 napcat_server.token；"
+                "若 NapCat 开启了访问令牌校验，连接可能会被服务端立即断开"
+            )
+            self._warned_missing_token_for_ws_url = ws_url
+
+    def _log_connection_ended(
+        self,
+        ws_url: str,
+        server_config: NapCatServerConfig,
+        connected: bool,
+        reason: str,
+        delay_sec: Optional[float],
+    ) -> None:
+        """记录连接结束与重连计划。
+
+        Args:
+            ws_url: 当前连接对应的 WebSocket 地址。
+            server_config: 当前生效的 NapCat 服务端配置。
+            connected: 本轮是否成功建立过连接。
+            reason: 当前连接结束或连接失败的原因。
+            delay_sec: 下一次连接前的等待秒数；停止请求已发出时为 ``None``。
+        """
+        label = "连接已断开" if connected else "连接失败"
+        self._logger.warning(
+            f"NapCat 适配器{label}: {ws_url}，{reason}"
+            f"{self._build_missing_token_hint(server_config)}"
+            f"{self._build_reconnect_hint(server_config, delay_sec)}"
+        )
+
+    def _build_missing_token_hint(self, server_config: NapCatServerConfig) -> str:
+        """构造缺失 token 时的附加提示。
+
+        Args:
+            server_config: 当前生效的 NapCat 服务端配置。
+
+        Returns:
+            str: 缺失 token 时的提示文案；无需提示时返回空字符串。
+        """
+        if server_config.token:
+            return ""
+        return "；当前未配置 napcat_server.token，若服务端开启了访问令牌校验，请补全 token"
+
+    def _build_reconnect_hint(self, server_config: NapCatServerConfig, delay_sec: Optional[float]) -> str:
+        """构造连接结束后的重连提示。
+
+        Args:
+            server_config: 当前生效的 NapCat 服务端配置。
+            delay_sec: 下一次连接前的等待秒数；为 ``None`` 时表示不再重连。
+
+        Returns:
+            str: 自动重连或地址切换提示；当停止请求已发出时返回空字符串。
+        """
+        if self._stop_requested or delay_sec is None:
+            return ""
+
+        when = "立即" if delay_sec <= 0 else f"在 {delay_sec:.1f} 秒后"
+        ws_urls = server_config.build_ws_urls()
+        if len(ws_urls) <= 1:
+            return f"；将{when}重连"
+        if self._endpoint_index == 0:
+            return f"；将{when}连接主地址"
+        return f"；将{when}切换到备用地址 {ws_urls[self._endpoint_index]}"
+
+    def _get_endpoint_stats(self) -> Dict[str, Any]:
+        """返回地址切换相关的运行指标。
+
+        Returns:
+            Dict[str, Any]: 当前地址、地址总数以及切换与探测计数。
+        """
+        server_config = self._server_config
+        return {
+            "active_ws_url": self._active_ws_url,
+            "active_index": self._endpoint_index if self._active_ws_url else None,
+            "endpoints": len(server_config.build_ws_urls()) if server_config is not None else 0,
+            "failovers": self._failover_count,
+            "failbacks": self._failback_count,
+            "primary_probes": self._primary_probe_count,
+        }
+
+    def _describe_terminal_ws_message(
+        self,
+        ws: AiohttpClientWebSocketResponse,
+        ws_message: Any,
+        message_label: str,
+    ) -> str:
+        """描述导致连接结束的终止类 WebSocket 消息。
+
+        Args:
+            ws: 当前活跃的 WebSocket 连接对象。
+            ws_message: aiohttp 返回的终止消息。
+            message_label: 当前终止消息的人类可读标签。
+
+        Returns:
+            str: 汇总后的终止原因描述。
+        """
+        details = []
+        close_code = getattr(ws, "close_code", None)
+        if close_code not in (None, 0):
+            details.append(f"close_code={close_code}")
+
+        message_data = getattr(ws_message, "data", None)
+        if message_data not in (None, "", 0, close_code):
+            details.append(f"data={message_data}")
+
+        message_extra = str(getattr(ws_message, "extra", "") or "").strip()
+        if message_extra:
+            details.append(f"extra={message_extra}")
+
+        ws_exception = ws.exception()
+        if ws_exception is not None:
+            details.append(f"exception={ws_exception}")
+
+        if not details:
+            return message_label
+        return f"{message_label}（{', '.join(str(item) for item in details)}）"
+
+    def _parse_json_message(self, data: Any) -> Optional[Dict[str, Any]]:
+        """解析 WebSocket 文本或二进制帧中的 JSON 数据。
+
+        Args:
+            data: WebSocket 收到的原始文本或字节数据，直接交给 JSON 编解码器，不做额外复制。
+
+        Returns:
+            Optional[Dict[str, Any]]: 成功时返回字典，失败时返回 ``None``。
+        """
+        try:
+            payload = self._json_codec.loads(data)
+        except Exception as exc:
+            self._logger.warning(f"NapCat 适配器解析 JSON 载荷失败: {exc}")
+            return None
+
+        return payload if isinstance(payload, dict) else None
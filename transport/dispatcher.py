@@ -0,0 +1,413 @@
+"""NapCat 入站事件有界调度队列。"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Callable, Coroutine, Deque, Dict, List, Mapping, Optional, Tuple
+
+import asyncio
+import contextlib
+import time
+import zlib
+
+from ..constants import (
+    DEFAULT_INBOUND_HIGH_WATER_RATIO,
+    DEFAULT_INBOUND_QUEUE_MAX_SIZE,
+    DEFAULT_INBOUND_WORKER_COUNT,
+)
+from .overload import mentions_self
+
+
+class _NapCatInboundLane:
+    """单条入站分片通道，由一个工作协程按先进先出顺序消费。"""
+
+    def __init__(self, index: int) -> None:
+        """初始化分片通道。
+
+        通道本身不限长度，容量由调度器按合计容量与单通道上限统一控制。
+
+        Args:
+            index: 通道序号。
+        """
+        self.index = index
+        self.queue: asyncio.Queue[Tuple[float, str, Dict[str, Any]]] = asyncio.Queue()
+        self.enqueued_at: Deque[float] = deque()
+        self.worker: Optional[asyncio.Task[None]] = None
+        self.busy: bool = False
+
+    def oldest_age_sec(self, now: float) -> float:
+        """返回通道内最旧事件的等待时长。
+
+        Args:
+            now: 当前单调时钟时间。
+
+        Returns:
+            float: 等待秒数；通道为空时为 ``0``。
+        """
+        return now - self.enqueued_at[0] if self.enqueued_at else 0.0
+
+
+class NapCatInboundDispatcher:
+    """以按会话分片的有界通道消费 NapCat 入站事件。
+
+    同一群聊或私聊的事件始终落入同一条通道，并由该通道唯一的工作协程按到达顺序处理；
+    不同会话分布在不同通道上并行处理。各通道共享合计容量：热点会话所在的通道可以占用超出平均份额的空间，
+    但单条通道最多占用合计容量的四分之一，单个会话最多占用通道上限的一半，同一通道上的其他会话始终留有空间。
+    私聊消息与 @ 机器人的消息不受通道与会话上限限制，并可使用为它们预留的合计容量，
+    因此热点群写满通道时它们仍会被接收。接收循环同时负责读取动作的 echo 响应，
+    因此只通过不等待的 ``offer`` 放入载荷，容量不足时丢弃新事件并计数，而不是暂停读取 WebSocket；
+    补收历史消息等内部调用方使用会等待空位的 ``submit``。
+    """
+
+    # 单条通道最多占用的合计容量比例
+    _LANE_SPILL_RATIO = 0.25
+    # 单个会话最多占用的单通道上限比例
+    _CONVERSATION_SHARE_RATIO = 0.5
+    # 只留给私聊消息与 @ 机器人消息的合计容量比例
+    _PRIORITY_RESERVE_RATIO = 0.1
+
+    def __init__(
+        self,
+        logger: Any,
+        on_payload: Callable[[Dict[str, Any]], Coroutine[Any, Any, None]],
+    ) -> None:
+        """初始化入站调度器。
+
+        Args:
+            logger: 插件日志对象。
+            on_payload: 工作协程处理单条载荷时调用的异步回调。
+        """
+        self._logger = logger
+        self._on_payload = on_payload
+        self._max_size: int = DEFAULT_INBOUND_QUEUE_MAX_SIZE
+        self._worker_count: int = DEFAULT_INBOUND_WORKER_COUNT
+        self._high_water_mark: int = max(1, int(DEFAULT_INBOUND_QUEUE_MAX_SIZE * DEFAULT_INBOUND_HIGH_WATER_RATIO))
+        self._lanes: List[_NapCatInboundLane] = []
+        self._lane_limit: int = self._max_size
+        self._conversation_limit: int = self._max_size
+        self._priority_reserve: int = 0
+        self._conversation_depths: Dict[str, int] = {}
+        self._space_available = asyncio.Event()
+        self._depth: int = 0
+        self._above_high_water: bool = False
+        self._peak_depth: int = 0
+        self._high_water_hits: int = 0
+        self._submitted_total: int = 0
+        self._completed_total: int = 0
+        self._failed_total: int = 0
+        self._rejected_total: int = 0
+        self._priority_total: int = 0
+        self._rejecting: bool = False
+
+    def configure(self, max_size: int, worker_count: int, high_water_mark: int) -> None:
+        """更新队列容量与通道数量，下次 ``start`` 时生效。
+
+        Args:
+            max_size: 所有通道合计的最大长度。
+            worker_count: 分片通道数量，每条通道一个工作协程。
+            high_water_mark: 触发高水位告警的合计队列深度。
+        """
+        self._max_size = max(1, int(max_size))
+        self._worker_count = max(1, int(worker_count))
+        self._high_water_mark = min(max(1, int(high_water_mark)), self._max_size)
+
+    @property
+    def is_running(self) -> bool:
+        """返回调度器当前是否正在运行。"""
+        return bool(self._lanes)
+
+    @property
+    def queue_depth(self) -> int:
+        """返回所有通道合计的当前队列深度。"""
+        return self._depth
+
+    @property
+    def queue_capacity(self) -> int:
+        """返回所有通道合计的队列容量。"""
+        return self._max_size
+
+    @property
+    def fill_ratio(self) -> float:
+        """返回队列占用比例，取最繁忙通道相对单通道上限与合计深度相对合计容量两者中的较大值。
+
+        热点会话会先让自身所在通道达到上限并开始丢弃事件，此时合计深度可能仍很低，
+        因此过载判断需要看最繁忙的通道。
+        """
+        busiest_lane_depth = max((lane.queue.qsize() for lane in self._lanes), default=0)
+        return max(busiest_lane_depth / self._lane_limit, self._depth / self._max_size)
+
+    async def start(self) -> None:
+        """创建分片通道并启动工作协程。"""
+        if self._lanes:
+            return
+
+        lane_share = max(1, -(-self._max_size // self._worker_count))
+        self._lane_limit = max(lane_share, int(self._max_size * self._LANE_SPILL_RATIO))
+        self._conversation_limit = max(1, int(self._lane_limit * self._CONVERSATION_SHARE_RATIO))
+        self._priority_reserve = min(self._max_size - 1, int(self._max_size * self._PRIORITY_RESERVE_RATIO))
+        self._conversation_depths = {}
+        self._lanes = [_NapCatInboundLane(index) for index in range(self._worker_count)]
+        self._depth = 0
+        self._above_high_water = False
+        for lane in self._lanes:
+            lane.worker = asyncio.create_task(
+                self._worker_loop(lane),
+                name=f"napcat_adapter.inbound_worker.{lane.index}",
+            )
+
+    async def stop(self) -> None:
+        """停止工作协程并丢弃尚未处理的载荷。"""
+        lanes = self._lanes
+        self._lanes = []
+        workers = [lane.worker for lane in lanes if lane.worker is not None]
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            with contextlib.suppress(Exception):
+                await asyncio.gather(*workers, return_exceptions=True)
+
+        pending_count = sum(lane.queue.qsize() for lane in lanes)
+        if pending_count:
+            self._logger.warning(f"NapCat 入站队列停止时仍有 {pending_count} 条事件未处理，已丢弃")
+        self._depth = 0
+        self._conversation_depths = {}
+        # 唤醒仍在等待空位的 submit，使其发现调度器已停止
+        self._space_available.set()
+
+    async def submit(self, payload: Dict[str, Any]) -> None:
+        """将一条载荷放入所属会话的通道，容量不足时等待空位。
+
+        Args:
+            payload: NapCat 推送的非 echo 载荷。
+
+        Raises:
+            RuntimeError: 当调度器尚未启动时抛出。
+        """
+        conversation_key = self.resolve_conversation_key(payload)
+        is_priority = self.is_priority_payload(payload)
+        while True:
+            if not self._lanes:
+                raise RuntimeError("NapCat 入站调度器尚未启动")
+            lane = self._select_lane(conversation_key)
+            if self._has_room(lane, conversation_key, is_priority):
+                break
+            self._space_available.clear()
+            await self._space_available.wait()
+
+        self._enqueue(lane, conversation_key, payload, is_priority)
+
+    def offer(self, payload: Dict[str, Any]) -> bool:
+        """不等待地将一条载荷放入所属会话的通道；容量不足时丢弃该载荷并计数。
+
+        供 WebSocket 接收循环使用：接收循环还要读取 echo 响应，阻塞在这里会让所有在途动作一起超时。
+
+        Args:
+            payload: NapCat 推送的非 echo 载荷。
+
+        Returns:
+            bool: 已放入通道时返回 ``True``；因合计容量、单通道或单会话上限已满被丢弃时返回 ``False``。
+
+        Raises:
+            RuntimeError: 当调度器尚未启动时抛出。
+        """
+        if not self._lanes:
+            raise RuntimeError("NapCat 入站调度器尚未启动")
+
+        conversation_key = self.resolve_conversation_key(payload)
+        is_priority = self.is_priority_payload(payload)
+        lane = self._select_lane(conversation_key)
+        if not self._has_room(lane, conversation_key, is_priority):
+            self._rejected_total += 1
+            if not self._rejecting:
+                self._rejecting = True
+                self._logger.warning(
+                    f"NapCat 入站通道 {lane.index} 已满: lane_depth={lane.queue.qsize()}/{self._lane_limit} "
+                    f"depth={self._depth}/{self._max_size}，新到达的事件将被丢弃，直到出现空位"
+                )
+            return False
+
+        if self._rejecting:
+            self._rejecting = False
+            self._logger.info(f"NapCat 入站通道已恢复接收，此前累计丢弃 {self._rejected_total} 条事件")
+        self._enqueue(lane, conversation_key, payload, is_priority)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回入站队列的运行指标。
+
+        Returns:
+            Dict[str, Any]: 队列深度、最旧事件等待时长、各通道深度与处理计数等指标。
+        """
+        now = time.monotonic()
+        lanes = self._lanes
+        lane_depths = [lane.queue.qsize() for lane in lanes]
+        oldest_age_sec = max((lane.oldest_age_sec(now) for lane in lanes), default=0.0)
+        return {
+            "running": bool(lanes),
+            "queue_depth": self._depth,
+            "queue_capacity": self._max_size,
+            "queue_peak_depth": self._peak_depth,
+            "queue_oldest_age_sec": round(oldest_age_sec, 3),
+            "high_water_mark": self._high_water_mark,
+            "high_water_hits": self._high_water_hits,
+            "worker_count": self._worker_count,
+            "busy_workers": sum(1 for lane in lanes if lane.busy),
+            "lane_depths": lane_depths,
+            "lane_limit": self._lane_limit,
+            "conversation_limit": self._conversation_limit,
+            "priority_reserve": self._priority_reserve,
+            "priority_submitted": self._priority_total,
+            "busiest_lane_depth": max(lane_depths, default=0),
+            "submitted": self._submitted_total,
+            "completed": self._completed_total,
+            "failed": self._failed_total,
+            "rejected": self._rejected_total,
+        }
+
+    @staticmethod
+    def resolve_conversation_key(payload: Mapping[str, Any]) -> str:
+        """解析载荷所属会话的分片键。
+
+        群事件按群号分片，私聊与好友类事件按用户号分片；
+        元事件等无法归属会话的载荷返回空字符串。
+
+        Args:
+            payload: NapCat 推送的非 echo 载荷。
+
+        Returns:
+            str: 形如 ``group:<群号>`` 或 ``user:<用户号>`` 的分片键；无法归属时为空字符串。
+        """
+        post_type = payload.get("post_type")
+        if post_type == "meta_event":
+            return ""
+
+        group_id = payload.get("group_id")
+        if group_id:
+            return f"group:{group_id}"
+
+        user_id = payload.get("user_id")
+        if user_id:
+            return f"user:{user_id}"
+        return ""
+
+    @staticmethod
+    def is_priority_payload(payload: Mapping[str, Any]) -> bool:
+        """判断载荷是否属于任何情况下都不应丢弃的私聊消息或 @ 机器人的群消息。
+
+        Args:
+            payload: NapCat 推送的非 echo 载荷。
+
+        Returns:
+            bool: 私聊消息或 @ 了机器人的群消息返回 ``True``。
+        """
+        if payload.get("post_type") != "message":
+            return False
+        return payload.get("message_type") == "private" or mentions_self(payload)
+
+    def _select_lane(self, conversation_key: str) -> _NapCatInboundLane:
+        """为分片键选择通道。
+
+        Args:
+            conversation_key: 会话分片键；为空时选择当前最空闲的通道。
+
+        Returns:
+            _NapCatInboundLane: 目标通道。
+        """
+        lanes = self._lanes
+        if not conversation_key:
+            return min(lanes, key=lambda lane: lane.queue.qsize() + int(lane.busy))
+        return lanes[zlib.crc32(conversation_key.encode("utf-8")) % len(lanes)]
+
+    def _has_room(self, lane: _NapCatInboundLane, conversation_key: str, is_priority: bool) -> bool:
+        """判断通道能否再放入一条载荷。
+
+        Args:
+            lane: 目标通道。
+            conversation_key: 载荷所属会话的分片键。
+            is_priority: 载荷是否为私聊消息或 @ 机器人的消息。
+
+        Returns:
+            bool: 优先载荷只要合计深度未满即返回 ``True``；其他载荷需合计深度未进入预留容量，
+            且该通道与该会话的深度都未达到上限。
+        """
+        if is_priority:
+            return self._depth < self._max_size
+        if self._depth >= self._max_size - self._priority_reserve or lane.queue.qsize() >= self._lane_limit:
+            return False
+        return not conversation_key or self._conversation_depths.get(conversation_key, 0) < self._conversation_limit
+
+    def _enqueue(
+        self,
+        lane: _NapCatInboundLane,
+        conversation_key: str,
+        payload: Dict[str, Any],
+        is_priority: bool,
+    ) -> None:
+        """将载荷放入通道并记录。
+
+        Args:
+            lane: 目标通道。
+            conversation_key: 载荷所属会话的分片键。
+            payload: NapCat 推送的非 echo 载荷。
+            is_priority: 载荷是否为私聊消息或 @ 机器人的消息。
+        """
+        enqueued_at = time.monotonic()
+        lane.queue.put_nowait((enqueued_at, conversation_key, payload))
+        lane.enqueued_at.append(enqueued_at)
+        if conversation_key:
+            self._conversation_depths[conversation_key] = self._conversation_depths.get(conversation_key, 0) + 1
+        if is_priority:
+            self._priority_total += 1
+        self._submitted_total += 1
+        self._depth += 1
+        self._observe_depth()
+
+    async def _worker_loop(self, lane: _NapCatInboundLane) -> None:
+        """持续从通道取出载荷并交给上层回调处理。
+
+        Args:
+            lane: 当前工作协程独占的分片通道。
+        """
+        while True:
+            _enqueued_at, conversation_key, payload = await lane.queue.get()
+            if lane.enqueued_at:
+                lane.enqueued_at.popleft()
+            if conversation_key:
+                remaining = self._conversation_depths.pop(conversation_key, 1) - 1
+                if remaining > 0:
+                    self._conversation_depths[conversation_key] = remaining
+            self._depth = max(0, self._depth - 1)
+            self._observe_depth()
+            self._space_available.set()
+            lane.busy = True
+            try:
+                await self._on_payload(payload)
+                self._completed_total += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self._failed_total += 1
+                self._logger.error(f"NapCat 入站事件处理异常: {exc}", exc_info=True)
+            finally:
+                lane.busy = False
+                lane.queue.task_done()
+
+    def _observe_depth(self) -> None:
+        """记录合计队列深度并在跨越高水位时输出告警。
+
+        告警带有回差：深度回落到高水位的一半以下后，才会再次告警。
+        """
+        depth = self._depth
+        if depth > self._peak_depth:
+            self._peak_depth = depth
+
+        if not self._above_high_water and depth >= self._high_water_mark:
+            self._above_high_water = True
+            self._high_water_hits += 1
+            self._logger.warning(
+                f"NapCat 入站队列达到高水位: depth={depth}/{self._max_size} "
+                f"workers={self._worker_count}，事件处理速度跟不上推送速度"
+            )
+        elif self._above_high_water and depth < self._high_water_mark // 2:
+            self._above_high_water = False
+            self._logger.info(f"NapCat 入站队列已回落到高水位以下: depth={depth}/{self._max_size}")
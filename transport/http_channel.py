@@ -0,0 +1,245 @@
+"""NapCat HTTP 动作通道。"""
+
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple, cast
+
+import asyncio
+import time
+
+from ..codecs.json_codec import NapCatJsonCodec
+from ..config import NapCatServerConfig
+from ..constants import DEFAULT_HTTP_ACTION_RETRY_AFTER_SEC
+
+try:
+    from aiohttp import ClientConnectionError, ClientConnectorError, ClientSession, ClientTimeout, TCPConnector
+
+    try:
+        from aiohttp import ConnectionTimeoutError
+    except ImportError:
+        # aiohttp 3.10 之前的连接超时以 ServerTimeoutError 表示；本通道未设置读超时，不会混入读超时
+        from aiohttp import ServerTimeoutError as ConnectionTimeoutError
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    ClientConnectionError = cast(Any, None)
+    ClientConnectorError = cast(Any, None)
+    ConnectionTimeoutError = cast(Any, None)
+    ClientSession = cast(Any, None)
+    ClientTimeout = cast(Any, None)
+    TCPConnector = cast(Any, None)
+    AIOHTTP_AVAILABLE = False
+
+
+class NapCatHttpActionChannel:
+    """通过 NapCat HTTP API 发送指定动作的连接池通道。
+
+    命中路由规则的动作以 ``POST <http_action_url>/<action>`` 发送，复用同一个保持长连接的
+    ``ClientSession``，不再与事件推送共用 WebSocket 排队。HTTP 服务不可达或返回非 200 状态码时，
+    该动作回退到 WebSocket 发送，通道在一段冷却时间内不再尝试 HTTP。请求可能已发出时的连接中断与超时不会回退，
+    避免上传文件等非幂等动作被重复执行，但同样让通道进入冷却期，后续动作暂时改走 WebSocket。
+    """
+
+    def __init__(
+        self,
+        logger: Any,
+        json_codec: NapCatJsonCodec,
+        retry_after_sec: float = DEFAULT_HTTP_ACTION_RETRY_AFTER_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """初始化 HTTP 动作通道。
+
+        Args:
+            logger: 插件日志对象。
+            json_codec: 请求体与响应体使用的 JSON 编解码器。
+            retry_after_sec: HTTP 不可用后重新尝试前的冷却秒数。
+            clock: 单调时钟函数。
+        """
+        self._logger = logger
+        self._json_codec = json_codec
+        self._retry_after_sec = max(0.0, float(retry_after_sec))
+        self._clock = clock
+        self._base_url: str = ""
+        self._headers: Dict[str, str] = {}
+        self._exact_routes: FrozenSet[str] = frozenset()
+        self._pattern_routes: Tuple[str, ...] = ()
+        self._max_connections: int = 1
+        self._timeout_sec: float = 0.0
+        self._session: Optional[Any] = None
+        self._unavailable_until: float = 0.0
+        self._requests_total: int = 0
+        self._succeeded_total: int = 0
+        self._fallbacks_total: int = 0
+        self._failed_total: int = 0
+        self._requests_by_action: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """返回是否配置了可用的 HTTP 动作地址。"""
+        return bool(self._base_url) and AIOHTTP_AVAILABLE
+
+    def configure(self, server_config: NapCatServerConfig) -> None:
+        """按服务端配置更新 HTTP 地址与路由规则，下次发送时按新配置建立连接池。
+
+        调用前应先通过 ``close`` 关闭旧的连接池。
+
+        Args:
+            server_config: 最新生效的 NapCat 服务端配置。
+        """
+        self._base_url = server_config.http_action_url.rstrip("/")
+        self._headers = {"Content-Type": "application/json"}
+        if server_config.token:
+            self._headers["Authorization"] = f"Bearer {server_config.token}"
+        self._exact_routes = frozenset(rule for rule in server_config.http_action_routes if not _is_pattern(rule))
+        self._pattern_routes = tuple(rule for rule in server_config.http_action_routes if _is_pattern(rule))
+        self._max_connections = server_config.http_action_max_connections
+        self._timeout_sec = server_config.action_timeout_sec
+        self._unavailable_until = 0.0
+        if self._base_url and not AIOHTTP_AVAILABLE:
+            self._logger.warning("NapCat HTTP 动作通道依赖 aiohttp，当前环境未安装，所有动作将继续通过 WebSocket 发送")
+
+    def should_route(self, action_name: str) -> bool:
+        """判断动作是否应当优先通过 HTTP 发送。
+
+        Args:
+            action_name: OneBot 动作名称。
+
+        Returns:
+            bool: 通道已启用、未处于冷却期且动作命中路由规则时返回 ``True``。
+        """
+        if not self.enabled or self._clock() < self._unavailable_until:
+            return False
+        if action_name in self._exact_routes:
+            return True
+        return any(fnmatchcase(action_name, pattern) for pattern in self._pattern_routes)
+
+    async def call_action(self, action_name: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """通过 HTTP 发送一次动作。
+
+        Args:
+            action_name: OneBot 动作名称。
+            params: 动作参数。
+
+        Returns:
+            Optional[Dict[str, Any]]: NapCat 返回的原始响应字典；HTTP 不可用、需要回退到 WebSocket 时返回 ``None``。
+
+        Raises:
+            RuntimeError: 请求可能已送达但超时、连接中断或响应无法解析时抛出。
+        """
+        self._requests_total += 1
+        self._requests_by_action[action_name] = self._requests_by_action.get(action_name, 0) + 1
+        session = self._ensure_session()
+        try:
+            async with session.post(
+                f"{self._base_url}/{action_name}",
+                data=self._json_codec.dumps(params),
+                headers=self._headers,
+            ) as response:
+                if response.status != 200:
+                    return self._fall_back(f"HTTP {response.status}")
+                response_body = await response.read()
+        except asyncio.CancelledError:
+            raise
+        except (ClientConnectorError, ConnectionTimeoutError) as exc:
+            # 连接尚未建立，动作一定没有送达，可以安全回退
+            return self._fall_back(str(exc) or type(exc).__name__)
+        except ClientConnectionError as exc:
+            # 请求可能已送达，不回退以免重复执行，但后续动作暂时改走 WebSocket
+            self._mark_unavailable(str(exc) or type(exc).__name__)
+            self._failed_total += 1
+            raise RuntimeError(f"NapCat HTTP 动作连接中断: action={action_name} error={exc}") from exc
+        except asyncio.TimeoutError as exc:
+            # 同上：无法确认是否已送达，不回退，但停止把后续动作继续发往无响应的 HTTP 服务
+            self._mark_unavailable("timeout")
+            self._failed_total += 1
+            raise RuntimeError(f"NapCat HTTP 动作响应超时: action={action_name}") from exc
+
+        try:
+            payload = self._json_codec.loads(response_body)
+        except Exception as exc:
+            self._failed_total += 1
+            raise RuntimeError(f"NapCat HTTP 动作响应不是合法 JSON: action={action_name}") from exc
+        if not isinstance(payload, dict):
+            self._failed_total += 1
+            raise RuntimeError(f"NapCat HTTP 动作响应格式异常: action={action_name}")
+
+        self._succeeded_total += 1
+        return payload
+
+    async def close(self) -> None:
+        """关闭连接池。"""
+        session = self._session
+        self._session = None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回 HTTP 动作通道的运行指标。
+
+        Returns:
+            Dict[str, Any]: 是否启用、冷却状态与请求、成功、回退、失败计数。
+        """
+        return {
+            "enabled": self.enabled,
+            "url": self._base_url,
+            "max_connections": self._max_connections,
+            "cooling_down": self._clock() < self._unavailable_until,
+            "requests": self._requests_total,
+            "succeeded": self._succeeded_total,
+            "fallbacks": self._fallbacks_total,
+            "failed": self._failed_total,
+            "requests_by_action": dict(self._requests_by_action),
+        }
+
+    def _ensure_session(self) -> Any:
+        """返回当前连接池，必要时新建。
+
+        Returns:
+            Any: 保持长连接的 ``aiohttp.ClientSession``。
+        """
+        session = self._session
+        if session is None or session.closed:
+            session = ClientSession(
+                connector=TCPConnector(limit=self._max_connections),
+                timeout=ClientTimeout(total=self._timeout_sec),
+            )
+            self._session = session
+        return session
+
+    def _fall_back(self, reason: str) -> None:
+        """记录一次回退到 WebSocket，并让通道进入冷却期。
+
+        Args:
+            reason: HTTP 不可用的原因。
+
+        Returns:
+            None: 供 ``call_action`` 直接返回，表示改由 WebSocket 发送。
+        """
+        self._fallbacks_total += 1
+        self._mark_unavailable(reason)
+
+    def _mark_unavailable(self, reason: str) -> None:
+        """让通道进入冷却期，冷却期内的动作改由 WebSocket 发送。
+
+        Args:
+            reason: HTTP 不可用的原因。
+        """
+        if self._clock() >= self._unavailable_until:
+            self._logger.warning(
+                f"NapCat HTTP 动作通道不可用，{self._retry_after_sec:.0f} 秒内改用 WebSocket 发送: "
+                f"url={self._base_url} reason={reason}"
+            )
+        self._unavailable_until = self._clock() + self._retry_after_sec
+
+
+def _is_pattern(rule: str) -> bool:
+    """判断路由规则是否包含通配符。
+
+    Args:
+        rule: 路由规则。
+
+    Returns:
+        bool: 含有 ``*``、``?`` 或 ``[`` 时返回 ``True``。
+    """
+    return any(char in rule for char in "*?[")
@@ -0,0 +1,249 @@
+"""NapCat 入站过载分级丢弃。"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Optional
+
+import heapq
+import time
+
+from ..config import NapCatInboundConfig
+from ..constants import DEFAULT_OVERLOAD_GROUP_WINDOW_SEC
+from ..event_lag import NapCatEventLagEstimator
+
+
+def mentions_self(payload: Mapping[str, Any]) -> bool:
+    """判断消息是否 @ 了当前机器人账号。
+
+    Args:
+        payload: 消息事件载荷。
+
+    Returns:
+        bool: 若消息段或 CQ 码中包含对 ``self_id`` 的 @，则返回 ``True``。
+    """
+    self_id = str(payload.get("self_id") or "").strip()
+    if not self_id:
+        # 无法确认机器人账号时保守处理，视为提及
+        return True
+
+    message: Optional[Any] = payload.get("message")
+    if isinstance(message, str):
+        return f"[CQ:at,qq={self_id}" in message
+    if not isinstance(message, list):
+        return False
+    for segment in message:
+        if not isinstance(segment, Mapping) or segment.get("type") != "at":
+            continue
+        segment_data = segment.get("data")
+        if isinstance(segment_data, Mapping) and str(segment_data.get("qq") or "").strip() == self_id:
+            return True
+    return False
+
+
+class NapCatOverloadController:
+    """依据入站队列占用比例与事件延迟判断过载等级，并按层级丢弃低价值事件。
+
+    过载分为两级：第一级丢弃表情回应、戳一戳等低价值通知；第二级在此基础上丢弃最繁忙几个群里
+    未 @ 机器人的消息。私聊消息与 @ 机器人的消息在任何等级下都不会被丢弃。
+    队列占用比例取最繁忙通道与合计队列两者中的较大值，使单个热点群在其通道写满前就能触发过载。
+    事件延迟由 ``NapCatEventLagEstimator`` 估计，已扣除 NapCat 主机与本机之间的时钟偏差。
+    每一级在队列占用比例或事件延迟任一超过阈值时进入，二者都回落到阈值一半以下时退出，
+    避免在阈值附近反复切换。
+    """
+
+    TIER_NONE = 0
+    TIER_LOW_VALUE_NOTICE = 1
+    TIER_GROUP_CHATTER = 2
+
+    _TIER_NAMES: Dict[int, str] = {
+        TIER_NONE: "none",
+        TIER_LOW_VALUE_NOTICE: "low_value_notice",
+        TIER_GROUP_CHATTER: "group_chatter",
+    }
+    _LOW_VALUE_NOTICE_KEYS: FrozenSet[str] = frozenset({"group_msg_emoji_like", "notify.poke"})
+    _RECOVER_RATIO = 0.5
+
+    def __init__(
+        self,
+        logger: Any,
+        group_window_sec: float = DEFAULT_OVERLOAD_GROUP_WINDOW_SEC,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """初始化过载控制器。
+
+        Args:
+            logger: 插件日志对象。
+            group_window_sec: 统计各群消息数以挑选最繁忙群的时间窗口。
+            clock: 返回 Unix 时间戳的时钟函数，需与事件的 ``time`` 字段可比。
+        """
+        self._logger = logger
+        self._clock = clock
+        self._group_window_sec = max(1.0, float(group_window_sec))
+        self._config = NapCatInboundConfig()
+        self._tier: int = self.TIER_NONE
+        self._lag_estimator = NapCatEventLagEstimator(wall_clock=clock)
+        self._depth_ratio: float = 0.0
+        self._window_started_at: float = 0.0
+        self._group_counts: Dict[str, int] = {}
+        self._busiest_groups: FrozenSet[str] = frozenset()
+        self._peak_tier: int = self.TIER_NONE
+        self._tier_entries: Dict[int, int] = {self.TIER_LOW_VALUE_NOTICE: 0, self.TIER_GROUP_CHATTER: 0}
+        self._shed_counts: Dict[int, int] = {self.TIER_LOW_VALUE_NOTICE: 0, self.TIER_GROUP_CHATTER: 0}
+
+    def configure(self, inbound_config: NapCatInboundConfig) -> None:
+        """更新过载阈值，并回到未过载状态。
+
+        Args:
+            inbound_config: 最新生效的入站调度配置。
+        """
+        self._config = inbound_config
+        self._tier = self.TIER_NONE
+        self._lag_estimator.reset_lag()
+
+    @property
+    def tier(self) -> int:
+        """返回当前过载等级。"""
+        return self._tier
+
+    def inspect(self, payload: Mapping[str, Any], queue_fill_ratio: float) -> int:
+        """更新过载等级，并判断一条事件是否应当丢弃。
+
+        Args:
+            payload: NapCat 推送的非 echo 事件。
+            queue_fill_ratio: 入站队列占用比例，见 ``NapCatInboundDispatcher.fill_ratio``。
+
+        Returns:
+            int: 丢弃该事件的过载层级；应当继续处理时返回 ``TIER_NONE``。
+        """
+        config = self._config
+        if not config.overload_shedding_enabled:
+            return self.TIER_NONE
+
+        post_type = payload.get("post_type")
+        if post_type == "meta_event":
+            return self.TIER_NONE
+
+        now = self._clock()
+        self._lag_estimator.observe(payload.get("time"))
+        self._depth_ratio = queue_fill_ratio
+        self._update_tier()
+
+        if post_type == "message":
+            group_id = str(payload.get("group_id") or "") if payload.get("message_type") == "group" else ""
+            if group_id:
+                self._count_group_message(group_id, now)
+            if self._tier < self.TIER_GROUP_CHATTER or not group_id:
+                return self.TIER_NONE
+            if group_id not in self._resolve_busiest_groups() or mentions_self(payload):
+                return self.TIER_NONE
+            return self._record_shed(self.TIER_GROUP_CHATTER)
+
+        if post_type == "notice" and self._tier >= self.TIER_LOW_VALUE_NOTICE:
+            notice_type = str(payload.get("notice_type") or "")
+            notice_key = f"notify.{payload.get('sub_type') or ''}" if notice_type == "notify" else notice_type
+            if notice_key in self._LOW_VALUE_NOTICE_KEYS:
+                return self._record_shed(self.TIER_LOW_VALUE_NOTICE)
+        return self.TIER_NONE
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回过载控制的运行指标。
+
+        Returns:
+            Dict[str, Any]: 当前等级、平滑后的事件延迟与估计的时钟偏差、繁忙群以及按层级划分的进入次数与丢弃计数。
+        """
+        return {
+            "enabled": self._config.overload_shedding_enabled,
+            "tier": self._TIER_NAMES[self._tier],
+            "peak_tier": self._TIER_NAMES[self._peak_tier],
+            "event_lag_sec": round(self._lag_estimator.lag_sec, 3),
+            "clock_offset_sec": round(self._lag_estimator.clock_offset_sec, 3),
+            "queue_depth_ratio": round(self._depth_ratio, 3),
+            "busiest_groups": sorted(self._busiest_groups),
+            "tier_entries": {self._TIER_NAMES[tier]: count for tier, count in self._tier_entries.items()},
+            "shed": {self._TIER_NAMES[tier]: count for tier, count in self._shed_counts.items()},
+            "shed_total": sum(self._shed_counts.values()),
+        }
+
+    def _update_tier(self) -> None:
+        """依据当前队列占用比例与事件延迟重新计算过载等级。"""
+        config = self._config
+        lag_sec = self._lag_estimator.lag_sec
+        thresholds = (
+            (self.TIER_GROUP_CHATTER, config.overload_group_queue_ratio, config.overload_group_lag_sec),
+            (self.TIER_LOW_VALUE_NOTICE, config.overload_notice_queue_ratio, config.overload_notice_lag_sec),
+        )
+        next_tier = self.TIER_NONE
+        for tier, queue_ratio, lag_threshold_sec in thresholds:
+            if self._depth_ratio >= queue_ratio or lag_sec >= lag_threshold_sec:
+                next_tier = tier
+                break
+            # 已处于该等级时，需两项指标都回落到阈值一半以下才退出
+            if self._tier >= tier and (
+                self._depth_ratio >= queue_ratio * self._RECOVER_RATIO
+                or lag_sec >= lag_threshold_sec * self._RECOVER_RATIO
+            ):
+                next_tier = tier
+                break
+
+        previous_tier = self._tier
+        if next_tier == previous_tier:
+            return
+
+        self._tier = next_tier
+        if next_tier > previous_tier:
+            self._tier_entries[next_tier] += 1
+            self._peak_tier = max(self._peak_tier, next_tier)
+            self._logger.warning(
+                f"NapCat 入站进入过载等级 {self._TIER_NAMES[next_tier]}: "
+                f"queue_ratio={self._depth_ratio:.2f} event_lag={lag_sec:.1f}s，开始丢弃低价值事件"
+            )
+        else:
+            self._logger.info(
+                f"NapCat 入站过载等级回落到 {self._TIER_NAMES[next_tier]}: "
+                f"queue_ratio={self._depth_ratio:.2f} event_lag={lag_sec:.1f}s"
+            )
+
+    def _count_group_message(self, group_id: str, now: float) -> None:
+        """累计群消息数，并在窗口结束时重新挑选最繁忙的群。
+
+        Args:
+            group_id: 群号。
+            now: 当前 Unix 时间戳。
+        """
+        if now - self._window_started_at >= self._group_window_sec:
+            self._busiest_groups = self._pick_busiest_groups()
+            self._group_counts = {}
+            self._window_started_at = now
+        self._group_counts[group_id] = self._group_counts.get(group_id, 0) + 1
+
+    def _resolve_busiest_groups(self) -> FrozenSet[str]:
+        """返回当前用于丢弃判断的繁忙群集合。
+
+        Returns:
+            FrozenSet[str]: 繁忙群号集合；上一窗口尚无统计时以当前窗口的计数临时挑选。
+        """
+        if not self._busiest_groups:
+            self._busiest_groups = self._pick_busiest_groups()
+        return self._busiest_groups
+
+    def _pick_busiest_groups(self) -> FrozenSet[str]:
+        """按当前窗口的消息数挑选最繁忙的群。
+
+        Returns:
+            FrozenSet[str]: 消息数排名靠前的群号集合。
+        """
+        counts = self._group_counts
+        limit = self._config.overload_busiest_group_count
+        return frozenset(heapq.nlargest(limit, counts, key=counts.__getitem__))
+
+    def _record_shed(self, tier: int) -> int:
+        """累计一次丢弃。
+
+        Args:
+            tier: 触发丢弃的过载层级。
+
+        Returns:
+            int: 原样返回 ``tier``。
+        """
+        self._shed_counts[tier] += 1
+        return tier
@@ -0,0 +1,144 @@
+"""NapCat 断线重连退避策略。"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Optional
+
+import random
+import time
+
+from ..constants import (
+    DEFAULT_RECONNECT_DELAY_SEC,
+    DEFAULT_RECONNECT_JITTER_RATIO,
+    DEFAULT_RECONNECT_MAX_DELAY_SEC,
+    DEFAULT_RECONNECT_STABLE_AFTER_SEC,
+)
+
+
+class NapCatReconnectPolicy:
+    """带抖动的指数退避重连策略。
+
+    连接断开后的第一次重试立即进行；此后每次失败的等待时间以 ``base_delay_sec`` 为起点翻倍，
+    不超过 ``max_delay_sec``，并叠加 ``±jitter_ratio`` 的随机抖动，避免多个实例同时重连。
+    连接持续时间达到 ``stable_after_sec`` 后才视为稳定，下一次断开会重新从立即重试开始。
+    """
+
+    def __init__(
+        self,
+        base_delay_sec: float = DEFAULT_RECONNECT_DELAY_SEC,
+        max_delay_sec: float = DEFAULT_RECONNECT_MAX_DELAY_SEC,
+        stable_after_sec: float = DEFAULT_RECONNECT_STABLE_AFTER_SEC,
+        jitter_ratio: float = DEFAULT_RECONNECT_JITTER_RATIO,
+        random_func: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """初始化重连策略。
+
+        Args:
+            base_delay_sec: 第一次退避的等待时间。
+            max_delay_sec: 退避等待时间上限。
+            stable_after_sec: 连接持续多久后重置退避。
+            jitter_ratio: 抖动比例，取值范围 ``[0, 1)``。
+            random_func: 返回 ``[0, 1)`` 随机数的函数。
+            clock: 单调时钟函数。
+        """
+        self._random_func = random_func
+        self._clock = clock
+        self._base_delay_sec: float = 0.0
+        self._max_delay_sec: float = 0.0
+        self._stable_after_sec: float = 0.0
+        self._jitter_ratio: float = 0.0
+        self._consecutive_failures: int = 0
+        self._connected_at: Optional[float] = None
+        self._attempts_total: int = 0
+        self._successes_total: int = 0
+        self._resets_total: int = 0
+        self._last_delay_sec: float = 0.0
+        self._last_connection_duration_sec: Optional[float] = None
+        self.configure(base_delay_sec, max_delay_sec, stable_after_sec, jitter_ratio)
+
+    def configure(
+        self,
+        base_delay_sec: float,
+        max_delay_sec: float,
+        stable_after_sec: float,
+        jitter_ratio: float = DEFAULT_RECONNECT_JITTER_RATIO,
+    ) -> None:
+        """更新退避参数，已累计的失败次数保持不变。
+
+        Args:
+            base_delay_sec: 第一次退避的等待时间。
+            max_delay_sec: 退避等待时间上限；小于 ``base_delay_sec`` 时按 ``base_delay_sec`` 处理。
+            stable_after_sec: 连接持续多久后重置退避。
+            jitter_ratio: 抖动比例，取值范围 ``[0, 1)``。
+        """
+        self._base_delay_sec = max(0.0, float(base_delay_sec))
+        self._max_delay_sec = max(self._base_delay_sec, float(max_delay_sec))
+        self._stable_after_sec = max(0.0, float(stable_after_sec))
+        self._jitter_ratio = min(max(0.0, float(jitter_ratio)), 0.99)
+
+    @property
+    def consecutive_failures(self) -> int:
+        """返回自上次稳定连接以来的连续失败轮数。"""
+        return self._consecutive_failures
+
+    def record_attempt(self) -> None:
+        """记录一次连接尝试。"""
+        self._attempts_total += 1
+
+    def record_connected(self) -> None:
+        """记录连接已建立。"""
+        self._successes_total += 1
+        self._connected_at = self._clock()
+
+    def record_disconnected(self) -> None:
+        """记录已建立的连接断开；若连接足够稳定则重置退避。"""
+        connected_at = self._connected_at
+        self._connected_at = None
+        if connected_at is None:
+            return
+
+        duration_sec = self._clock() - connected_at
+        self._last_connection_duration_sec = duration_sec
+        if duration_sec >= self._stable_after_sec and self._consecutive_failures > 0:
+            self._consecutive_failures = 0
+            self._resets_total += 1
+
+    def next_delay(self) -> float:
+        """返回下一次重连前应等待的时长，并累计一次失败。
+
+        Returns:
+            float: 等待秒数；稳定连接断开后的第一次重试返回 ``0``。
+        """
+        failures = self._consecutive_failures
+        self._consecutive_failures += 1
+        if failures == 0:
+            self._last_delay_sec = 0.0
+            return 0.0
+
+        # 指数在上限附近截断，避免失败次数很大时浮点溢出
+        exponent = min(failures - 1, 32)
+        delay_sec = min(self._max_delay_sec, self._base_delay_sec * (2**exponent))
+        if self._jitter_ratio > 0:
+            delay_sec *= 1.0 + self._jitter_ratio * (2.0 * self._random_func() - 1.0)
+        self._last_delay_sec = min(self._max_delay_sec, max(0.0, delay_sec))
+        return self._last_delay_sec
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回重连相关的运行指标。
+
+        Returns:
+            Dict[str, Any]: 尝试、成功与重置次数，以及当前退避状态。
+        """
+        last_duration = self._last_connection_duration_sec
+        return {
+            "attempts": self._attempts_total,
+            "successes": self._successes_total,
+            "resets": self._resets_total,
+            "consecutive_failures": self._consecutive_failures,
+            "last_delay_sec": round(self._last_delay_sec, 3),
+            "last_connection_duration_sec": None if last_duration is None else round(last_duration, 3),
+            "base_delay_sec": self._base_delay_sec,
+            "max_delay_sec": self._max_delay_sec,
+            "stable_after_sec": self._stable_after_sec,
+        }
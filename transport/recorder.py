@@ -0,0 +1,227 @@
+"""NapCat 原始帧录制。"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+import asyncio
+import gzip
+import time
+
+from ..codecs.json_codec import NapCatJsonCodec
+from ..config import NapCatCaptureConfig
+from ..constants import DEFAULT_CAPTURE_FLUSH_INTERVAL_SEC
+
+if TYPE_CHECKING:
+    from ..runtime.scheduler import NapCatRuntimeScheduler, NapCatScheduledJob
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_DEFAULT_CAPTURE_DIRECTORY = _PROJECT_ROOT / "data" / "napcat_adapter" / "capture"
+_CAPTURE_FILE_NAME = "frames.jsonl.gz"
+_ROTATED_FILE_PATTERN = "frames.*.jsonl.gz"
+
+
+def build_capture_path(connection_id: str = "") -> Path:
+    """返回指定连接的帧录制文件路径。
+
+    Args:
+        connection_id: 连接标识；为空时返回录制目录下的默认文件。
+
+    Returns:
+        Path: 当前写入的 gzip 压缩 JSONL 文件路径，轮转出的旧文件与其位于同一目录。
+    """
+    if not connection_id:
+        return _DEFAULT_CAPTURE_DIRECTORY / _CAPTURE_FILE_NAME
+    safe_connection_id = "".join(char if char.isalnum() or char in "-_" else "_" for char in connection_id)
+    return _DEFAULT_CAPTURE_DIRECTORY / safe_connection_id / _CAPTURE_FILE_NAME
+
+
+class NapCatFrameRecorder:
+    """把原始入站帧与出站动作请求写入轮转的 gzip 压缩 JSONL 文件。
+
+    每行格式为 ``{"ts": <Unix 时间戳>, "dir": "in" | "out", "frame": <原始帧>}``。入站帧直接拼接收到的
+    原始文本，不重新序列化；接收循环只把行追加到内存缓冲，由调度器周期性地在线程池中压缩写盘，
+    不阻塞事件循环。经 HTTP 通道发送的动作会补上 ``http:`` 前缀的 echo，使请求与响应在回放时能够配对。
+    """
+
+    # 写盘跟不上时内存中最多保留的行数，超出部分直接丢弃并计数
+    _MAX_BUFFERED_LINES = 50000
+
+    def __init__(
+        self,
+        logger: Any,
+        scheduler: "NapCatRuntimeScheduler",
+        json_codec: NapCatJsonCodec,
+        flush_interval_sec: float = DEFAULT_CAPTURE_FLUSH_INTERVAL_SEC,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """初始化帧录制器。
+
+        Args:
+            logger: 插件日志对象。
+            scheduler: 运行时统一调度器，用于周期性写盘。
+            json_codec: 序列化出站请求与非紧凑入站帧使用的 JSON 编解码器。
+            flush_interval_sec: 缓冲写盘的间隔秒数。
+            clock: 返回 Unix 时间戳的时钟函数。
+        """
+        self._logger = logger
+        self._scheduler = scheduler
+        self._json_codec = json_codec
+        self._flush_interval_sec = max(0.1, float(flush_interval_sec))
+        self._clock = clock
+        self._enabled: bool = False
+        self._path: Path = build_capture_path()
+        self._max_file_bytes: int = 0
+        self._max_files: int = 1
+        self._buffer: List[str] = []
+        self._flush_job: Optional["NapCatScheduledJob"] = None
+        self._flush_lock = asyncio.Lock()
+        self._http_sequence: int = 0
+        self._recorded_frames: int = 0
+        self._dropped_frames: int = 0
+        self._written_bytes: int = 0
+        self._rotations: int = 0
+        self._write_failures: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        """返回当前是否正在录制。"""
+        return self._enabled
+
+    def configure(self, capture_config: NapCatCaptureConfig, path: Path) -> None:
+        """更新录制开关与文件轮转规则。
+
+        调用前应先通过 ``stop`` 写出旧配置下缓冲的帧。
+
+        Args:
+            capture_config: 最新生效的帧录制配置。
+            path: 当前连接的录制文件路径。
+        """
+        self._enabled = capture_config.enabled
+        self._path = path
+        self._max_file_bytes = int(capture_config.max_file_mb * 1024 * 1024)
+        self._max_files = capture_config.max_files
+
+    def start(self) -> None:
+        """开启录制时启动周期性写盘任务。"""
+        if not self._enabled or self._flush_job is not None:
+            return
+        self._logger.info(f"NapCat 帧录制已开启，录制文件: {self._path}")
+        self._flush_job = self._scheduler.every(self._flush_interval_sec, self.flush, name="transport.frame_recorder")
+
+    async def stop(self) -> None:
+        """停止周期性写盘，并写出缓冲中剩余的帧。"""
+        flush_job = self._flush_job
+        self._flush_job = None
+        if flush_job is not None:
+            flush_job.cancel()
+        await self.flush()
+
+    def record_inbound(self, raw_frame: Any, payload: Dict[str, Any]) -> None:
+        """记录一条已成功解析的入站帧。
+
+        Args:
+            raw_frame: WebSocket 收到的原始文本或字节。
+            payload: 解析后的载荷，原始文本含换行时改用它重新序列化。
+        """
+        if not self._enabled:
+            return
+        frame_text = raw_frame.decode("utf-8", errors="replace") if isinstance(raw_frame, (bytes, bytearray)) else raw_frame
+        if not isinstance(frame_text, str) or "\n" in frame_text or "\r" in frame_text:
+            frame_text = self._json_codec.dumps(payload)
+        self._append("in", frame_text)
+
+    def record_outbound(self, request_text: str) -> None:
+        """记录一条经 WebSocket 发出的动作请求。
+
+        Args:
+            request_text: 已序列化的动作请求。
+        """
+        if self._enabled:
+            self._append("out", request_text)
+
+    def record_http_action(self, action_name: str, params: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """记录一次经 HTTP 通道完成的动作请求与响应。
+
+        Args:
+            action_name: OneBot 动作名称。
+            params: 动作参数。
+            response: NapCat 返回的原始响应字典。
+        """
+        if not self._enabled:
+            return
+        self._http_sequence += 1
+        echo_id = f"http:{self._http_sequence}"
+        self._append("out", self._json_codec.dumps({"action": action_name, "params": params, "echo": echo_id}))
+        self._append("in", self._json_codec.dumps({**response, "echo": echo_id}))
+
+    async def flush(self) -> None:
+        """把缓冲中的帧压缩追加到录制文件，必要时轮转。"""
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            lines = self._buffer
+            self._buffer = []
+            try:
+                await asyncio.to_thread(self._write_lines, lines)
+            except Exception as exc:
+                self._write_failures += 1
+                self._dropped_frames += len(lines)
+                self._logger.warning(f"NapCat 帧录制写入失败，已丢弃 {len(lines)} 条: path={self._path} error={exc}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回帧录制的运行指标。
+
+        Returns:
+            Dict[str, Any]: 是否开启、录制文件、已录制、丢弃与待写盘的帧数以及写入字节数和轮转次数。
+        """
+        return {
+            "enabled": self._enabled,
+            "path": str(self._path),
+            "recorded": self._recorded_frames,
+            "dropped": self._dropped_frames,
+            "buffered": len(self._buffer),
+            "written_bytes": self._written_bytes,
+            "rotations": self._rotations,
+            "write_failures": self._write_failures,
+        }
+
+    def _append(self, direction: str, frame_text: str) -> None:
+        """把一帧拼接成 JSONL 行追加到内存缓冲。
+
+        Args:
+            direction: ``in`` 或 ``out``。
+            frame_text: 紧凑的 JSON 文本。
+        """
+        if len(self._buffer) >= self._MAX_BUFFERED_LINES:
+            self._dropped_frames += 1
+            return
+        self._recorded_frames += 1
+        self._buffer.append(f'{{"ts":{self._clock():.6f},"dir":"{direction}","frame":{frame_text}}}\n')
+
+    def _write_lines(self, lines: List[str]) -> None:
+        """在工作线程中写入一批行，文件超过上限后轮转并清理旧文件。
+
+        Args:
+            lines: 需要写入的 JSONL 行。
+        """
+        path = self._path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size_before = path.stat().st_size if path.exists() else 0
+        # 每次追加一个独立的 gzip 成员，gzip.open 读取时会自动串联
+        with gzip.open(path, "at", encoding="utf-8") as capture_file:
+            capture_file.writelines(lines)
+        size_after = path.stat().st_size
+        self._written_bytes += size_after - size_before
+        if size_after < self._max_file_bytes:
+            return
+
+        rotated_path = path.with_name(f"frames.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.jsonl.gz")
+        path.rename(rotated_path)
+        self._rotations += 1
+        rotated_files = sorted(path.parent.glob(_ROTATED_FILE_PATTERN))
+        # 当前写入的文件也计入保留数量
+        for stale_path in rotated_files[: max(0, len(rotated_files) - max(0, self._max_files - 1))]:
+            stale_path.unlink(missing_ok=True)
@@ -0,0 +1,441 @@
+"""NapCat 反向 WebSocket 服务端。"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Dict, List, Optional, Tuple, cast
+
+import asyncio
+import contextlib
+import hmac
+import ipaddress
+
+from ..filters import NapCatFrameClassifier
+from .client import NapCatTransportClient
+
+if TYPE_CHECKING:
+    from ..runtime.scheduler import NapCatRuntimeScheduler
+
+try:
+    from aiohttp import web
+
+    AIOHTTP_WEB_AVAILABLE = True
+except ImportError:
+    web = cast(Any, None)
+    AIOHTTP_WEB_AVAILABLE = False
+
+
+def _is_loopback_host(host: str) -> bool:
+    """判断监听地址是否只接受本机连接。
+
+    Args:
+        host: 配置的监听主机；为空时表示监听全部网卡。
+
+    Returns:
+        bool: 地址为 ``localhost`` 或回环 IP 时返回 ``True``。
+    """
+    normalized_host = host.strip().strip("[]").lower()
+    if normalized_host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(normalized_host).is_loopback
+    except ValueError:
+        return False
+
+
+@dataclass
+class _NapCatReverseSession:
+    """一条等待交给传输层处理的反向连接。"""
+
+    ws: Any
+    peer: str
+    client_self_id: str
+    finished: "asyncio.Future[None]" = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+class NapCatReverseTransport(NapCatTransportClient):
+    """由 NapCat 主动连入的反向 WebSocket 传输层。
+
+    与正向客户端共享动作调用、入站调度、出站写协程与 HTTP 动作通道，只是连接由
+    :class:`NapCatReverseServer` 接受后交给本对象处理，不再主动拨号，也不需要重连退避。
+    同一时刻只服务一条连接；同一账号重新连入时会替换旧连接。
+    未配置 token 时只允许监听回环地址，否则拒绝启动监听，避免任何能访问该端口的人冒充 NapCat。
+    """
+
+    def __init__(
+        self,
+        logger: Any,
+        on_connection_opened: Callable[[], Coroutine[Any, Any, None]],
+        on_connection_closed: Callable[[], Coroutine[Any, Any, None]],
+        on_payload: Callable[[Dict[str, Any]], Coroutine[Any, Any, None]],
+        scheduler: "NapCatRuntimeScheduler",
+        reverse_server: "NapCatReverseServer",
+        frame_classifier: Optional[NapCatFrameClassifier] = None,
+    ) -> None:
+        """初始化反向传输层。
+
+        Args:
+            logger: 插件日志对象。
+            on_connection_opened: 连接建立后的异步回调。
+            on_connection_closed: 连接断开后的异步回调。
+            on_payload: 收到非 echo 载荷后的异步回调。
+            scheduler: 运行时统一调度器。
+            reverse_server: 负责监听与鉴权的共享反向 WebSocket 服务端。
+            frame_classifier: 入站事件预分类器；为空时所有事件都进入调度队列。
+        """
+        super().__init__(
+            logger=logger,
+            on_connection_opened=on_connection_opened,
+            on_connection_closed=on_connection_closed,
+            on_payload=on_payload,
+            scheduler=scheduler,
+            frame_classifier=frame_classifier,
+        )
+        self._reverse_server = reverse_server
+        self._sessions: "asyncio.Queue[_NapCatReverseSession]" = asyncio.Queue()
+        self._current_session: Optional[_NapCatReverseSession] = None
+        self._client_self_id: str = ""
+        self._sessions_total: int = 0
+        self._replaced_total: int = 0
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """判断当前环境是否安装了反向 WebSocket 服务端依赖。
+
+        Returns:
+            bool: 若已安装 ``aiohttp``，则返回 ``True``。
+        """
+        return AIOHTTP_WEB_AVAILABLE
+
+    @property
+    def listen_address(self) -> Tuple[str, int]:
+        """返回当前配置的监听地址。"""
+        server_config = self._server_config
+        if server_config is None:
+            return "", 0
+        return server_config.host, server_config.port
+
+    @property
+    def heartbeat_interval(self) -> float:
+        """返回服务端发送 WebSocket ping 的间隔秒数。"""
+        server_config = self._server_config
+        return server_config.heartbeat_interval if server_config is not None else 0.0
+
+    @property
+    def client_self_id(self) -> str:
+        """返回最近一次连入的 NapCat 账号 ID（来自 ``X-Self-ID`` 请求头）。"""
+        return self._client_self_id
+
+    @property
+    def is_serving(self) -> bool:
+        """判断当前是否已有 NapCat 连接在本传输层上。"""
+        return self._current_session is not None
+
+    @property
+    def requires_token(self) -> bool:
+        """判断当前监听地址是否必须配置访问令牌。
+
+        Returns:
+            bool: 监听地址不是回环地址时返回 ``True``。
+        """
+        host, _ = self.listen_address
+        return not _is_loopback_host(host)
+
+    def matches_token(self, token: str) -> bool:
+        """判断连入请求携带的访问令牌是否与本连接的配置一致。
+
+        Args:
+            token: 请求携带的访问令牌；未携带时为空字符串。
+
+        Returns:
+            bool: 令牌一致时返回 ``True``；未配置令牌且监听地址不是回环地址时始终返回 ``False``。
+        """
+        server_config = self._server_config
+        expected_token = server_config.token if server_config is not None else ""
+        if not expected_token and self.requires_token:
+            return False
+        return hmac.compare_digest(token.encode("utf-8"), expected_token.encode("utf-8"))
+
+    async def accept(self, ws: Any, peer: str, client_self_id: str) -> None:
+        """接管一条已完成握手的反向连接，并等待它结束。
+
+        Args:
+            ws: 已完成握手的服务端 WebSocket 对象。
+            peer: 对端地址。
+            client_self_id: 对端在 ``X-Self-ID`` 请求头中声明的账号 ID。
+        """
+        current_session = self._current_session
+        if current_session is not None and not current_session.ws.closed:
+            self._replaced_total += 1
+            self._logger.info(f"NapCat 账号 {client_self_id or '?'} 从 {peer} 重新连入，关闭旧的反向连接")
+            await current_session.ws.close()
+
+        session = _NapCatReverseSession(ws=ws, peer=peer, client_self_id=client_self_id)
+        if client_self_id:
+            self._client_self_id = client_self_id
+        await self._sessions.put(session)
+        await session.finished
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回传输层的运行指标。
+
+        Returns:
+            Dict[str, Any]: 在正向客户端指标的基础上附加反向连接信息。
+        """
+        stats = super().get_stats()
+        current_session = self._current_session
+        host, port = self.listen_address
+        stats["reverse"] = {
+            "listen": f"{host}:{port}",
+            "peer": current_session.peer if current_session is not None else "",
+            "client_self_id": self._client_self_id,
+            "sessions": self._sessions_total,
+            "replaced": self._replaced_total,
+        }
+        return stats
+
+    async def _connection_loop(self) -> None:
+        """登记到共享服务端，并逐条处理 NapCat 连入的连接。"""
+        server_config = self._server_config
+        if server_config is not None and not server_config.token and self.requires_token:
+            host, port = self.listen_address
+            self._logger.error(
+                f"NapCat 反向 WebSocket 拒绝在 {host or '*'}:{port} 上无令牌监听：非回环地址必须配置 napcat_server.token，"
+                "否则任何能访问该端口的客户端都可以冒充 NapCat；请配置 token 或改为监听 127.0.0.1"
+            )
+            return
+
+        while not self._stop_requested:
+            try:
+                await self._reverse_server.register(self)
+                break
+            except OSError as exc:
+                delay_sec = max(1.0, self._reconnect_policy.next_delay())
+                host, port = self.listen_address
+                self._logger.error(f"NapCat 反向 WebSocket 无法监听 {host}:{port}: {exc}；将在 {delay_sec:.1f} 秒后重试")
+                await asyncio.sleep(delay_sec)
+
+        try:
+            while not self._stop_requested:
+                session = await self._sessions.get()
+                if session.ws.closed:
+                    self._finish_session(session)
+                    continue
+
+                server_config = self._server_config
+                ws_url = server_config.build_ws_url() if server_config is not None else ""
+                self._current_session = session
+                self._sessions_total += 1
+                self._logger.info(f"NapCat 账号 {session.client_self_id or '?'} 已通过反向 WebSocket 连入: {session.peer}")
+                end_reason = ""
+                try:
+                    end_reason = await self._run_session(session.ws, ws_url)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    end_reason = str(exc)
+                finally:
+                    self._current_session = None
+                    with contextlib.suppress(Exception):
+                        await session.ws.close()
+                    self._finish_session(session)
+                if not self._stop_requested:
+                    self._logger.warning(
+                        f"NapCat 反向 WebSocket 连接已断开: {session.peer}，{end_reason}；等待 NapCat 重新连入"
+                    )
+        finally:
+            while not self._sessions.empty():
+                self._finish_session(self._sessions.get_nowait())
+            await self._reverse_server.unregister(self)
+
+    @staticmethod
+    def _finish_session(session: _NapCatReverseSession) -> None:
+        """通知服务端处理函数连接已结束。
+
+        Args:
+            session: 已结束的反向连接。
+        """
+        if not session.finished.done():
+            session.finished.set_result(None)
+
+
+class NapCatReverseServer:
+    """供多个 NapCat 账号连入的共享反向 WebSocket 服务端。
+
+    监听地址相同的反向连接共用一个 ``aiohttp.web`` 监听器。连入请求按访问令牌找到候选连接；
+    候选不止一条时，按 ``X-Self-ID`` 优先匹配此前服务过同一账号的连接，其次选择尚未绑定账号的空闲连接。
+    """
+
+    def __init__(self, logger: Any) -> None:
+        """初始化反向 WebSocket 服务端。
+
+        Args:
+            logger: 插件日志对象。
+        """
+        self._logger = logger
+        self._transports: Dict[Tuple[str, int], List[NapCatReverseTransport]] = {}
+        self._runners: Dict[Tuple[str, int], Any] = {}
+        self._listener_lock = asyncio.Lock()
+        self._accepted_total: int = 0
+        self._rejected_counts: Dict[str, int] = {}
+
+    async def register(self, transport: NapCatReverseTransport) -> None:
+        """登记一条反向连接，必要时启动对应地址的监听器。
+
+        Args:
+            transport: 需要接收连接的反向传输层。
+
+        Raises:
+            OSError: 监听地址无法绑定时抛出。
+        """
+        address = transport.listen_address
+        async with self._listener_lock:
+            if address not in self._runners:
+                await self._start_listener(address)
+            transports = self._transports.setdefault(address, [])
+            if transport not in transports:
+                transports.append(transport)
+
+    async def unregister(self, transport: NapCatReverseTransport) -> None:
+        """注销一条反向连接；地址上不再有连接时关闭监听器。
+
+        Args:
+            transport: 需要注销的反向传输层。
+        """
+        async with self._listener_lock:
+            for address, transports in list(self._transports.items()):
+                if transport in transports:
+                    transports.remove(transport)
+                if transports:
+                    continue
+                self._transports.pop(address, None)
+                runner = self._runners.pop(address, None)
+                if runner is not None:
+                    with contextlib.suppress(Exception):
+                        await runner.cleanup()
+                    self._logger.info(f"NapCat 反向 WebSocket 已停止监听: {address[0]}:{address[1]}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回反向服务端的运行指标。
+
+        Returns:
+            Dict[str, Any]: 监听地址、已登记连接数以及接受与按原因划分的拒绝计数。
+        """
+        return {
+            "listeners": [f"{host}:{port}" for host, port in self._runners],
+            "registered": sum(len(transports) for transports in self._transports.values()),
+            "accepted": self._accepted_total,
+            "rejected": dict(self._rejected_counts),
+        }
+
+    async def _start_listener(self, address: Tuple[str, int]) -> None:
+        """在指定地址启动监听器。
+
+        Args:
+            address: 监听的主机与端口。
+        """
+        if not AIOHTTP_WEB_AVAILABLE:
+            raise RuntimeError("NapCat 反向 WebSocket 依赖 aiohttp，但当前环境未安装该依赖")
+
+        async def _handle(request: Any) -> Any:
+            return await self._handle_request(request, address)
+
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", _handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, address[0], address[1]).start()
+        except BaseException:
+            await runner.cleanup()
+            raise
+        self._runners[address] = runner
+        self._logger.info(f"NapCat 反向 WebSocket 开始监听: ws://{address[0]}:{address[1]}")
+
+    async def _handle_request(self, request: Any, address: Tuple[str, int]) -> Any:
+        """鉴权并接受一条 NapCat 连入请求。
+
+        Args:
+            request: ``aiohttp.web`` 请求对象。
+            address: 接收该请求的监听地址。
+
+        Returns:
+            Any: WebSocket 响应，或鉴权失败时的 HTTP 错误响应。
+        """
+        peer = str(request.remote or "")
+        client_role = str(request.headers.get("X-Client-Role") or "Universal")
+        if client_role.lower() != "universal":
+            return self._reject("unsupported_role", 400, f"仅支持 Universal 角色的连接，收到 {client_role}", peer)
+
+        token = self._extract_token(request)
+        client_self_id = str(request.headers.get("X-Self-ID") or "").strip()
+        candidates = [transport for transport in self._transports.get(address, []) if transport.matches_token(token)]
+        if not candidates:
+            return self._reject("unauthorized", 401, "访问令牌不匹配任何反向连接", peer)
+
+        transport = self._select_transport(candidates, client_self_id)
+        if transport is None:
+            return self._reject("no_free_connection", 409, f"没有可供账号 {client_self_id or '?'} 使用的空闲反向连接", peer)
+
+        ws = web.WebSocketResponse(heartbeat=transport.heartbeat_interval or None)
+        await ws.prepare(request)
+        self._accepted_total += 1
+        await transport.accept(ws, peer, client_self_id)
+        return ws
+
+    @staticmethod
+    def _select_transport(
+        candidates: List[NapCatReverseTransport],
+        client_self_id: str,
+    ) -> Optional[NapCatReverseTransport]:
+        """为连入请求选择反向连接。
+
+        Args:
+            candidates: 访问令牌匹配的反向连接。
+            client_self_id: 请求声明的账号 ID。
+
+        Returns:
+            Optional[NapCatReverseTransport]: 选中的连接；没有可用连接时返回 ``None``。
+        """
+        if len(candidates) == 1:
+            return candidates[0]
+        if client_self_id:
+            for transport in candidates:
+                if transport.client_self_id == client_self_id:
+                    return transport
+        for transport in candidates:
+            if not transport.is_serving and not transport.client_self_id:
+                return transport
+        return None
+
+    @staticmethod
+    def _extract_token(request: Any) -> str:
+        """从请求头或查询参数中读取访问令牌。
+
+        Args:
+            request: ``aiohttp.web`` 请求对象。
+
+        Returns:
+            str: 访问令牌；未携带时为空字符串。
+        """
+        authorization = str(request.headers.get("Authorization") or "").strip()
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() in {"bearer", "token"} and credentials:
+            return credentials.strip()
+        return str(request.query.get("access_token") or "").strip()
+
+    def _reject(self, reason: str, status: int, message: str, peer: str) -> Any:
+        """记录并拒绝一条连入请求。
+
+        Args:
+            reason: 拒绝原因键。
+            status: HTTP 状态码。
+            message: 日志与响应中的说明。
+            peer: 对端地址。
+
+        Returns:
+            Any: HTTP 错误响应。
+        """
+        self._rejected_counts[reason] = self._rejected_counts.get(reason, 0) + 1
+        self._logger.warning(f"NapCat 反向 WebSocket 拒绝来自 {peer} 的连接: {message}")
+        return web.Response(status=status, text=message)
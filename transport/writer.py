@@ -0,0 +1,311 @@
+"""NapCat 出站帧单写协程。"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
+
+import asyncio
+import contextlib
+import time
+
+from ..constants import (
+    DEFAULT_OUTBOUND_BULK_FRAME_BYTES,
+    DEFAULT_OUTBOUND_BULK_MAX_BYPASS,
+    DEFAULT_OUTBOUND_BULK_MAX_WAIT_MS,
+    DEFAULT_OUTBOUND_LATENCY_SAMPLE_SIZE,
+)
+
+if TYPE_CHECKING:
+    from aiohttp import ClientWebSocketResponse as AiohttpClientWebSocketResponse
+else:
+    AiohttpClientWebSocketResponse = Any
+
+FRAME_PRIORITY_CONTROL = 0
+FRAME_PRIORITY_BULK = 1
+
+_OutboundFrame = Tuple[int, float, str, "asyncio.Future[None]"]
+
+
+class NapCatNotConnectedError(RuntimeError):
+    """连接不可用导致动作帧没有写出。
+
+    与其他发送异常不同，抛出该异常时可以确定 NapCat 没有收到这一帧，调用方可以安全地重新发送。
+    """
+
+
+class NapCatOutboundWriter:
+    """由唯一写协程按优先级发送出站帧。
+
+    调用方把编码好的帧放入优先级队列后等待写出完成。小体积的控制与查询帧优先于
+    ``base64://`` 媒体等大帧发送，因此单个多 MB 的图片发送不会阻塞 ``get_msg`` 等小请求；
+    同一优先级内保持先进先出。写协程每次醒来会把已就绪的小帧一并写出。
+
+    为避免持续的小帧流量让大帧永远得不到发送，最早的大帧等待超过 ``bulk_max_wait_ms``，
+    或其等待期间已有 ``bulk_max_bypass`` 个小帧先行写出时，该大帧会被提前到下一批写出。
+    """
+
+    def __init__(
+        self,
+        logger: Any,
+        bulk_frame_threshold: int = DEFAULT_OUTBOUND_BULK_FRAME_BYTES,
+        latency_sample_size: int = DEFAULT_OUTBOUND_LATENCY_SAMPLE_SIZE,
+        bulk_max_wait_ms: float = DEFAULT_OUTBOUND_BULK_MAX_WAIT_MS,
+        bulk_max_bypass: int = DEFAULT_OUTBOUND_BULK_MAX_BYPASS,
+    ) -> None:
+        """初始化出站写协程管理器。
+
+        Args:
+            logger: 插件日志对象。
+            bulk_frame_threshold: 帧长度达到该值时按大帧处理。
+            latency_sample_size: 用于统计发送延迟的最近样本数。
+            bulk_max_wait_ms: 最早的大帧最多等待的毫秒数，超过后优先于小帧写出。
+            bulk_max_bypass: 最早的大帧等待期间最多允许先行写出的小帧数。
+        """
+        self._logger = logger
+        self._bulk_frame_threshold = max(1, int(bulk_frame_threshold))
+        self._bulk_max_wait_sec = max(0.0, float(bulk_max_wait_ms)) / 1000
+        self._bulk_max_bypass = max(1, int(bulk_max_bypass))
+        self._control_frames: Deque[_OutboundFrame] = deque()
+        self._bulk_frames: Deque[_OutboundFrame] = deque()
+        self._frame_ready = asyncio.Event()
+        self._bulk_bypassed: int = 0
+        self._ws: Optional[AiohttpClientWebSocketResponse] = None
+        self._writer_task: Optional[asyncio.Task[None]] = None
+        self._latency_samples: Deque[float] = deque(maxlen=max(1, int(latency_sample_size)))
+        self._peak_depth: int = 0
+        self._frames_sent: int = 0
+        self._bulk_frames_sent: int = 0
+        self._bytes_sent: int = 0
+        self._batches_sent: int = 0
+        self._max_batch_size: int = 0
+        self._failed_total: int = 0
+        self._bulk_promoted_total: int = 0
+        self._last_latency_ms: float = 0.0
+
+    @property
+    def is_attached(self) -> bool:
+        """返回当前是否已绑定可写的连接。"""
+        return self._ws is not None and self._writer_task is not None
+
+    def attach(self, ws: AiohttpClientWebSocketResponse) -> None:
+        """绑定新的 WebSocket 连接并启动写协程。
+
+        Args:
+            ws: 新建立的 WebSocket 连接对象。
+        """
+        self._ws = ws
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer_loop(), name="napcat_adapter.outbound_writer")
+
+    async def detach(self, error_message: str) -> None:
+        """停止写协程，并让尚未写出的帧以异常结束。
+
+        Args:
+            error_message: 写入异常中的错误信息。
+        """
+        self._ws = None
+        writer_task = self._writer_task
+        self._writer_task = None
+        if writer_task is not None:
+            writer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await writer_task
+
+        for queued in (self._control_frames, self._bulk_frames):
+            while queued:
+                _priority, _enqueued_at, _frame, send_future = queued.popleft()
+                if not send_future.done():
+                    send_future.set_exception(NapCatNotConnectedError(error_message))
+        self._bulk_bypassed = 0
+
+    def enqueue(self, frame: str) -> "asyncio.Future[None]":
+        """将一帧放入出站队列。
+
+        返回的 future 在帧写出后完成；调用方在帧写出前取消该 future 时，写协程会跳过这一帧。
+
+        Args:
+            frame: 已编码的 JSON 文本帧。
+
+        Returns:
+            asyncio.Future[None]: 帧写出完成的 future，写出失败时以异常结束。
+
+        Raises:
+            NapCatNotConnectedError: 当连接不可用、帧无法入队时抛出。
+        """
+        if not self.is_attached:
+            raise NapCatNotConnectedError("NapCat is not connected")
+
+        is_bulk = len(frame) >= self._bulk_frame_threshold
+        priority = FRAME_PRIORITY_BULK if is_bulk else FRAME_PRIORITY_CONTROL
+        send_future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        queued = self._bulk_frames if is_bulk else self._control_frames
+        queued.append((priority, time.monotonic(), frame, send_future))
+        self._frame_ready.set()
+        self._peak_depth = max(self._peak_depth, self._queue_depth())
+        return send_future
+
+    async def send(self, frame: str) -> None:
+        """将一帧放入出站队列并等待其写出。
+
+        Args:
+            frame: 已编码的 JSON 文本帧。
+
+        Raises:
+            NapCatNotConnectedError: 当连接不可用、帧尚未写出时抛出。
+            RuntimeError: 当写出失败时抛出。
+        """
+        await self.enqueue(frame)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """返回出站队列与发送延迟指标。
+
+        Returns:
+            Dict[str, Any]: 队列深度、批量写出与最近帧发送延迟等指标。
+        """
+        samples = sorted(self._latency_samples)
+        return {
+            "running": self.is_attached,
+            "queue_depth": self._queue_depth(),
+            "queue_bulk_depth": len(self._bulk_frames),
+            "queue_peak_depth": self._peak_depth,
+            "bulk_frame_threshold": self._bulk_frame_threshold,
+            "bulk_max_wait_ms": round(self._bulk_max_wait_sec * 1000, 3),
+            "bulk_max_bypass": self._bulk_max_bypass,
+            "bulk_promoted": self._bulk_promoted_total,
+            "frames_sent": self._frames_sent,
+            "bulk_frames_sent": self._bulk_frames_sent,
+            "bytes_sent": self._bytes_sent,
+            "batches_sent": self._batches_sent,
+            "max_batch_size": self._max_batch_size,
+            "failed": self._failed_total,
+            "send_latency_ms": {
+                "last": round(self._last_latency_ms, 3),
+                "p50": round(self._percentile(samples, 0.5), 3),
+                "p95": round(self._percentile(samples, 0.95), 3),
+                "max": round(samples[-1], 3) if samples else 0.0,
+                "samples": len(samples),
+            },
+        }
+
+    async def _writer_loop(self) -> None:
+        """持续取出优先级最高的帧并写出。
+
+        大帧每次只写一帧，写完后重新检查队列，使期间到达的小帧能插到其余大帧之前；
+        小帧则与同时就绪的其它小帧组成一批连续写出。
+        """
+        while True:
+            while not self._control_frames and not self._bulk_frames:
+                self._frame_ready.clear()
+                await self._frame_ready.wait()
+            await self._write_batch(self._next_batch())
+
+    def _next_batch(self) -> List[_OutboundFrame]:
+        """取出下一批待写出的帧。
+
+        Returns:
+            List[_OutboundFrame]: 单个大帧，或按入队顺序排列的全部已就绪小帧。
+        """
+        while self._bulk_frames and self._bulk_frames[0][3].done():
+            self._bulk_frames.popleft()
+        if self._bulk_frames and (not self._control_frames or self._is_bulk_overdue()):
+            if self._control_frames:
+                self._bulk_promoted_total += 1
+            self._bulk_bypassed = 0
+            return [self._bulk_frames.popleft()]
+
+        batch = list(self._control_frames)
+        self._control_frames.clear()
+        if self._bulk_frames:
+            self._bulk_bypassed += len(batch)
+        return batch
+
+    def _is_bulk_overdue(self) -> bool:
+        """判断最早的大帧是否已等待过久。
+
+        Returns:
+            bool: 等待时间或先行写出的小帧数达到上限时返回 ``True``。
+        """
+        if self._bulk_bypassed >= self._bulk_max_bypass:
+            return True
+        return time.monotonic() - self._bulk_frames[0][1] >= self._bulk_max_wait_sec
+
+    def _queue_depth(self) -> int:
+        """返回尚未写出的帧数。
+
+        Returns:
+            int: 小帧与大帧队列的总长度。
+        """
+        return len(self._control_frames) + len(self._bulk_frames)
+
+    async def _write_batch(self, batch: List[_OutboundFrame]) -> None:
+        """依次写出一批帧并记录指标。
+
+        Args:
+            batch: 待写出的帧。
+        """
+        written = 0
+        for priority, enqueued_at, frame, send_future in batch:
+            if send_future.done():
+                continue
+
+            ws = self._ws
+            if ws is None or ws.closed:
+                self._failed_total += 1
+                send_future.set_exception(NapCatNotConnectedError("NapCat is not connected"))
+                continue
+
+            try:
+                await ws.send_str(frame)
+            except asyncio.CancelledError:
+                for _item_priority, _item_enqueued_at, _item_frame, pending_future in batch:
+                    if not pending_future.done():
+                        pending_future.set_exception(RuntimeError("NapCat connection closed"))
+                raise
+            except Exception as exc:
+                self._failed_total += 1
+                self._logger.debug(f"NapCat 出站帧写出失败: {exc}")
+                if not send_future.done():
+                    send_future.set_exception(RuntimeError(f"NapCat 出站帧写出失败: {exc}"))
+                continue
+
+            self._record_sent(priority, frame, enqueued_at)
+            written += 1
+            if not send_future.done():
+                send_future.set_result(None)
+
+        if written:
+            self._batches_sent += 1
+            self._max_batch_size = max(self._max_batch_size, written)
+
+    def _record_sent(self, priority: int, frame: str, enqueued_at: float) -> None:
+        """记录一帧写出完成后的计数与延迟。
+
+        Args:
+            priority: 帧优先级。
+            frame: 已写出的帧。
+            enqueued_at: 帧入队时的单调时钟时间。
+        """
+        latency_ms = (time.monotonic() - enqueued_at) * 1000
+        self._last_latency_ms = latency_ms
+        self._latency_samples.append(latency_ms)
+        self._frames_sent += 1
+        self._bytes_sent += len(frame)
+        if priority == FRAME_PRIORITY_BULK:
+            self._bulk_frames_sent += 1
+
+    @staticmethod
+    def _percentile(sorted_samples: List[float], ratio: float) -> float:
+        """计算已排序样本的分位数。
+
+        Args:
+            sorted_samples: 升序排列的样本。
+            ratio: 分位比例，取值 ``0`` 到 ``1``。
+
+        Returns:
+            float: 分位值；无样本时为 ``0``。
+        """
+        if not sorted_samples:
+            return 0.0
+        index = min(len(sorted_samples) - 1, int(round(ratio * (len(sorted_samples) - 1))))
+        return sorted_samples[index]